@@ -36,6 +36,7 @@ from app.presentation.api.invoices.invoice import router as invoice_router
 from app.presentation.api.payments.payment import router as payment_router
 from app.presentation.api.tenant_subscriptions.tenant_subscription import router as subscription_router
 from app.presentation.api.system.maintenance import router as maintenance_router
+from app.presentation.api.dashboard.dashboard import router as dashboard_router
 import sqlalchemy
 from app.core.auth_middleware import conditional_auth
 from app.core.audit_middleware import AuditMiddleware
@@ -97,11 +98,100 @@ async def lifespan(app: FastAPI):
     asyncio.create_task(periodic_cleanup())
     default_logger.info("✅ Automatic connection cleanup started (every 2 minutes)")
     
+    # Resolve pending M-PESA STK pushes whose callback is late or lost
+    if config("MPESA_RECONCILIATION_ENABLED", default="true", cast=bool):
+        from app.services.payments.mpesa_reconciliation import start_mpesa_reconciliation
+        start_mpesa_reconciliation()
+        default_logger.info("✅ M-PESA reconciliation worker started")
+    
+    # Flush aggregated tenant usage to the database and Stripe in batches
+    from app.services.tenant_subscriptions.usage_meter import start_usage_meter
+    start_usage_meter()
+    
+    # Handle queued Stripe webhook events outside the webhook requests
+    if config("STRIPE_SECRET_KEY", default=None) and config("STRIPE_WEBHOOK_WORKER_ENABLED", default="true", cast=bool):
+        from app.services.stripe.stripe_webhook_worker import start_stripe_webhook_worker
+        start_stripe_webhook_worker()
+        default_logger.info("✅ Stripe webhook worker started")
+    
+    # Snapshot stock balances so as-of and movement reports only read the recent ledger
+    if config("STOCK_SNAPSHOT_WORKER_ENABLED", default="true", cast=bool):
+        from app.services.stock_levels.stock_snapshot_worker import start_stock_snapshot_worker
+        start_stock_snapshot_worker()
+        default_logger.info("✅ Stock snapshot worker started")
+    
+    # Release abandoned stock reservation holds once they expire
+    if config("STOCK_RESERVATION_EXPIRER_ENABLED", default="true", cast=bool):
+        from app.services.stock_levels.stock_reservation_expirer import start_stock_reservation_expirer
+        start_stock_reservation_expirer()
+        default_logger.info("✅ Stock reservation expirer started")
+    
+    # Reconcile each day's returned truck stock against manifests and deliveries
+    if config("TRUCK_RECONCILIATION_WORKER_ENABLED", default="true", cast=bool):
+        from app.services.vehicles.truck_reconciliation_worker import start_truck_reconciliation_worker
+        start_truck_reconciliation_worker()
+        default_logger.info("✅ Truck reconciliation worker started")
+    
+    # Keep the landing dashboard snapshots of tenants in use current between views
+    if config("DASHBOARD_REFRESH_WORKER_ENABLED", default="true", cast=bool):
+        from app.services.dashboard.dashboard_refresh_worker import start_dashboard_refresh_worker
+        start_dashboard_refresh_worker()
+        default_logger.info("✅ Dashboard refresh worker started")
+    
     yield
     
     # Shutdown - Clean up all database connections
     default_logger.info("Shutting down OMS Backend application...")
     
+    # Stop background workers before the connections they use are closed
+    try:
+        from app.services.dashboard.dashboard_refresh_worker import stop_dashboard_refresh_worker
+        await stop_dashboard_refresh_worker()
+    except Exception as e:
+        default_logger.error(f"Error stopping dashboard refresh worker: {str(e)}")
+    
+    try:
+        from app.services.vehicles.truck_reconciliation_worker import stop_truck_reconciliation_worker
+        await stop_truck_reconciliation_worker()
+    except Exception as e:
+        default_logger.error(f"Error stopping truck reconciliation worker: {str(e)}")
+    
+    try:
+        from app.services.stock_levels.stock_reservation_expirer import stop_stock_reservation_expirer
+        await stop_stock_reservation_expirer()
+    except Exception as e:
+        default_logger.error(f"Error stopping stock reservation expirer: {str(e)}")
+    
+    try:
+        from app.services.stock_levels.stock_snapshot_worker import stop_stock_snapshot_worker
+        await stop_stock_snapshot_worker()
+    except Exception as e:
+        default_logger.error(f"Error stopping stock snapshot worker: {str(e)}")
+    
+    try:
+        from app.services.stripe.stripe_webhook_worker import stop_stripe_webhook_worker
+        await stop_stripe_webhook_worker()
+    except Exception as e:
+        default_logger.error(f"Error stopping Stripe webhook worker: {str(e)}")
+    
+    try:
+        from app.services.tenant_subscriptions.usage_meter import stop_usage_meter
+        await stop_usage_meter()
+    except Exception as e:
+        default_logger.error(f"Error flushing tenant usage: {str(e)}")
+    
+    try:
+        from app.services.payments.mpesa_reconciliation import stop_mpesa_reconciliation
+        await stop_mpesa_reconciliation()
+    except Exception as e:
+        default_logger.error(f"Error stopping M-PESA reconciliation: {str(e)}")
+    
+    try:
+        from app.services.invoices.invoice_pdf_renderer import shutdown_invoice_pdf_renderer
+        shutdown_invoice_pdf_renderer()
+    except Exception as e:
+        default_logger.error(f"Error stopping invoice PDF workers: {str(e)}")
+    
     # Clean up direct SQLAlchemy connections
     try:
         if not should_use_railway_mode() and direct_db_connection._engine:
@@ -109,6 +199,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         default_logger.error(f"Error closing direct SQLAlchemy connections: {str(e)}")
     
+    # Close pooled M-PESA connections
+    try:
+        from app.services.payments.mpesa_client import close_daraja_client
+        await close_daraja_client()
+    except Exception as e:
+        default_logger.error(f"Error closing M-PESA client: {str(e)}")
+    
     # Clean up Supabase connections
     try:
         from app.infrastucture.database.connection import db_connection
@@ -354,6 +451,7 @@ app.include_router(invoice_router, prefix="/api/v1")
 app.include_router(payment_router, prefix="/api/v1")
 app.include_router(subscription_router, prefix="/api/v1")
 app.include_router(maintenance_router, prefix="/api/v1")
+app.include_router(dashboard_router, prefix="/api/v1")
 
 
 def custom_openapi():
@@ -445,6 +543,7 @@ async def debug_environment():
         "supabase_key_configured": bool(config("SUPABASE_KEY", default=None)),
         "supabase_anon_key_configured": bool(config("SUPABASE_ANON_KEY", default=None)),
         "database_url_configured": bool(config("DATABASE_URL", default=None)),
+        "database_replica_url_configured": bool(config("DATABASE_REPLICA_URL", default=None)),
         "port": config("PORT", default="not_set"),
         "python_version": os.sys.version,
         "available_env_keys": [key for key in os.environ.keys() if "SUPABASE" in key or "DATABASE" in key or "PORT" in key]
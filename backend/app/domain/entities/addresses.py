@@ -100,4 +100,30 @@ class Address:
             zip_code=data.get("zip_code"),
             country=data["country"],
             access_instructions=data.get("access_instructions")
-        ) 
\ No newline at end of file
+        ) 
+
+@dataclass(frozen=True)
+class AddressLocation:
+    """Lightweight, immutable view of a geocoded address for map and proximity queries"""
+    address_id: UUID
+    customer_id: UUID
+    address_type: AddressType
+    longitude: float
+    latitude: float
+    street: str
+    city: str
+    is_primary_delivery: bool
+    distance_km: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "address_id": str(self.address_id),
+            "customer_id": str(self.customer_id),
+            "address_type": self.address_type.value,
+            "longitude": self.longitude,
+            "latitude": self.latitude,
+            "street": self.street,
+            "city": self.city,
+            "is_primary_delivery": self.is_primary_delivery,
+            "distance_km": round(self.distance_km, 3) if self.distance_km is not None else None
+        }
@@ -0,0 +1,51 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Read-only precomputed KPIs of a tenant's landing dashboard"""
+    tenant_id: UUID
+    version: int
+    digest: str
+    generated_at: datetime
+    kpis: Mapping[str, Mapping[str, Any]]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}-{self.digest}"'
+
+    @staticmethod
+    def build(
+        tenant_id: UUID,
+        kpis: Mapping[str, Mapping[str, Any]],
+        previous: Optional["DashboardSnapshot"] = None
+    ) -> "DashboardSnapshot":
+        """Snapshot of the KPIs; the version only moves on when they differ from the previous snapshot"""
+        digest = hashlib.sha256(json.dumps(kpis, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        if previous is None:
+            version = 1
+        elif previous.digest == digest:
+            version = previous.version
+        else:
+            version = previous.version + 1
+        return DashboardSnapshot(
+            tenant_id=tenant_id,
+            version=version,
+            digest=digest,
+            generated_at=datetime.utcnow(),
+            kpis=MappingProxyType({section: MappingProxyType(dict(values)) for section, values in kpis.items()})
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "tenant_id": str(self.tenant_id),
+            "version": self.version,
+            "generated_at": self.generated_at.isoformat(),
+            **{section: dict(values) for section, values in self.kpis.items()}
+        }
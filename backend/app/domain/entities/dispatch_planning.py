@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+
+@dataclass
+class DispatchOrder:
+    """An approved order waiting to be assigned to a vehicle"""
+    order_id: UUID
+    order_no: str
+    customer_id: UUID
+    weight_kg: float
+    volume_m3: float = 0.0
+    location: Optional[Tuple[float, float]] = None  # (longitude, latitude)
+
+    def to_dict(self) -> dict:
+        return {
+            "order_id": str(self.order_id),
+            "order_no": self.order_no,
+            "customer_id": str(self.customer_id),
+            "weight_kg": self.weight_kg,
+            "volume_m3": self.volume_m3,
+            "location": list(self.location) if self.location else None
+        }
+
+
+@dataclass
+class DispatchVehicle:
+    """A vehicle available for dispatch with its home depot"""
+    vehicle_id: UUID
+    plate: str
+    capacity_kg: float
+    capacity_m3: float = 0.0  # 0 means volume is not constrained
+    depot_id: Optional[UUID] = None
+    depot_location: Optional[Tuple[float, float]] = None  # (longitude, latitude)
+
+    def to_dict(self) -> dict:
+        return {
+            "vehicle_id": str(self.vehicle_id),
+            "plate": self.plate,
+            "capacity_kg": self.capacity_kg,
+            "capacity_m3": self.capacity_m3,
+            "depot_id": str(self.depot_id) if self.depot_id else None
+        }
+
+
+@dataclass
+class DispatchRoute:
+    """Orders assigned to one vehicle, in delivery sequence"""
+    vehicle: DispatchVehicle
+    orders: List[DispatchOrder] = field(default_factory=list)
+    total_weight_kg: float = 0.0
+    total_volume_m3: float = 0.0
+    trip_id: Optional[UUID] = None
+    trip_no: Optional[str] = None
+
+    def fits(self, order: DispatchOrder) -> bool:
+        """Check whether the order fits the remaining vehicle capacity"""
+        if self.total_weight_kg + order.weight_kg > self.vehicle.capacity_kg:
+            return False
+        if self.vehicle.capacity_m3 > 0 and self.total_volume_m3 + order.volume_m3 > self.vehicle.capacity_m3:
+            return False
+        return True
+
+    def add(self, order: DispatchOrder) -> None:
+        """Add an order and update running totals"""
+        self.orders.append(order)
+        self.total_weight_kg += order.weight_kg
+        self.total_volume_m3 += order.volume_m3
+
+    def get_utilization_percentage(self) -> dict:
+        weight_pct = (self.total_weight_kg / self.vehicle.capacity_kg * 100) if self.vehicle.capacity_kg > 0 else 0
+        volume_pct = (self.total_volume_m3 / self.vehicle.capacity_m3 * 100) if self.vehicle.capacity_m3 > 0 else 0
+        return {
+            "weight_utilization_pct": round(weight_pct, 2),
+            "volume_utilization_pct": round(volume_pct, 2)
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "trip_id": str(self.trip_id) if self.trip_id else None,
+            "trip_no": self.trip_no,
+            "vehicle": self.vehicle.to_dict(),
+            "stops": [
+                {"stop_no": index + 1, **order.to_dict()}
+                for index, order in enumerate(self.orders)
+            ],
+            "total_weight_kg": round(self.total_weight_kg, 3),
+            "total_volume_m3": round(self.total_volume_m3, 4),
+            "utilization": self.get_utilization_percentage()
+        }
+
+
+@dataclass
+class DispatchPlan:
+    """Result of a bulk dispatch planning run for one delivery date"""
+    planned_date: date
+    routes: List[DispatchRoute] = field(default_factory=list)
+    unassigned: List[DispatchOrder] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        used_routes = [route for route in self.routes if route.orders]
+        return {
+            "planned_date": self.planned_date.isoformat(),
+            "trip_count": len(used_routes),
+            "assigned_order_count": sum(len(route.orders) for route in used_routes),
+            "unassigned_order_count": len(self.unassigned),
+            "trips": [route.to_dict() for route in used_routes],
+            "unassigned_orders": [order.to_dict() for order in self.unassigned]
+        }
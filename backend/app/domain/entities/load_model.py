@@ -0,0 +1,189 @@
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+# Fixed-point scales: quantities in thousandths, weights in grams, volumes in cm³
+QTY_SCALE = 1000
+WEIGHT_SCALE = 1000
+VOLUME_SCALE = 1000000
+
+# Totals are qty × unit, so they carry both scales
+_WEIGHT_EXPONENT = -6  # 10^-3 (qty) × 10^-3 (kg per gram)
+_VOLUME_EXPONENT = -9  # 10^-3 (qty) × 10^-6 (m³ per cm³)
+
+
+def to_fixed(value: Any, scale: int) -> int:
+    """Convert a Decimal/float/int/str value to a scaled integer (half-up rounding)"""
+    if value is None:
+        return 0
+    return int((Decimal(str(value)) * scale).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_fixed(value: int, exponent: int) -> Decimal:
+    """Convert a scaled integer back to Decimal"""
+    return Decimal(value).scaleb(exponent) if value else Decimal("0")
+
+
+class LoadModel:
+    """
+    Compact load model for capacity planning.
+
+    Every item (usually a variant) occupies one slot in parallel integer arrays
+    holding its quantity and unit weight/volume as fixed-point integers. Totals
+    are maintained incrementally on add/remove, so changing one line costs O(1)
+    instead of re-summing every line, and candidate loads can be evaluated in
+    bulk against the current load without mutating it.
+    """
+
+    __slots__ = ("_index", "_keys", "_qty", "_unit_weight", "_unit_volume", "_total_weight", "_total_volume")
+
+    def __init__(self):
+        self._index: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self._qty = array("q")
+        self._unit_weight = array("q")
+        self._unit_volume = array("q")
+        self._total_weight = 0
+        self._total_volume = 0
+
+    @classmethod
+    def from_items(cls, items: Sequence[Tuple[Hashable, Any, Any, Any]]) -> "LoadModel":
+        """Build a model from (key, quantity, unit_weight_kg, unit_volume_m3) tuples; repeated keys accumulate"""
+        model = cls()
+        for key, quantity, unit_weight_kg, unit_volume_m3 in items:
+            if key not in model._index:
+                model.set_item(key, unit_weight_kg, unit_volume_m3)
+            model.add(key, quantity)
+        return model
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def set_item(self, key: Hashable, unit_weight_kg: Any, unit_volume_m3: Any = 0, quantity: Any = None) -> None:
+        """Register or re-price an item; optionally set its quantity at the same time"""
+        weight = to_fixed(unit_weight_kg, WEIGHT_SCALE)
+        volume = to_fixed(unit_volume_m3, VOLUME_SCALE)
+        slot = self._index.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            self._index[key] = slot
+            self._keys.append(key)
+            self._qty.append(0)
+            self._unit_weight.append(weight)
+            self._unit_volume.append(volume)
+        else:
+            qty = self._qty[slot]
+            self._total_weight += qty * (weight - self._unit_weight[slot])
+            self._total_volume += qty * (volume - self._unit_volume[slot])
+            self._unit_weight[slot] = weight
+            self._unit_volume[slot] = volume
+
+        if quantity is not None:
+            self.set_quantity(key, quantity)
+
+    def add(self, key: Hashable, quantity: Any) -> None:
+        """Add quantity of a registered item"""
+        self._apply(self._slot(key), to_fixed(quantity, QTY_SCALE))
+
+    def remove(self, key: Hashable, quantity: Any) -> None:
+        """Remove quantity of a registered item; the quantity cannot go below zero"""
+        slot = self._slot(key)
+        delta = to_fixed(quantity, QTY_SCALE)
+        if delta > self._qty[slot]:
+            raise ValueError(f"Cannot remove more than the loaded quantity of {key}")
+        self._apply(slot, -delta)
+
+    def set_quantity(self, key: Hashable, quantity: Any) -> None:
+        """Replace the quantity of a registered item"""
+        slot = self._slot(key)
+        self._apply(slot, to_fixed(quantity, QTY_SCALE) - self._qty[slot])
+
+    def discard(self, key: Hashable) -> None:
+        """Zero an item's quantity; unknown keys are ignored"""
+        slot = self._index.get(key)
+        if slot is not None:
+            self._apply(slot, -self._qty[slot])
+
+    def get_quantity(self, key: Hashable) -> Decimal:
+        return from_fixed(self._qty[self._slot(key)], -3)
+
+    def get_line_weight_kg(self, key: Hashable) -> Decimal:
+        slot = self._slot(key)
+        return from_fixed(self._qty[slot] * self._unit_weight[slot], _WEIGHT_EXPONENT)
+
+    def get_line_volume_m3(self, key: Hashable) -> Decimal:
+        slot = self._slot(key)
+        return from_fixed(self._qty[slot] * self._unit_volume[slot], _VOLUME_EXPONENT)
+
+    @property
+    def total_weight_kg(self) -> Decimal:
+        return from_fixed(self._total_weight, _WEIGHT_EXPONENT)
+
+    @property
+    def total_volume_m3(self) -> Decimal:
+        return from_fixed(self._total_volume, _VOLUME_EXPONENT)
+
+    def fits(self, capacity_kg: Any, capacity_m3: Any = None) -> bool:
+        """Check the current load against capacity; a zero/None volume capacity is unconstrained"""
+        return self._fits(self._total_weight, self._total_volume, *self._capacity(capacity_kg, capacity_m3))
+
+    def evaluate_candidates(
+        self,
+        candidates: Sequence[Mapping[Hashable, Any]],
+        capacity_kg: Any = None,
+        capacity_m3: Any = None
+    ) -> List[Dict[str, Any]]:
+        """
+        What-if evaluation of many candidate changes at once.
+
+        Each candidate maps item keys to a quantity delta (negative to unload)
+        applied on top of the current load. The model itself is not modified.
+        Unknown keys raise ValueError; register them with set_item first.
+        """
+        weight_capacity, volume_capacity = self._capacity(capacity_kg, capacity_m3)
+        results = []
+        for candidate in candidates:
+            weight = self._total_weight
+            volume = self._total_volume
+            for key, quantity in candidate.items():
+                slot = self._slot(key)
+                delta = to_fixed(quantity, QTY_SCALE)
+                weight += delta * self._unit_weight[slot]
+                volume += delta * self._unit_volume[slot]
+            results.append({
+                "weight_kg": from_fixed(weight, _WEIGHT_EXPONENT),
+                "volume_m3": from_fixed(volume, _VOLUME_EXPONENT),
+                "fits": self._fits(weight, volume, weight_capacity, volume_capacity)
+            })
+        return results
+
+    def _slot(self, key: Hashable) -> int:
+        slot = self._index.get(key)
+        if slot is None:
+            raise ValueError(f"Item {key} is not part of the load model")
+        return slot
+
+    def _apply(self, slot: int, delta: int) -> None:
+        if not delta:
+            return
+        self._qty[slot] += delta
+        self._total_weight += delta * self._unit_weight[slot]
+        self._total_volume += delta * self._unit_volume[slot]
+
+    @staticmethod
+    def _capacity(capacity_kg: Any, capacity_m3: Any) -> Tuple[Optional[int], Optional[int]]:
+        # Capacities are compared in total units (qty scale × unit scale)
+        weight = to_fixed(capacity_kg, QTY_SCALE * WEIGHT_SCALE) if capacity_kg is not None else None
+        volume = to_fixed(capacity_m3, QTY_SCALE * VOLUME_SCALE) if capacity_m3 else None
+        return weight, volume or None
+
+    @staticmethod
+    def _fits(weight: int, volume: int, weight_capacity: Optional[int], volume_capacity: Optional[int]) -> bool:
+        if weight_capacity is not None and weight > weight_capacity:
+            return False
+        if volume_capacity is not None and volume > volume_capacity:
+            return False
+        return True
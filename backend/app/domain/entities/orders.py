@@ -5,6 +5,8 @@ from typing import List, Optional
 from uuid import UUID
 from dataclasses import dataclass, field
 
+from app.domain.entities.audit_events import AuditEvent
+
 
 class OrderStatus(str, Enum):
     """Order status enumeration following the business workflow"""
@@ -403,4 +405,15 @@ class Order:
             delivery_instructions=delivery_instructions,
             payment_terms=payment_terms,
             created_by=created_by
-        ) 
\ No newline at end of file
+        )
+
+
+@dataclass
+class OrderTransition:
+    """A set-based status change of many orders, written in the same transaction as the work that caused it"""
+    order_ids: List[UUID]
+    from_status: OrderStatus
+    to_status: OrderStatus
+    updated_by: Optional[UUID] = None
+    mark_delivered: bool = False
+    audit_events: List[AuditEvent] = field(default_factory=list)
@@ -203,4 +203,18 @@ class PaymentSummary:
             'failed_payments': self.failed_payments,
             'failed_amount': float(self.failed_amount),
             'success_rate': round(self.success_rate, 2)
-        }
\ No newline at end of file
+        }
+
+@dataclass
+class PaymentPostingLine:
+    """One line of a bank or M-Pesa statement to be posted as a payment"""
+    reference: str
+    amount: Decimal
+    payment_date: Optional[date] = None
+    external_transaction_id: Optional[str] = None
+    description: Optional[str] = None
+
+    @property
+    def normalized_reference(self) -> str:
+        """Reference as matched against invoice and order numbers"""
+        return (self.reference or '').strip().upper()
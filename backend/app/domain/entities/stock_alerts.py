@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+from uuid import UUID, uuid4
+
+from app.domain.entities.stock_docs import StockStatus
+
+
+# Reorder point of variants nobody has set one for
+DEFAULT_REORDER_POINT = Decimal('10')
+
+
+class StockAlertSeverity(str, Enum):
+    """How far an on-hand bucket has fallen below its reorder point"""
+    LOW = "low"
+    CRITICAL = "critical"
+    NEGATIVE = "negative"
+
+    @classmethod
+    def evaluate(cls, available_qty: Decimal, reorder_point: Decimal) -> Optional["StockAlertSeverity"]:
+        """Severity of a bucket with the given available quantity, or None when it needs no alert"""
+        if available_qty < 0:
+            return cls.NEGATIVE
+        if available_qty == 0:
+            return cls.CRITICAL
+        if available_qty < reorder_point:
+            return cls.LOW
+        return None
+
+    @property
+    def rank(self) -> int:
+        return list(StockAlertSeverity).index(self)
+
+
+@dataclass
+class StockReorderPoint:
+    """Available quantity below which a variant's on-hand stock is alerted; without a warehouse it covers every warehouse lacking its own"""
+    tenant_id: UUID
+    variant_id: UUID
+    reorder_point: Decimal
+    warehouse_id: Optional[UUID] = None
+    created_by: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_by: Optional[UUID] = None
+    updated_at: Optional[datetime] = None
+    id: UUID = field(default_factory=uuid4)
+
+
+@dataclass
+class StockPosition:
+    """Quantity and available quantity of one stock level bucket as the alert engine last saw it"""
+    warehouse_id: UUID
+    variant_id: UUID
+    stock_status: StockStatus
+    quantity: Decimal = Decimal('0')
+    available_qty: Decimal = Decimal('0')
+    last_transaction_date: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class StockAlert:
+    """Active alert on an on-hand bucket below its reorder point"""
+    tenant_id: UUID
+    warehouse_id: UUID
+    variant_id: UUID
+    quantity: Decimal
+    available_qty: Decimal
+    reorder_point: Decimal
+    severity: StockAlertSeverity
+    raised_at: datetime
+    stock_status: StockStatus = StockStatus.ON_HAND
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from app.domain.entities.stock_docs import StockStatus
+
+
+@dataclass
+class AvailabilityRequestLine:
+    """Quantity an order, trip load or stock document needs from one bucket"""
+    warehouse_id: UUID
+    variant_id: UUID
+    quantity: Decimal
+    stock_status: StockStatus = StockStatus.ON_HAND
+
+
+@dataclass
+class AvailabilityLineResult:
+    """Requested against available quantity of one bucket; lines on the same bucket are combined"""
+    warehouse_id: UUID
+    variant_id: UUID
+    stock_status: StockStatus
+    requested: Decimal
+    available: Decimal
+
+    @property
+    def is_available(self) -> bool:
+        return self.available >= self.requested
+
+    @property
+    def shortfall(self) -> Decimal:
+        return max(self.requested - self.available, Decimal('0'))
+
+
+@dataclass
+class AvailabilityCheck:
+    """Availability of every bucket a multi-line request draws on"""
+    lines: List[AvailabilityLineResult] = field(default_factory=list)
+
+    @classmethod
+    def for_lines(cls, lines: Iterable[AvailabilityRequestLine]) -> "AvailabilityCheck":
+        """One result per bucket with the requested quantities added up and nothing available yet"""
+        requested: Dict[Tuple[UUID, UUID, StockStatus], Decimal] = {}
+        for line in lines:
+            key = (line.warehouse_id, line.variant_id, line.stock_status)
+            requested[key] = requested.get(key, Decimal('0')) + line.quantity
+        return cls(lines=[
+            AvailabilityLineResult(warehouse_id, variant_id, stock_status, quantity, Decimal('0'))
+            for (warehouse_id, variant_id, stock_status), quantity in requested.items()
+        ])
+
+    @property
+    def is_available(self) -> bool:
+        return all(line.is_available for line in self.lines)
+
+    @property
+    def shortfalls(self) -> List[AvailabilityLineResult]:
+        return [line for line in self.lines if not line.is_available]
@@ -151,6 +151,9 @@ class StockDoc:
     deleted_at: Optional[datetime] = None
     deleted_by: Optional[UUID] = None
     stock_doc_lines: List[StockDocLine] = field(default_factory=list)
+    # Line aggregates computed by header-only listings, which leave stock_doc_lines empty
+    line_count: Optional[int] = None
+    total_value: Optional[Decimal] = None
 
     def __post_init__(self):
         """Convert string values to proper types after initialization"""
@@ -342,4 +345,42 @@ class StockDoc:
         # Validate warehouse requirements
         doc._validate_warehouse_requirements()
         
-        return doc
\ No newline at end of file
+        return doc
+
+@dataclass
+class StockCount:
+    """A physically counted quantity of one variant in one stock bucket"""
+    variant_id: UUID
+    counted_qty: Decimal
+    stock_status: StockStatus = StockStatus.ON_HAND
+
+
+@dataclass
+class StockTakeLine:
+    """System vs counted quantity of one variant/bucket in a stock take"""
+    variant_id: UUID
+    stock_status: StockStatus
+    system_qty: Decimal
+    counted_qty: Decimal
+    unit_cost: Decimal = Decimal('0')
+
+    @property
+    def variance(self) -> Decimal:
+        return self.counted_qty - self.system_qty
+
+    @property
+    def variance_value(self) -> Decimal:
+        return self.variance * self.unit_cost
+
+
+@dataclass
+class StockTakeResult:
+    """Outcome of a stock take: every compared line and the variance document, if one was needed"""
+    warehouse_id: UUID
+    counted_items: int
+    lines: List[StockTakeLine] = field(default_factory=list)
+    stock_doc: Optional[StockDoc] = None
+
+    @property
+    def variance_lines(self) -> List[StockTakeLine]:
+        return [line for line in self.lines if line.variance != 0]
@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Iterator, Optional
+from uuid import UUID, uuid4
+
+from app.domain.entities.stock_docs import StockStatus
+
+
+class StockMovementType(str, Enum):
+    """Kind of change recorded in the stock ledger"""
+    OPENING_BALANCE = "opening_balance"
+    RECEIPT = "receipt"
+    ISSUE = "issue"
+    ADJUSTMENT = "adjustment"
+    STATUS_TRANSFER = "status_transfer"
+    WAREHOUSE_TRANSFER = "warehouse_transfer"
+
+
+@dataclass
+class StockLedgerEntry:
+    """Append-only record of one change to a stock level bucket"""
+    tenant_id: UUID
+    warehouse_id: UUID
+    variant_id: UUID
+    stock_status: StockStatus
+    quantity_change: Decimal
+    balance_after: Decimal
+    movement_type: StockMovementType
+    unit_cost: Decimal = Decimal('0')
+    ref_doc_id: Optional[UUID] = None
+    ref_doc_type: Optional[str] = None
+    notes: Optional[str] = None
+    created_by: Optional[UUID] = None
+    occurred_at: Optional[datetime] = None
+    id: UUID = field(default_factory=uuid4)
+
+
+@dataclass
+class StockBalance:
+    """Quantity of one stock level bucket at a point in time"""
+    tenant_id: UUID
+    warehouse_id: UUID
+    variant_id: UUID
+    stock_status: StockStatus
+    quantity: Decimal
+    unit_cost: Decimal = Decimal('0')
+
+    @property
+    def total_value(self) -> Decimal:
+        return self.quantity * self.unit_cost
+
+
+@dataclass
+class StockMovement:
+    """Opening balance, inflow and outflow of one stock level bucket over a period"""
+    warehouse_id: UUID
+    variant_id: UUID
+    stock_status: StockStatus
+    opening_qty: Decimal = Decimal('0')
+    qty_in: Decimal = Decimal('0')
+    qty_out: Decimal = Decimal('0')
+
+    @property
+    def closing_qty(self) -> Decimal:
+        return self.opening_qty + self.qty_in - self.qty_out
+
+
+@dataclass
+class StockMovementSource:
+    """Who or what caused the stock changes made while it is active"""
+    movement_type: Optional[StockMovementType] = None
+    ref_doc_id: Optional[UUID] = None
+    ref_doc_type: Optional[str] = None
+    notes: Optional[str] = None
+    created_by: Optional[UUID] = None
+
+
+_movement_source: ContextVar[Optional[StockMovementSource]] = ContextVar("stock_movement_source", default=None)
+
+
+@contextmanager
+def stock_movement_source(**kwargs) -> Iterator[StockMovementSource]:
+    """Attribute ledger entries written inside the block, e.g. to the stock document being posted"""
+    source = StockMovementSource(**kwargs)
+    token = _movement_source.set(source)
+    try:
+        yield source
+    finally:
+        _movement_source.reset(token)
+
+
+def current_movement_source() -> Optional[StockMovementSource]:
+    return _movement_source.get()
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
@@ -136,6 +137,15 @@ class StockLevel:
         return self.__str__()
 
 
+@dataclass
+class StockBucketChange:
+    """Signed quantity change to one variant/status bucket of a warehouse"""
+    variant_id: UUID
+    stock_status: StockStatus
+    quantity_change: Decimal
+    unit_cost: Decimal = Decimal('0')
+
+
 class StockLevelSummary:
     """Summary entity for aggregated stock levels across multiple buckets"""
     
@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.domain.entities.stock_docs import StockStatus
+
+
+# How long a hold lasts when the caller does not say
+DEFAULT_RESERVATION_HOLD = timedelta(hours=24)
+
+
+class StockReservationStatus(str, Enum):
+    """Lifecycle of a stock reservation hold"""
+    ACTIVE = "active"
+    RELEASED = "released"
+    EXPIRED = "expired"
+
+
+@dataclass
+class StockReservation:
+    """Hold on the available quantity of one stock level bucket until it is released or expires"""
+    tenant_id: UUID
+    warehouse_id: UUID
+    variant_id: UUID
+    quantity: Decimal
+    expires_at: datetime
+    stock_status: StockStatus = StockStatus.ON_HAND
+    order_id: Optional[UUID] = None
+    order_line_id: Optional[UUID] = None
+    status: StockReservationStatus = StockReservationStatus.ACTIVE
+    created_by: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    released_at: Optional[datetime] = None
+    id: UUID = field(default_factory=uuid4)
+
+    @property
+    def bucket(self) -> Tuple[UUID, UUID, UUID, StockStatus]:
+        """The stock level row whose reserved quantity this hold counts towards"""
+        return (self.tenant_id, self.warehouse_id, self.variant_id, self.stock_status)
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.status == StockReservationStatus.ACTIVE and self.expires_at <= now
+
+
+@dataclass
+class StockHoldRequest:
+    """One line of a request to hold stock, e.g. an order line"""
+    warehouse_id: UUID
+    variant_id: UUID
+    quantity: Decimal
+    stock_status: StockStatus = StockStatus.ON_HAND
+    order_line_id: Optional[UUID] = None
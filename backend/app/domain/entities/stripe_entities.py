@@ -167,6 +167,12 @@ class StripeWebhookEvent(BaseModel):
     data: Dict[str, Any]
     processed: bool = False
     processed_at: Optional[datetime] = None
+    # Queue state: events sharing an ordering_key (the subscription) are handled in order
+    ordering_key: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    dead_lettered_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
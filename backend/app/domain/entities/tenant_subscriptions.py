@@ -6,7 +6,8 @@ from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, FrozenSet, Mapping
 from uuid import UUID, uuid4
 
 
@@ -268,6 +269,50 @@ class TenantSubscription:
         }
 
 
+@dataclass(frozen=True)
+class TenantEntitlements:
+    """Read-only snapshot of what a tenant's subscription allows"""
+    tenant_id: UUID
+    subscription_id: UUID
+    plan_id: UUID
+    plan_tier: PlanTier
+    subscription_status: TenantSubscriptionStatus
+    limits: Mapping[str, int]
+    features: FrozenSet[str]
+    subscription_data: Mapping[str, Any]
+    plan_data: Mapping[str, Any]
+
+    @staticmethod
+    def from_subscription(subscription: TenantSubscription, plan: TenantPlan) -> "TenantEntitlements":
+        return TenantEntitlements(
+            tenant_id=subscription.tenant_id,
+            subscription_id=subscription.id,
+            plan_id=plan.id,
+            plan_tier=plan.plan_tier,
+            subscription_status=subscription.subscription_status,
+            limits=MappingProxyType({
+                'orders': plan.max_orders_per_month,
+                'drivers': plan.max_active_drivers,
+                'storage': plan.max_storage_gb,
+                'api_calls': plan.max_api_requests_per_minute
+            }),
+            features=frozenset(plan.features or []),
+            subscription_data=MappingProxyType(subscription.to_dict()),
+            plan_data=MappingProxyType(plan.to_dict())
+        )
+
+    @property
+    def is_active(self) -> bool:
+        return self.subscription_status in (TenantSubscriptionStatus.ACTIVE, TenantSubscriptionStatus.TRIAL)
+
+    def limit_for(self, usage_type: str) -> Optional[int]:
+        """Plan limit for a usage type, None when the plan does not limit it"""
+        return self.limits.get(usage_type)
+
+    def has_feature(self, feature: str) -> bool:
+        return feature in self.features
+
+
 @dataclass
 class TenantSubscriptionSummary:
     """Tenant subscription summary for reporting"""
@@ -1,10 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from uuid import UUID
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
 from decimal import Decimal
 
+from app.domain.entities.load_model import LoadModel
+
 class TripPlanningValidationResult(str, Enum):
     VALID = "valid"
     CAPACITY_EXCEEDED = "capacity_exceeded"
@@ -60,6 +62,7 @@ class TripPlan:
     total_volume_m3: Decimal
     validation_result: TripPlanningValidationResult
     validation_messages: List[str]
+    load: LoadModel = field(default_factory=LoadModel, repr=False, compare=False)
     
     @staticmethod
     def create(
@@ -99,14 +102,26 @@ class TripPlan:
         self.orders = order_sequence
     
     def add_planning_line(self, line: TripPlanningLine) -> None:
-        """Add a planning line and recalculate totals"""
-        # Remove existing line for same product/variant if exists
+        """Add a planning line and update totals"""
+        key = (line.product_id, line.variant_id)
+        # Replace existing line for same product/variant if exists
+        if key in self.load:
+            self.planning_lines = [
+                l for l in self.planning_lines 
+                if not (l.product_id == line.product_id and l.variant_id == line.variant_id)
+            ]
+        
+        self.planning_lines.append(line)
+        self.load.set_item(key, line.unit_weight_kg, line.unit_volume_m3, quantity=line.planned_qty)
+        self._recalculate_totals()
+    
+    def remove_planning_line(self, product_id: UUID, variant_id: UUID) -> None:
+        """Remove the planning line for a specific product/variant"""
         self.planning_lines = [
             l for l in self.planning_lines 
-            if not (l.product_id == line.product_id and l.variant_id == line.variant_id)
+            if not (l.product_id == product_id and l.variant_id == variant_id)
         ]
-        
-        self.planning_lines.append(line)
+        self.load.discard((product_id, variant_id))
         self._recalculate_totals()
     
     def update_planned_quantity(self, product_id: UUID, variant_id: UUID, new_qty: Decimal) -> None:
@@ -114,14 +129,23 @@ class TripPlan:
         for line in self.planning_lines:
             if line.product_id == product_id and line.variant_id == variant_id:
                 line.planned_qty = new_qty
+                self.load.set_quantity((product_id, variant_id), new_qty)
                 self._recalculate_totals()
                 return
         raise ValueError(f"Product {product_id} variant {variant_id} not found in planning lines")
     
+    def evaluate_quantity_changes(self, candidates: List[Dict[tuple, Decimal]]) -> List[Dict[str, Any]]:
+        """
+        Evaluate candidate quantity changes without modifying the plan.
+        
+        Each candidate maps (product_id, variant_id) to a planned quantity delta.
+        """
+        return self.load.evaluate_candidates(candidates, self.vehicle_capacity_kg, self.vehicle_capacity_m3)
+    
     def _recalculate_totals(self) -> None:
-        """Recalculate total weight and volume"""
-        self.total_weight_kg = sum(line.get_total_weight() for line in self.planning_lines)
-        self.total_volume_m3 = sum(line.get_total_volume() for line in self.planning_lines)
+        """Refresh total weight and volume from the incrementally maintained load model"""
+        self.total_weight_kg = self.load.total_weight_kg
+        self.total_volume_m3 = self.load.total_volume_m3
     
     def validate_plan(self) -> TripPlanningValidationResult:
         """Validate the trip plan against vehicle capacity"""
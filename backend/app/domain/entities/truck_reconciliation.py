@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+
+@dataclass
+class TruckStockPosition:
+    """Manifest, deliveries and count of one variant on a vehicle at the end of a trip"""
+    variant_id: UUID
+    loaded_qty: Decimal = Decimal('0')
+    delivered_qty: Decimal = Decimal('0')
+    empties_collected_qty: Decimal = Decimal('0')
+    counted_qty: Decimal = Decimal('0')
+
+    @property
+    def expected_qty(self) -> Decimal:
+        return self.loaded_qty - self.delivered_qty
+
+    @property
+    def variance_qty(self) -> Decimal:
+        """Signed difference of the count from the expected quantity; negative is stock missing"""
+        return self.counted_qty - self.expected_qty
+
+    def to_variance_dict(self) -> dict:
+        expected = self.expected_qty
+        return {
+            "variant_id": str(self.variant_id),
+            "expected_qty": float(expected),
+            "actual_qty": float(self.counted_qty),
+            "variance_qty": float(self.variance_qty),
+            "variance_pct": float(self.variance_qty / expected * 100) if expected > 0 else 0.0,
+            "empties_collected_qty": float(self.empties_collected_qty)
+        }
+
+
+@dataclass
+class TruckReconciliation:
+    """Expected against counted stock of every variant a vehicle carried on one trip"""
+    trip_id: UUID
+    tenant_id: Optional[UUID] = None
+    vehicle_id: Optional[UUID] = None
+    warehouse_id: Optional[UUID] = None
+    positions: Dict[UUID, TruckStockPosition] = field(default_factory=dict)
+
+    def position(self, variant_id: UUID) -> TruckStockPosition:
+        position = self.positions.get(variant_id)
+        if position is None:
+            position = self.positions[variant_id] = TruckStockPosition(variant_id)
+        return position
+
+    def record_counts(self, counted: Dict[UUID, Decimal]) -> "TruckReconciliation":
+        """Set the counted quantity of every variant; variants expected but not counted count as zero"""
+        for position in self.positions.values():
+            position.counted_qty = Decimal('0')
+        for variant_id, quantity in counted.items():
+            self.position(variant_id).counted_qty = quantity
+        return self
+
+    @property
+    def variances(self) -> List[TruckStockPosition]:
+        return sorted(
+            (position for position in self.positions.values() if position.variance_qty != 0),
+            key=lambda position: str(position.variant_id)
+        )
+
+    @property
+    def has_variance(self) -> bool:
+        return any(position.variance_qty != 0 for position in self.positions.values())
+
+    @classmethod
+    def from_manifests(cls, trip_id: Optional[UUID], expected: Dict[UUID, Decimal], counted: Dict[UUID, Decimal]) -> "TruckReconciliation":
+        """Reconcile an expected manifest given by the caller rather than derived from the trip"""
+        reconciliation = cls(trip_id=trip_id)
+        for variant_id, quantity in expected.items():
+            reconciliation.position(variant_id).loaded_qty = quantity
+        return reconciliation.record_counts(counted)
+
+    @classmethod
+    def group(cls, rows: Iterable[dict]) -> List["TruckReconciliation"]:
+        """
+        Build reconciliations from per trip and variant rows, in row order.
+
+        Each row carries trip_id, variant_id and optionally tenant_id,
+        vehicle_id, warehouse_id, loaded_qty, delivered_qty,
+        empties_collected_qty and counted_qty.
+        """
+        reconciliations: Dict[UUID, TruckReconciliation] = {}
+        for row in rows:
+            reconciliation = reconciliations.get(row["trip_id"])
+            if reconciliation is None:
+                reconciliation = reconciliations[row["trip_id"]] = cls(
+                    trip_id=row["trip_id"],
+                    tenant_id=row.get("tenant_id"),
+                    vehicle_id=row.get("vehicle_id"),
+                    warehouse_id=row.get("warehouse_id")
+                )
+            position = reconciliation.position(row["variant_id"])
+            position.loaded_qty += Decimal(str(row.get("loaded_qty") or 0))
+            position.delivered_qty += Decimal(str(row.get("delivered_qty") or 0))
+            position.empties_collected_qty += Decimal(str(row.get("empties_collected_qty") or 0))
+            position.counted_qty += Decimal(str(row.get("counted_qty") or 0))
+        return list(reconciliations.values())
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+
+@dataclass
+class VehicleManifestLine:
+    """One variant on a vehicle load or unload manifest, with repeated items added up"""
+    variant_id: UUID
+    quantity: Decimal
+    product_id: Optional[UUID] = None
+    unit_cost: Decimal = Decimal('0')
+    empties_expected_qty: Decimal = Decimal('0')
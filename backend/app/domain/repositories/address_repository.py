@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID
-from app.domain.entities.addresses import Address
+from app.domain.entities.addresses import Address, AddressLocation
 
 class AddressRepository(ABC):
     @abstractmethod
@@ -12,6 +12,41 @@ class AddressRepository(ABC):
     async def get_by_customer(self, customer_id: str) -> List[Address]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_primary_delivery_addresses(self, customer_ids: List[UUID]) -> List[Address]:
+        """Get the primary delivery address of each given customer in a single query"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_address_locations_in_bbox(
+        self,
+        tenant_id: UUID,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int = 5000
+    ) -> List[AddressLocation]:
+        """Geocoded addresses inside a bounding box (GiST index on coordinates)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_address_locations_within_radius(
+        self,
+        tenant_id: UUID,
+        longitude: float,
+        latitude: float,
+        radius_km: float,
+        limit: int = 500
+    ) -> List[AddressLocation]:
+        """Geocoded addresses within radius_km of a point, nearest first, with distance_km set"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_nearest_depot(self, address_id: str) -> Optional[Dict[str, Any]]:
+        """Nearest non-mobile warehouse of the address's tenant with its distance in km"""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[Address]:
         raise NotImplementedError
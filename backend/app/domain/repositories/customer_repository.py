@@ -12,6 +12,11 @@ class CustomerRepository(ABC):
         """Get customer by ID"""
         pass
     
+    @abstractmethod
+    async def get_by_ids(self, customer_ids: List[UUID]) -> List[Customer]:
+        """Get several customers by ID in one query"""
+        pass
+    
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[Customer]:
         """Get customer by email"""
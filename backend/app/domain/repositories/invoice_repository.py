@@ -13,16 +13,34 @@ class InvoiceRepository(ABC):
         """Create a new invoice"""
         pass
 
+    @abstractmethod
+    async def create_invoices(self, invoices: List[Invoice]) -> List[Invoice]:
+        """Bulk insert invoices with their lines; returns the invoices that were saved"""
+        pass
+
     @abstractmethod
     async def get_invoice_by_id(self, invoice_id: str, tenant_id: UUID) -> Optional[Invoice]:
         """Get invoice by ID"""
         pass
 
+    @abstractmethod
+    async def get_invoices_by_ids(self, invoice_ids: List[str], tenant_id: UUID) -> List[Invoice]:
+        """Get several invoices with their lines in one round trip"""
+        pass
+
     @abstractmethod
     async def get_invoice_by_number(self, invoice_no: str, tenant_id: UUID) -> Optional[Invoice]:
         """Get invoice by invoice number"""
         pass
 
+    @abstractmethod
+    async def get_payable_invoices_by_references(self, references: List[str], tenant_id: UUID) -> List[Invoice]:
+        """
+        Get invoices that can accept payments and whose invoice_no or order_no is one
+        of the references. Invoice lines are not loaded.
+        """
+        pass
+
     @abstractmethod
     async def get_invoices_by_customer(
         self, 
@@ -39,6 +57,11 @@ class InvoiceRepository(ABC):
         """Get invoices for an order"""
         pass
 
+    @abstractmethod
+    async def get_invoiced_order_ids(self, order_ids: List[UUID], tenant_id: UUID) -> List[UUID]:
+        """Subset of the given orders that already have an invoice"""
+        pass
+
     @abstractmethod
     async def get_invoices_by_status(
         self, 
@@ -92,6 +115,16 @@ class InvoiceRepository(ABC):
         """Generate next invoice number"""
         pass
 
+    @abstractmethod
+    async def get_next_invoice_numbers(self, tenant_id: UUID, prefix: str, count: int) -> List[str]:
+        """
+        Allocate a block of consecutive invoice numbers.
+
+        The block is reserved in the database, so concurrent callers never get
+        overlapping numbers; numbers of invoices that are not saved are skipped.
+        """
+        pass
+
     @abstractmethod
     async def count_invoices(
         self,
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
-from app.domain.entities.orders import Order, OrderLine, OrderStatus
+from app.domain.entities.orders import Order, OrderLine, OrderStatus, OrderTransition
+from app.domain.entities.audit_events import AuditEvent
 
 
 class OrderRepository(ABC):
@@ -40,6 +41,27 @@ class OrderRepository(ABC):
         """Get all orders with any of the specified statuses"""
         pass
 
+    @abstractmethod
+    async def get_orders_ready_for_invoicing(
+        self,
+        tenant_id: UUID,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        offset: int = 0
+    ) -> List[Order]:
+        """Delivered/closed orders without a paid invoice, newest first; after is a (created_at, id) keyset cursor"""
+        pass
+
+    @abstractmethod
+    async def get_orders_for_dispatch(
+        self,
+        tenant_id: UUID,
+        requested_date: date,
+        statuses: List[OrderStatus]
+    ) -> List[Order]:
+        """Get orders with lines for a delivery date in any of the given statuses"""
+        pass
+
     @abstractmethod
     async def get_orders_by_date_range(
         self, 
@@ -75,6 +97,39 @@ class OrderRepository(ABC):
         """Update order status"""
         pass
 
+    @abstractmethod
+    async def get_orders_by_ids(self, order_ids: List[UUID]) -> List[Order]:
+        """Get several orders with their lines in one query; missing or deleted ids are skipped"""
+        pass
+
+    @abstractmethod
+    async def bulk_transition_orders(
+        self,
+        order_ids: List[UUID],
+        from_status: OrderStatus,
+        to_status: OrderStatus,
+        updated_by: Optional[UUID] = None,
+        mark_delivered: bool = False,
+        audit_events: Optional[List[AuditEvent]] = None
+    ) -> List[UUID]:
+        """
+        Move all given orders that are still in from_status to to_status in one transaction.
+
+        With mark_delivered the orders are flagged executed and every allocated line
+        gets qty_delivered = qty_allocated. Audit events whose object_id was transitioned
+        are written in the same transaction. Returns the ids that were transitioned.
+        """
+        pass
+
+    @abstractmethod
+    async def add_order_transition(self, transition: OrderTransition) -> List[UUID]:
+        """
+        Add the same set-based transition to the current transaction without committing
+        it, for writes that must land together with the order statuses. Returns the ids
+        that were transitioned.
+        """
+        pass
+
     @abstractmethod
     async def delete_order(self, order_id: str, deleted_by: Optional[UUID] = None) -> bool:
         """Soft delete an order"""
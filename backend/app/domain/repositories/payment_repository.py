@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
-from app.domain.entities.payments import Payment, PaymentStatus, PaymentMethod, PaymentType
+from app.domain.entities.payments import Payment, PaymentStatus, PaymentMethod, PaymentType, PaymentSummary
 
 
 class PaymentRepository(ABC):
@@ -29,6 +29,51 @@ class PaymentRepository(ABC):
         """Update an existing payment"""
         pass
 
+    @abstractmethod
+    async def get_pending_gateway_payments(
+        self,
+        gateway_provider: str,
+        created_after: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> List[Payment]:
+        """Get pending payments awaiting a gateway result across all tenants, oldest first"""
+        pass
+
+    @abstractmethod
+    async def finalize_gateway_payments(
+        self,
+        outcomes: Dict[UUID, Tuple[PaymentStatus, Dict[str, Any]]]
+    ) -> Tuple[List[Payment], List[Dict[str, Any]]]:
+        """
+        Move payments that are still pending to their (status, gateway_response) outcome
+        and apply the completed ones to their invoices in one transaction. Amounts beyond
+        an invoice's balance due are left unapplied and noted on the payments.
+
+        Returns the payments that were changed, and invoice_id, tenant_id, order_id and
+        the new invoice_status of every invoice they updated.
+        """
+        pass
+
+    @abstractmethod
+    async def post_payments(self, payments: List[Payment]) -> List[Dict[str, Any]]:
+        """
+        Insert payments and apply their amounts to the linked invoices in one transaction.
+
+        All or nothing: if any invoice cannot accept its total amount the transaction
+        is rolled back and ValueError is raised. Returns invoice_id, tenant_id, order_id
+        and the new invoice_status of every updated invoice.
+        """
+        pass
+
+    @abstractmethod
+    async def get_existing_external_transaction_ids(
+        self,
+        tenant_id: UUID,
+        external_transaction_ids: List[str]
+    ) -> Set[str]:
+        """Return the external_transaction_ids among the given ones that already have a payment"""
+        pass
+
     @abstractmethod
     async def delete_payment(self, payment_id: str, tenant_id: UUID) -> bool:
         """Delete a payment"""
@@ -85,11 +130,26 @@ class PaymentRepository(ABC):
         """Search payments with filters"""
         pass
 
+    @abstractmethod
+    async def get_payment_summary(
+        self,
+        tenant_id: UUID,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> PaymentSummary:
+        """Payment counts and amounts by status, aggregated in the database"""
+        pass
+
     @abstractmethod
     async def get_next_payment_number(self, tenant_id: UUID, prefix: str) -> str:
         """Generate next payment number"""
         pass
 
+    @abstractmethod
+    async def get_next_payment_numbers(self, tenant_id: UUID, prefix: str, count: int) -> List[str]:
+        """Allocate count consecutive payment numbers from the tenant's counter in the database"""
+        pass
+
     @abstractmethod
     async def get_payments_count(
         self,
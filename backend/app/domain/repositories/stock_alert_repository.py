@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.stock_alerts import StockPosition, StockReorderPoint
+
+
+class StockAlertRepository(ABC):
+    """Abstract repository interface for stock reorder points and the positions alerts are evaluated on"""
+
+    @abstractmethod
+    async def get_reorder_points(self, tenant_id: UUID) -> List[StockReorderPoint]:
+        """All reorder points set for a tenant"""
+        pass
+
+    @abstractmethod
+    async def set_reorder_point(self, reorder_point: StockReorderPoint) -> StockReorderPoint:
+        """Create or replace the reorder point of a variant in a warehouse, or in all warehouses when none is given"""
+        pass
+
+    @abstractmethod
+    async def delete_reorder_point(self, tenant_id: UUID, variant_id: UUID, warehouse_id: Optional[UUID] = None) -> bool:
+        """Remove a reorder point so the variant falls back to the wider one"""
+        pass
+
+    @abstractmethod
+    async def get_stock_positions(self, tenant_id: UUID) -> List[StockPosition]:
+        """Quantity and available quantity of every stock level bucket of a tenant"""
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -26,13 +26,27 @@ class StockDocRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_stock_docs_by_type(self, doc_type: StockDocType, tenant_id: UUID) -> List[StockDoc]:
-        """Get all stock documents of a specific type"""
+    async def get_stock_docs_by_type(
+        self,
+        doc_type: StockDocType,
+        tenant_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
+    ) -> List[StockDoc]:
+        """Get a page of stock documents of a specific type, without lines"""
         pass
 
     @abstractmethod
-    async def get_stock_docs_by_status(self, status: StockDocStatus, tenant_id: UUID) -> List[StockDoc]:
-        """Get all stock documents with a specific status"""
+    async def get_stock_docs_by_status(
+        self,
+        status: StockDocStatus,
+        tenant_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
+    ) -> List[StockDoc]:
+        """Get a page of stock documents with a specific status, without lines"""
         pass
 
     @abstractmethod
@@ -41,9 +55,12 @@ class StockDocRepository(ABC):
         warehouse_id: UUID, 
         tenant_id: UUID,
         include_source: bool = True,
-        include_dest: bool = True
+        include_dest: bool = True,
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
     ) -> List[StockDoc]:
-        """Get stock documents involving a specific warehouse"""
+        """Get a page of stock documents involving a specific warehouse, without lines"""
         pass
 
     @abstractmethod
@@ -62,9 +79,12 @@ class StockDocRepository(ABC):
         start_date: datetime, 
         end_date: datetime, 
         tenant_id: UUID,
-        date_field: str = "created_at"  # "created_at", "posted_date", "updated_at"
+        date_field: str = "created_at",  # "created_at", "posted_date", "updated_at"
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
     ) -> List[StockDoc]:
-        """Get stock documents within a date range"""
+        """Get a page of stock documents within a date range, without lines"""
         pass
 
     @abstractmethod
@@ -125,6 +145,15 @@ class StockDocRepository(ABC):
         """Get all stock document lines for a specific document"""
         pass
 
+    @abstractmethod
+    async def get_stock_doc_lines_for_docs(
+        self,
+        doc_ids: List[UUID],
+        tenant_id: Optional[UUID] = None
+    ) -> Dict[UUID, List[StockDocLine]]:
+        """Get the lines of several stock documents in one query, keyed by document ID"""
+        pass
+
     @abstractmethod
     async def get_stock_doc_lines_by_variant(
         self, 
@@ -161,6 +190,11 @@ class StockDocRepository(ABC):
         """Create a stock document with all its lines in a transaction"""
         pass
 
+    @abstractmethod
+    async def add_stock_doc_with_lines(self, stock_doc: StockDoc) -> StockDoc:
+        """Add a stock document and its lines to the current transaction without committing it"""
+        pass
+
     @abstractmethod
     async def update_stock_doc_with_lines(self, stock_doc: StockDoc) -> Optional[StockDoc]:
         """Update a stock document with all its lines in a transaction"""
@@ -184,9 +218,10 @@ class StockDocRepository(ABC):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        include_line_totals: bool = True
     ) -> List[StockDoc]:
-        """Search stock documents with multiple filters"""
+        """Search stock documents with multiple filters, returning a page without lines"""
         pass
 
     @abstractmethod
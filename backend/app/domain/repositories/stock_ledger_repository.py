@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.stock_ledger import StockBalance, StockLedgerEntry, StockMovement
+
+
+class StockLedgerRepository(ABC):
+    """Abstract repository interface for the append-only stock ledger and its balance snapshots"""
+
+    @abstractmethod
+    async def append_entries(self, entries: List[StockLedgerEntry]) -> None:
+        """Add ledger entries to the current transaction without committing it"""
+        pass
+
+    @abstractmethod
+    async def get_entries(
+        self,
+        tenant_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 500,
+        offset: int = 0
+    ) -> List[StockLedgerEntry]:
+        """Get ledger entries in occurrence order"""
+        pass
+
+    @abstractmethod
+    async def get_balances_as_of(
+        self,
+        tenant_id: UUID,
+        as_of: datetime,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None
+    ) -> List[StockBalance]:
+        """Get non-zero balances at a point in time from the latest snapshot plus the ledger tail"""
+        pass
+
+    @abstractmethod
+    async def get_movements(
+        self,
+        tenant_id: UUID,
+        start: datetime,
+        end: datetime,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None
+    ) -> List[StockMovement]:
+        """Get opening balance, inflow and outflow per bucket for the period (start, end]"""
+        pass
+
+    @abstractmethod
+    async def get_latest_snapshot_time(self) -> Optional[datetime]:
+        """Get the time of the most recent balance snapshot"""
+        pass
+
+    @abstractmethod
+    async def create_balance_snapshot(self, snapshot_at: datetime) -> Optional[int]:
+        """Snapshot all tenants' balances as of snapshot_at; None if that snapshot already exists"""
+        pass
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from decimal import Decimal
 
-from app.domain.entities.stock_levels import StockLevel, StockLevelSummary
+from app.domain.entities.stock_levels import StockBucketChange, StockLevel, StockLevelSummary
 from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_ledger import StockMovementType
 
 
 class StockLevelRepository(ABC):
@@ -30,6 +31,23 @@ class StockLevelRepository(ABC):
         """Get all stock levels for a warehouse"""
         pass
 
+    @abstractmethod
+    async def get_warehouse_stock_snapshot(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID
+    ) -> Dict[Tuple[UUID, StockStatus], Tuple[Decimal, Decimal]]:
+        """Get (quantity, unit_cost) of every variant/status bucket in a warehouse in one query"""
+        pass
+
+    @abstractmethod
+    async def get_available_quantities(
+        self,
+        tenant_id: UUID
+    ) -> Dict[Tuple[UUID, UUID, StockStatus], Decimal]:
+        """Get the available quantity of every warehouse/variant/status bucket of a tenant in one query"""
+        pass
+
     @abstractmethod
     async def get_stock_levels_by_variant(
         self, 
@@ -80,9 +98,10 @@ class StockLevelRepository(ABC):
     @abstractmethod
     async def create_or_update_stock_level(
         self, 
-        stock_level: StockLevel
+        stock_level: StockLevel,
+        movement_type: StockMovementType = StockMovementType.ADJUSTMENT
     ) -> StockLevel:
-        """Create new stock level or update existing one"""
+        """Create new stock level or update existing one, recording the change in the stock ledger"""
         pass
 
     @abstractmethod
@@ -196,6 +215,18 @@ class StockLevelRepository(ABC):
         """Validate if sufficient stock is available"""
         pass
 
+    @abstractmethod
+    async def apply_stock_changes(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        changes: List[StockBucketChange],
+        movement_type: StockMovementType = StockMovementType.ADJUSTMENT,
+        allow_negative: bool = False
+    ) -> List[StockLevel]:
+        """Add changes to many buckets of one warehouse to the current transaction without committing it"""
+        pass
+
     @abstractmethod
     async def bulk_update_stock_levels(
         self, 
@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_reservations import StockReservation
+
+
+class StockReservationRepository(ABC):
+    """Abstract repository interface for stock reservation holds and the reserved quantities they make up"""
+
+    @abstractmethod
+    async def place_holds(self, holds: List[StockReservation]) -> List[StockReservation]:
+        """Place all holds and raise their buckets' reserved quantity, or none if any bucket lacks available stock"""
+        pass
+
+    @abstractmethod
+    async def release_holds(
+        self,
+        tenant_id: UUID,
+        reservation_ids: Optional[List[UUID]] = None,
+        order_id: Optional[UUID] = None
+    ) -> int:
+        """Release active holds by ID or by order; returns the number of holds released"""
+        pass
+
+    @abstractmethod
+    async def release_bucket_quantity(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus,
+        quantity: Decimal
+    ) -> Decimal:
+        """Release up to quantity from a bucket's active holds, newest first; returns the quantity released"""
+        pass
+
+    @abstractmethod
+    async def expire_holds(self, now: datetime, batch_size: int = 500) -> int:
+        """Expire up to batch_size active holds past their expiry; returns the number expired"""
+        pass
+
+    @abstractmethod
+    async def get_holds(
+        self,
+        tenant_id: UUID,
+        order_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        active_only: bool = True
+    ) -> List[StockReservation]:
+        """Get reservation holds, oldest first"""
+        pass
@@ -183,6 +183,27 @@ class StripeRepository(ABC):
         """Get unprocessed webhook events"""
         pass
     
+    @abstractmethod
+    async def enqueue_webhook_event(self, webhook_event: StripeWebhookEvent) -> bool:
+        """Insert a webhook event unless its Stripe event ID is already stored; returns True if inserted"""
+        pass
+    
+    @abstractmethod
+    async def claim_webhook_events(self, limit: int = 50, lease_seconds: int = 300) -> List[StripeWebhookEvent]:
+        """
+        Claim due webhook events for processing.
+
+        Only the oldest pending event of each ordering key is eligible, so events of
+        one subscription are handled in order. Claimed events count an attempt and
+        are hidden from other workers for lease_seconds.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_dead_lettered_webhook_events(self, limit: int = 100) -> List[StripeWebhookEvent]:
+        """Get webhook events that exhausted their retries"""
+        pass
+    
     # Tenant plan operations
     @abstractmethod
     async def create_tenant_plan(self, tenant_plan: TenantPlan) -> TenantPlan:
@@ -108,6 +108,20 @@ class TenantSubscriptionRepository(ABC):
         """Get usage summary for a tenant"""
         pass
     
+    @abstractmethod
+    async def apply_usage_batch(
+        self,
+        increments: Dict[UUID, Dict[str, int]],
+        gauges: Dict[UUID, Dict[str, int]]
+    ) -> None:
+        """
+        Apply aggregated usage to the active subscriptions of many tenants in one statement.
+
+        Counter metrics in increments are added to current_usage atomically in the
+        database; gauge metrics overwrite the stored value.
+        """
+        pass
+    
     # ============================================================================
     # REPORTING OPERATIONS
     # ============================================================================
@@ -93,6 +93,16 @@ class TripRepository(ABC):
         """Get trip stops that contain the specified order"""
         pass
     
+    @abstractmethod
+    async def create_trip_stops(self, trip_stops: List[TripStop]) -> List[TripStop]:
+        """Create several trip stops in a single transaction"""
+        pass
+    
+    @abstractmethod
+    async def get_assigned_order_ids(self, order_ids: List[UUID]) -> List[UUID]:
+        """Return the subset of order IDs that already have a trip stop"""
+        pass
+    
     @abstractmethod
     async def get_trips_summary(self, tenant_id: UUID) -> dict:
         """Get optimized trips summary for dashboard"""
@@ -39,4 +39,9 @@ class TruckInventoryRepository(ABC):
     @abstractmethod
     async def get_truck_inventory_by_trip_and_variant(self, trip_id: UUID, vehicle_id: UUID, variant_id: UUID) -> Optional[TruckInventory]:
         """Get truck inventory record for specific trip, vehicle, and variant combination"""
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def add_loaded_quantities(self, records: List[TruckInventory]) -> None:
+        """Add loaded and expected empty quantities to a trip's truck inventory in the current transaction without committing it"""
+        pass
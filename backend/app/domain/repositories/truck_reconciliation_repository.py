@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.truck_reconciliation import TruckReconciliation
+
+
+class TruckReconciliationRepository(ABC):
+    """Abstract repository interface for end-of-trip truck stock reconciliation"""
+
+    @abstractmethod
+    async def get_trip_reconciliation(self, trip_id: UUID) -> Optional[TruckReconciliation]:
+        """Expected end-of-trip stock of a trip from its load manifest, deliveries and empties collected, with nothing counted yet"""
+        pass
+
+    @abstractmethod
+    async def get_unreconciled_trips(self, completed_from: datetime, completed_to: datetime) -> List[TruckReconciliation]:
+        """
+        Reconciliations of every trip completed in [completed_from, completed_to)
+        that was unloaded without a variance document, counted from what its
+        unload returned to the depot
+        """
+        pass
+
+    @abstractmethod
+    async def claim_trip_for_reconciliation(self, trip_id: UUID) -> bool:
+        """
+        Lock the trip against concurrent reconciliation until the current
+        transaction ends. Returns False, with the transaction rolled back, when
+        the trip already has a variance document. Must share the session of the
+        repository that posts the variance document.
+        """
+        pass
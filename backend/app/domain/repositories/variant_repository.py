@@ -18,6 +18,11 @@ class VariantRepository(ABC):
         """Get a variant by its ID"""
         pass
     
+    @abstractmethod
+    async def get_variants_by_ids(self, variant_ids: List[UUID]) -> List[Variant]:
+        """Get several variants by ID in a single query"""
+        pass
+    
     @abstractmethod
     async def get_variant_by_sku(self, tenant_id: UUID, sku: str) -> Optional[Variant]:
         """Get a variant by SKU within a tenant"""
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.orders import OrderTransition
+from app.domain.entities.stock_docs import StockDoc
+from app.domain.entities.stock_ledger import StockMovementType
+from app.domain.entities.stock_levels import StockBucketChange
+from app.domain.entities.truck_inventory import TruckInventory
+
+
+class VehicleLoadRepository(ABC):
+    """Abstract repository interface for loading and unloading vehicles at a depot"""
+
+    @abstractmethod
+    async def apply_vehicle_movement(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        stock_docs: List[StockDoc],
+        changes: List[StockBucketChange],
+        truck_inventory: List[TruckInventory],
+        movement_type: StockMovementType = StockMovementType.STATUS_TRANSFER,
+        allow_negative: bool = False,
+        order_transition: Optional[OrderTransition] = None
+    ) -> List[UUID]:
+        """
+        Write the documents, depot stock changes and truck inventory of a whole load
+        or unload in one transaction, together with the status change of the orders
+        it carries. Returns the ids of the orders that were transitioned.
+        """
+        pass
@@ -9,6 +9,11 @@ class WarehouseRepository(ABC):
     async def get_by_id(self, warehouse_id: str) -> Optional[Warehouse]:
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, warehouse_ids: List[str]) -> List[Warehouse]:
+        """Get several warehouses in one query; missing or deleted ids are skipped"""
+        pass
+
     @abstractmethod
     async def get_all(self, tenant_id: str, limit: int = 100, offset: int = 0) -> List[Warehouse]:
         pass
@@ -0,0 +1,133 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from app.domain.entities.stock_docs import StockStatus
+from app.infrastucture.database.dashboard_cache import invalidate_tenant_dashboard
+from app.infrastucture.database.stock_alert_engine import StockAlertEngine, stock_alert_engine
+from app.infrastucture.logs.logger import default_logger
+
+# (warehouse_id, variant_id, stock_status) of one stock level row. Vehicles
+# carry their load in the TRUCK_STOCK bucket of the warehouse they load from.
+AvailabilityKey = Tuple[UUID, UUID, StockStatus]
+
+
+class AvailabilityMatrix:
+    """Available quantity (quantity - reserved) of every stock level bucket of one tenant"""
+
+    def __init__(self, available: Optional[Dict[AvailabilityKey, Decimal]] = None):
+        self._available: Dict[AvailabilityKey, Decimal] = dict(available or {})
+        self._loaded_at = datetime.now().timestamp()
+
+    def get(self, warehouse_id: UUID, variant_id: UUID, stock_status: StockStatus = StockStatus.ON_HAND) -> Decimal:
+        return self._available.get((warehouse_id, variant_id, stock_status), Decimal('0'))
+
+    def total(self, variant_id: UUID, stock_status: StockStatus = StockStatus.ON_HAND) -> Decimal:
+        """Available quantity of a variant across all warehouses"""
+        return sum(
+            (available for (_, variant, status), available in self._available.items()
+             if variant == variant_id and status == stock_status),
+            Decimal('0')
+        )
+
+    def buckets(self, stock_status: StockStatus = StockStatus.ON_HAND) -> Dict[Tuple[UUID, UUID], Decimal]:
+        """Available quantity by (warehouse_id, variant_id) of every bucket with the given status"""
+        return {
+            (warehouse_id, variant_id): available
+            for (warehouse_id, variant_id, status), available in self._available.items()
+            if status == stock_status
+        }
+
+    def set(self, warehouse_id: UUID, variant_id: UUID, stock_status: StockStatus, available: Decimal) -> None:
+        self._available[(warehouse_id, variant_id, stock_status)] = available
+
+    def age(self) -> float:
+        return datetime.now().timestamp() - self._loaded_at
+
+
+class AvailabilityCache:
+    """
+    Per-tenant availability matrices kept current by stock mutations.
+
+    A matrix is loaded from stock_levels once and then updated in place with
+    the new available quantity of every bucket a committed write touched, so
+    availability checks do not go to the database. Writes in other processes
+    are not seen here; the TTL bounds how long a matrix can miss them.
+    """
+
+    def __init__(self, ttl: int = 120):
+        self.ttl = ttl
+        self._matrices: Dict[str, AvailabilityMatrix] = {}
+
+    def get(self, tenant_id: UUID) -> Optional[AvailabilityMatrix]:
+        """Loaded matrix or None when missing/expired"""
+        matrix = self._matrices.get(str(tenant_id))
+        if matrix is None:
+            return None
+        if matrix.age() >= self.ttl:
+            del self._matrices[str(tenant_id)]
+            return None
+        return matrix
+
+    def store(self, tenant_id: UUID, matrix: AvailabilityMatrix) -> None:
+        self._matrices[str(tenant_id)] = matrix
+
+    def apply(self, changes: Iterable[Tuple[UUID, UUID, UUID, StockStatus, Decimal]]) -> None:
+        """Set the available quantity of changed buckets in the matrices that are loaded"""
+        for tenant_id, warehouse_id, variant_id, stock_status, available in changes:
+            matrix = self._matrices.get(str(tenant_id))
+            if matrix is not None:
+                matrix.set(warehouse_id, variant_id, stock_status, available)
+
+    def invalidate(self, tenant_id: UUID) -> None:
+        if self._matrices.pop(str(tenant_id), None) is not None:
+            default_logger.info("Availability cache invalidated", tenant_id=str(tenant_id))
+
+    def clear(self) -> None:
+        self._matrices.clear()
+
+
+class AvailabilityChanges:
+    """
+    Bucket availability written in the current transaction.
+
+    Repositories record the new available quantity of each bucket they write,
+    and its quantity when that changed as well, and publish once the
+    transaction commits, so the cache and the stock alerts never see a value
+    that was rolled back. Recording the resulting value rather than a delta
+    makes publishing the same change twice harmless.
+    """
+
+    def __init__(self, cache: Optional[AvailabilityCache] = None, alerts: Optional[StockAlertEngine] = None):
+        self.cache = cache or availability_cache
+        self.alerts = alerts or stock_alert_engine
+        self._pending: Dict[Tuple[UUID, UUID, UUID, StockStatus], Tuple[Decimal, Optional[Decimal]]] = {}
+
+    def record(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus,
+        available: Decimal,
+        quantity: Optional[Decimal] = None
+    ) -> None:
+        key = (tenant_id, warehouse_id, variant_id, stock_status)
+        if quantity is None and key in self._pending:
+            quantity = self._pending[key][1]
+        self._pending[key] = (available, quantity)
+
+    def publish(self) -> None:
+        pending, self._pending = self._pending, {}
+        self.cache.apply(key + (available,) for key, (available, _) in pending.items())
+        self.alerts.apply(key + values for key, values in pending.items())
+        for tenant_id in {key[0] for key in pending}:
+            invalidate_tenant_dashboard(tenant_id)
+
+    def discard(self) -> None:
+        self._pending = {}
+
+
+# Available-to-promise quantities for order, trip and stock document checks
+availability_cache = AvailabilityCache(ttl=120)
@@ -1,8 +1,10 @@
 import asyncio
 from typing import Optional, AsyncGenerator
+from uuid import UUID
 from decouple import config
 from supabase import create_client, Client
 from app.infrastucture.logs.logger import default_logger
+from app.infrastucture.database.read_routing import REPLICA_LAG_SQL, read_router
 import sqlalchemy
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
@@ -162,22 +164,71 @@ def get_supabase_admin_client_sync() -> Client:
 
 
 class DirectDatabaseConnection:
-    """Async SQLAlchemy direct database connection manager"""
+    """
+    Async SQLAlchemy direct database connection manager.
+
+    Transactional work uses the primary engine. Read-only reporting uses a
+    second engine with its own, smaller pool, pointed at the replica when
+    one is configured and at the primary otherwise, so a burst of reports
+    queues on its own pool instead of starving order entry. Reporting
+    sessions run read-only transactions.
+    """
     def __init__(self):
         self._engine = None
         self._sessionmaker = None
         self._url = None
+        self._read_engine = None
+        self._read_sessionmaker = None
+        self._replica_url = None
 
-    def configure(self, url: str):
+    def configure(
+        self,
+        url: str,
+        replica_url: Optional[str] = None,
+        read_pool_size: int = 10,
+        read_max_overflow: int = 10
+    ):
         self._url = url
+        self._replica_url = replica_url
         # Optimized connection pool settings for high performance
-        self._engine = create_async_engine(
-            url, 
-            echo=False, 
-            future=True,
-            # High-performance connection pool settings
+        self._engine = self._create_engine(
+            url,
             pool_size=20,           # Increased for better concurrency
             max_overflow=30,        # Increased to handle traffic spikes
+            application_name="oms_backend"
+        )
+        self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False, class_=AsyncSession)
+        self._read_engine = self._create_engine(
+            replica_url or url,
+            pool_size=read_pool_size,
+            max_overflow=read_max_overflow,
+            application_name="oms_backend_reporting",
+            read_only=True
+        )
+        self._read_sessionmaker = async_sessionmaker(self._read_engine, expire_on_commit=False, class_=AsyncSession)
+        default_logger.info("Direct SQLAlchemy connection configured with optimized settings", url=url[:20] + "...")
+        if replica_url:
+            default_logger.info("Read replica configured for reporting sessions", url=replica_url[:20] + "...")
+
+    @staticmethod
+    def _create_engine(url: str, pool_size: int, max_overflow: int, application_name: str, read_only: bool = False):
+        server_settings = {
+            "application_name": application_name,
+            "tcp_keepalives_idle": "30",      # Reduced keepalive timeout
+            "tcp_keepalives_interval": "5",
+            "tcp_keepalives_count": "2",
+            "statement_timeout": "30000",     # Reduced to 30 seconds
+            "idle_in_transaction_session_timeout": "60000"  # Reduced to 1 minute
+        }
+        if read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        return create_async_engine(
+            url,
+            echo=False,
+            future=True,
+            # High-performance connection pool settings
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             pool_pre_ping=True,     # Validate connections before use
             pool_recycle=180,       # Recycle connections every 3 minutes (faster recovery)
             pool_timeout=15,        # Reduced timeout to 15 seconds (faster failure)
@@ -187,31 +238,72 @@ class DirectDatabaseConnection:
                 "statement_cache_size": 0,  # Disable statement cache for pooled connections
                 "prepared_statement_cache_size": 0,
                 "command_timeout": 30,      # Reduced to 30 seconds (faster failure)
-                "server_settings": {
-                    "application_name": "oms_backend",
-                    "tcp_keepalives_idle": "30",      # Reduced keepalive timeout
-                    "tcp_keepalives_interval": "5",
-                    "tcp_keepalives_count": "2",
-                    "statement_timeout": "30000",     # Reduced to 30 seconds
-                    "idle_in_transaction_session_timeout": "60000"  # Reduced to 1 minute
-                }
+                "server_settings": server_settings
             }
         )
-        self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False, class_=AsyncSession)
-        default_logger.info("Direct SQLAlchemy connection configured with optimized settings", url=url[:20] + "...")
+
+    @property
+    def has_replica(self) -> bool:
+        return bool(self._replica_url)
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """Get async database session with proper lifecycle management and retry logic"""
         if not self._sessionmaker:
             raise ValueError("Direct database not configured. Call configure() first.")
-        
+
+        async for session in self._open_session(self._sessionmaker):
+            yield session
+
+    async def get_read_session(
+        self,
+        tenant_id: Optional[UUID] = None,
+        consistent: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get a read-only session for reporting.
+
+        It reads from the replica unless the replica is lagging or unknown,
+        the tenant wrote recently enough that the replica may not have its
+        writes yet, or the caller needs to read its own writes (consistent).
+        Those reads go to the primary.
+        """
+        if not self._read_sessionmaker:
+            raise ValueError("Direct database not configured. Call configure() first.")
+
+        sessionmaker = self._read_sessionmaker
+        if self.has_replica:
+            if read_router.lag_check_due():
+                await self.check_replica_lag()
+            if consistent or read_router.use_primary(tenant_id):
+                sessionmaker = self._sessionmaker
+
+        async for session in self._open_session(sessionmaker):
+            yield session
+
+    async def check_replica_lag(self) -> Optional[float]:
+        """Measure the replica's replication lag in seconds and hand it to the read router"""
+        lag = None
+        try:
+            async with self._read_engine.connect() as conn:
+                result = await asyncio.wait_for(conn.execute(sqlalchemy.text(REPLICA_LAG_SQL)), timeout=5.0)
+                value = result.scalar()
+                lag = float(value) if value is not None else None
+        except (asyncio.TimeoutError, SQLAlchemyError, OSError) as e:
+            default_logger.warning(f"Replica lag check failed: {str(e)}")
+
+        if lag is None or lag > read_router.max_lag:
+            default_logger.warning("Read replica unavailable or lagging, reporting reads use the primary", lag_seconds=lag)
+        read_router.record_replica_lag(lag)
+        return lag
+
+    async def _open_session(self, sessionmaker) -> AsyncGenerator[AsyncSession, None]:
         max_retries = 3
         retry_delay = 1.0
-        
+
         for attempt in range(max_retries):
             try:
                 # Use the sessionmaker as an async context manager
-                async with self._sessionmaker() as session:
+                async with sessionmaker() as session:
                     try:
                         yield session
                     except Exception:
@@ -260,7 +352,14 @@ class DirectDatabaseConnection:
                     retry_delay *= 1.5  # Moderate exponential backoff
 
     async def close(self):
-        """Properly close the database engine and all connections"""
+        """Properly close the database engines and all connections"""
+        if self._read_engine:
+            try:
+                await self._read_engine.dispose()
+                self._read_engine = None
+                self._read_sessionmaker = None
+            except Exception as e:
+                default_logger.error(f"Error disposing reporting SQLAlchemy engine: {str(e)}")
         if self._engine:
             try:
                 default_logger.info("Disposing SQLAlchemy engine...")
@@ -281,9 +380,20 @@ async def init_direct_database() -> None:
     if not url:
         default_logger.warning("DATABASE_URL not found in environment variables")
         return
-    direct_db_connection.configure(url)
+    configure_direct_database(url)
     await direct_db_connection.test_connection()
 
+
+def configure_direct_database(url: str) -> None:
+    """Configure the direct connection, with the read replica and reporting pool from the environment"""
+    from decouple import config
+    direct_db_connection.configure(
+        url,
+        replica_url=config("DATABASE_REPLICA_URL", default=None) or None,
+        read_pool_size=config("DATABASE_READ_POOL_SIZE", default=10, cast=int),
+        read_max_overflow=config("DATABASE_READ_MAX_OVERFLOW", default=10, cast=int)
+    )
+
 async def cleanup_idle_connections():
     """Enhanced connection cleanup"""
     try:
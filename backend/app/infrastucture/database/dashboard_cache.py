@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.domain.entities.dashboard import DashboardSnapshot
+from app.infrastucture.database.read_routing import read_router
+from app.infrastucture.logs.logger import default_logger
+
+
+class DashboardSnapshotCache:
+    """
+    Latest dashboard snapshot of every tenant whose dashboard is being viewed.
+
+    Writes to orders, trips, invoices, payments and stock only count a change
+    against the tenant; a snapshot is current while no change has been
+    counted since it started building and it is younger than max_age. The
+    next read or scheduled refresh rebuilds it otherwise. Snapshots are
+    frozen, so they are shared rather than copied. Tenants nobody has looked
+    at for idle_after seconds are dropped instead of being refreshed forever.
+    """
+
+    def __init__(self, max_age: int = 60, idle_after: int = 1800):
+        self.max_age = max_age
+        self.idle_after = idle_after
+        self._snapshots: Dict[str, DashboardSnapshot] = {}
+        self._built_at_change: Dict[str, int] = {}
+        self._changes: Dict[str, int] = {}
+        self._read_at: Dict[str, float] = {}
+
+    def get(self, tenant_id: UUID) -> Optional[DashboardSnapshot]:
+        """Latest snapshot, current or not, recording that the tenant's dashboard is in use"""
+        self._read_at[str(tenant_id)] = datetime.now().timestamp()
+        return self._snapshots.get(str(tenant_id))
+
+    def peek(self, tenant_id: UUID) -> Optional[DashboardSnapshot]:
+        """Latest snapshot without counting as a dashboard view"""
+        return self._snapshots.get(str(tenant_id))
+
+    def is_current(self, tenant_id: UUID) -> bool:
+        snapshot = self._snapshots.get(str(tenant_id))
+        if snapshot is None or self._built_at_change.get(str(tenant_id)) != self.change_count(tenant_id):
+            return False
+        return (datetime.utcnow() - snapshot.generated_at).total_seconds() < self.max_age
+
+    def change_count(self, tenant_id: UUID) -> int:
+        """Changes counted against the tenant; take it before reading the KPIs and pass it to store()"""
+        return self._changes.get(str(tenant_id), 0)
+
+    def store(self, snapshot: DashboardSnapshot, change_count: int) -> None:
+        """Keep a snapshot built from data read after change_count changes"""
+        self._snapshots[str(snapshot.tenant_id)] = snapshot
+        self._built_at_change[str(snapshot.tenant_id)] = change_count
+
+    def mark_stale(self, tenant_id: UUID) -> None:
+        self._changes[str(tenant_id)] = self.change_count(tenant_id) + 1
+
+    def tenants_to_refresh(self) -> List[UUID]:
+        """Tenants in use whose snapshot is stale or old; idle tenants are dropped"""
+        now = datetime.now().timestamp()
+        refresh = []
+        for tenant_key in list(self._snapshots):
+            if now - self._read_at.get(tenant_key, 0) >= self.idle_after:
+                self._snapshots.pop(tenant_key, None)
+                self._built_at_change.pop(tenant_key, None)
+                self._read_at.pop(tenant_key, None)
+                default_logger.info("Dashboard snapshot dropped for idle tenant", tenant_id=tenant_key)
+            elif not self.is_current(UUID(tenant_key)):
+                refresh.append(UUID(tenant_key))
+        return refresh
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._built_at_change.clear()
+        self._changes.clear()
+        self._read_at.clear()
+
+
+# Landing dashboard KPIs served from memory
+dashboard_cache = DashboardSnapshotCache(max_age=60)
+
+
+def invalidate_tenant_dashboard(tenant_id: Optional[UUID]) -> None:
+    """Called by order, trip, invoice, payment and stock writes"""
+    if tenant_id:
+        dashboard_cache.mark_stale(tenant_id)
+        # The tenant's reports read from the primary until the replica has caught up
+        read_router.record_write(tenant_id)
@@ -8,12 +8,21 @@ from supabase import Client
 from app.domain.entities.invoices import Invoice, InvoiceLine, InvoiceStatus, InvoiceType
 from app.domain.repositories.invoice_repository import InvoiceRepository
 from app.infrastucture.database.connection import get_database
+from app.infrastucture.database.reference_cache import invalidate_tenant_summaries
 from app.infrastucture.logs.logger import get_logger
 
 # Simple cache for invoice queries
 _invoice_cache = {}
 _cache_ttl = 300  # 5 minutes
 
+def clear_invoice_cache() -> None:
+    """Drop cached invoice queries, for writes to invoices made outside this repository"""
+    _invoice_cache.clear()
+
+
+# Max ids per PostgREST in.() filter, keeps request URLs well below server limits
+_IN_FILTER_CHUNK = 200
+
 class InvoiceRepositoryImpl(InvoiceRepository):
     """Supabase implementation of invoice repository"""
     
@@ -74,6 +83,7 @@ class InvoiceRepositoryImpl(InvoiceRepository):
             
             # Clear cache when new invoice is created
             self.clear_cache()
+            invalidate_tenant_summaries(invoice.tenant_id)
             
             return await self.get_invoice_by_id(created_invoice_data['id'], invoice.tenant_id)
             
@@ -81,6 +91,50 @@ class InvoiceRepositoryImpl(InvoiceRepository):
             self.logger.error(f"Error creating invoice: {e}")
             raise
 
+    async def create_invoices(self, invoices: List[Invoice]) -> List[Invoice]:
+        """Bulk insert invoices: one header insert and one line insert per chunk"""
+        created = []
+        for start in range(0, len(invoices), _IN_FILTER_CHUNK):
+            chunk = invoices[start:start + _IN_FILTER_CHUNK]
+            headers = []
+            lines = []
+            for invoice in chunk:
+                invoice_data = invoice.to_dict(include_computed=False)
+                for line in invoice_data.pop('invoice_lines', []):
+                    line['invoice_id'] = invoice_data['id']
+                    lines.append(line)
+                headers.append(invoice_data)
+
+            try:
+                self.supabase.table(self.table_name).insert(headers).execute()
+            except Exception as e:
+                self.logger.error(f"Error bulk creating invoices: {e}")
+                continue
+
+            try:
+                if lines:
+                    self.supabase.table(self.lines_table_name).insert(lines).execute()
+            except Exception as e:
+                self.logger.error(f"Error bulk creating invoice lines: {e}")
+                # Do not leave invoices without lines behind
+                try:
+                    self.supabase.table(self.table_name)\
+                        .delete()\
+                        .in_("id", [invoice_data['id'] for invoice_data in headers])\
+                        .execute()
+                except Exception as cleanup_error:
+                    self.logger.error(f"Error removing partially created invoices: {cleanup_error}")
+                continue
+
+            created.extend(chunk)
+
+        if created:
+            self.clear_cache()
+            for tenant_id in {invoice.tenant_id for invoice in created}:
+                invalidate_tenant_summaries(tenant_id)
+
+        return created
+
     async def get_invoice_by_id(self, invoice_id: str, tenant_id: UUID) -> Optional[Invoice]:
         """Get invoice by ID"""
         try:
@@ -110,6 +164,41 @@ class InvoiceRepositoryImpl(InvoiceRepository):
         except Exception as e:
             return None
 
+    async def get_invoices_by_ids(self, invoice_ids: List[str], tenant_id: UUID) -> List[Invoice]:
+        """Get invoices by IDs with their lines (two queries regardless of count)"""
+        if not invoice_ids:
+            return []
+        try:
+            result = self.supabase.table(self.table_name)\
+                .select("*")\
+                .in_("id", [str(invoice_id) for invoice_id in invoice_ids])\
+                .eq("tenant_id", str(tenant_id))\
+                .execute()
+
+            if not result.data:
+                return []
+
+            lines_result = self.supabase.table(self.lines_table_name)\
+                .select("*")\
+                .in_("invoice_id", [invoice_data['id'] for invoice_data in result.data])\
+                .order("invoice_id, created_at")\
+                .execute()
+
+            lines_by_invoice = {}
+            for line_data in lines_result.data or []:
+                lines_by_invoice.setdefault(line_data['invoice_id'], []).append(line_data)
+
+            invoices = []
+            for invoice_data in result.data:
+                invoice_data['invoice_lines'] = lines_by_invoice.get(invoice_data['id'], [])
+                invoices.append(self._dict_to_invoice(invoice_data))
+
+            return invoices
+
+        except Exception as e:
+            self.logger.error(f"Error getting invoices by IDs: {e}")
+            return []
+
     async def get_invoice_by_number(self, invoice_no: str, tenant_id: UUID) -> Optional[Invoice]:
         """Get invoice by invoice number"""
         try:
@@ -138,6 +227,37 @@ class InvoiceRepositoryImpl(InvoiceRepository):
         except Exception as e:
             return None
 
+    async def get_payable_invoices_by_references(self, references: List[str], tenant_id: UUID) -> List[Invoice]:
+        """Get payable invoices matching invoice or order numbers, without lines (two queries per chunk of references)"""
+        payable_statuses = [
+            InvoiceStatus.SENT.value,
+            InvoiceStatus.GENERATED.value,
+            InvoiceStatus.PARTIAL_PAID.value,
+            InvoiceStatus.OVERDUE.value
+        ]
+        references = list(references)
+        try:
+            invoices_by_id = {}
+            for start in range(0, len(references), _IN_FILTER_CHUNK):
+                chunk = references[start:start + _IN_FILTER_CHUNK]
+                for column in ("invoice_no", "order_no"):
+                    result = self.supabase.table(self.table_name)\
+                        .select("*")\
+                        .eq("tenant_id", str(tenant_id))\
+                        .in_(column, chunk)\
+                        .in_("invoice_status", payable_statuses)\
+                        .order("due_date")\
+                        .execute()
+                    for invoice_data in result.data or []:
+                        invoice_data['invoice_lines'] = []
+                        invoices_by_id.setdefault(invoice_data['id'], invoice_data)
+
+            return [self._dict_to_invoice(invoice_data) for invoice_data in invoices_by_id.values()]
+
+        except Exception as e:
+            self.logger.error(f"Error getting invoices by references: {e}")
+            raise
+
     async def get_invoices_by_order(self, order_id: UUID, tenant_id: UUID) -> List[Invoice]:
         """Get invoices by order ID"""
         try:
@@ -180,6 +300,19 @@ class InvoiceRepositoryImpl(InvoiceRepository):
             self.logger.error(f"Error getting invoices by order ID: {e}")
             return []
 
+    async def get_invoiced_order_ids(self, order_ids: List[UUID], tenant_id: UUID) -> List[UUID]:
+        """Get the orders among order_ids that already have an invoice (header columns only)"""
+        invoiced = set()
+        ids = [str(order_id) for order_id in order_ids]
+        for start in range(0, len(ids), _IN_FILTER_CHUNK):
+            result = self.supabase.table(self.table_name)\
+                .select("order_id")\
+                .in_("order_id", ids[start:start + _IN_FILTER_CHUNK])\
+                .eq("tenant_id", str(tenant_id))\
+                .execute()
+            invoiced.update(row['order_id'] for row in result.data or [] if row.get('order_id'))
+        return [UUID(order_id) for order_id in invoiced]
+
     async def get_invoices_by_status(
         self, 
         status: InvoiceStatus, 
@@ -278,6 +411,7 @@ class InvoiceRepositoryImpl(InvoiceRepository):
             
             # Clear cache when invoice is updated
             self.clear_cache()
+            invalidate_tenant_summaries(invoice.tenant_id)
             
             return await self.get_invoice_by_id(invoice_id, invoice.tenant_id)
             
@@ -303,6 +437,7 @@ class InvoiceRepositoryImpl(InvoiceRepository):
             
             # Clear cache when invoice is deleted
             self.clear_cache()
+            invalidate_tenant_summaries(tenant_id)
             
             return True
             
@@ -542,32 +677,25 @@ class InvoiceRepositoryImpl(InvoiceRepository):
 
     async def get_next_invoice_number(self, tenant_id: UUID, prefix: str) -> str:
         """Generate next invoice number"""
+        return (await self.get_next_invoice_numbers(tenant_id, prefix, 1))[0]
+
+    async def get_next_invoice_numbers(self, tenant_id: UUID, prefix: str, count: int) -> List[str]:
+        """Allocate count consecutive invoice numbers from the tenant's counter in the database"""
+        if count <= 0:
+            return []
         try:
-            # Get the highest number for this prefix and tenant
-            result = self.supabase.table(self.table_name)\
-                .select("invoice_no")\
-                .eq("tenant_id", str(tenant_id))\
-                .like("invoice_no", f"{prefix}%")\
-                .order("invoice_no", desc=True)\
-                .limit(1)\
-                .execute()
-            
-            if result.data:
-                last_no = result.data[0]['invoice_no']
-                # Extract number part and increment
-                try:
-                    number_part = int(last_no.split('-')[-1])
-                    next_number = number_part + 1
-                except (ValueError, IndexError):
-                    next_number = 1
-            else:
-                next_number = 1
-            
-            return f"{prefix}-{next_number:06d}"
-            
+            result = self.supabase.rpc('allocate_document_numbers', {
+                'p_document_type': 'invoice',
+                'p_tenant_id': str(tenant_id),
+                'p_prefix': prefix,
+                'p_count': count
+            }).execute()
+            first_number = int(result.data)
+            return [f"{prefix}-{first_number + i:06d}" for i in range(count)]
+
         except Exception as e:
-            self.logger.error(f"Error generating invoice number: {e}")
-            return f"{prefix}-000001"
+            self.logger.error(f"Error allocating invoice numbers: {e}")
+            raise
 
     async def get_invoices_count(
         self,
@@ -595,69 +723,32 @@ class InvoiceRepositoryImpl(InvoiceRepository):
             return 0
 
     async def get_invoice_summary(self, tenant_id: UUID) -> dict:
-        """Get optimized invoice summary for dashboard (single query)"""
+        """Get invoice summary for dashboard, counted in the database by the get_invoice_summary function"""
+        summary = {
+            'draft_invoices': 0,
+            'sent_invoices': 0,
+            'paid_invoices': 0,
+            'overdue_invoices': 0,
+            'total_invoices': 0
+        }
         try:
-            from datetime import date
-            
-            # Get all invoices for tenant in one query
-            result = self.supabase.table(self.table_name)\
-                .select("invoice_status,due_date")\
-                .eq("tenant_id", str(tenant_id))\
-                .execute()
-            
-            if not result.data:
-                return {
-                    'draft_invoices': 0,
-                    'sent_invoices': 0,
-                    'paid_invoices': 0,
-                    'overdue_invoices': 0,
-                    'total_invoices': 0
-                }
-            
-            # Count by status in memory (much faster than multiple DB queries)
-            draft_count = 0
-            sent_count = 0
-            paid_count = 0
-            overdue_count = 0
-            today = date.today()
-            
-            for invoice in result.data:
-                status = invoice.get('invoice_status')
-                due_date = invoice.get('due_date')
-                
-                if status == InvoiceStatus.DRAFT.value:
-                    draft_count += 1
-                elif status == InvoiceStatus.SENT.value:
-                    sent_count += 1
-                    # Check if overdue
-                    if due_date and due_date < today.isoformat():
-                        overdue_count += 1
-                elif status == InvoiceStatus.PAID.value:
-                    paid_count += 1
-                elif status == InvoiceStatus.PARTIAL_PAID.value:
-                    # Check if overdue
-                    if due_date and due_date < today.isoformat():
-                        overdue_count += 1
-            
-            total_count = draft_count + sent_count + paid_count + overdue_count
-            
-            return {
-                'draft_invoices': draft_count,
-                'sent_invoices': sent_count,
-                'paid_invoices': paid_count,
-                'overdue_invoices': overdue_count,
-                'total_invoices': total_count
-            }
-            
+            result = self.supabase.rpc('get_invoice_summary', {
+                'p_tenant_id': str(tenant_id),
+                'p_today': date.today().isoformat()
+            }).execute()
+
+            row = result.data[0] if result.data else {}
+            for key in ('draft_invoices', 'sent_invoices', 'paid_invoices', 'overdue_invoices'):
+                summary[key] = int(row.get(key) or 0)
+            summary['total_invoices'] = (
+                summary['draft_invoices'] + summary['sent_invoices'] +
+                summary['paid_invoices'] + summary['overdue_invoices']
+            )
+            return summary
+
         except Exception as e:
             self.logger.error(f"Error getting invoice summary: {e}")
-            return {
-                'draft_invoices': 0,
-                'sent_invoices': 0,
-                'paid_invoices': 0,
-                'overdue_invoices': 0,
-                'total_invoices': 0
-            }
+            return summary
 
     def _parse_datetime(self, datetime_str: str) -> datetime:
         """Parse datetime string with proper error handling for various formats"""
@@ -8,6 +8,9 @@ from .products import *
 from .variants import *
 from .stock_docs import *
 from .stock_levels import *
+from .stock_ledger import *
+from .stock_reservations import *
+from .stock_reorder_points import *
 from .tenants import *
 from .trips import *
 from .trip_stops import *
@@ -38,5 +41,10 @@ __all__ = [
     "WarehouseModel",
     "StockLevelModel",
     "StockDocModel",
-    "StockDocLineModel"
+    "StockDocLineModel",
+    "StockLedgerModel",
+    "StockBalanceSnapshotModel",
+    "StockSnapshotRunModel",
+    "StockReservationModel",
+    "StockReorderPointModel"
 ] 
\ No newline at end of file
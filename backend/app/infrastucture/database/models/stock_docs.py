@@ -63,6 +63,8 @@ class StockDocModel(Base):
         UniqueConstraint("tenant_id", "doc_no", name="stock_docs_tenant_doc_no_unique"),
         Index("stock_docs_tenant_type_idx", "tenant_id", "doc_type", postgresql_where=text("deleted_at IS NULL")),
         Index("stock_docs_ref_doc_idx", "ref_doc_id", postgresql_where=text("deleted_at IS NULL")),
+        Index("stock_docs_tenant_created_idx", "tenant_id", text("created_at DESC"), postgresql_where=text("deleted_at IS NULL")),
+        Index("stock_docs_tenant_status_created_idx", "tenant_id", "doc_status", text("created_at DESC"), postgresql_where=text("deleted_at IS NULL")),
     )
 
     def __repr__(self):
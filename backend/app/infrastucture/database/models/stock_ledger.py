@@ -0,0 +1,70 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import (
+    Numeric, String, Text, Integer, ForeignKey, Index, TIMESTAMP, Enum as SQLAlchemyEnum, text
+)
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastucture.database.models.base import Base
+from app.domain.entities.stock_docs import StockStatus
+
+
+class StockLedgerModel(Base):
+    """SQLAlchemy model for stock_ledger table - append-only history of stock level changes"""
+    __tablename__ = "stock_ledger"
+
+    id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+
+    tenant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    warehouse_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("warehouses.id"), nullable=False)
+    variant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("variants.id"), nullable=False)
+    stock_status: Mapped[StockStatus] = mapped_column(
+        SQLAlchemyEnum(StockStatus, name="stock_status_type", create_constraint=False, native_enum=True),
+        nullable=False
+    )
+
+    quantity_change: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=3), nullable=False)
+    balance_after: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=3), nullable=False)
+    unit_cost: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=6), nullable=False, default=0)
+
+    movement_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    ref_doc_id: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), nullable=True)
+    ref_doc_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_by: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    occurred_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
+
+    __table_args__ = (
+        Index("idx_stock_ledger_bucket_time", "tenant_id", "warehouse_id", "variant_id", "stock_status", "occurred_at"),
+        Index("idx_stock_ledger_tenant_time", "tenant_id", "occurred_at"),
+    )
+
+
+class StockBalanceSnapshotModel(Base):
+    """SQLAlchemy model for stock_balance_snapshots table - stock level balances at a snapshot time"""
+    __tablename__ = "stock_balance_snapshots"
+
+    tenant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    snapshot_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    warehouse_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("warehouses.id"), primary_key=True)
+    variant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("variants.id"), primary_key=True)
+    stock_status: Mapped[StockStatus] = mapped_column(
+        SQLAlchemyEnum(StockStatus, name="stock_status_type", create_constraint=False, native_enum=True),
+        primary_key=True
+    )
+
+    quantity: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=3), nullable=False)
+    unit_cost: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=6), nullable=False, default=0)
+
+
+class StockSnapshotRunModel(Base):
+    """SQLAlchemy model for stock_snapshot_runs table - one row per completed balance snapshot"""
+    __tablename__ = "stock_snapshot_runs"
+
+    snapshot_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    balance_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
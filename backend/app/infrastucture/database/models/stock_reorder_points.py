@@ -0,0 +1,34 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import Numeric, ForeignKey, Index, CheckConstraint, TIMESTAMP, text
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastucture.database.models.base import Base
+
+
+class StockReorderPointModel(Base):
+    """SQLAlchemy model for stock_reorder_points table - low stock alert thresholds per variant and warehouse"""
+    __tablename__ = "stock_reorder_points"
+
+    id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+
+    tenant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    warehouse_id: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("warehouses.id"), nullable=True)
+    variant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("variants.id"), nullable=False)
+    reorder_point: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=3), nullable=False)
+
+    created_by: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
+    updated_by: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
+
+    __table_args__ = (
+        CheckConstraint("reorder_point >= 0", name="stock_reorder_points_non_negative"),
+        Index("idx_stock_reorder_points_warehouse", "tenant_id", "variant_id", "warehouse_id", unique=True,
+              postgresql_where=text("warehouse_id IS NOT NULL")),
+        Index("idx_stock_reorder_points_variant", "tenant_id", "variant_id", unique=True,
+              postgresql_where=text("warehouse_id IS NULL")),
+    )
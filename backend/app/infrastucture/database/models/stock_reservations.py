@@ -0,0 +1,47 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import (
+    Numeric, String, ForeignKey, Index, CheckConstraint, TIMESTAMP, Enum as SQLAlchemyEnum, text
+)
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastucture.database.models.base import Base
+from app.domain.entities.stock_docs import StockStatus
+
+
+class StockReservationModel(Base):
+    """SQLAlchemy model for stock_reservations table - individual holds making up stock_levels.reserved_qty"""
+    __tablename__ = "stock_reservations"
+
+    id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+
+    tenant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    warehouse_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("warehouses.id"), nullable=False)
+    variant_id: Mapped[UUID] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("variants.id"), nullable=False)
+    stock_status: Mapped[StockStatus] = mapped_column(
+        SQLAlchemyEnum(StockStatus, name="stock_status_type", create_constraint=False, native_enum=True),
+        nullable=False
+    )
+    quantity: Mapped[Decimal] = mapped_column(Numeric(precision=15, scale=3), nullable=False)
+
+    order_id: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), nullable=True)
+    order_line_id: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), nullable=True)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="active")
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    released_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+
+    created_by: Mapped[Optional[UUID]] = mapped_column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
+
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="stock_reservations_quantity_positive"),
+        CheckConstraint("status IN ('active', 'released', 'expired')", name="stock_reservations_status_valid"),
+        Index("idx_stock_reservations_active_expiry", "expires_at", postgresql_where=text("status = 'active'")),
+        Index("idx_stock_reservations_active_bucket", "tenant_id", "warehouse_id", "variant_id", "stock_status",
+              postgresql_where=text("status = 'active'")),
+        Index("idx_stock_reservations_order", "tenant_id", "order_id", postgresql_where=text("order_id IS NOT NULL")),
+    )
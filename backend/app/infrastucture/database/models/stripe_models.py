@@ -192,6 +192,11 @@ class StripeWebhookEventModel(Base):
     data = Column(JSON, nullable=False)
     processed = Column(Boolean, default=False)
     processed_at = Column(DateTime(timezone=True), nullable=True)
+    ordering_key = Column(String(255), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    dead_lettered_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
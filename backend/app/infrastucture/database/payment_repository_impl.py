@@ -1,17 +1,16 @@
-from typing import List, Optional
-from uuid import UUID
-from datetime import date
-
+import json
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import UUID
-from sqlalchemy import select, update, delete, and_, or_, func, desc
+from sqlalchemy import select, update, delete, insert, and_, func, desc, bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.repositories.payment_repository import PaymentRepository
-from app.domain.entities.payments import Payment, PaymentStatus, PaymentMethod, PaymentType
+from app.domain.entities.payments import Payment, PaymentStatus, PaymentMethod, PaymentType, PaymentSummary
 from app.infrastucture.database.models.payments import PaymentModel
+from app.infrastucture.database.reference_cache import invalidate_tenant_summaries
+from app.infrastucture.database.invoice_repository_impl import clear_invoice_cache
 from app.infrastucture.logs.logger import default_logger
 
 
@@ -89,6 +88,7 @@ class PaymentRepositoryImpl(PaymentRepository):
             self.session.add(model)
             await self.session.commit()
             await self.session.refresh(model)
+            invalidate_tenant_summaries(payment.tenant_id)
             
             self.logger.info(f"Created payment {payment.id}")
             return payment
@@ -167,6 +167,7 @@ class PaymentRepositoryImpl(PaymentRepository):
             )
             await self.session.execute(stmt)
             await self.session.commit()
+            invalidate_tenant_summaries(payment.tenant_id)
             
             self.logger.info(f"Updated payment {payment_id}")
             return payment
@@ -176,6 +177,229 @@ class PaymentRepositoryImpl(PaymentRepository):
             self.logger.error(f"Error updating payment: {e}")
             raise
 
+    async def get_pending_gateway_payments(
+        self,
+        gateway_provider: str,
+        created_after: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> List[Payment]:
+        """Get pending payments awaiting a gateway result across all tenants, oldest first"""
+        try:
+            conditions = [
+                PaymentModel.gateway_provider == gateway_provider,
+                PaymentModel.payment_status.in_([PaymentStatus.PENDING.value, PaymentStatus.PROCESSING.value]),
+                PaymentModel.external_transaction_id.isnot(None)
+            ]
+            if created_after:
+                conditions.append(PaymentModel.created_at >= created_after)
+
+            stmt = (
+                select(PaymentModel)
+                .where(and_(*conditions))
+                .order_by(PaymentModel.created_at)
+                .limit(limit)
+            )
+            result = await self.session.execute(stmt)
+            return [self._to_payment_entity(model) for model in result.scalars().all()]
+
+        except Exception as e:
+            self.logger.error(f"Error getting pending gateway payments: {e}")
+            return []
+
+    async def finalize_gateway_payments(
+        self,
+        outcomes: Dict[UUID, Tuple[PaymentStatus, Dict[str, Any]]]
+    ) -> Tuple[List[Payment], List[Dict[str, Any]]]:
+        """
+        Move payments that are still pending to their gateway outcome and apply the
+        completed ones to their invoices in one transaction.
+
+        Rows are locked with SKIP LOCKED so a callback finishing the same payment
+        concurrently wins, and rows that already left pending are not touched.
+        Amounts beyond an invoice's balance are noted on the payments instead.
+        """
+        if not outcomes:
+            return [], []
+        try:
+            stmt = (
+                select(PaymentModel)
+                .where(
+                    and_(
+                        PaymentModel.id.in_(list(outcomes)),
+                        PaymentModel.payment_status.in_([PaymentStatus.PENDING.value, PaymentStatus.PROCESSING.value])
+                    )
+                )
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.session.execute(stmt)
+            payments = [self._to_payment_entity(model) for model in result.scalars().all()]
+            if not payments:
+                await self.session.commit()
+                return [], []
+
+            invoice_amounts = {}
+            for payment in payments:
+                status, gateway_response = outcomes[payment.id]
+                if status == PaymentStatus.COMPLETED:
+                    payment.mark_as_completed(gateway_response=gateway_response)
+                    if payment.invoice_id:
+                        invoice_amounts[payment.invoice_id] = invoice_amounts.get(payment.invoice_id, Decimal('0')) + payment.amount
+                else:
+                    payment.mark_as_failed(gateway_response=gateway_response)
+                    reason = gateway_response.get('result_description') if gateway_response else None
+                    if reason:
+                        payment.notes = f"{payment.notes or ''}\nFailure reason: {reason}".strip()
+
+            # The money is already collected: whatever the invoice cannot take is
+            # recorded on the payments (latest first) for a refund or credit note
+            applied, unapplied = await self._apply_invoice_payments(invoice_amounts)
+            for payment in reversed(payments):
+                excess = unapplied.get(payment.invoice_id, Decimal('0'))
+                if payment.payment_status != PaymentStatus.COMPLETED or excess <= 0:
+                    continue
+                amount = min(excess, payment.amount)
+                unapplied[payment.invoice_id] = excess - amount
+                payment.notes = f"{payment.notes or ''}\nUnapplied amount: {amount} exceeds the invoice balance".strip()
+                self.logger.warning(
+                    f"Gateway payment {payment.payment_no} left {amount} unapplied on invoice {payment.invoice_id}"
+                )
+
+            table = PaymentModel.__table__
+            await self.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(
+                    payment_status=bindparam("b_status"),
+                    gateway_response=bindparam("b_response"),
+                    notes=bindparam("b_notes"),
+                    processed_date=date.today(),
+                    updated_at=datetime.utcnow()
+                ),
+                [
+                    {
+                        "b_id": payment.id,
+                        "b_status": payment.payment_status.value,
+                        "b_response": payment.gateway_response,
+                        "b_notes": payment.notes
+                    }
+                    for payment in payments
+                ]
+            )
+            await self.session.commit()
+
+            for tenant_id in {payment.tenant_id for payment in payments}:
+                invalidate_tenant_summaries(tenant_id)
+            if applied:
+                clear_invoice_cache()
+
+            self.logger.info(f"Finalized {len(payments)} gateway payments, applied to {len(applied)} invoices")
+            return payments, applied
+
+        except Exception as e:
+            await self.session.rollback()
+            self.logger.error(f"Error finalizing gateway payments: {e}")
+            raise
+
+    async def _apply_invoice_payments(
+        self,
+        amounts: Dict[UUID, Decimal]
+    ) -> Tuple[List[Dict[str, Any]], Dict[UUID, Decimal]]:
+        """
+        Move invoice balances by invoice_id -> amount through apply_invoice_payments,
+        without committing. Returns the updated invoices and the amount per invoice
+        that was left unapplied because it exceeded the balance or the invoice could
+        not take payments.
+        """
+        if not amounts:
+            return [], {}
+        result = await self.session.execute(
+            text(
+                "SELECT invoice_id, tenant_id, order_id, invoice_status::text AS invoice_status, "
+                "applied_amount, unapplied_amount "
+                "FROM apply_invoice_payments(CAST(:payments AS jsonb))"
+            ),
+            {"payments": json.dumps([
+                {"invoice_id": str(invoice_id), "amount": str(amount)}
+                for invoice_id, amount in amounts.items()
+            ])}
+        )
+        applied = []
+        unapplied = {}
+        for row in result:
+            if row.applied_amount > 0:
+                applied.append({
+                    "invoice_id": row.invoice_id,
+                    "tenant_id": row.tenant_id,
+                    "order_id": row.order_id,
+                    "invoice_status": row.invoice_status
+                })
+            if row.unapplied_amount != 0:
+                unapplied[row.invoice_id] = row.unapplied_amount
+        return applied, unapplied
+
+    async def post_payments(self, payments: List[Payment]) -> List[Dict[str, Any]]:
+        """
+        Insert payments and apply them to their invoices in one transaction.
+
+        Rows go in with a single executemany insert and the invoice balances move
+        through apply_invoice_payments in the same session, so a batch either lands
+        completely or not at all.
+        """
+        if not payments:
+            return []
+        try:
+            table = PaymentModel.__table__
+            rows = []
+            for payment in payments:
+                model = self._to_payment_model(payment)
+                model.created_at = payment.created_at
+                model.updated_at = payment.updated_at
+                rows.append({column.key: getattr(model, column.key) for column in table.columns})
+            await self.session.execute(insert(table), rows)
+
+            expected = {}
+            for payment in payments:
+                if payment.invoice_id:
+                    expected[payment.invoice_id] = expected.get(payment.invoice_id, Decimal('0')) + payment.amount
+            applied, skipped = await self._apply_invoice_payments(expected)
+            if skipped:
+                raise ValueError(
+                    f"{len(skipped)} invoice(s) can no longer accept the posted amount: "
+                    f"{', '.join(sorted(str(invoice_id) for invoice_id in skipped))}"
+                )
+
+            await self.session.commit()
+
+            for tenant_id in {payment.tenant_id for payment in payments}:
+                invalidate_tenant_summaries(tenant_id)
+            if applied:
+                clear_invoice_cache()
+
+            self.logger.info(f"Posted {len(payments)} payments to {len(applied)} invoices")
+            return applied
+
+        except Exception as e:
+            await self.session.rollback()
+            self.logger.error(f"Error posting payments: {e}")
+            raise
+
+    async def get_existing_external_transaction_ids(
+        self,
+        tenant_id: UUID,
+        external_transaction_ids: List[str]
+    ) -> Set[str]:
+        """Return the external_transaction_ids among the given ones that already have a payment"""
+        if not external_transaction_ids:
+            return set()
+        stmt = select(PaymentModel.external_transaction_id).where(
+            and_(
+                PaymentModel.tenant_id == tenant_id,
+                PaymentModel.external_transaction_id.in_(list(external_transaction_ids))
+            )
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
     async def delete_payment(self, payment_id: str, tenant_id: UUID) -> bool:
         """Delete a payment"""
         try:
@@ -187,6 +411,7 @@ class PaymentRepositoryImpl(PaymentRepository):
             )
             result = await self.session.execute(stmt)
             await self.session.commit()
+            invalidate_tenant_summaries(tenant_id)
             
             self.logger.info(f"Deleted payment {payment_id}")
             return result.rowcount > 0
@@ -343,39 +568,70 @@ class PaymentRepositoryImpl(PaymentRepository):
         except Exception as e:
             return []
 
+    async def get_payment_summary(
+        self,
+        tenant_id: UUID,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> PaymentSummary:
+        """Payment summary in one grouped query with conditional aggregates"""
+        conditions = [PaymentModel.tenant_id == tenant_id]
+        if from_date:
+            conditions.append(PaymentModel.payment_date >= from_date)
+        if to_date:
+            conditions.append(PaymentModel.payment_date <= to_date)
+
+        # Refunds are stored as negative amounts and excluded from the totals
+        positive = PaymentModel.amount > 0
+        completed = and_(PaymentModel.payment_status == PaymentStatus.COMPLETED.value, positive)
+        pending = PaymentModel.payment_status == PaymentStatus.PENDING.value
+        failed = PaymentModel.payment_status == PaymentStatus.FAILED.value
+
+        def amount_where(condition):
+            return func.coalesce(func.sum(PaymentModel.amount).filter(condition), 0)
+
+        stmt = select(
+            func.count(),
+            amount_where(positive),
+            func.count().filter(completed),
+            amount_where(completed),
+            func.count().filter(pending),
+            amount_where(pending),
+            func.count().filter(failed),
+            amount_where(failed)
+        ).where(and_(*conditions))
+
+        row = (await self.session.execute(stmt)).one()
+        return PaymentSummary(
+            total_payments=row[0],
+            total_amount=Decimal(row[1]),
+            completed_payments=row[2],
+            completed_amount=Decimal(row[3]),
+            pending_payments=row[4],
+            pending_amount=Decimal(row[5]),
+            failed_payments=row[6],
+            failed_amount=Decimal(row[7])
+        )
+
     async def get_next_payment_number(self, tenant_id: UUID, prefix: str) -> str:
         """Generate next payment number"""
+        return (await self.get_next_payment_numbers(tenant_id, prefix, 1))[0]
+
+    async def get_next_payment_numbers(self, tenant_id: UUID, prefix: str, count: int) -> List[str]:
+        """Allocate count consecutive payment numbers from the tenant's counter in the database"""
+        if count <= 0:
+            return []
         try:
-            # Get the highest number for this prefix and tenant
-            stmt = (
-                select(PaymentModel.payment_no)
-                .where(
-                    and_(
-                        PaymentModel.tenant_id == tenant_id,
-                        PaymentModel.payment_no.like(f"{prefix}%")
-                    )
-                )
-                .order_by(desc(PaymentModel.payment_no))
-                .limit(1)
+            result = await self.session.execute(
+                text("SELECT allocate_document_numbers('payment', :tenant_id, :prefix, :count)"),
+                {"tenant_id": tenant_id, "prefix": prefix, "count": count}
             )
-            result = await self.session.execute(stmt)
-            latest_payment_no = result.scalar_one_or_none()
-            
-            if latest_payment_no:
-                # Extract number part and increment
-                try:
-                    number_part = int(latest_payment_no.split('-')[-1])
-                    next_number = number_part + 1
-                except (ValueError, IndexError):
-                    next_number = 1
-            else:
-                next_number = 1
-            
-            return f"{prefix}-{next_number:06d}"
-            
+            first_number = int(result.scalar_one())
+            return [f"{prefix}-{first_number + i:06d}" for i in range(count)]
+
         except Exception as e:
-            self.logger.error(f"Error generating payment number: {e}")
-            return f"{prefix}-000001"
+            self.logger.error(f"Error allocating payment numbers: {e}")
+            raise
 
     async def get_payments_count(
         self,
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+# Replication lag of the replica, or NULL (read as unknown) when it is not a standby.
+# A replica that has replayed everything it received is current however long ago
+# the last transaction was.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag_seconds
+"""
+
+
+class ReadRouter:
+    """
+    Decides whether a read-only session may go to the replica.
+
+    Tenant writes are recorded as they commit. A tenant that wrote within
+    the replica's last measured lag (plus a margin) reads from the primary,
+    so users see their own writes; everyone else reads from the replica.
+    While the lag is unknown or beyond max_lag every read goes to the
+    primary. The lag is re-measured every check_interval seconds.
+    """
+
+    def __init__(self, margin: float = 1.0, max_lag: float = 30.0, check_interval: float = 10.0):
+        self.margin = margin
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._replica_lag: Optional[float] = None
+        self._lag_checked_at = 0.0
+        self._written_at: Dict[str, float] = {}
+
+    @property
+    def replica_lag(self) -> Optional[float]:
+        return self._replica_lag
+
+    def record_write(self, tenant_id: Optional[UUID]) -> None:
+        if tenant_id:
+            self._written_at[str(tenant_id)] = datetime.now().timestamp()
+
+    def lag_check_due(self) -> bool:
+        return datetime.now().timestamp() - self._lag_checked_at >= self.check_interval
+
+    def record_replica_lag(self, lag: Optional[float]) -> None:
+        """Store a lag measurement; None when the replica could not be measured"""
+        self._replica_lag = lag
+        self._lag_checked_at = datetime.now().timestamp()
+
+    def use_primary(self, tenant_id: Optional[UUID] = None) -> bool:
+        lag = self._replica_lag
+        if lag is None or lag > self.max_lag:
+            return True
+        if tenant_id is None:
+            return False
+
+        written_at = self._written_at.get(str(tenant_id))
+        if written_at is None:
+            return False
+        if datetime.now().timestamp() - written_at < lag + self.margin:
+            return True
+        # Past every window the replica could still be behind by
+        if datetime.now().timestamp() - written_at >= self.max_lag + self.margin:
+            self._written_at.pop(str(tenant_id), None)
+        return False
+
+    def clear(self) -> None:
+        self._written_at.clear()
+        self._replica_lag = None
+        self._lag_checked_at = 0.0
+
+
+# Routes reporting reads between the replica and the primary
+read_router = ReadRouter()
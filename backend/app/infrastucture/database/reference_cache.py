@@ -0,0 +1,94 @@
+import copy
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+from app.infrastucture.database.dashboard_cache import invalidate_tenant_dashboard
+from app.infrastucture.logs.logger import default_logger
+
+
+class TenantCache:
+    """
+    Simple in-process cache partitioned by tenant.
+
+    Entries expire after ttl seconds and a whole tenant can be dropped at once,
+    so writers only need to know the tenant they touched. Values are deep-copied
+    on the way in and out (unless copy_values=False for immutable values) so
+    callers can never mutate the cached copy.
+    """
+
+    def __init__(self, name: str, ttl: int = 300, copy_values: bool = True):
+        self.name = name
+        self.ttl = ttl
+        self.copy_values = copy_values
+        self._entries: Dict[str, Dict[Hashable, Tuple[Any, float]]] = {}
+
+    def get(self, tenant_id: UUID, key: Hashable) -> Optional[Any]:
+        """Cached value or None when missing/expired"""
+        tenant_entries = self._entries.get(str(tenant_id))
+        if not tenant_entries or key not in tenant_entries:
+            return None
+        value, timestamp = tenant_entries[key]
+        if (datetime.now().timestamp() - timestamp) >= self.ttl:
+            del tenant_entries[key]
+            return None
+        return copy.deepcopy(value) if self.copy_values else value
+
+    def set(self, tenant_id: UUID, key: Hashable, value: Any) -> None:
+        stored = copy.deepcopy(value) if self.copy_values else value
+        self._entries.setdefault(str(tenant_id), {})[key] = (stored, datetime.now().timestamp())
+
+    def invalidate(self, tenant_id: UUID) -> None:
+        """Drop every entry of a tenant"""
+        if self._entries.pop(str(tenant_id), None) is not None:
+            default_logger.info(f"{self.name} cache invalidated", tenant_id=str(tenant_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Warehouse/vehicle reference data used by trip planning screens
+reference_cache = TenantCache("Warehouse/vehicle reference", ttl=300)
+
+# Geocoded addresses per geohash tile for map and proximity queries.
+# Tiles hold immutable AddressLocation tuples, so they are not copied.
+address_tile_cache = TenantCache("Address tile", ttl=600, copy_values=False)
+
+# Invoice and payment dashboard summaries; short TTL on top of write invalidation
+# because invoices also turn overdue with the passing of time
+summary_cache = TenantCache("Dashboard summary", ttl=60)
+
+# Per-tenant plan limits, status and features read on every entitlement check.
+# Snapshots are frozen, so they are not copied. Invalidated by subscription and
+# plan writes and by Stripe webhooks; the TTL only bounds missed events.
+entitlement_cache = TenantCache("Tenant entitlement", ttl=600, copy_values=False)
+
+
+def invalidate_tenant_references(tenant_id: Optional[UUID]) -> None:
+    """Called by warehouse and vehicle writes"""
+    if tenant_id:
+        reference_cache.invalidate(tenant_id)
+
+
+def invalidate_tenant_addresses(tenant_id: Optional[UUID]) -> None:
+    """Called by address writes"""
+    if tenant_id:
+        address_tile_cache.invalidate(tenant_id)
+
+
+def invalidate_tenant_summaries(tenant_id: Optional[UUID]) -> None:
+    """Called by invoice and payment writes"""
+    if tenant_id:
+        summary_cache.invalidate(tenant_id)
+        invalidate_tenant_dashboard(tenant_id)
+
+
+def invalidate_tenant_entitlements(tenant_id: Optional[UUID]) -> None:
+    """Called by subscription writes and subscription webhooks"""
+    if tenant_id:
+        entitlement_cache.invalidate(tenant_id)
+
+
+def invalidate_all_entitlements() -> None:
+    """Called by plan writes, which can change the limits of many tenants"""
+    entitlement_cache.clear()
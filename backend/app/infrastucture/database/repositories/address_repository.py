@@ -1,17 +1,37 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update as sa_update
-from app.domain.entities.addresses import Address, AddressType
+from sqlalchemy import update as sa_update, func, cast, text
+from app.domain.entities.addresses import Address, AddressType, AddressLocation
 from app.domain.repositories.address_repository import AddressRepository as AddressRepositoryInterface
+from app.infrastucture.database.reference_cache import invalidate_tenant_addresses
 from datetime import datetime
+from geoalchemy2 import Geography, Geometry
 from geoalchemy2.elements import WKTElement
 from geoalchemy2.shape import to_shape
 
 # You will need to create the ORM model for Address in models/addresses.py
 from app.infrastucture.database.models.adresses import Address as AddressORM
 
+# Warehouse locations are free text; only WKT points can be measured
+_NEAREST_DEPOT_SQL = text("""
+    SELECT w.id, w.name, w.code, w.type,
+           ST_Distance(a.coordinates, ST_GeogFromText(w.location)) / 1000.0 AS distance_km
+    FROM addresses a
+    JOIN warehouses w ON w.tenant_id = a.tenant_id AND w.deleted_at IS NULL
+    WHERE a.id = :address_id
+      AND a.coordinates IS NOT NULL
+      AND (w.type IS NULL OR w.type <> 'MOB')
+      AND w.location ~* '^\\s*(SRID=4326;)?\\s*POINT\\s*\\(\\s*-?[0-9.]+\\s+-?[0-9.]+\\s*\\)\\s*$'
+    ORDER BY distance_km
+    LIMIT 1
+""")
+
+
+def _geography_point(longitude: float, latitude: float):
+    return cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography)
+
 class AddressRepository(AddressRepositoryInterface):
     def __init__(self, session: AsyncSession):
         self._session = session
@@ -26,6 +46,95 @@ class AddressRepository(AddressRepositoryInterface):
         objs = result.scalars().all()
         return [self._to_entity(obj) for obj in objs]
 
+    async def get_primary_delivery_addresses(self, customer_ids: List[UUID]) -> List[Address]:
+        if not customer_ids:
+            return []
+        result = await self._session.execute(
+            select(AddressORM).where(
+                AddressORM.customer_id.in_(customer_ids),
+                AddressORM.is_primary_delivery == True,
+                AddressORM.deleted_at == None
+            )
+        )
+        return [self._to_entity(obj) for obj in result.scalars().all()]
+
+    def _location_query(self, tenant_id: UUID, *columns):
+        """Select only what a map marker needs; coordinates come back as plain floats"""
+        geometry = cast(AddressORM.coordinates, Geometry)
+        return select(
+            AddressORM.id,
+            AddressORM.customer_id,
+            AddressORM.address_type,
+            func.ST_X(geometry).label("longitude"),
+            func.ST_Y(geometry).label("latitude"),
+            AddressORM.street,
+            AddressORM.city,
+            AddressORM.is_primary_delivery,
+            *columns
+        ).where(
+            AddressORM.tenant_id == tenant_id,
+            AddressORM.coordinates != None,
+            AddressORM.deleted_at == None
+        )
+
+    def _to_location(self, row, distance_km: Optional[float] = None) -> AddressLocation:
+        return AddressLocation(
+            address_id=row.id,
+            customer_id=row.customer_id,
+            address_type=AddressType(row.address_type),
+            longitude=float(row.longitude),
+            latitude=float(row.latitude),
+            street=row.street,
+            city=row.city,
+            is_primary_delivery=row.is_primary_delivery,
+            distance_km=distance_km
+        )
+
+    async def get_address_locations_in_bbox(
+        self,
+        tenant_id: UUID,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int = 5000
+    ) -> List[AddressLocation]:
+        envelope = cast(func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326), Geography)
+        query = self._location_query(tenant_id).where(
+            func.ST_Intersects(AddressORM.coordinates, envelope)
+        ).limit(limit)
+        result = await self._session.execute(query)
+        return [self._to_location(row) for row in result.all()]
+
+    async def get_address_locations_within_radius(
+        self,
+        tenant_id: UUID,
+        longitude: float,
+        latitude: float,
+        radius_km: float,
+        limit: int = 500
+    ) -> List[AddressLocation]:
+        point = _geography_point(longitude, latitude)
+        distance = (func.ST_Distance(AddressORM.coordinates, point) / 1000.0).label("distance_km")
+        query = self._location_query(tenant_id, distance).where(
+            func.ST_DWithin(AddressORM.coordinates, point, radius_km * 1000.0)
+        ).order_by(distance).limit(limit)
+        result = await self._session.execute(query)
+        return [self._to_location(row, float(row.distance_km)) for row in result.all()]
+
+    async def get_nearest_depot(self, address_id: str) -> Optional[Dict[str, Any]]:
+        result = await self._session.execute(_NEAREST_DEPOT_SQL, {"address_id": UUID(address_id)})
+        row = result.first()
+        if not row:
+            return None
+        return {
+            "warehouse_id": str(row.id),
+            "name": row.name,
+            "code": row.code,
+            "type": row.type,
+            "distance_km": round(float(row.distance_km), 3)
+        }
+
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[Address]:
         result = await self._session.execute(select(AddressORM).where(AddressORM.deleted_at == None).offset(offset).limit(limit))
         objs = result.scalars().all()
@@ -94,6 +203,7 @@ class AddressRepository(AddressRepositoryInterface):
         self._session.add(obj)
         await self._session.commit()
         await self._session.refresh(obj)
+        invalidate_tenant_addresses(obj.tenant_id)
         return self._to_entity(obj)
 
     async def update_address(self, address_id: str, address: Address) -> Optional[Address]:
@@ -150,6 +260,7 @@ class AddressRepository(AddressRepositoryInterface):
         obj.updated_at = datetime.now()
         await self._session.commit()
         await self._session.refresh(obj)
+        invalidate_tenant_addresses(obj.tenant_id)
         return self._to_entity(obj)
 
     async def delete_address(self, address_id: str, deleted_by: Optional[UUID] = None) -> bool:
@@ -160,6 +271,7 @@ class AddressRepository(AddressRepositoryInterface):
         obj.deleted_at = datetime.now()
         obj.deleted_by = deleted_by
         await self._session.commit()
+        invalidate_tenant_addresses(obj.tenant_id)
         return True
 
     async def set_primary_billing_address(self, customer_id: str, address_id: str, updated_by: Optional[UUID] = None) -> bool:
@@ -198,6 +310,7 @@ class AddressRepository(AddressRepositoryInterface):
         obj.updated_at = datetime.now()
         obj.updated_by = updated_by
         await self._session.commit()
+        invalidate_tenant_addresses(obj.tenant_id)
         return True
 
     def _to_entity(self, obj: AddressORM) -> Address:
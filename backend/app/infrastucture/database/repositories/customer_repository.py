@@ -17,6 +17,12 @@ class CustomerRepository(CustomerRepositoryInterface):
         obj = result.scalar_one_or_none()
         return self._to_entity(obj) if obj else None
 
+    async def get_by_ids(self, customer_ids: List[UUID]) -> List[Customer]:
+        if not customer_ids:
+            return []
+        result = await self._session.execute(select(CustomerORM).where(CustomerORM.id.in_(customer_ids), CustomerORM.deleted_at == None))
+        return [self._to_entity(obj) for obj in result.scalars().all()]
+
     async def get_by_email(self, email: str) -> Optional[Customer]:
         result = await self._session.execute(select(CustomerORM).where(CustomerORM.email == email, CustomerORM.deleted_at == None))
         obj = result.scalar_one_or_none()
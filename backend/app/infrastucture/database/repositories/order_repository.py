@@ -1,12 +1,14 @@
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import select, update, delete, and_, or_, func, text
+from sqlalchemy import select, update, delete, and_, or_, func, text, any_, bindparam, exists, tuple_, table, column, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PostgresUUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, noload
 
-from app.domain.entities.orders import Order, OrderLine, OrderStatus
+from app.domain.entities.orders import Order, OrderLine, OrderStatus, OrderTransition
+from app.domain.entities.audit_events import AuditEvent
 from app.domain.repositories.order_repository import OrderRepository
 from app.domain.exceptions.orders import (
     OrderNotFoundError,
@@ -14,7 +16,19 @@ from app.domain.exceptions.orders import (
     OrderAlreadyExistsError,
     OrderTenantMismatchError
 )
+from app.infrastucture.database.dashboard_cache import invalidate_tenant_dashboard
 from app.infrastucture.database.models.orders import OrderModel, OrderLineModel
+from app.infrastucture.database.models.audit_events import AuditEventModel
+
+
+def _any_id(id_column, ids: List[UUID], name: str):
+    """id_column = ANY(:name) with the ids bound as a single uuid[] parameter"""
+    return id_column == any_(bindparam(name, value=list(ids), type_=ARRAY(PostgresUUID(as_uuid=True))))
+
+
+# Invoices are owned by the Supabase invoice repository; only the columns needed
+# for the invoicing anti-join are declared here
+_invoices = table("invoices", column("order_id"), column("invoice_status"))
 
 
 class SQLAlchemyOrderRepository(OrderRepository):
@@ -152,6 +166,7 @@ class SQLAlchemyOrderRepository(OrderRepository):
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
+        invalidate_tenant_dashboard(order.tenant_id)
         
         return self._to_order_entity(model)
 
@@ -251,6 +266,42 @@ class SQLAlchemyOrderRepository(OrderRepository):
         
         return [self._to_order_entity(model) for model in models]
 
+    async def get_orders_ready_for_invoicing(
+        self,
+        tenant_id: UUID,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        offset: int = 0
+    ) -> List[Order]:
+        """Anti-join against paid invoices, keyset paginated on (created_at, id)"""
+        paid_invoice = exists().where(
+            and_(
+                _invoices.c.order_id == OrderModel.id,
+                _invoices.c.invoice_status == literal_column("'paid'::invoice_status")
+            )
+        )
+        conditions = [
+            OrderModel.tenant_id == tenant_id,
+            OrderModel.order_status.in_([OrderStatus.DELIVERED.value, OrderStatus.CLOSED.value]),
+            OrderModel.deleted_at.is_(None),
+            ~paid_invoice
+        ]
+        if after:
+            conditions.append(tuple_(OrderModel.created_at, OrderModel.id) < tuple_(*after))
+
+        stmt = (
+            select(OrderModel)
+            .options(noload(OrderModel.order_lines))
+            .where(and_(*conditions))
+            .order_by(OrderModel.created_at.desc(), OrderModel.id.desc())
+            .limit(limit)
+        )
+        if offset and not after:
+            stmt = stmt.offset(offset)
+
+        result = await self.session.execute(stmt)
+        return [self._to_order_entity(model) for model in result.scalars().all()]
+
     async def get_orders_by_date_range(
         self, 
         start_date: date, 
@@ -276,6 +327,32 @@ class SQLAlchemyOrderRepository(OrderRepository):
         
         return [self._to_order_entity(model) for model in models]
 
+    async def get_orders_for_dispatch(
+        self,
+        tenant_id: UUID,
+        requested_date: date,
+        statuses: List[OrderStatus]
+    ) -> List[Order]:
+        """Get orders with lines for a delivery date in any of the given statuses"""
+        status_values = [status.value if isinstance(status, OrderStatus) else status for status in statuses]
+        stmt = (
+            select(OrderModel)
+            .options(selectinload(OrderModel.order_lines))
+            .where(
+                and_(
+                    OrderModel.tenant_id == tenant_id,
+                    OrderModel.requested_date == requested_date,
+                    OrderModel.order_status.in_(status_values),
+                    OrderModel.deleted_at.is_(None)
+                )
+            )
+            .order_by(OrderModel.created_at.asc())
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._to_order_entity(model) for model in models]
+
     async def get_all_orders(
         self, 
         tenant_id: UUID, 
@@ -367,6 +444,7 @@ class SQLAlchemyOrderRepository(OrderRepository):
         )
         await self.session.execute(stmt)
         await self.session.commit()
+        invalidate_tenant_dashboard(order.tenant_id)
         
         return await self.get_order_by_id(order_id)
 
@@ -385,11 +463,139 @@ class SQLAlchemyOrderRepository(OrderRepository):
                 updated_by=updated_by,
                 updated_at=datetime.utcnow()
             )
+            .returning(OrderModel.tenant_id)
         )
         result = await self.session.execute(stmt)
+        tenant_ids = result.scalars().all()
         await self.session.commit()
+        for tenant_id in set(tenant_ids):
+            invalidate_tenant_dashboard(tenant_id)
         
-        return result.rowcount > 0
+        return len(tenant_ids) > 0
+
+    async def get_orders_by_ids(self, order_ids: List[UUID]) -> List[Order]:
+        """Get several orders with their lines in one query"""
+        if not order_ids:
+            return []
+        stmt = (
+            select(OrderModel)
+            .options(selectinload(OrderModel.order_lines))
+            .where(
+                and_(
+                    _any_id(OrderModel.id, order_ids, "order_ids"),
+                    OrderModel.deleted_at.is_(None)
+                )
+            )
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._to_order_entity(model) for model in models]
+
+    async def bulk_transition_orders(
+        self,
+        order_ids: List[UUID],
+        from_status: OrderStatus,
+        to_status: OrderStatus,
+        updated_by: Optional[UUID] = None,
+        mark_delivered: bool = False,
+        audit_events: Optional[List[AuditEvent]] = None
+    ) -> List[UUID]:
+        """Set-based status transition: one UPDATE per table, one commit"""
+        if not order_ids:
+            return []
+        
+        try:
+            rows = await self._apply_transition(OrderTransition(
+                order_ids=order_ids,
+                from_status=from_status,
+                to_status=to_status,
+                updated_by=updated_by,
+                mark_delivered=mark_delivered,
+                audit_events=audit_events or []
+            ))
+            await self.session.commit()
+            for tenant_id in {row.tenant_id for row in rows}:
+                invalidate_tenant_dashboard(tenant_id)
+            return [row.id for row in rows]
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def add_order_transition(self, transition: OrderTransition) -> List[UUID]:
+        """Add a set-based status transition to the current transaction without committing it"""
+        if not transition.order_ids:
+            return []
+        rows = await self._apply_transition(transition)
+        return [row.id for row in rows]
+
+    async def _apply_transition(self, transition: OrderTransition) -> list:
+        now = datetime.utcnow()
+        updated_by = transition.updated_by
+        order_values = {
+            "order_status": transition.to_status.value,
+            "updated_by": updated_by,
+            "updated_at": now
+        }
+        if transition.mark_delivered:
+            order_values.update(executed=True, executed_at=now, executed_by=updated_by)
+        
+        # Guarding on the current status keeps concurrent transitions from being applied twice
+        stmt = (
+            update(OrderModel)
+            .where(
+                and_(
+                    _any_id(OrderModel.id, transition.order_ids, "order_ids"),
+                    OrderModel.order_status == transition.from_status.value,
+                    OrderModel.deleted_at.is_(None)
+                )
+            )
+            .values(**order_values)
+            .returning(OrderModel.id, OrderModel.tenant_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        transitioned = [row.id for row in rows]
+        
+        if transitioned and transition.mark_delivered:
+            await self.session.execute(
+                update(OrderLineModel)
+                .where(
+                    and_(
+                        _any_id(OrderLineModel.order_id, transitioned, "transitioned_ids"),
+                        OrderLineModel.qty_allocated > 0
+                    )
+                )
+                .values(
+                    qty_delivered=OrderLineModel.qty_allocated,
+                    updated_by=updated_by,
+                    updated_at=now
+                )
+                .execution_options(synchronize_session=False)
+            )
+        
+        if transitioned and transition.audit_events:
+            transitioned_set = set(transitioned)
+            self.session.add_all([
+                AuditEventModel(
+                    tenant_id=event.tenant_id,
+                    event_time=event.event_time,
+                    actor_id=event.actor_id,
+                    actor_type=event.actor_type.value,
+                    object_type=event.object_type.value,
+                    object_id=event.object_id,
+                    event_type=event.event_type.value,
+                    field_name=event.field_name,
+                    old_value=event.old_value,
+                    new_value=event.new_value,
+                    context=event.context
+                )
+                for event in transition.audit_events
+                if event.object_id in transitioned_set
+            ])
+        
+        return rows
 
     async def delete_order(self, order_id: str, deleted_by: Optional[UUID] = None) -> bool:
         """Soft delete an order"""
@@ -400,11 +606,15 @@ class SQLAlchemyOrderRepository(OrderRepository):
                 deleted_at=datetime.utcnow(),
                 deleted_by=deleted_by
             )
+            .returning(OrderModel.tenant_id)
         )
         result = await self.session.execute(stmt)
+        tenant_ids = result.scalars().all()
         await self.session.commit()
+        for tenant_id in set(tenant_ids):
+            invalidate_tenant_dashboard(tenant_id)
         
-        return result.rowcount > 0
+        return len(tenant_ids) > 0
 
     async def generate_order_number(self, tenant_id: UUID) -> str:
         """Generate a unique order number for a tenant"""
@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import select, delete, and_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.stock_alerts import StockPosition, StockReorderPoint
+from app.domain.repositories.stock_alert_repository import StockAlertRepository
+from app.infrastucture.database.models.stock_levels import StockLevelModel
+from app.infrastucture.database.models.stock_reorder_points import StockReorderPointModel
+
+
+class SQLAlchemyStockAlertRepository(StockAlertRepository):
+    """SQLAlchemy implementation of StockAlertRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _to_reorder_point_entity(self, model: StockReorderPointModel) -> StockReorderPoint:
+        """Convert StockReorderPointModel to StockReorderPoint entity"""
+        return StockReorderPoint(
+            id=model.id,
+            tenant_id=model.tenant_id,
+            warehouse_id=model.warehouse_id,
+            variant_id=model.variant_id,
+            reorder_point=model.reorder_point,
+            created_by=model.created_by,
+            created_at=model.created_at,
+            updated_by=model.updated_by,
+            updated_at=model.updated_at
+        )
+
+    async def get_reorder_points(self, tenant_id: UUID) -> List[StockReorderPoint]:
+        stmt = select(StockReorderPointModel).where(StockReorderPointModel.tenant_id == tenant_id)
+        result = await self.session.execute(stmt)
+        return [self._to_reorder_point_entity(model) for model in result.scalars().all()]
+
+    async def set_reorder_point(self, reorder_point: StockReorderPoint) -> StockReorderPoint:
+        now = datetime.now(timezone.utc)
+        insert_stmt = pg_insert(StockReorderPointModel).values(
+            id=reorder_point.id,
+            tenant_id=reorder_point.tenant_id,
+            warehouse_id=reorder_point.warehouse_id,
+            variant_id=reorder_point.variant_id,
+            reorder_point=reorder_point.reorder_point,
+            created_by=reorder_point.created_by,
+            created_at=now,
+            updated_by=reorder_point.updated_by or reorder_point.created_by,
+            updated_at=now
+        )
+        # Warehouse and all-warehouse reorder points are kept unique by separate partial indexes
+        if reorder_point.warehouse_id is None:
+            conflict = dict(index_elements=["tenant_id", "variant_id"], index_where=text("warehouse_id IS NULL"))
+        else:
+            conflict = dict(
+                index_elements=["tenant_id", "variant_id", "warehouse_id"],
+                index_where=text("warehouse_id IS NOT NULL")
+            )
+        stmt = insert_stmt.on_conflict_do_update(
+            **conflict,
+            set_={
+                'reorder_point': insert_stmt.excluded.reorder_point,
+                'updated_by': insert_stmt.excluded.updated_by,
+                'updated_at': insert_stmt.excluded.updated_at
+            }
+        ).returning(StockReorderPointModel)
+        try:
+            result = await self.session.execute(stmt.execution_options(populate_existing=True))
+            model = result.scalar_one()
+            saved = self._to_reorder_point_entity(model)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return saved
+
+    async def delete_reorder_point(self, tenant_id: UUID, variant_id: UUID, warehouse_id: Optional[UUID] = None) -> bool:
+        stmt = delete(StockReorderPointModel).where(
+            and_(
+                StockReorderPointModel.tenant_id == tenant_id,
+                StockReorderPointModel.variant_id == variant_id,
+                StockReorderPointModel.warehouse_id == warehouse_id
+                if warehouse_id is not None else StockReorderPointModel.warehouse_id.is_(None)
+            )
+        )
+        try:
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return result.rowcount > 0
+
+    async def get_stock_positions(self, tenant_id: UUID) -> List[StockPosition]:
+        stmt = select(
+            StockLevelModel.warehouse_id,
+            StockLevelModel.variant_id,
+            StockLevelModel.stock_status,
+            StockLevelModel.quantity,
+            StockLevelModel.available_qty,
+            StockLevelModel.last_transaction_date
+        ).where(StockLevelModel.tenant_id == tenant_id)
+        result = await self.session.execute(stmt)
+        return [
+            StockPosition(
+                warehouse_id=row.warehouse_id,
+                variant_id=row.variant_id,
+                stock_status=row.stock_status,
+                quantity=row.quantity,
+                available_qty=row.available_qty,
+                last_transaction_date=row.last_transaction_date
+            )
+            for row in result
+        ]
@@ -1,8 +1,8 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from sqlalchemy import select, update, delete, and_, or_, func, text
+from sqlalchemy import select, insert, update, delete, and_, or_, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -26,8 +26,12 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
 
     def _to_stock_doc_entity(self, model: StockDocModel) -> StockDoc:
         """Convert StockDocModel to StockDoc entity"""
-        stock_doc_lines = [self._to_stock_doc_line_entity(line) for line in model.stock_doc_lines]
-        
+        stock_doc = self._to_stock_doc_header(model)
+        stock_doc.stock_doc_lines = [self._to_stock_doc_line_entity(line) for line in model.stock_doc_lines]
+        return stock_doc
+
+    def _to_stock_doc_header(self, model) -> StockDoc:
+        """Convert a StockDocModel or a stock_docs result row to a StockDoc entity without lines"""
         return StockDoc(
             id=model.id,
             tenant_id=model.tenant_id,
@@ -46,8 +50,7 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
             updated_at=model.updated_at,
             updated_by=model.updated_by,
             deleted_at=model.deleted_at,
-            deleted_by=model.deleted_by,
-            stock_doc_lines=stock_doc_lines
+            deleted_by=model.deleted_by
         )
 
     def _to_stock_doc_line_entity(self, model: StockDocLineModel) -> StockDocLine:
@@ -99,6 +102,60 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
             updated_by=entity.updated_by
         )
 
+    async def _get_stock_doc_headers(
+        self,
+        conditions: list,
+        limit: int,
+        offset: int,
+        include_line_totals: bool
+    ) -> List[StockDoc]:
+        """
+        One page of stock documents without their lines, newest first.
+
+        Line counts and values are aggregated in SQL over the page's documents
+        only; use get_stock_doc_lines_for_docs when the lines themselves are needed.
+        Plain rows are selected instead of StockDocModel instances so these
+        header-only documents never end up in the session's identity map with
+        an empty stock_doc_lines collection.
+        """
+        page = (
+            select(*StockDocModel.__table__.columns)
+            .where(and_(*conditions))
+            .order_by(StockDocModel.created_at.desc(), StockDocModel.id)
+            .limit(limit)
+            .offset(offset)
+            .cte("page")
+        )
+
+        if include_line_totals:
+            line_totals = (
+                select(
+                    StockDocLineModel.stock_doc_id,
+                    func.count(StockDocLineModel.id).label('line_count'),
+                    func.sum(StockDocLineModel.quantity * StockDocLineModel.unit_cost).label('total_value')
+                )
+                .where(StockDocLineModel.stock_doc_id.in_(select(page.c.id)))
+                .group_by(StockDocLineModel.stock_doc_id)
+                .subquery()
+            )
+            stmt = (
+                select(page, line_totals.c.line_count, line_totals.c.total_value)
+                .outerjoin(line_totals, line_totals.c.stock_doc_id == page.c.id)
+            )
+        else:
+            stmt = select(page)
+
+        result = await self.session.execute(stmt.order_by(page.c.created_at.desc(), page.c.id))
+
+        stock_docs = []
+        for row in result:
+            stock_doc = self._to_stock_doc_header(row)
+            if include_line_totals:
+                stock_doc.line_count = row.line_count or 0
+                stock_doc.total_value = row.total_value if row.total_value is not None else Decimal('0')
+            stock_docs.append(stock_doc)
+        return stock_docs
+
     async def create_stock_doc(self, stock_doc: StockDoc) -> StockDoc:
         """Create a new stock document"""
         # Check if document number already exists
@@ -147,52 +204,49 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         
         return self._to_stock_doc_entity(model) if model else None
 
-    async def get_stock_docs_by_type(self, doc_type: StockDocType, tenant_id: UUID) -> List[StockDoc]:
-        """Get all stock documents of a specific type"""
-        stmt = (
-            select(StockDocModel)
-            .options(selectinload(StockDocModel.stock_doc_lines))
-            .where(
-                and_(
-                    StockDocModel.doc_type == doc_type,
-                    StockDocModel.tenant_id == tenant_id,
-                    StockDocModel.deleted_at.is_(None)
-                )
-            )
-            .order_by(StockDocModel.created_at.desc())
-        )
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_stock_doc_entity(model) for model in models]
+    async def get_stock_docs_by_type(
+        self,
+        doc_type: StockDocType,
+        tenant_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
+    ) -> List[StockDoc]:
+        """Get a page of stock documents of a specific type, without lines"""
+        conditions = [
+            StockDocModel.doc_type == doc_type,
+            StockDocModel.tenant_id == tenant_id,
+            StockDocModel.deleted_at.is_(None)
+        ]
+        return await self._get_stock_doc_headers(conditions, limit, offset, include_line_totals)
 
-    async def get_stock_docs_by_status(self, status: StockDocStatus, tenant_id: UUID) -> List[StockDoc]:
-        """Get all stock documents with a specific status"""
-        stmt = (
-            select(StockDocModel)
-            .options(selectinload(StockDocModel.stock_doc_lines))
-            .where(
-                and_(
-                    StockDocModel.doc_status == status,
-                    StockDocModel.tenant_id == tenant_id,
-                    StockDocModel.deleted_at.is_(None)
-                )
-            )
-            .order_by(StockDocModel.created_at.desc())
-        )
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_stock_doc_entity(model) for model in models]
+    async def get_stock_docs_by_status(
+        self,
+        status: StockDocStatus,
+        tenant_id: UUID,
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
+    ) -> List[StockDoc]:
+        """Get a page of stock documents with a specific status, without lines"""
+        conditions = [
+            StockDocModel.doc_status == status,
+            StockDocModel.tenant_id == tenant_id,
+            StockDocModel.deleted_at.is_(None)
+        ]
+        return await self._get_stock_doc_headers(conditions, limit, offset, include_line_totals)
 
     async def get_stock_docs_by_warehouse(
         self, 
         warehouse_id: UUID, 
         tenant_id: UUID,
         include_source: bool = True,
-        include_dest: bool = True
+        include_dest: bool = True,
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
     ) -> List[StockDoc]:
-        """Get stock documents involving a specific warehouse"""
+        """Get a page of stock documents involving a specific warehouse, without lines"""
         conditions = [
             StockDocModel.tenant_id == tenant_id,
             StockDocModel.deleted_at.is_(None)
@@ -207,16 +261,7 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         if warehouse_conditions:
             conditions.append(or_(*warehouse_conditions))
         
-        stmt = (
-            select(StockDocModel)
-            .options(selectinload(StockDocModel.stock_doc_lines))
-            .where(and_(*conditions))
-            .order_by(StockDocModel.created_at.desc())
-        )
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_stock_doc_entity(model) for model in models]
+        return await self._get_stock_doc_headers(conditions, limit, offset, include_line_totals)
 
     async def get_stock_docs_by_reference(
         self, 
@@ -248,28 +293,21 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         start_date: datetime, 
         end_date: datetime, 
         tenant_id: UUID,
-        date_field: str = "created_at"
+        date_field: str = "created_at",
+        limit: int = 100,
+        offset: int = 0,
+        include_line_totals: bool = True
     ) -> List[StockDoc]:
-        """Get stock documents within a date range"""
+        """Get a page of stock documents within a date range, without lines"""
         date_column = getattr(StockDocModel, date_field)
         
-        stmt = (
-            select(StockDocModel)
-            .options(selectinload(StockDocModel.stock_doc_lines))
-            .where(
-                and_(
-                    date_column >= start_date,
-                    date_column <= end_date,
-                    StockDocModel.tenant_id == tenant_id,
-                    StockDocModel.deleted_at.is_(None)
-                )
-            )
-            .order_by(StockDocModel.created_at.desc())
-        )
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_stock_doc_entity(model) for model in models]
+        conditions = [
+            date_column >= start_date,
+            date_column <= end_date,
+            StockDocModel.tenant_id == tenant_id,
+            StockDocModel.deleted_at.is_(None)
+        ]
+        return await self._get_stock_doc_headers(conditions, limit, offset, include_line_totals)
 
     async def get_all_stock_docs(
         self, 
@@ -457,6 +495,32 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         
         return [self._to_stock_doc_line_entity(model) for model in models]
 
+    async def get_stock_doc_lines_for_docs(
+        self,
+        doc_ids: List[UUID],
+        tenant_id: Optional[UUID] = None
+    ) -> Dict[UUID, List[StockDocLine]]:
+        """Get the lines of several stock documents in one query, keyed by document ID"""
+        lines_by_doc: Dict[UUID, List[StockDocLine]] = {doc_id: [] for doc_id in doc_ids}
+        if not doc_ids:
+            return lines_by_doc
+
+        stmt = (
+            select(StockDocLineModel)
+            .where(StockDocLineModel.stock_doc_id.in_(doc_ids))
+            .order_by(StockDocLineModel.stock_doc_id, StockDocLineModel.created_at)
+        )
+        if tenant_id is not None:
+            stmt = stmt.join(StockDocModel, StockDocModel.id == StockDocLineModel.stock_doc_id).where(
+                StockDocModel.tenant_id == tenant_id,
+                StockDocModel.deleted_at.is_(None)
+            )
+        result = await self.session.execute(stmt)
+        for model in result.scalars().all():
+            lines_by_doc[model.stock_doc_id].append(self._to_stock_doc_line_entity(model))
+
+        return lines_by_doc
+
     async def get_stock_doc_lines_by_variant(
         self, 
         variant_id: UUID, 
@@ -544,6 +608,21 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
     # Bulk operations
     async def create_stock_doc_with_lines(self, stock_doc: StockDoc) -> StockDoc:
         """Create a stock document with all its lines in a transaction"""
+        doc_model = await self._add_stock_doc_with_lines(stock_doc)
+        await self.session.commit()
+        await self.session.refresh(doc_model, attribute_names=['created_at', 'updated_at'])
+        
+        # The lines were written as given, so return them instead of reloading them
+        stock_doc.created_at = doc_model.created_at
+        stock_doc.updated_at = doc_model.updated_at
+        return stock_doc
+
+    async def add_stock_doc_with_lines(self, stock_doc: StockDoc) -> StockDoc:
+        """Add a stock document and its lines to the current transaction without committing it"""
+        await self._add_stock_doc_with_lines(stock_doc)
+        return stock_doc
+
+    async def _add_stock_doc_with_lines(self, stock_doc: StockDoc) -> StockDocModel:
         # Check if document number already exists
         if not await self.validate_doc_number_unique(stock_doc.doc_no, stock_doc.tenant_id):
             raise StockDocAlreadyExistsError(stock_doc.doc_no, str(stock_doc.tenant_id))
@@ -553,16 +632,24 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         self.session.add(doc_model)
         await self.session.flush()  # Get the ID without committing
         
-        # Create the lines
-        for line in stock_doc.stock_doc_lines:
-            line.stock_doc_id = doc_model.id
-            line_model = self._to_stock_doc_line_model(line)
-            self.session.add(line_model)
-        
-        await self.session.commit()
-        await self.session.refresh(doc_model)
-        
-        return self._to_stock_doc_entity(doc_model)
+        # Create all lines with a single executemany insert; stock takes can carry thousands
+        if stock_doc.stock_doc_lines:
+            line_rows = []
+            for line in stock_doc.stock_doc_lines:
+                line.stock_doc_id = doc_model.id
+                line_rows.append({
+                    'id': line.id,
+                    'stock_doc_id': line.stock_doc_id,
+                    'variant_id': line.variant_id,
+                    'gas_type': line.gas_type,
+                    'quantity': line.quantity,
+                    'unit_cost': line.unit_cost,
+                    'created_by': line.created_by,
+                    'updated_by': line.updated_by
+                })
+            await self.session.execute(insert(StockDocLineModel), line_rows)
+        
+        return doc_model
 
     async def update_stock_doc_with_lines(self, stock_doc: StockDoc) -> Optional[StockDoc]:
         """Update a stock document with all its lines in a transaction"""
@@ -604,9 +691,10 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        include_line_totals: bool = True
     ) -> List[StockDoc]:
-        """Search stock documents with multiple filters"""
+        """Search stock documents with multiple filters, returning a page without lines"""
         conditions = [
             StockDocModel.tenant_id == tenant_id,
             StockDocModel.deleted_at.is_(None)
@@ -643,18 +731,7 @@ class SQLAlchemyStockDocRepository(StockDocRepository):
         if end_date:
             conditions.append(StockDocModel.created_at <= end_date)
         
-        stmt = (
-            select(StockDocModel)
-            .options(selectinload(StockDocModel.stock_doc_lines))
-            .where(and_(*conditions))
-            .order_by(StockDocModel.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_stock_doc_entity(model) for model in models]
+        return await self._get_stock_doc_headers(conditions, limit, offset, include_line_totals)
 
     async def get_stock_docs_count(
         self, 
@@ -0,0 +1,261 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select, insert, and_, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_ledger import StockBalance, StockLedgerEntry, StockMovement, StockMovementType
+from app.domain.repositories.stock_ledger_repository import StockLedgerRepository
+from app.infrastucture.database.models.stock_ledger import StockLedgerModel, StockSnapshotRunModel
+
+# Balances as of :as_of - the latest snapshot at or before it plus the ledger entries after the snapshot.
+# The unit cost is the one recorded by the most recent change of each bucket.
+_BALANCES_SQL = """
+    SELECT tenant_id, warehouse_id, variant_id, stock_status,
+           SUM(quantity) AS quantity,
+           (ARRAY_AGG(unit_cost ORDER BY changed_at DESC))[1] AS unit_cost
+    FROM (
+        SELECT s.tenant_id, s.warehouse_id, s.variant_id, s.stock_status,
+               s.quantity, s.unit_cost, s.snapshot_at AS changed_at
+        FROM stock_balance_snapshots s
+        WHERE s.snapshot_at = (
+            SELECT MAX(snapshot_at) FROM stock_snapshot_runs WHERE snapshot_at <= :as_of
+        ){snapshot_filters}
+        UNION ALL
+        SELECT l.tenant_id, l.warehouse_id, l.variant_id, l.stock_status,
+               l.quantity_change, l.unit_cost, l.occurred_at
+        FROM stock_ledger l
+        WHERE l.occurred_at <= :as_of
+          AND l.occurred_at > COALESCE(
+              (SELECT MAX(snapshot_at) FROM stock_snapshot_runs WHERE snapshot_at <= :as_of),
+              CAST('-infinity' AS timestamptz)
+          ){ledger_filters}
+    ) balances
+    GROUP BY tenant_id, warehouse_id, variant_id, stock_status
+    HAVING SUM(quantity) <> 0
+"""
+
+_MOVEMENTS_SQL = """
+    WITH opening AS ({balances}),
+    moves AS (
+        SELECT warehouse_id, variant_id, stock_status,
+               SUM(CASE WHEN quantity_change > 0 THEN quantity_change ELSE 0 END) AS qty_in,
+               SUM(CASE WHEN quantity_change < 0 THEN -quantity_change ELSE 0 END) AS qty_out
+        FROM stock_ledger l
+        WHERE l.occurred_at > :as_of AND l.occurred_at <= :end{ledger_filters}
+        GROUP BY warehouse_id, variant_id, stock_status
+    )
+    SELECT COALESCE(o.warehouse_id, m.warehouse_id) AS warehouse_id,
+           COALESCE(o.variant_id, m.variant_id) AS variant_id,
+           COALESCE(o.stock_status, m.stock_status) AS stock_status,
+           COALESCE(o.quantity, 0) AS opening_qty,
+           COALESCE(m.qty_in, 0) AS qty_in,
+           COALESCE(m.qty_out, 0) AS qty_out
+    FROM opening o
+    FULL JOIN moves m
+      ON m.warehouse_id = o.warehouse_id AND m.variant_id = o.variant_id AND m.stock_status = o.stock_status
+    ORDER BY 1, 2, 3
+"""
+
+# Serializes snapshot creation across processes
+_SNAPSHOT_LOCK_KEY = 4201
+
+
+def _filters(alias: str, tenant_id: Optional[UUID], warehouse_id: Optional[UUID], variant_id: Optional[UUID]) -> str:
+    conditions = []
+    if tenant_id is not None:
+        conditions.append(f"{alias}.tenant_id = :tenant_id")
+    if warehouse_id is not None:
+        conditions.append(f"{alias}.warehouse_id = :warehouse_id")
+    if variant_id is not None:
+        conditions.append(f"{alias}.variant_id = :variant_id")
+    return "".join(f"\n          AND {condition}" for condition in conditions)
+
+
+def _balances_sql(tenant_id: Optional[UUID], warehouse_id: Optional[UUID], variant_id: Optional[UUID]) -> str:
+    return _BALANCES_SQL.format(
+        snapshot_filters=_filters("s", tenant_id, warehouse_id, variant_id),
+        ledger_filters=_filters("l", tenant_id, warehouse_id, variant_id)
+    )
+
+
+def _params(tenant_id: Optional[UUID], warehouse_id: Optional[UUID], variant_id: Optional[UUID], **params) -> Dict[str, Any]:
+    for name, value in (('tenant_id', tenant_id), ('warehouse_id', warehouse_id), ('variant_id', variant_id)):
+        if value is not None:
+            params[name] = value
+    return params
+
+
+class SQLAlchemyStockLedgerRepository(StockLedgerRepository):
+    """SQLAlchemy implementation of StockLedgerRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _to_entry_entity(self, model: StockLedgerModel) -> StockLedgerEntry:
+        """Convert StockLedgerModel to StockLedgerEntry entity"""
+        return StockLedgerEntry(
+            id=model.id,
+            tenant_id=model.tenant_id,
+            warehouse_id=model.warehouse_id,
+            variant_id=model.variant_id,
+            stock_status=StockStatus(model.stock_status),
+            quantity_change=model.quantity_change,
+            balance_after=model.balance_after,
+            movement_type=StockMovementType(model.movement_type),
+            unit_cost=model.unit_cost,
+            ref_doc_id=model.ref_doc_id,
+            ref_doc_type=model.ref_doc_type,
+            notes=model.notes,
+            created_by=model.created_by,
+            occurred_at=model.occurred_at
+        )
+
+    async def append_entries(self, entries: List[StockLedgerEntry]) -> None:
+        """Add ledger entries to the current transaction without committing it"""
+        if not entries:
+            return
+        await self.session.execute(
+            insert(StockLedgerModel),
+            [
+                {
+                    'id': entry.id,
+                    'tenant_id': entry.tenant_id,
+                    'warehouse_id': entry.warehouse_id,
+                    'variant_id': entry.variant_id,
+                    'stock_status': entry.stock_status,
+                    'quantity_change': entry.quantity_change,
+                    'balance_after': entry.balance_after,
+                    'unit_cost': entry.unit_cost,
+                    'movement_type': entry.movement_type.value,
+                    'ref_doc_id': entry.ref_doc_id,
+                    'ref_doc_type': entry.ref_doc_type,
+                    'notes': entry.notes,
+                    'created_by': entry.created_by
+                }
+                for entry in entries
+            ]
+        )
+
+    async def get_entries(
+        self,
+        tenant_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 500,
+        offset: int = 0
+    ) -> List[StockLedgerEntry]:
+        """Get ledger entries in occurrence order"""
+        conditions = [StockLedgerModel.tenant_id == tenant_id]
+        if warehouse_id:
+            conditions.append(StockLedgerModel.warehouse_id == warehouse_id)
+        if variant_id:
+            conditions.append(StockLedgerModel.variant_id == variant_id)
+        if start:
+            conditions.append(StockLedgerModel.occurred_at > start)
+        if end:
+            conditions.append(StockLedgerModel.occurred_at <= end)
+
+        stmt = (
+            select(StockLedgerModel)
+            .where(and_(*conditions))
+            .order_by(StockLedgerModel.occurred_at, StockLedgerModel.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_entry_entity(model) for model in result.scalars().all()]
+
+    async def get_balances_as_of(
+        self,
+        tenant_id: UUID,
+        as_of: datetime,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None
+    ) -> List[StockBalance]:
+        """Get non-zero balances at a point in time from the latest snapshot plus the ledger tail"""
+        result = await self.session.execute(
+            text(_balances_sql(tenant_id, warehouse_id, variant_id) + " ORDER BY warehouse_id, variant_id, stock_status"),
+            _params(tenant_id, warehouse_id, variant_id, as_of=as_of)
+        )
+        return [
+            StockBalance(
+                tenant_id=row.tenant_id,
+                warehouse_id=row.warehouse_id,
+                variant_id=row.variant_id,
+                stock_status=StockStatus(row.stock_status),
+                quantity=row.quantity,
+                unit_cost=row.unit_cost or Decimal('0')
+            )
+            for row in result
+        ]
+
+    async def get_movements(
+        self,
+        tenant_id: UUID,
+        start: datetime,
+        end: datetime,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None
+    ) -> List[StockMovement]:
+        """Get opening balance, inflow and outflow per bucket for the period (start, end]"""
+        sql = _MOVEMENTS_SQL.format(
+            balances=_balances_sql(tenant_id, warehouse_id, variant_id),
+            ledger_filters=_filters("l", tenant_id, warehouse_id, variant_id)
+        )
+        result = await self.session.execute(
+            text(sql),
+            _params(tenant_id, warehouse_id, variant_id, as_of=start, end=end)
+        )
+        return [
+            StockMovement(
+                warehouse_id=row.warehouse_id,
+                variant_id=row.variant_id,
+                stock_status=StockStatus(row.stock_status),
+                opening_qty=row.opening_qty,
+                qty_in=row.qty_in,
+                qty_out=row.qty_out
+            )
+            for row in result
+        ]
+
+    async def get_latest_snapshot_time(self) -> Optional[datetime]:
+        """Get the time of the most recent balance snapshot"""
+        result = await self.session.execute(select(func.max(StockSnapshotRunModel.snapshot_at)))
+        return result.scalar()
+
+    async def create_balance_snapshot(self, snapshot_at: datetime) -> Optional[int]:
+        """Snapshot all tenants' balances as of snapshot_at; None if that snapshot already exists"""
+        try:
+            await self.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _SNAPSHOT_LOCK_KEY})
+            existing = await self.session.execute(
+                select(StockSnapshotRunModel.snapshot_at).where(StockSnapshotRunModel.snapshot_at == snapshot_at)
+            )
+            if existing.scalar() is not None:
+                await self.session.rollback()
+                return None
+
+            # Built from the previous snapshot and the ledger, never from stock_levels,
+            # so snapshots and the ledger tail always agree
+            result = await self.session.execute(
+                text(
+                    "INSERT INTO stock_balance_snapshots "
+                    "(tenant_id, warehouse_id, variant_id, stock_status, quantity, unit_cost, snapshot_at) "
+                    "SELECT tenant_id, warehouse_id, variant_id, stock_status, quantity, COALESCE(unit_cost, 0), :as_of "
+                    f"FROM ({_balances_sql(None, None, None)}) balances"
+                ),
+                {"as_of": snapshot_at}
+            )
+            balance_count = result.rowcount
+            await self.session.execute(
+                insert(StockSnapshotRunModel).values(snapshot_at=snapshot_at, balance_count=balance_count)
+            )
+            await self.session.commit()
+            return balance_count
+        except Exception:
+            await self.session.rollback()
+            raise
@@ -1,17 +1,26 @@
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Optional
-from uuid import UUID
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 from sqlalchemy import select, update, delete, and_, or_, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 
-from app.domain.entities.stock_levels import StockLevel, StockLevelSummary
+from app.domain.entities.stock_levels import StockBucketChange, StockLevel, StockLevelSummary
 from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_ledger import (
+    StockLedgerEntry, StockMovementSource, StockMovementType, current_movement_source
+)
+from app.domain.entities.stock_reservations import DEFAULT_RESERVATION_HOLD, StockReservation
 from app.domain.repositories.stock_level_repository import StockLevelRepository
-from app.domain.exceptions.stock_docs.stock_doc_exceptions import StockDocNotFoundError
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import StockDocNotFoundError, InsufficientStockError
+from app.infrastucture.database.availability_cache import AvailabilityChanges
 from app.infrastucture.database.models.stock_levels import StockLevelModel
+from app.infrastucture.database.repositories.stock_ledger_repository import SQLAlchemyStockLedgerRepository
+from app.infrastucture.database.repositories.stock_reservation_repository import SQLAlchemyStockReservationRepository
 
 
 class SQLAlchemyStockLevelRepository(StockLevelRepository):
@@ -19,6 +28,19 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.ledger = SQLAlchemyStockLedgerRepository(session)
+        # Shared with the reservation repository, which writes through the same session
+        self.availability_changes = AvailabilityChanges()
+        self.reservations = SQLAlchemyStockReservationRepository(session, self.availability_changes)
+
+    async def _commit(self) -> None:
+        """Commit and hand the buckets written in the transaction to the availability cache"""
+        await self.session.commit()
+        self.availability_changes.publish()
+
+    async def _rollback(self) -> None:
+        await self.session.rollback()
+        self.availability_changes.discard()
 
     def _to_stock_level_entity(self, model: StockLevelModel) -> StockLevel:
         """Convert StockLevelModel to StockLevel entity"""
@@ -104,6 +126,48 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         
         return [self._to_stock_level_entity(model) for model in models]
 
+    async def get_warehouse_stock_snapshot(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID
+    ) -> Dict[Tuple[UUID, StockStatus], Tuple[Decimal, Decimal]]:
+        """Get (quantity, unit_cost) of every variant/status bucket in a warehouse in one query"""
+        stmt = select(
+            StockLevelModel.variant_id,
+            StockLevelModel.stock_status,
+            StockLevelModel.quantity,
+            StockLevelModel.unit_cost
+        ).where(
+            and_(
+                StockLevelModel.tenant_id == tenant_id,
+                StockLevelModel.warehouse_id == warehouse_id
+            )
+        )
+        result = await self.session.execute(stmt)
+
+        # Plain rows keep this cheap for warehouses with thousands of buckets
+        return {
+            (row.variant_id, StockStatus(row.stock_status)): (row.quantity or Decimal('0'), row.unit_cost or Decimal('0'))
+            for row in result
+        }
+
+    async def get_available_quantities(
+        self,
+        tenant_id: UUID
+    ) -> Dict[Tuple[UUID, UUID, StockStatus], Decimal]:
+        """Get the available quantity of every warehouse/variant/status bucket of a tenant in one query"""
+        stmt = select(
+            StockLevelModel.warehouse_id,
+            StockLevelModel.variant_id,
+            StockLevelModel.stock_status,
+            (StockLevelModel.quantity - StockLevelModel.reserved_qty).label("available")
+        ).where(StockLevelModel.tenant_id == tenant_id)
+        result = await self.session.execute(stmt)
+        return {
+            (row.warehouse_id, row.variant_id, StockStatus(row.stock_status)): row.available or Decimal('0')
+            for row in result
+        }
+
     async def get_stock_levels_by_variant(
         self, 
         tenant_id: UUID, 
@@ -195,35 +259,63 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         
         return total or Decimal('0')
 
-    async def create_or_update_stock_level(
-        self, 
-        stock_level: StockLevel
-    ) -> StockLevel:
-        """Create new stock level or update existing one"""
-        # Try to get existing stock level
-        existing = await self.get_stock_level(
+    async def _lock_stock_level(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus
+    ) -> Optional[StockLevelModel]:
+        """Read a stock level row and lock it until the transaction ends"""
+        stmt = (
+            select(StockLevelModel)
+            .where(
+                and_(
+                    StockLevelModel.tenant_id == tenant_id,
+                    StockLevelModel.warehouse_id == warehouse_id,
+                    StockLevelModel.variant_id == variant_id,
+                    StockLevelModel.stock_status == stock_status
+                )
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def _save_stock_level(
+        self,
+        stock_level: StockLevel,
+        movement_type: StockMovementType = StockMovementType.ADJUSTMENT
+    ) -> None:
+        """Write a stock level and its ledger entry without committing"""
+        existing = await self._lock_stock_level(
             stock_level.tenant_id,
             stock_level.warehouse_id,
             stock_level.variant_id,
             stock_level.stock_status
         )
+        previous_quantity = existing.quantity if existing else Decimal('0')
+        reserved_qty = existing.reserved_qty if existing else stock_level.reserved_qty
+        self.availability_changes.record(
+            stock_level.tenant_id,
+            stock_level.warehouse_id,
+            stock_level.variant_id,
+            stock_level.stock_status,
+            stock_level.quantity - reserved_qty,
+            stock_level.quantity
+        )
 
         if existing:
-            # Update existing stock level
+            # Update existing stock level. The reserved quantity belongs to the reservation
+            # holds, so the locked row's value is kept rather than the one read earlier
             stmt = (
                 update(StockLevelModel)
-                .where(
-                    and_(
-                        StockLevelModel.tenant_id == stock_level.tenant_id,
-                        StockLevelModel.warehouse_id == stock_level.warehouse_id,
-                        StockLevelModel.variant_id == stock_level.variant_id,
-                        StockLevelModel.stock_status == stock_level.stock_status
-                    )
-                )
+                .where(StockLevelModel.id == existing.id)
                 .values(
                     quantity=stock_level.quantity,
-                    reserved_qty=stock_level.reserved_qty,
-                    available_qty=stock_level.available_qty,
+                    reserved_qty=existing.reserved_qty,
+                    available_qty=stock_level.quantity - existing.reserved_qty,
                     unit_cost=stock_level.unit_cost,
                     total_cost=stock_level.total_cost,
                     last_transaction_date=datetime.utcnow(),
@@ -231,24 +323,64 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
                 )
             )
             await self.session.execute(stmt)
-            await self.session.commit()
-            
-            # Return updated entity
-            return await self.get_stock_level(
-                stock_level.tenant_id,
-                stock_level.warehouse_id,
-                stock_level.variant_id,
-                stock_level.stock_status
-            )
         else:
             # Create new stock level
             model = self._to_stock_level_model(stock_level)
             model.last_transaction_date = datetime.utcnow()
             self.session.add(model)
-            await self.session.commit()
-            await self.session.refresh(model)
-            
-            return self._to_stock_level_entity(model)
+            await self.session.flush()
+
+        # The ledger is written in the same transaction; the row lock keeps
+        # the recorded change consistent with the value that was overwritten
+        quantity_change = stock_level.quantity - previous_quantity
+        if quantity_change != 0:
+            await self.ledger.append_entries([
+                self._to_ledger_entry(stock_level, quantity_change, stock_level.quantity, movement_type)
+            ])
+
+    def _to_ledger_entry(
+        self,
+        stock_level: StockLevel,
+        quantity_change: Decimal,
+        balance_after: Decimal,
+        movement_type: StockMovementType
+    ) -> StockLedgerEntry:
+        source = current_movement_source() or StockMovementSource()
+        return StockLedgerEntry(
+            tenant_id=stock_level.tenant_id,
+            warehouse_id=stock_level.warehouse_id,
+            variant_id=stock_level.variant_id,
+            stock_status=stock_level.stock_status,
+            quantity_change=quantity_change,
+            balance_after=balance_after,
+            movement_type=source.movement_type or movement_type,
+            unit_cost=stock_level.unit_cost or Decimal('0'),
+            ref_doc_id=source.ref_doc_id,
+            ref_doc_type=source.ref_doc_type,
+            notes=source.notes,
+            created_by=source.created_by
+        )
+
+    async def create_or_update_stock_level(
+        self, 
+        stock_level: StockLevel,
+        movement_type: StockMovementType = StockMovementType.ADJUSTMENT
+    ) -> StockLevel:
+        """Create new stock level or update existing one, recording the change in the stock ledger"""
+        try:
+            await self._save_stock_level(stock_level, movement_type)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+
+        # Return updated entity
+        return await self.get_stock_level(
+            stock_level.tenant_id,
+            stock_level.warehouse_id,
+            stock_level.variant_id,
+            stock_level.stock_status
+        )
 
     async def update_stock_quantity(
         self, 
@@ -256,9 +388,10 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         warehouse_id: UUID, 
         variant_id: UUID, 
         stock_status: StockStatus, 
-        quantity_change: Decimal
+        quantity_change: Decimal,
+        unit_cost: Optional[Decimal] = None
     ) -> StockLevel:
-        """Update stock quantity with positive change only"""
+        """Update stock quantity with positive or negative change"""
         # Get or create stock level
         existing = await self.get_stock_level(tenant_id, warehouse_id, variant_id, stock_status)
         
@@ -280,13 +413,14 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
 
         # Apply quantity change (positive for additions, negative for reductions)
         if quantity_change > 0:
-            existing.add_quantity(quantity_change, Decimal('0'))
+            existing.add_quantity(quantity_change, unit_cost)
         elif quantity_change < 0:
             existing.reduce_quantity(abs(quantity_change))
         # If quantity_change is 0, no change needed
 
         # Save updated stock level
-        return await self.create_or_update_stock_level(existing)
+        movement_type = StockMovementType.RECEIPT if quantity_change > 0 else StockMovementType.ISSUE
+        return await self.create_or_update_stock_level(existing, movement_type)
 
     async def reserve_stock(
         self, 
@@ -296,14 +430,19 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         quantity: Decimal, 
         stock_status: StockStatus = StockStatus.ON_HAND
     ) -> bool:
-        """Reserve stock for allocation"""
-        stock_level = await self.get_stock_level(tenant_id, warehouse_id, variant_id, stock_status)
-        
-        if not stock_level or not stock_level.is_available_for_allocation(quantity):
+        """Reserve stock for allocation as a hold expiring after the default hold time"""
+        hold = StockReservation(
+            tenant_id=tenant_id,
+            warehouse_id=warehouse_id,
+            variant_id=variant_id,
+            stock_status=stock_status,
+            quantity=quantity,
+            expires_at=datetime.now(timezone.utc) + DEFAULT_RESERVATION_HOLD
+        )
+        try:
+            await self.reservations.place_holds([hold])
+        except InsufficientStockError:
             return False
-
-        stock_level.reserve_quantity(quantity)
-        await self.create_or_update_stock_level(stock_level)
         return True
 
     async def release_stock_reservation(
@@ -314,15 +453,11 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         quantity: Decimal, 
         stock_status: StockStatus = StockStatus.ON_HAND
     ) -> bool:
-        """Release reserved stock"""
-        stock_level = await self.get_stock_level(tenant_id, warehouse_id, variant_id, stock_status)
-        
-        if not stock_level or quantity > stock_level.reserved_qty:
-            return False
-
-        stock_level.release_reservation(quantity)
-        await self.create_or_update_stock_level(stock_level)
-        return True
+        """Release reserved stock from the bucket's active holds"""
+        released = await self.reservations.release_bucket_quantity(
+            tenant_id, warehouse_id, variant_id, stock_status, quantity
+        )
+        return released == quantity
 
     async def transfer_stock_between_statuses(
         self, 
@@ -358,9 +493,14 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         from_stock.reduce_quantity(quantity)
         to_stock.add_quantity(quantity, from_stock.unit_cost)
 
-        # Save both stock levels
-        await self.create_or_update_stock_level(from_stock)
-        await self.create_or_update_stock_level(to_stock)
+        # Save both stock levels in one transaction
+        try:
+            await self._save_stock_level(from_stock, StockMovementType.STATUS_TRANSFER)
+            await self._save_stock_level(to_stock, StockMovementType.STATUS_TRANSFER)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
         
         return True
 
@@ -398,9 +538,14 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         from_stock.reduce_quantity(quantity)
         to_stock.add_quantity(quantity, from_stock.unit_cost)
 
-        # Save both stock levels
-        await self.create_or_update_stock_level(from_stock)
-        await self.create_or_update_stock_level(to_stock)
+        # Save both stock levels in one transaction
+        try:
+            await self._save_stock_level(from_stock, StockMovementType.WAREHOUSE_TRANSFER)
+            await self._save_stock_level(to_stock, StockMovementType.WAREHOUSE_TRANSFER)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
         
         return True
 
@@ -538,17 +683,139 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         )
         return available_qty >= required_quantity
 
+    async def apply_stock_changes(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        changes: List[StockBucketChange],
+        movement_type: StockMovementType = StockMovementType.ADJUSTMENT,
+        allow_negative: bool = False
+    ) -> List[StockLevel]:
+        """Add changes to many buckets of one warehouse to the current transaction without committing it"""
+        combined: Dict[Tuple[UUID, StockStatus], StockBucketChange] = {}
+        for change in changes:
+            key = (change.variant_id, change.stock_status)
+            if key in combined:
+                combined[key].quantity_change += change.quantity_change
+                combined[key].unit_cost = change.unit_cost or combined[key].unit_cost
+            else:
+                combined[key] = replace(change)
+        combined = {key: change for key, change in combined.items() if change.quantity_change != 0}
+        if not combined:
+            return []
+
+        # One locked read of every bucket touched, in a fixed order so concurrent
+        # loads of the same depot cannot deadlock
+        stmt = (
+            select(StockLevelModel)
+            .where(
+                and_(
+                    StockLevelModel.tenant_id == tenant_id,
+                    StockLevelModel.warehouse_id == warehouse_id,
+                    StockLevelModel.variant_id.in_({variant_id for variant_id, _ in combined}),
+                    StockLevelModel.stock_status.in_({stock_status for _, stock_status in combined})
+                )
+            )
+            .order_by(StockLevelModel.variant_id, StockLevelModel.stock_status)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        existing = {
+            (model.variant_id, StockStatus(model.stock_status)): self._to_stock_level_entity(model)
+            for model in result.scalars().all()
+        }
+
+        levels: List[StockLevel] = []
+        shortages: List[str] = []
+        for variant_id, stock_status in sorted(combined, key=lambda key: (str(key[0]), key[1].value)):
+            change = combined[(variant_id, stock_status)]
+            level = existing.get((variant_id, stock_status)) or StockLevel(
+                tenant_id=tenant_id,
+                warehouse_id=warehouse_id,
+                variant_id=variant_id,
+                stock_status=stock_status
+            )
+            if change.quantity_change > 0:
+                level.add_quantity(change.quantity_change, change.unit_cost)
+            else:
+                if not allow_negative and level.available_qty < -change.quantity_change:
+                    shortages.append(
+                        f"variant {variant_id} ({stock_status.value}): "
+                        f"{level.available_qty} available, {-change.quantity_change} required"
+                    )
+                level.reduce_quantity(-change.quantity_change)
+            levels.append(level)
+
+        if shortages:
+            raise InsufficientStockError(
+                f"Insufficient stock in warehouse {warehouse_id} for " + "; ".join(shortages)
+            )
+
+        now = datetime.utcnow()
+        insert_stmt = pg_insert(StockLevelModel).values([
+            {
+                'id': level.id or uuid4(),
+                'tenant_id': tenant_id,
+                'warehouse_id': warehouse_id,
+                'variant_id': level.variant_id,
+                'stock_status': level.stock_status,
+                'quantity': level.quantity,
+                'reserved_qty': level.reserved_qty,
+                'available_qty': level.available_qty,
+                'unit_cost': level.unit_cost,
+                'total_cost': level.total_cost,
+                'last_transaction_date': now,
+                'updated_at': now
+            }
+            for level in levels
+        ])
+        # The reserved quantity belongs to the reservation holds and is never overwritten
+        await self.session.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="stock_levels_unique_combination",
+                set_={
+                    'quantity': insert_stmt.excluded.quantity,
+                    'available_qty': insert_stmt.excluded.quantity - StockLevelModel.reserved_qty,
+                    'unit_cost': insert_stmt.excluded.unit_cost,
+                    'total_cost': insert_stmt.excluded.total_cost,
+                    'last_transaction_date': insert_stmt.excluded.last_transaction_date,
+                    'updated_at': insert_stmt.excluded.updated_at
+                }
+            )
+        )
+
+        await self.ledger.append_entries([
+            self._to_ledger_entry(
+                level, combined[(level.variant_id, level.stock_status)].quantity_change, level.quantity, movement_type
+            )
+            for level in levels
+        ])
+        for level in levels:
+            self.availability_changes.record(
+                tenant_id, warehouse_id, level.variant_id, level.stock_status, level.available_qty, level.quantity
+            )
+        return levels
+
     async def bulk_update_stock_levels(
         self, 
         stock_level_updates: List[dict]
     ) -> List[StockLevel]:
         """Bulk update multiple stock levels in a transaction"""
+        stock_levels = [StockLevel(**update_data) for update_data in stock_level_updates]
+        try:
+            for stock_level in stock_levels:
+                await self._save_stock_level(stock_level)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+
         updated_levels = []
-        
-        for update_data in stock_level_updates:
-            stock_level = StockLevel(**update_data)
-            updated_level = await self.create_or_update_stock_level(stock_level)
-            updated_levels.append(updated_level)
+        for stock_level in stock_levels:
+            updated_levels.append(await self.get_stock_level(
+                stock_level.tenant_id, stock_level.warehouse_id, stock_level.variant_id, stock_level.stock_status
+            ))
         
         return updated_levels
 
@@ -560,6 +827,16 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
         stock_status: StockStatus
     ) -> bool:
         """Delete a stock level record (use with caution)"""
+        # Whatever quantity the row still holds leaves the ledger with it
+        existing = await self._lock_stock_level(tenant_id, warehouse_id, variant_id, stock_status)
+        if existing and existing.quantity != 0:
+            await self.ledger.append_entries([
+                self._to_ledger_entry(
+                    self._to_stock_level_entity(existing), -existing.quantity, Decimal('0'),
+                    StockMovementType.ADJUSTMENT
+                )
+            ])
+
         stmt = (
             delete(StockLevelModel)
             .where(
@@ -572,6 +849,7 @@ class SQLAlchemyStockLevelRepository(StockLevelRepository):
             )
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
+        self.availability_changes.record(tenant_id, warehouse_id, variant_id, stock_status, Decimal('0'), Decimal('0'))
+        await self._commit()
         
         return result.rowcount > 0
\ No newline at end of file
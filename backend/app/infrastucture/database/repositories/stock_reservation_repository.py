@@ -0,0 +1,313 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, insert, update, and_, func, text, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_reservations import StockReservation, StockReservationStatus
+from app.domain.repositories.stock_reservation_repository import StockReservationRepository
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import InsufficientStockError
+from app.infrastucture.database.availability_cache import AvailabilityChanges
+from app.infrastucture.database.models.stock_levels import StockLevelModel
+from app.infrastucture.database.models.stock_reservations import StockReservationModel
+
+# Marks the selected active holds released (or expired) and takes their quantity off
+# the buckets' reserved quantity in the same statement, so stock_levels.reserved_qty
+# always equals the sum of the active holds
+_RELEASE_SQL = """
+    WITH released AS (
+        UPDATE stock_reservations r
+        SET status = :status, released_at = :now
+        WHERE r.id IN ({selected}) AND r.status = 'active'
+        RETURNING r.tenant_id, r.warehouse_id, r.variant_id, r.stock_status, r.quantity
+    ),
+    totals AS (
+        SELECT tenant_id, warehouse_id, variant_id, stock_status, SUM(quantity) AS quantity
+        FROM released
+        GROUP BY tenant_id, warehouse_id, variant_id, stock_status
+    ),
+    counters AS (
+        UPDATE stock_levels s
+        SET reserved_qty = GREATEST(s.reserved_qty - t.quantity, 0),
+            available_qty = s.quantity - GREATEST(s.reserved_qty - t.quantity, 0),
+            updated_at = :now
+        FROM totals t
+        WHERE s.tenant_id = t.tenant_id
+          AND s.warehouse_id = t.warehouse_id
+          AND s.variant_id = t.variant_id
+          AND s.stock_status = t.stock_status
+        RETURNING s.tenant_id, s.warehouse_id, s.variant_id, CAST(s.stock_status AS TEXT) AS stock_status,
+                  s.available_qty
+    )
+    SELECT n.released, c.tenant_id, c.warehouse_id, c.variant_id, c.stock_status, c.available_qty
+    FROM (SELECT COUNT(*) AS released FROM released) n
+    LEFT JOIN counters c ON TRUE
+"""
+
+_EXPIRED_HOLDS_SQL = """
+        SELECT id FROM stock_reservations
+        WHERE status = 'active' AND expires_at <= :now
+        ORDER BY expires_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+"""
+
+Bucket = Tuple[UUID, UUID, UUID, StockStatus]
+
+
+def _stock_status(value: str) -> StockStatus:
+    """Stock status from raw SQL, which returns the enum label (the member name)"""
+    return StockStatus[value] if value in StockStatus.__members__ else StockStatus(value)
+
+
+class SQLAlchemyStockReservationRepository(StockReservationRepository):
+    """SQLAlchemy implementation of StockReservationRepository"""
+
+    def __init__(self, session: AsyncSession, availability_changes: Optional[AvailabilityChanges] = None):
+        self.session = session
+        self.availability_changes = availability_changes or AvailabilityChanges()
+
+    async def _commit(self) -> None:
+        await self.session.commit()
+        self.availability_changes.publish()
+
+    async def _rollback(self) -> None:
+        await self.session.rollback()
+        self.availability_changes.discard()
+
+    def _to_reservation_entity(self, model: StockReservationModel) -> StockReservation:
+        """Convert StockReservationModel to StockReservation entity"""
+        return StockReservation(
+            id=model.id,
+            tenant_id=model.tenant_id,
+            warehouse_id=model.warehouse_id,
+            variant_id=model.variant_id,
+            stock_status=StockStatus(model.stock_status),
+            quantity=model.quantity,
+            expires_at=model.expires_at,
+            order_id=model.order_id,
+            order_line_id=model.order_line_id,
+            status=StockReservationStatus(model.status),
+            created_by=model.created_by,
+            created_at=model.created_at,
+            released_at=model.released_at
+        )
+
+    async def place_holds(self, holds: List[StockReservation]) -> List[StockReservation]:
+        """Place all holds and raise their buckets' reserved quantity, or none if any bucket lacks available stock"""
+        if not holds:
+            return []
+
+        requested: Dict[Bucket, Decimal] = defaultdict(Decimal)
+        for hold in holds:
+            requested[hold.bucket] += hold.quantity
+
+        try:
+            # One conditional increment per bucket instead of read-modify-write; buckets are
+            # taken in a fixed order so concurrent multi-line reservations cannot deadlock
+            for bucket in sorted(requested, key=lambda b: tuple(str(part) for part in b)):
+                tenant_id, warehouse_id, variant_id, stock_status = bucket
+                quantity = requested[bucket]
+                stmt = (
+                    update(StockLevelModel)
+                    .where(
+                        and_(
+                            StockLevelModel.tenant_id == tenant_id,
+                            StockLevelModel.warehouse_id == warehouse_id,
+                            StockLevelModel.variant_id == variant_id,
+                            StockLevelModel.stock_status == stock_status,
+                            StockLevelModel.quantity - StockLevelModel.reserved_qty >= quantity
+                        )
+                    )
+                    .values(
+                        reserved_qty=StockLevelModel.reserved_qty + quantity,
+                        available_qty=StockLevelModel.quantity - StockLevelModel.reserved_qty - quantity,
+                        updated_at=func.now()
+                    )
+                    .returning(StockLevelModel.available_qty)
+                    .execution_options(synchronize_session=False)
+                )
+                result = await self.session.execute(stmt)
+                available = result.scalar_one_or_none()
+                if available is None:
+                    raise InsufficientStockError(
+                        f"Cannot reserve {quantity} of variant {variant_id} in warehouse {warehouse_id} "
+                        f"- insufficient available stock"
+                    )
+                self.availability_changes.record(*bucket, available)
+
+            await self.session.execute(
+                insert(StockReservationModel),
+                [
+                    {
+                        'id': hold.id,
+                        'tenant_id': hold.tenant_id,
+                        'warehouse_id': hold.warehouse_id,
+                        'variant_id': hold.variant_id,
+                        'stock_status': hold.stock_status,
+                        'quantity': hold.quantity,
+                        'order_id': hold.order_id,
+                        'order_line_id': hold.order_line_id,
+                        'status': StockReservationStatus.ACTIVE.value,
+                        'expires_at': hold.expires_at,
+                        'created_by': hold.created_by
+                    }
+                    for hold in holds
+                ]
+            )
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+
+        return holds
+
+    async def _release(self, selected: str, status: StockReservationStatus, now: datetime, **params) -> int:
+        """Run _RELEASE_SQL for the holds chosen by the selected subquery and commit"""
+        stmt = text(_RELEASE_SQL.format(selected=selected))
+        if 'reservation_ids' in params:
+            stmt = stmt.bindparams(bindparam('reservation_ids', expanding=True))
+        try:
+            result = await self.session.execute(stmt, {'status': status.value, 'now': now, **params})
+            released = 0
+            for row in result:
+                released = row.released or 0
+                if row.tenant_id is not None:
+                    self.availability_changes.record(
+                        row.tenant_id, row.warehouse_id, row.variant_id,
+                        _stock_status(row.stock_status), row.available_qty
+                    )
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        return released
+
+    async def release_holds(
+        self,
+        tenant_id: UUID,
+        reservation_ids: Optional[List[UUID]] = None,
+        order_id: Optional[UUID] = None
+    ) -> int:
+        """Release active holds by ID or by order; returns the number of holds released"""
+        conditions = ["tenant_id = :tenant_id", "status = 'active'"]
+        params = {'tenant_id': tenant_id}
+        if reservation_ids is not None:
+            if not reservation_ids:
+                return 0
+            conditions.append("id IN :reservation_ids")
+            params['reservation_ids'] = list(reservation_ids)
+        if order_id is not None:
+            conditions.append("order_id = :order_id")
+            params['order_id'] = order_id
+        if len(conditions) == 2:
+            raise ValueError("Releasing holds requires reservation IDs or an order ID")
+
+        selected = "SELECT id FROM stock_reservations WHERE " + " AND ".join(conditions)
+        return await self._release(selected, StockReservationStatus.RELEASED, datetime.now(timezone.utc), **params)
+
+    async def release_bucket_quantity(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus,
+        quantity: Decimal
+    ) -> Decimal:
+        """Release up to quantity from a bucket's active holds, newest first; returns the quantity released"""
+        now = datetime.now(timezone.utc)
+        try:
+            stmt = (
+                select(StockReservationModel)
+                .where(
+                    and_(
+                        StockReservationModel.tenant_id == tenant_id,
+                        StockReservationModel.warehouse_id == warehouse_id,
+                        StockReservationModel.variant_id == variant_id,
+                        StockReservationModel.stock_status == stock_status,
+                        StockReservationModel.status == StockReservationStatus.ACTIVE.value
+                    )
+                )
+                .order_by(StockReservationModel.created_at.desc())
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            result = await self.session.execute(stmt)
+
+            remaining = quantity
+            for model in result.scalars().all():
+                if remaining <= 0:
+                    break
+                if model.quantity <= remaining:
+                    remaining -= model.quantity
+                    model.status = StockReservationStatus.RELEASED.value
+                    model.released_at = now
+                else:
+                    model.quantity -= remaining
+                    remaining = Decimal('0')
+
+            released = quantity - remaining
+            if released > 0:
+                result = await self.session.execute(
+                    update(StockLevelModel)
+                    .where(
+                        and_(
+                            StockLevelModel.tenant_id == tenant_id,
+                            StockLevelModel.warehouse_id == warehouse_id,
+                            StockLevelModel.variant_id == variant_id,
+                            StockLevelModel.stock_status == stock_status
+                        )
+                    )
+                    .values(
+                        reserved_qty=func.greatest(StockLevelModel.reserved_qty - released, 0),
+                        available_qty=StockLevelModel.quantity - func.greatest(StockLevelModel.reserved_qty - released, 0),
+                        updated_at=now
+                    )
+                    .returning(StockLevelModel.available_qty)
+                    .execution_options(synchronize_session=False)
+                )
+                available = result.scalar_one_or_none()
+                if available is not None:
+                    self.availability_changes.record(tenant_id, warehouse_id, variant_id, stock_status, available)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+
+        return released
+
+    async def expire_holds(self, now: datetime, batch_size: int = 500) -> int:
+        """Expire up to batch_size active holds past their expiry; returns the number expired"""
+        return await self._release(
+            _EXPIRED_HOLDS_SQL, StockReservationStatus.EXPIRED, now, batch_size=batch_size
+        )
+
+    async def get_holds(
+        self,
+        tenant_id: UUID,
+        order_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        active_only: bool = True
+    ) -> List[StockReservation]:
+        """Get reservation holds, oldest first"""
+        conditions = [StockReservationModel.tenant_id == tenant_id]
+        if order_id:
+            conditions.append(StockReservationModel.order_id == order_id)
+        if warehouse_id:
+            conditions.append(StockReservationModel.warehouse_id == warehouse_id)
+        if variant_id:
+            conditions.append(StockReservationModel.variant_id == variant_id)
+        if active_only:
+            conditions.append(StockReservationModel.status == StockReservationStatus.ACTIVE.value)
+
+        stmt = (
+            select(StockReservationModel)
+            .where(and_(*conditions))
+            .order_by(StockReservationModel.created_at)
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_reservation_entity(model) for model in result.scalars().all()]
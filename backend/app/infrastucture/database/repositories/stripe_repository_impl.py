@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import select, update, delete, func, and_, or_, exists, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -390,7 +392,8 @@ class StripeRepositoryImpl(StripeRepository):
             request_idempotency_key=webhook_event.request_idempotency_key,
             data=webhook_event.data,
             processed=webhook_event.processed,
-            processed_at=webhook_event.processed_at
+            processed_at=webhook_event.processed_at,
+            ordering_key=webhook_event.ordering_key
         )
         self.session.add(webhook_event_model)
         await self.session.commit()
@@ -439,6 +442,92 @@ class StripeRepositoryImpl(StripeRepository):
         webhook_event_models = result.scalars().all()
         return [self._to_webhook_event_entity(model) for model in webhook_event_models]
     
+    async def enqueue_webhook_event(self, webhook_event: StripeWebhookEvent) -> bool:
+        """Idempotent insert keyed on stripe_event_id; redeliveries are a no-op"""
+        stmt = (
+            pg_insert(StripeWebhookEventModel)
+            .values(
+                id=webhook_event.id,
+                stripe_event_id=webhook_event.stripe_event_id,
+                event_type=webhook_event.event_type,
+                api_version=webhook_event.api_version,
+                created=webhook_event.created,
+                livemode=webhook_event.livemode,
+                pending_webhooks=webhook_event.pending_webhooks,
+                request_id=webhook_event.request_id,
+                request_idempotency_key=webhook_event.request_idempotency_key,
+                data=webhook_event.data,
+                processed=False,
+                ordering_key=webhook_event.ordering_key,
+                attempts=0
+            )
+            .on_conflict_do_nothing(index_elements=[StripeWebhookEventModel.stripe_event_id])
+            .returning(StripeWebhookEventModel.id)
+        )
+        result = await self.session.execute(stmt)
+        inserted = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return inserted
+    
+    async def claim_webhook_events(self, limit: int = 50, lease_seconds: int = 300) -> List[StripeWebhookEvent]:
+        """Lease the head event of each ordering key with FOR UPDATE SKIP LOCKED"""
+        now = datetime.utcnow()
+        earlier = aliased(StripeWebhookEventModel)
+        pending = and_(
+            StripeWebhookEventModel.processed == False,
+            StripeWebhookEventModel.dead_lettered_at.is_(None)
+        )
+        # An older pending event of the same subscription blocks this one, even while it waits for a retry
+        has_earlier = exists().where(
+            and_(
+                earlier.ordering_key == StripeWebhookEventModel.ordering_key,
+                earlier.processed == False,
+                earlier.dead_lettered_at.is_(None),
+                tuple_(earlier.created, earlier.created_at) < tuple_(StripeWebhookEventModel.created, StripeWebhookEventModel.created_at)
+            )
+        )
+        due_ids = (
+            select(StripeWebhookEventModel.id)
+            .where(
+                and_(
+                    pending,
+                    or_(
+                        StripeWebhookEventModel.next_attempt_at.is_(None),
+                        StripeWebhookEventModel.next_attempt_at <= now
+                    ),
+                    ~has_earlier
+                )
+            )
+            .order_by(StripeWebhookEventModel.created, StripeWebhookEventModel.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(StripeWebhookEventModel)
+            .where(StripeWebhookEventModel.id.in_(due_ids.scalar_subquery()))
+            .values(
+                attempts=StripeWebhookEventModel.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=lease_seconds),
+                updated_at=now
+            )
+            .returning(StripeWebhookEventModel)
+            .execution_options(synchronize_session=False)
+        )
+        models = result.scalars().all()
+        await self.session.commit()
+        events = [self._to_webhook_event_entity(model) for model in models]
+        return sorted(events, key=lambda event: (event.created, event.created_at))
+    
+    async def get_dead_lettered_webhook_events(self, limit: int = 100) -> List[StripeWebhookEvent]:
+        """Get dead-lettered webhook events, most recent first"""
+        result = await self.session.execute(
+            select(StripeWebhookEventModel)
+            .where(StripeWebhookEventModel.dead_lettered_at.isnot(None))
+            .order_by(StripeWebhookEventModel.dead_lettered_at.desc())
+            .limit(limit)
+        )
+        return [self._to_webhook_event_entity(model) for model in result.scalars().all()]
+    
     # Tenant plan operations
     async def create_tenant_plan(self, tenant_plan: TenantPlan) -> TenantPlan:
         """Create a new tenant plan"""
@@ -810,6 +899,11 @@ class StripeRepositoryImpl(StripeRepository):
             data=model.data,
             processed=model.processed,
             processed_at=model.processed_at,
+            ordering_key=model.ordering_key,
+            attempts=model.attempts or 0,
+            next_attempt_at=model.next_attempt_at,
+            last_error=model.last_error,
+            dead_lettered_at=model.dead_lettered_at,
             created_at=model.created_at,
             updated_at=model.updated_at
         )
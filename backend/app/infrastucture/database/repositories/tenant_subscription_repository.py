@@ -2,12 +2,13 @@
 Tenant Subscription Repository Implementation
 """
 
+import json
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import List, Optional, Tuple, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -17,6 +18,9 @@ from app.domain.entities.tenant_subscriptions import (
 )
 from app.domain.repositories.tenant_subscription_repository import TenantSubscriptionRepository
 from app.services.dependencies.common import get_db_session
+from app.infrastucture.database.reference_cache import (
+    invalidate_all_entitlements, invalidate_tenant_entitlements
+)
 from app.infrastucture.database.models.tenant_subscriptions import (
     TenantPlanModel, TenantSubscriptionModel
 )
@@ -129,6 +133,8 @@ class TenantSubscriptionRepositoryImpl(TenantSubscriptionRepository):
         
         await session.commit()
         await session.refresh(plan_model)
+        # Limits and features are copied into every subscriber's snapshot
+        invalidate_all_entitlements()
         
         return self._map_plan_model_to_entity(plan_model)
     
@@ -143,6 +149,7 @@ class TenantSubscriptionRepositoryImpl(TenantSubscriptionRepository):
         if plan_model:
             await session.delete(plan_model)
             await session.commit()
+            invalidate_all_entitlements()
     
     # ============================================================================
     # TENANT SUBSCRIPTION OPERATIONS
@@ -184,6 +191,7 @@ class TenantSubscriptionRepositoryImpl(TenantSubscriptionRepository):
             }
             
             result = client.table('tenant_subscriptions').insert(subscription_data).execute()
+            invalidate_tenant_entitlements(subscription.tenant_id)
             
             if result.data:
                 return self._map_dict_to_subscription_entity(result.data[0])
@@ -332,6 +340,7 @@ class TenantSubscriptionRepositoryImpl(TenantSubscriptionRepository):
         
         await session.commit()
         await session.refresh(subscription_model)
+        invalidate_tenant_entitlements(subscription_model.tenant_id)
         
         return self._map_subscription_model_to_entity(subscription_model)
     
@@ -344,8 +353,10 @@ class TenantSubscriptionRepositoryImpl(TenantSubscriptionRepository):
         subscription_model = result.scalar_one_or_none()
         
         if subscription_model:
+            tenant_id = subscription_model.tenant_id
             await session.delete(subscription_model)
             await session.commit()
+            invalidate_tenant_entitlements(tenant_id)
     
     # ============================================================================
     # USAGE TRACKING OPERATIONS
@@ -401,6 +412,44 @@ class TenantSubscriptionRepositoryImpl(TenantSubscriptionRepository):
         
         return {}
     
+    async def apply_usage_batch(
+        self,
+        increments: Dict[UUID, Dict[str, int]],
+        gauges: Dict[UUID, Dict[str, int]]
+    ) -> None:
+        """Atomic per-metric increments in SQL, so concurrent flushes never lose updates"""
+        tenant_ids = set(increments) | set(gauges)
+        if not tenant_ids:
+            return
+        
+        payload = [
+            {
+                'tenant_id': str(tenant_id),
+                'increments': increments.get(tenant_id, {}),
+                'gauges': gauges.get(tenant_id, {})
+            }
+            for tenant_id in tenant_ids
+        ]
+        session = await self._get_session()
+        await session.execute(
+            text("""
+                UPDATE tenant_subscriptions s
+                SET current_usage = COALESCE(s.current_usage, '{}'::jsonb)
+                        || COALESCE((
+                            SELECT jsonb_object_agg(m.key, COALESCE((s.current_usage ->> m.key)::bigint, 0) + m.value::bigint)
+                            FROM jsonb_each_text(b.increments) AS m
+                        ), '{}'::jsonb)
+                        || b.gauges,
+                    updated_at = now()
+                FROM jsonb_to_recordset(CAST(:payload AS jsonb)) AS b(tenant_id uuid, increments jsonb, gauges jsonb)
+                WHERE s.tenant_id = b.tenant_id
+                  AND s.subscription_status IN ('active', 'trial')
+                  AND s.ended_at IS NULL
+            """),
+            {'payload': json.dumps(payload)}
+        )
+        await session.commit()
+    
     # ============================================================================
     # REPORTING OPERATIONS
     # ============================================================================
@@ -8,6 +8,7 @@ from geoalchemy2.functions import ST_AsText, ST_GeomFromText
 from app.domain.entities.trips import Trip, TripStatus
 from app.domain.entities.trip_stops import TripStop
 from app.domain.repositories.trip_repository import TripRepository
+from app.infrastucture.database.dashboard_cache import invalidate_tenant_dashboard
 from app.infrastucture.database.models.trips import TripModel
 from app.infrastucture.database.models.trip_stops import TripStopModel
 from app.infrastucture.logs.logger import default_logger
@@ -48,6 +49,7 @@ class SQLAlchemyTripRepository(TripRepository):
             self.session.add(trip_model)
             await self.session.commit()
             await self.session.refresh(trip_model)
+            invalidate_tenant_dashboard(trip_model.tenant_id)
             
             return self._model_to_entity(trip_model)
             
@@ -208,6 +210,7 @@ class SQLAlchemyTripRepository(TripRepository):
             
             await self.session.commit()
             await self.session.refresh(trip_model)
+            invalidate_tenant_dashboard(trip_model.tenant_id)
             
             return self._model_to_entity(trip_model)
             
@@ -235,6 +238,7 @@ class SQLAlchemyTripRepository(TripRepository):
             trip_model.deleted_by = deleted_by
             
             await self.session.commit()
+            invalidate_tenant_dashboard(trip_model.tenant_id)
             return True
             
         except Exception as e:
@@ -410,6 +414,67 @@ class SQLAlchemyTripRepository(TripRepository):
             default_logger.error(f"Failed to get trip stops by order: {str(e)}", order_id=str(order_id))
             raise
     
+    async def create_trip_stops(self, trip_stops: List[TripStop]) -> List[TripStop]:
+        """Create several trip stops in a single transaction"""
+        if not trip_stops:
+            return []
+        try:
+            stop_models = []
+            for trip_stop in trip_stops:
+                location_wkt = None
+                if trip_stop.location:
+                    lon, lat = trip_stop.location
+                    location_wkt = f"POINT({lon} {lat})"
+                
+                stop_models.append(TripStopModel(
+                    id=trip_stop.id,
+                    trip_id=trip_stop.trip_id,
+                    stop_no=trip_stop.stop_no,
+                    order_id=trip_stop.order_id,
+                    location=location_wkt,
+                    arrival_time=trip_stop.arrival_time,
+                    departure_time=trip_stop.departure_time,
+                    created_at=trip_stop.created_at,
+                    created_by=trip_stop.created_by,
+                    updated_at=trip_stop.updated_at,
+                    updated_by=trip_stop.updated_by
+                ))
+            
+            self.session.add_all(stop_models)
+            await self.session.commit()
+            
+            # Return the input entities - the models carry no server-generated values we need
+            return list(trip_stops)
+            
+        except Exception as e:
+            await self.session.rollback()
+            default_logger.error(f"Failed to create trip stops: {str(e)}", stop_count=len(trip_stops))
+            raise
+    
+    async def get_assigned_order_ids(self, order_ids: List[UUID]) -> List[UUID]:
+        """Return the subset of order IDs that already have a trip stop on a live trip"""
+        if not order_ids:
+            return []
+        try:
+            stmt = (
+                select(TripStopModel.order_id)
+                .join(TripModel, TripModel.id == TripStopModel.trip_id)
+                .where(
+                    and_(
+                        TripStopModel.order_id.in_(order_ids),
+                        TripModel.deleted_at.is_(None),
+                        TripModel.trip_status != TripStatus.CANCELLED.value
+                    )
+                )
+                .distinct()
+            )
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+            
+        except Exception as e:
+            default_logger.error(f"Failed to get assigned order IDs: {str(e)}", order_count=len(order_ids))
+            raise
+    
     def _model_to_entity(self, trip_model: TripModel) -> Trip:
         """Convert TripModel to Trip entity"""
         if not trip_model:
@@ -1,10 +1,12 @@
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.domain.entities.truck_inventory import TruckInventory
 from app.domain.repositories.truck_inventory_repository import TruckInventoryRepository
 from app.infrastucture.database.models.truck_inventory import TruckInventoryModel
+from app.infrastucture.database.models.variants import Variant
 from app.infrastucture.logs.logger import default_logger
 
 class SQLAlchemyTruckInventoryRepository(TruckInventoryRepository):
@@ -161,6 +163,42 @@ class SQLAlchemyTruckInventoryRepository(TruckInventoryRepository):
             default_logger.error(f"Failed to get truck inventory by trip and variant: {str(e)}")
             raise
     
+    async def add_loaded_quantities(self, records: List[TruckInventory]) -> None:
+        """Add loaded and expected empty quantities to a trip's truck inventory in the current transaction without committing it"""
+        if not records:
+            return
+
+        # One upsert for the whole manifest; lines loaded without a product take it from their variant
+        insert_stmt = pg_insert(TruckInventoryModel).values([
+            {
+                'id': record.id,
+                'trip_id': record.trip_id,
+                'vehicle_id': record.vehicle_id,
+                'product_id': record.product_id or (
+                    select(Variant.product_id).where(Variant.id == record.variant_id).scalar_subquery()
+                ),
+                'variant_id': record.variant_id,
+                'loaded_qty': record.loaded_qty,
+                'delivered_qty': record.delivered_qty,
+                'empties_collected_qty': record.empties_collected_qty,
+                'empties_expected_qty': record.empties_expected_qty,
+                'created_by': record.created_by,
+                'updated_by': record.updated_by
+            }
+            for record in records
+        ])
+        await self.session.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="truck_inventory_unique_combination",
+                set_={
+                    'loaded_qty': TruckInventoryModel.loaded_qty + insert_stmt.excluded.loaded_qty,
+                    'empties_expected_qty': TruckInventoryModel.empties_expected_qty + insert_stmt.excluded.empties_expected_qty,
+                    'updated_by': insert_stmt.excluded.updated_by,
+                    'updated_at': func.now()
+                }
+            )
+        )
+
     def _model_to_entity(self, model: TruckInventoryModel) -> TruckInventory:
         """Convert SQLAlchemy model to domain entity"""
         return TruckInventory(
@@ -0,0 +1,145 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.truck_reconciliation import TruckReconciliation
+from app.domain.repositories.truck_reconciliation_repository import TruckReconciliationRepository
+
+# Stock a vehicle should bring back from each of the selected trips, one row per
+# trip and variant: loaded from the manifest, delivered and empties collected from
+# the delivery lines and counted from the unload transfers back to the depot.
+# Each source is aggregated once for all the trips instead of per item.
+_POSITIONS_SQL = """
+    WITH selected_trips AS ({trips}),
+    loaded AS (
+        SELECT ti.trip_id, ti.variant_id, SUM(ti.loaded_qty) AS loaded_qty
+        FROM truck_inventory ti
+        JOIN selected_trips st ON st.trip_id = ti.trip_id
+        GROUP BY ti.trip_id, ti.variant_id
+    ),
+    delivered AS (
+        SELECT d.trip_id, dl.variant_id,
+               SUM(dl.delivered_qty) AS delivered_qty,
+               SUM(dl.empties_collected) AS empties_collected_qty
+        FROM deliveries d
+        JOIN selected_trips st ON st.trip_id = d.trip_id
+        JOIN delivery_lines dl ON dl.delivery_id = d.id
+        WHERE dl.variant_id IS NOT NULL
+        GROUP BY d.trip_id, dl.variant_id
+    ),
+    counted AS (
+        SELECT sd.ref_doc_id AS trip_id, sl.variant_id, SUM(sl.quantity) AS counted_qty
+        FROM stock_docs sd
+        JOIN selected_trips st ON st.trip_id = sd.ref_doc_id
+        JOIN stock_doc_lines sl ON sl.stock_doc_id = sd.id
+        WHERE sd.doc_type = 'TRF_TRUCK'
+          AND sd.dest_wh_id IS NOT NULL
+          AND sd.doc_status <> 'cancelled'
+          AND sd.deleted_at IS NULL
+          AND sl.variant_id IS NOT NULL
+        GROUP BY sd.ref_doc_id, sl.variant_id
+    ),
+    variants AS (
+        SELECT trip_id, variant_id FROM loaded
+        UNION SELECT trip_id, variant_id FROM delivered
+        UNION SELECT trip_id, variant_id FROM counted
+    )
+    SELECT st.trip_id, st.tenant_id, st.vehicle_id, st.warehouse_id, v.variant_id,
+           COALESCE(l.loaded_qty, 0) AS loaded_qty,
+           COALESCE(d.delivered_qty, 0) AS delivered_qty,
+           COALESCE(d.empties_collected_qty, 0) AS empties_collected_qty,
+           COALESCE(c.counted_qty, 0) AS counted_qty
+    FROM selected_trips st
+    JOIN variants v ON v.trip_id = st.trip_id
+    LEFT JOIN loaded l ON l.trip_id = v.trip_id AND l.variant_id = v.variant_id
+    LEFT JOIN delivered d ON d.trip_id = v.trip_id AND d.variant_id = v.variant_id
+    LEFT JOIN counted c ON c.trip_id = v.trip_id AND c.variant_id = v.variant_id
+    ORDER BY st.trip_id, v.variant_id
+"""
+
+_TRIP_SQL = """
+    SELECT t.id AS trip_id, t.tenant_id, t.vehicle_id, t.end_wh_id AS warehouse_id
+    FROM trips t
+    WHERE t.id = :trip_id AND t.deleted_at IS NULL
+"""
+
+# Completed trips that went back to a depot but have no variance document yet. The
+# depot is the one the latest unload transfer went to.
+_UNRECONCILED_TRIPS_SQL = """
+    SELECT t.id AS trip_id, t.tenant_id, t.vehicle_id, unload.dest_wh_id AS warehouse_id
+    FROM trips t
+    JOIN LATERAL (
+        SELECT sd.dest_wh_id
+        FROM stock_docs sd
+        WHERE sd.ref_doc_id = t.id
+          AND sd.doc_type = 'TRF_TRUCK'
+          AND sd.dest_wh_id IS NOT NULL
+          AND sd.doc_status <> 'cancelled'
+          AND sd.deleted_at IS NULL
+        ORDER BY sd.created_at DESC
+        LIMIT 1
+    ) unload ON TRUE
+    WHERE t.trip_status = 'completed'
+      AND t.deleted_at IS NULL
+      AND t.end_time >= :completed_from
+      AND t.end_time < :completed_to
+      AND NOT EXISTS (
+          SELECT 1 FROM stock_docs v
+          WHERE v.ref_doc_id = t.id
+            AND v.doc_type = 'ADJ_VARIANCE'
+            AND v.doc_status <> 'cancelled'
+            AND v.deleted_at IS NULL
+      )
+"""
+
+_VARIANCE_DOC_EXISTS_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM stock_docs v
+        WHERE v.ref_doc_id = :trip_id
+          AND v.doc_type = 'ADJ_VARIANCE'
+          AND v.doc_status <> 'cancelled'
+          AND v.deleted_at IS NULL
+    )
+"""
+
+# Advisory lock class of trip reconciliations; the trip is the second key
+_RECONCILIATION_LOCK_KEY = 4202
+
+
+class SQLAlchemyTruckReconciliationRepository(TruckReconciliationRepository):
+    """SQLAlchemy implementation of TruckReconciliationRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_trip_reconciliation(self, trip_id: UUID) -> Optional[TruckReconciliation]:
+        result = await self.session.execute(
+            text(_POSITIONS_SQL.format(trips=_TRIP_SQL)), {'trip_id': trip_id}
+        )
+        reconciliations = TruckReconciliation.group(dict(row) for row in result.mappings())
+        if not reconciliations:
+            return None
+        # The count is supplied by the caller rather than read from earlier unloads
+        return reconciliations[0].record_counts({})
+
+    async def get_unreconciled_trips(self, completed_from: datetime, completed_to: datetime) -> List[TruckReconciliation]:
+        result = await self.session.execute(
+            text(_POSITIONS_SQL.format(trips=_UNRECONCILED_TRIPS_SQL)),
+            {'completed_from': completed_from, 'completed_to': completed_to}
+        )
+        return TruckReconciliation.group(dict(row) for row in result.mappings())
+
+    async def claim_trip_for_reconciliation(self, trip_id: UUID) -> bool:
+        # Every process runs the end-of-day pass; the lock is held until the
+        # variance document is committed, so the re-check below sees it
+        await self.session.execute(
+            text("SELECT pg_advisory_xact_lock(:key, hashtext(:trip_id))"),
+            {'key': _RECONCILIATION_LOCK_KEY, 'trip_id': str(trip_id)}
+        )
+        result = await self.session.execute(text(_VARIANCE_DOC_EXISTS_SQL), {'trip_id': trip_id})
+        if result.scalar():
+            await self.session.rollback()
+            return False
+        return True
@@ -122,6 +122,19 @@ class VariantRepositoryImpl(VariantRepository):
         """Get a variant by its ID (alias for get_variant_by_id for compatibility)"""
         return await self.get_variant_by_id(variant_id)
     
+    async def get_variants_by_ids(self, variant_ids: List[UUID]) -> List[VariantEntity]:
+        """Get several variants by ID in a single query"""
+        if not variant_ids:
+            return []
+        stmt = select(VariantModel).where(
+            and_(
+                VariantModel.id.in_(variant_ids),
+                VariantModel.deleted_at.is_(None)
+            )
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_entity(model) for model in result.scalars().all()]
+    
     async def get_variant_by_sku(self, tenant_id: UUID, sku: str) -> Optional[VariantEntity]:
         """Get a variant by SKU within a tenant"""
         stmt = select(VariantModel).where(
@@ -0,0 +1,61 @@
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.orders import OrderTransition
+from app.domain.entities.stock_docs import StockDoc
+from app.domain.entities.stock_ledger import StockMovementType
+from app.domain.entities.stock_levels import StockBucketChange
+from app.domain.entities.truck_inventory import TruckInventory
+from app.domain.repositories.vehicle_load_repository import VehicleLoadRepository
+from app.infrastucture.database.dashboard_cache import invalidate_tenant_dashboard
+from app.infrastucture.database.repositories.order_repository import SQLAlchemyOrderRepository
+from app.infrastucture.database.repositories.stock_doc_repository import SQLAlchemyStockDocRepository
+from app.infrastucture.database.repositories.stock_level_repository import SQLAlchemyStockLevelRepository
+from app.infrastucture.database.repositories.truck_inventory_repository import SQLAlchemyTruckInventoryRepository
+
+
+class SQLAlchemyVehicleLoadRepository(VehicleLoadRepository):
+    """SQLAlchemy implementation of VehicleLoadRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.stock_docs = SQLAlchemyStockDocRepository(session)
+        self.stock_levels = SQLAlchemyStockLevelRepository(session)
+        self.truck_inventory = SQLAlchemyTruckInventoryRepository(session)
+        self.orders = SQLAlchemyOrderRepository(session)
+
+    async def apply_vehicle_movement(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        stock_docs: List[StockDoc],
+        changes: List[StockBucketChange],
+        truck_inventory: List[TruckInventory],
+        movement_type: StockMovementType = StockMovementType.STATUS_TRANSFER,
+        allow_negative: bool = False,
+        order_transition: Optional[OrderTransition] = None
+    ) -> List[UUID]:
+        """Write the documents, depot stock changes and truck inventory of a whole load or unload in one transaction"""
+        # Each part is a fixed number of statements however long the manifest is:
+        # document and line inserts, one locked read and one upsert of the depot's
+        # buckets, the ledger insert, one truck inventory upsert and the order update
+        transitioned = []
+        try:
+            for stock_doc in stock_docs:
+                await self.stock_docs.add_stock_doc_with_lines(stock_doc)
+            await self.stock_levels.apply_stock_changes(
+                tenant_id, warehouse_id, changes, movement_type, allow_negative
+            )
+            await self.truck_inventory.add_loaded_quantities(truck_inventory)
+            if order_transition:
+                transitioned = await self.orders.add_order_transition(order_transition)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            self.stock_levels.availability_changes.discard()
+            raise
+        self.stock_levels.availability_changes.publish()
+        if transitioned:
+            invalidate_tenant_dashboard(tenant_id)
+        return transitioned
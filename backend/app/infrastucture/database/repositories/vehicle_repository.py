@@ -7,6 +7,7 @@ from app.domain.entities.vehicles import Vehicle, VehicleType
 from app.domain.repositories.vehicle_repository import VehicleRepository
 from app.domain.exceptions.vehicles.vehicle_exceptions import VehicleNotFoundError, VehicleAlreadyExistsError, VehicleValidationError
 from app.infrastucture.database.models.vehicles import Vehicle as VehicleORM
+from app.infrastucture.database.reference_cache import invalidate_tenant_references
 from datetime import datetime
 
 class VehicleRepositoryImpl(VehicleRepository):
@@ -111,6 +112,7 @@ class VehicleRepositoryImpl(VehicleRepository):
         self._session.add(obj)
         await self._session.commit()
         await self._session.refresh(obj)
+        invalidate_tenant_references(obj.tenant_id)
         return self._to_entity(obj)
 
     async def update_vehicle(self, vehicle_id: UUID, vehicle: Vehicle) -> Optional[Vehicle]:
@@ -125,6 +127,7 @@ class VehicleRepositoryImpl(VehicleRepository):
         obj.updated_at = datetime.now()
         await self._session.commit()
         await self._session.refresh(obj)
+        invalidate_tenant_references(obj.tenant_id)
         return self._to_entity(obj)
 
     async def delete_vehicle(self, vehicle_id: UUID) -> bool:
@@ -134,6 +137,7 @@ class VehicleRepositoryImpl(VehicleRepository):
             return False
         obj.deleted_at = datetime.now()
         await self._session.commit()
+        invalidate_tenant_references(obj.tenant_id)
         return True
 
     def _to_entity(self, obj: VehicleORM) -> Vehicle:
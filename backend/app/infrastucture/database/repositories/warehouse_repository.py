@@ -5,6 +5,7 @@ from sqlalchemy.future import select
 from app.domain.entities.warehouses import Warehouse, WarehouseType
 from app.domain.repositories.warehouse_repository import WarehouseRepository
 from app.infrastucture.database.models.warehouses import WarehouseModel
+from app.infrastucture.database.reference_cache import invalidate_tenant_references
 
 class WarehouseRepositoryImpl(WarehouseRepository):
     def __init__(self, session: AsyncSession):
@@ -21,6 +22,18 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
 
+    async def get_by_ids(self, warehouse_ids: List[str]) -> List[Warehouse]:
+        if not warehouse_ids:
+            return []
+        result = await self.session.execute(
+            select(WarehouseModel)
+            .where(
+                WarehouseModel.id.in_([UUID(str(warehouse_id)) for warehouse_id in warehouse_ids]),
+                WarehouseModel.deleted_at.is_(None)
+            )
+        )
+        return [self._to_entity(m) for m in result.scalars().all()]
+
     async def get_all(self, tenant_id: str, limit: int = 100, offset: int = 0) -> List[Warehouse]:
         result = await self.session.execute(
             select(WarehouseModel)
@@ -43,6 +56,7 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
+        invalidate_tenant_references(model.tenant_id)
         return self._to_entity(model)
 
     async def update_warehouse(self, warehouse_id: str, warehouse: Warehouse) -> Optional[Warehouse]:
@@ -68,6 +82,7 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         
         await self.session.commit()
         await self.session.refresh(model)
+        invalidate_tenant_references(model.tenant_id)
         return self._to_entity(model)
 
     async def delete_warehouse(self, warehouse_id: str) -> bool:
@@ -81,8 +96,10 @@ class WarehouseRepositoryImpl(WarehouseRepository):
         model = result.scalar_one_or_none()
         if not model:
             return False
+        tenant_id = model.tenant_id
         await self.session.delete(model)
         await self.session.commit()
+        invalidate_tenant_references(tenant_id)
         return True
 
     def _to_entity(self, model: WarehouseModel) -> Warehouse:
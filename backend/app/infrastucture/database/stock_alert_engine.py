@@ -0,0 +1,224 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.entities.stock_alerts import (
+    DEFAULT_REORDER_POINT, StockAlert, StockAlertSeverity, StockPosition, StockReorderPoint
+)
+from app.domain.entities.stock_docs import StockStatus
+from app.infrastucture.logs.logger import default_logger
+
+# (warehouse_id, variant_id, stock_status) of one stock level row
+PositionKey = Tuple[UUID, UUID, StockStatus]
+
+# Called with every alert that is raised or gets more severe
+StockAlertListener = Callable[[StockAlert], None]
+
+
+class StockAlertBook:
+    """Stock positions, reorder points and active alerts of one tenant"""
+
+    def __init__(
+        self,
+        tenant_id: UUID,
+        positions: Iterable[StockPosition] = (),
+        reorder_points: Iterable[StockReorderPoint] = (),
+        default_reorder_point: Decimal = DEFAULT_REORDER_POINT
+    ):
+        self.tenant_id = tenant_id
+        self.default_reorder_point = default_reorder_point
+        self._reorder_points: Dict[Tuple[Optional[UUID], UUID], Decimal] = {
+            (point.warehouse_id, point.variant_id): point.reorder_point for point in reorder_points
+        }
+        self._positions: Dict[PositionKey, StockPosition] = {}
+        self._alerts: Dict[Tuple[UUID, UUID], StockAlert] = {}
+        self._loaded_at = datetime.now().timestamp()
+        for position in positions:
+            self._positions[(position.warehouse_id, position.variant_id, position.stock_status)] = position
+            self._evaluate(position, position.last_transaction_date or datetime.now(timezone.utc))
+
+    def reorder_point(self, warehouse_id: UUID, variant_id: UUID) -> Decimal:
+        """The warehouse's own reorder point, else the variant's, else the tenant default"""
+        reorder_point = self._reorder_points.get((warehouse_id, variant_id))
+        if reorder_point is None:
+            reorder_point = self._reorder_points.get((None, variant_id), self.default_reorder_point)
+        return reorder_point
+
+    def update(
+        self,
+        warehouse_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus,
+        available: Decimal,
+        quantity: Optional[Decimal] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[StockAlert]:
+        """
+        Record a bucket's new available quantity, and its quantity when that
+        changed too. Returns the bucket's alert if this raised it or made it
+        more severe.
+        """
+        now = now or datetime.now(timezone.utc)
+        key = (warehouse_id, variant_id, stock_status)
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = StockPosition(warehouse_id, variant_id, stock_status)
+        position.available_qty = available
+        if quantity is not None:
+            position.quantity = quantity
+            position.last_transaction_date = now
+        return self._evaluate(position, now)
+
+    def set_reorder_point(self, warehouse_id: Optional[UUID], variant_id: UUID, reorder_point: Optional[Decimal]) -> List[StockAlert]:
+        """Change (or with None remove) a reorder point and re-evaluate the buckets it covers; returns alerts raised"""
+        if reorder_point is None:
+            self._reorder_points.pop((warehouse_id, variant_id), None)
+        else:
+            self._reorder_points[(warehouse_id, variant_id)] = reorder_point
+        now = datetime.now(timezone.utc)
+        raised = []
+        for (position_warehouse, position_variant, stock_status), position in self._positions.items():
+            if stock_status != StockStatus.ON_HAND or position_variant != variant_id:
+                continue
+            if warehouse_id is None or position_warehouse == warehouse_id:
+                alert = self._evaluate(position, now)
+                if alert is not None:
+                    raised.append(alert)
+        return raised
+
+    def _evaluate(self, position: StockPosition, now: datetime) -> Optional[StockAlert]:
+        if position.stock_status != StockStatus.ON_HAND:
+            return None
+        key = (position.warehouse_id, position.variant_id)
+        reorder_point = self.reorder_point(*key)
+        severity = StockAlertSeverity.evaluate(position.available_qty, reorder_point)
+        previous = self._alerts.get(key)
+        if severity is None:
+            self._alerts.pop(key, None)
+            return None
+
+        alert = StockAlert(
+            tenant_id=self.tenant_id,
+            warehouse_id=position.warehouse_id,
+            variant_id=position.variant_id,
+            quantity=position.quantity,
+            available_qty=position.available_qty,
+            reorder_point=reorder_point,
+            severity=severity,
+            # An alert stays raised from when it was first raised while it only changes in depth
+            raised_at=previous.raised_at if previous is not None else now
+        )
+        self._alerts[key] = alert
+        if previous is None or severity.rank > previous.severity.rank:
+            return alert
+        return None
+
+    def alerts(self, warehouse_id: Optional[UUID] = None) -> List[StockAlert]:
+        """Active alerts, most severe and lowest available quantity first"""
+        return sorted(
+            (alert for alert in self._alerts.values() if warehouse_id is None or alert.warehouse_id == warehouse_id),
+            key=lambda alert: (-alert.severity.rank, alert.available_qty, str(alert.warehouse_id), str(alert.variant_id))
+        )
+
+    def negative_positions(self) -> List[StockPosition]:
+        """Buckets of any status holding a negative quantity, most negative first"""
+        return sorted(
+            (position for position in self._positions.values() if position.quantity < 0),
+            key=lambda position: (position.quantity, str(position.warehouse_id), str(position.variant_id))
+        )
+
+    def age(self) -> float:
+        return datetime.now().timestamp() - self._loaded_at
+
+
+class StockAlertEngine:
+    """
+    Per-tenant alert books kept current by stock mutations.
+
+    A book is loaded from stock_levels and the tenant's reorder points once
+    and afterwards every committed write is evaluated against the reorder
+    point of the bucket it touched, so reading the active alerts costs no
+    queries. Listeners hear of each alert as it is raised or worsens. As
+    with the availability cache, writes in other processes are only seen
+    once the TTL forces a reload.
+    """
+
+    def __init__(self, ttl: int = 300):
+        self.ttl = ttl
+        self._books: Dict[str, StockAlertBook] = {}
+        self._listeners: List[StockAlertListener] = []
+
+    def get(self, tenant_id: UUID) -> Optional[StockAlertBook]:
+        """Loaded book or None when missing/expired"""
+        book = self._books.get(str(tenant_id))
+        if book is None:
+            return None
+        if book.age() >= self.ttl:
+            del self._books[str(tenant_id)]
+            return None
+        return book
+
+    def store(self, book: StockAlertBook) -> None:
+        self._books[str(book.tenant_id)] = book
+
+    def subscribe(self, listener: StockAlertListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: StockAlertListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def apply(self, changes: Iterable[Tuple[UUID, UUID, UUID, StockStatus, Decimal, Optional[Decimal]]]) -> None:
+        """Evaluate changed buckets in the books that are loaded"""
+        now = datetime.now(timezone.utc)
+        for tenant_id, warehouse_id, variant_id, stock_status, available, quantity in changes:
+            book = self._books.get(str(tenant_id))
+            if book is not None:
+                self._notify(book.update(warehouse_id, variant_id, stock_status, available, quantity, now))
+
+    def set_reorder_point(self, tenant_id: UUID, warehouse_id: Optional[UUID], variant_id: UUID, reorder_point: Optional[Decimal]) -> None:
+        book = self._books.get(str(tenant_id))
+        if book is not None:
+            for alert in book.set_reorder_point(warehouse_id, variant_id, reorder_point):
+                self._notify(alert)
+
+    def _notify(self, alert: Optional[StockAlert]) -> None:
+        if alert is None:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(alert)
+            except Exception as e:
+                # A failing notification must not fail the stock write that raised the alert
+                default_logger.error(
+                    f"Stock alert listener failed: {str(e)}",
+                    tenant_id=str(alert.tenant_id),
+                    warehouse_id=str(alert.warehouse_id),
+                    variant_id=str(alert.variant_id)
+                )
+
+    def invalidate(self, tenant_id: UUID) -> None:
+        if self._books.pop(str(tenant_id), None) is not None:
+            default_logger.info("Stock alert book invalidated", tenant_id=str(tenant_id))
+
+    def clear(self) -> None:
+        self._books.clear()
+
+
+def log_stock_alert(alert: StockAlert) -> None:
+    """Default listener: every alert raised or worsened is logged"""
+    default_logger.warning(
+        "Stock alert raised",
+        tenant_id=str(alert.tenant_id),
+        warehouse_id=str(alert.warehouse_id),
+        variant_id=str(alert.variant_id),
+        severity=alert.severity.value,
+        available_qty=str(alert.available_qty),
+        reorder_point=str(alert.reorder_point)
+    )
+
+
+# Low and negative stock alerts for the stock level API and notifications
+stock_alert_engine = StockAlertEngine(ttl=300)
+stock_alert_engine.subscribe(log_stock_alert)
@@ -5,7 +5,13 @@ from uuid import UUID
 from pydantic import BaseModel
 from app.services.addresses.address_service import AddressService, AddressNotFoundError, AddressAlreadyExistsError
 from app.presentation.schemas.addresses.input_schemas import CreateAddressRequest, UpdateAddressRequest
-from app.presentation.schemas.addresses.output_schemas import AddressResponse, AddressListResponse
+from app.presentation.schemas.addresses.output_schemas import (
+    AddressResponse,
+    AddressListResponse,
+    AddressLocationResponse,
+    AddressLocationListResponse,
+    NearestDepotResponse
+)
 from app.services.dependencies.addresses import get_address_service
 from app.services.dependencies.auth import get_current_user
 from app.domain.entities.users import User
@@ -61,6 +67,57 @@ async def create_address(
         # Return error details in response (for development only)
         raise HTTPException(status_code=500, detail={"error": str(e), "traceback": tb})
 
+@router.get("/nearby", response_model=AddressLocationListResponse)
+async def get_nearby_addresses(
+    longitude: float = Query(..., ge=-180, le=180),
+    latitude: float = Query(..., ge=-90, le=90),
+    radius_km: float = Query(5, gt=0, le=200),
+    limit: int = Query(500, ge=1, le=5000),
+    address_service: AddressService = Depends(get_address_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Geocoded addresses of the tenant within radius_km of a point, nearest first"""
+    locations = await address_service.get_addresses_within_radius(
+        current_user.tenant_id, longitude, latitude, radius_km, limit
+    )
+    return AddressLocationListResponse(
+        addresses=[AddressLocationResponse(**location.to_dict()) for location in locations],
+        total=len(locations)
+    )
+
+@router.get("/map", response_model=AddressLocationListResponse)
+async def get_map_addresses(
+    min_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    address_service: AddressService = Depends(get_address_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Geocoded addresses of the tenant inside the visible map bounding box"""
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bounding box minimum must not exceed maximum")
+    locations = await address_service.get_addresses_in_bbox(
+        current_user.tenant_id, min_lon, min_lat, max_lon, max_lat
+    )
+    return AddressLocationListResponse(
+        addresses=[AddressLocationResponse(**location.to_dict()) for location in locations],
+        total=len(locations)
+    )
+
+@router.get("/{address_id}/nearest-depot", response_model=NearestDepotResponse)
+async def get_nearest_depot(
+    address_id: str,
+    address_service: AddressService = Depends(get_address_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Nearest depot (non-mobile warehouse with a point location) for an address"""
+    try:
+        depot = await address_service.get_nearest_depot(current_user.tenant_id, address_id)
+    except AddressNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Address with ID {address_id} not found")
+    return NearestDepotResponse(address_id=address_id, **(depot or {}))
+
 @router.get("/{address_id}", response_model=AddressResponse)
 async def get_address(address_id: str, address_service: AddressService = Depends(get_address_service)):
     address = await address_service.get_address_by_id(address_id)
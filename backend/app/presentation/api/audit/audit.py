@@ -8,7 +8,7 @@ import io
 from app.domain.entities.audit_events import AuditFilter, AuditActorType, AuditObjectType, AuditEventType
 from app.domain.entities.users import User
 from app.services.audit.audit_service import AuditService
-from app.services.dependencies.audit import get_audit_service
+from app.services.dependencies.audit import get_audit_service, get_audit_reporting_service
 from app.services.dependencies.auth import get_current_user
 from app.infrastucture.logs.logger import get_logger
 
@@ -335,7 +335,7 @@ async def get_business_events(
 async def get_audit_summary(
     request: AuditSummaryRequestSchema,
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    audit_service: Annotated[AuditService, Depends(get_audit_service)] = None,
+    audit_service: Annotated[AuditService, Depends(get_audit_reporting_service)] = None,
 ):
     """Get audit summary statistics"""
     try:
@@ -356,7 +356,7 @@ async def get_audit_summary(
 async def get_user_activity_summary(
     request: UserActivitySummaryRequestSchema,
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    audit_service: Annotated[AuditService, Depends(get_audit_service)] = None,
+    audit_service: Annotated[AuditService, Depends(get_audit_reporting_service)] = None,
 ):
     """Get user activity summary"""
     try:
@@ -378,7 +378,7 @@ async def get_user_activity_summary(
 async def get_system_activity_summary(
     request: SystemActivitySummaryRequestSchema,
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    audit_service: Annotated[AuditService, Depends(get_audit_service)] = None,
+    audit_service: Annotated[AuditService, Depends(get_audit_reporting_service)] = None,
 ):
     """Get system activity summary"""
     try:
@@ -508,7 +508,7 @@ async def export_events(
     request: ExportEventsRequestSchema,
     http_request: Request,
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    audit_service: Annotated[AuditService, Depends(get_audit_service)] = None,
+    audit_service: Annotated[AuditService, Depends(get_audit_reporting_service)] = None,
 ):
     """Export audit events in specified format"""
     try:
@@ -648,7 +648,7 @@ async def log_business_event(
 @router.get("/dashboard", response_model=AuditDashboardResponseSchema)
 async def get_audit_dashboard(
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    audit_service: Annotated[AuditService, Depends(get_audit_service)] = None,
+    audit_service: Annotated[AuditService, Depends(get_audit_reporting_service)] = None,
 ):
     """Get audit dashboard data"""
     try:
@@ -708,7 +708,7 @@ async def get_audit_dashboard(
 @router.get("/compliance", response_model=AuditComplianceResponseSchema)
 async def get_audit_compliance(
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    audit_service: Annotated[AuditService, Depends(get_audit_service)] = None,
+    audit_service: Annotated[AuditService, Depends(get_audit_reporting_service)] = None,
 ):
     """Get audit compliance information"""
     try:
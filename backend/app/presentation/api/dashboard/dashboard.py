@@ -1 +1,44 @@
- 
\ No newline at end of file
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from typing import Optional
+
+from app.domain.entities.users import User
+from app.infrastucture.logs.logger import get_logger
+from app.presentation.schemas.dashboard.output_schemas import DashboardSnapshotResponse
+from app.services.dashboard.dashboard_snapshot_service import DashboardSnapshotService
+from app.services.dependencies.auth import get_current_user
+from app.services.dependencies.dashboard import get_dashboard_snapshot_service
+
+logger = get_logger("dashboard_api")
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/snapshot", response_model=DashboardSnapshotResponse)
+async def get_dashboard_snapshot(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    dashboard_service: DashboardSnapshotService = Depends(get_dashboard_snapshot_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the landing dashboard KPIs of the user's tenant.
+
+    Served from the tenant's in-memory snapshot. The ETag changes only when a
+    KPI does, so clients polling with If-None-Match get 304 until then.
+    """
+    try:
+        snapshot = await dashboard_service.get_snapshot(current_user.tenant_id)
+    except Exception as e:
+        logger.error(
+            "Failed to get dashboard snapshot",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get dashboard")
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and snapshot.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return DashboardSnapshotResponse.from_entity(snapshot)
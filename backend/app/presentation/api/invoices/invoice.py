@@ -19,6 +19,9 @@ from app.domain.exceptions.invoices import (
 from app.presentation.schemas.invoices import (
     CreateInvoiceRequest,
     InvoiceFromOrderRequest,
+    BulkInvoiceFromOrdersRequest,
+    BulkInvoiceGenerationResponse,
+    InvoicePdfBundleRequest,
     RecordPaymentRequest,
     InvoiceResponse,
     InvoiceListResponse,
@@ -86,12 +89,14 @@ async def debug_order_statuses(
 
 @router.get("/available-orders", response_model=List[dict])
 async def get_orders_ready_for_invoicing(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
     invoice_service: InvoiceService = Depends(get_invoice_service),
     current_user: User = Depends(get_current_user)
 ):
-    """Get orders that are ready for invoicing (delivered or closed)"""
+    """Get orders that are ready for invoicing (delivered or closed, without a paid invoice)"""
     logger.info(
         "Getting orders ready for invoicing",
         user_id=str(current_user.id),
@@ -101,30 +106,15 @@ async def get_orders_ready_for_invoicing(
     )
     
     try:
-        # First, get ALL orders to understand what we have
-        from app.services.orders.order_service import OrderService
-        from app.services.dependencies.orders import get_order_service
-        
-        # Debug: Get total orders count
-        all_orders = await invoice_service.order_repository.get_all_orders(
-            tenant_id=current_user.tenant_id,
-            limit=10,
-            offset=0
-        )
-        
-        logger.info(
-            f"Debug: Found {len(all_orders)} total orders for tenant",
-            user_id=str(current_user.id),
-            tenant_id=str(current_user.tenant_id),
-            order_statuses=[order.order_status.value for order in all_orders] if all_orders else []
-        )
-        
         # Get orders that are delivered or closed
-        orders = await invoice_service.get_orders_ready_for_invoicing(
+        orders, next_cursor = await invoice_service.get_orders_ready_for_invoicing(
             user=current_user,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         logger.info(
             f"Found {len(orders)} orders ready for invoicing",
@@ -149,6 +139,8 @@ async def get_orders_ready_for_invoicing(
         
         return order_list
         
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         import traceback
         logger.error(
@@ -245,6 +237,50 @@ async def generate_invoice_from_order(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/from-orders/bulk", response_model=BulkInvoiceGenerationResponse)
+async def generate_invoices_from_orders(
+    request: BulkInvoiceFromOrdersRequest,
+    invoice_service: InvoiceService = Depends(get_invoice_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Generate invoices for many delivered orders; failures are reported per order"""
+    logger.info(
+        "Generating invoices for delivered orders",
+        user_id=str(current_user.id),
+        tenant_id=str(current_user.tenant_id),
+        order_count=len(request.order_ids)
+    )
+
+    try:
+        result = await invoice_service.generate_invoices_for_delivered_orders(
+            user=current_user,
+            order_ids=request.order_ids,
+            invoice_date=request.invoice_date,
+            due_date=request.due_date,
+            payment_terms=request.payment_terms
+        )
+
+        return BulkInvoiceGenerationResponse(
+            invoices=[InvoiceResponse(**invoice.to_dict()) for invoice in result["invoices"]],
+            failed=result["failed"],
+            requested_count=result["requested_count"],
+            created_count=result["created_count"],
+            failed_count=result["failed_count"]
+        )
+
+    except InvoicePermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        logger.error(
+            "Failed to generate invoices for delivered orders",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
 @router.post("", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED)
 async def create_manual_invoice(
     request: CreateInvoiceRequest,
@@ -420,6 +456,51 @@ async def search_invoices_server_side(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@router.post("/pdf/bundle")
+async def download_invoice_pdf_bundle(
+    request: InvoicePdfBundleRequest,
+    invoice_service: InvoiceService = Depends(get_invoice_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Download many invoices as a zip of PDFs or as one merged PDF"""
+    logger.info(
+        "Downloading invoice PDF bundle",
+        user_id=str(current_user.id),
+        tenant_id=str(current_user.tenant_id),
+        invoice_count=len(request.invoice_ids),
+        merge=request.merge
+    )
+
+    try:
+        content = await invoice_service.generate_invoices_pdf_bundle(
+            current_user, request.invoice_ids, merge=request.merge
+        )
+
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        if request.merge:
+            media_type, filename = "application/pdf", f"invoices-{stamp}.pdf"
+        else:
+            media_type, filename = "application/zip", f"invoices-{stamp}.zip"
+
+        return Response(
+            content=content,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    except InvoiceNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(
+            "Failed to generate invoice PDF bundle",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
 @router.get("/{invoice_id}/pdf")
 async def download_invoice_pdf(
     invoice_id: str,
@@ -8,10 +8,11 @@ from fastapi import APIRouter, HTTPException, Depends, status, Request
 from fastapi.responses import JSONResponse
 
 from app.domain.entities.users import User
-from app.domain.entities.payments import PaymentMethod
+from app.domain.entities.payments import PaymentMethod, PaymentStatus
 from app.domain.exceptions.payments import PaymentValidationError
 from app.presentation.schemas.payments import CreateMpesaPaymentRequest, MpesaPaymentResponse
 from app.services.payments.mpesa_service import MpesaService
+from app.services.payments.mpesa_reconciliation import get_mpesa_reconciliation_worker
 from app.services.payments.payment_service import PaymentService
 from app.services.dependencies.payments import get_payment_service
 from app.services.dependencies.auth import get_current_user
@@ -85,6 +86,9 @@ async def initiate_mpesa_payment(
         # Update payment in database
         updated_payment = await payment_service.update_payment(str(payment.id), payment)
         
+        # The reconciliation worker resolves the request if the callback never arrives
+        get_mpesa_reconciliation_worker().track(stk_result['checkout_request_id'], payment.id)
+        
         logger.info(
             "M-PESA payment initiated successfully",
             user_id=str(current_user.id),
@@ -213,32 +217,40 @@ async def check_mpesa_status(
     payment_service: PaymentService = Depends(get_payment_service),
     current_user: User = Depends(get_current_user)
 ):
-    """Check M-PESA transaction status"""
+    """
+    Check M-PESA transaction status.
+
+    Answers from the payment record; pending requests are resolved by the callback
+    or the reconciliation worker, which this call only asks to check sooner.
+    """
     try:
-        # Create M-PESA service instance
-        mpesa_service = MpesaService()
+        payments = await payment_service.search_payments(
+            user=current_user,
+            external_transaction_id=checkout_request_id
+        )
+        if not payments:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found")
         
-        # Check status
-        result = await mpesa_service.check_transaction_status(checkout_request_id)
+        payment = payments[0]
+        if payment.payment_status in (PaymentStatus.PENDING, PaymentStatus.PROCESSING):
+            worker = get_mpesa_reconciliation_worker()
+            worker.track(checkout_request_id, payment.id)
+            worker.expedite(checkout_request_id)
         
-        if result['success']:
-            return {
-                "success": True,
-                "result_code": result['result_code'],
-                "result_description": result['result_description'],
-                "amount": result.get('amount'),
-                "mpesa_receipt_number": result.get('mpesa_receipt_number'),
-                "transaction_date": result.get('transaction_date'),
-                "phone_number": result.get('phone_number')
-            }
-        else:
-            return {
-                "success": False,
-                "error": result.get('error'),
-                "result_code": result.get('result_code'),
-                "result_description": result.get('result_description')
-            }
-            
+        gateway_response = payment.gateway_response or {}
+        return {
+            "success": payment.payment_status == PaymentStatus.COMPLETED,
+            "payment_status": payment.payment_status.value,
+            "result_code": gateway_response.get('result_code'),
+            "result_description": gateway_response.get('result_description'),
+            "amount": float(payment.amount),
+            "mpesa_receipt_number": gateway_response.get('mpesa_receipt_number'),
+            "transaction_date": gateway_response.get('transaction_date'),
+            "phone_number": gateway_response.get('phone_number')
+        }
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error checking M-PESA status: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
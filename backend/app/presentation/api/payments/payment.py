@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from fastapi.responses import JSONResponse
 
-from app.domain.entities.payments import PaymentStatus, PaymentMethod, PaymentType
+from app.domain.entities.payments import PaymentStatus, PaymentMethod, PaymentType, PaymentPostingLine
 from app.domain.entities.users import User
 from app.domain.exceptions.payments import (
     PaymentNotFoundError,
@@ -19,10 +19,12 @@ from app.presentation.schemas.payments import (
     FailPaymentRequest,
     CreateRefundRequest,
     CompleteOrderPaymentRequest,
+    PostPaymentBatchRequest,
     PaymentResponse,
     PaymentListResponse,
     PaymentSummaryResponse,
     OrderPaymentCycleResponse,
+    PaymentBatchResponse,
     PaymentStatusResponse
 )
 from app.presentation.api.payments.mpesa import router as mpesa_router
@@ -512,4 +514,51 @@ async def complete_order_payment_cycle(
             error=str(e),
             error_type=type(e).__name__
         )
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+@router.post("/batch", response_model=PaymentBatchResponse, status_code=status.HTTP_201_CREATED)
+async def post_payment_batch(
+    request: PostPaymentBatchRequest,
+    payment_service: PaymentService = Depends(get_payment_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Post a bank/M-Pesa statement or cash-up batch, matching lines to invoices by reference"""
+    logger.info(
+        "Posting payment batch",
+        user_id=str(current_user.id),
+        tenant_id=str(current_user.tenant_id),
+        lines=len(request.lines),
+        payment_method=request.payment_method.value
+    )
+
+    try:
+        result = await payment_service.post_payment_batch(
+            user=current_user,
+            lines=[PaymentPostingLine(**line.dict()) for line in request.lines],
+            payment_method=request.payment_method
+        )
+
+        logger.info(
+            "Payment batch posted",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            posted=len(result["posted"]),
+            rejected=len(result["rejected"]),
+            orders_closed=result["orders_closed"]
+        )
+
+        return PaymentBatchResponse(**result)
+
+    except PaymentPermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except PaymentValidationError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except Exception as e:
+        logger.error(
+            "Failed to post payment batch",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Query, File, Form, UploadFile
 from fastapi.responses import JSONResponse
 
 from app.domain.entities.stock_docs import StockDocType, StockDocStatus
@@ -36,6 +36,7 @@ from app.presentation.schemas.stock_docs.input_schemas import (
     UpdateStockDocStatusRequest,
     StockDocSearchRequest,
     StockDocGetRequest,
+    StockDocLinesRequest,
     StockMovementsSummaryRequest,
     ConversionCreateRequest,
     TransferCreateRequest,
@@ -44,6 +45,7 @@ from app.presentation.schemas.stock_docs.input_schemas import (
 )
 from app.presentation.schemas.stock_docs.output_schemas import (
     StockDocResponse,
+    StockDocLineResponse,
     StockDocSummaryResponse,
     StockDocListResponse,
     StockDocStatusResponse,
@@ -55,9 +57,11 @@ from app.presentation.schemas.stock_docs.output_schemas import (
     StockDocBusinessRulesResponse,
     ConversionResponse,
     TransferResponse,
-    TruckOperationResponse
+    TruckOperationResponse,
+    StockTakeResponse
 )
 from app.services.stock_docs.stock_doc_service import StockDocService
+from app.services.stock_docs.stock_count_import import parse_stock_counts
 from app.services.dependencies.stock_docs import get_stock_doc_service
 from app.services.dependencies.auth import get_current_user
 from app.infrastucture.logs.logger import get_logger
@@ -844,15 +848,35 @@ async def get_stock_docs_by_ref_and_status(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@router.post("/lines", response_model=Dict[UUID, List[StockDocLineResponse]])
+async def get_stock_doc_lines_for_docs(
+    request: StockDocLinesRequest,
+    stock_doc_service: StockDocService = Depends(get_stock_doc_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the lines of several stock documents from a listing in one request"""
+    try:
+        lines_by_doc = await stock_doc_service.get_stock_doc_lines_for_docs(request.doc_ids, current_user.tenant_id)
+        return {
+            doc_id: [StockDocLineResponse.from_entity(line) for line in lines]
+            for doc_id, lines in lines_by_doc.items()
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @router.get("/type/{doc_type}", response_model=List[StockDocSummaryResponse])
 async def get_stock_docs_by_type(
     doc_type: StockDocType,
+    limit: int = Query(100, ge=1, le=1000, description="Number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
     stock_doc_service: StockDocService = Depends(get_stock_doc_service),
     current_user: User = Depends(get_current_user)
 ):
-    """Get stock documents by type"""
+    """Get a page of stock documents by type"""
     try:
-        stock_docs = await stock_doc_service.get_stock_docs_by_type(doc_type, current_user.tenant_id)
+        stock_docs = await stock_doc_service.get_stock_docs_by_type(doc_type, current_user.tenant_id, limit, offset)
         return [StockDocSummaryResponse.from_entity(doc) for doc in stock_docs]
 
     except Exception as e:
@@ -862,12 +886,14 @@ async def get_stock_docs_by_type(
 @router.get("/status/{doc_status}", response_model=List[StockDocSummaryResponse])
 async def get_stock_docs_by_status(
     doc_status: StockDocStatus,
+    limit: int = Query(100, ge=1, le=1000, description="Number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
     stock_doc_service: StockDocService = Depends(get_stock_doc_service),
     current_user: User = Depends(get_current_user)
 ):
-    """Get stock documents by status"""
+    """Get a page of stock documents by status"""
     try:
-        stock_docs = await stock_doc_service.get_stock_docs_by_status(doc_status, current_user.tenant_id)
+        stock_docs = await stock_doc_service.get_stock_docs_by_status(doc_status, current_user.tenant_id, limit, offset)
         return [StockDocSummaryResponse.from_entity(doc) for doc in stock_docs]
 
     except Exception as e:
@@ -879,13 +905,15 @@ async def get_stock_docs_by_warehouse(
     warehouse_id: UUID,
     include_source: bool = Query(True, description="Include documents where this is source warehouse"),
     include_dest: bool = Query(True, description="Include documents where this is destination warehouse"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
     stock_doc_service: StockDocService = Depends(get_stock_doc_service),
     current_user: User = Depends(get_current_user)
 ):
-    """Get stock documents by warehouse"""
+    """Get a page of stock documents by warehouse"""
     try:
         stock_docs = await stock_doc_service.get_stock_docs_by_warehouse(
-            warehouse_id, current_user.tenant_id, include_source, include_dest
+            warehouse_id, current_user.tenant_id, include_source, include_dest, limit, offset
         )
         return [StockDocSummaryResponse.from_entity(doc) for doc in stock_docs]
 
@@ -1164,6 +1192,49 @@ async def create_truck_unload(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
 
+@router.post("/stock-takes", response_model=StockTakeResponse, status_code=status.HTTP_201_CREATED)
+async def create_stock_take(
+    warehouse_id: UUID = Form(..., description="Counted warehouse ID"),
+    full_count: bool = Form(False, description="Treat items missing from the file as counted at zero"),
+    notes: Optional[str] = Form(None, description="Notes for the variance document"),
+    count_file: UploadFile = File(..., description="CSV, JSON array or JSON lines with variant_id, counted_qty and optional stock_status"),
+    stock_doc_service: StockDocService = Depends(get_stock_doc_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Import a physical count file and create one variance document for the warehouse"""
+    try:
+        result = await stock_doc_service.create_stock_take_variance(
+            user=current_user,
+            warehouse_id=warehouse_id,
+            counts=parse_stock_counts(count_file.file),
+            full_count=full_count,
+            notes=notes
+        )
+
+        logger.info(
+            "Stock take imported",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            warehouse_id=str(warehouse_id),
+            counted_items=result.counted_items,
+            variance_count=len(result.variance_lines),
+            doc_id=str(result.stock_doc.id) if result.stock_doc else None
+        )
+
+        return StockTakeResponse.from_result(result)
+
+    except StockDocLineValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except StockDocPermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except StockDocAlreadyExistsError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (StockDocInventoryError, StockDocIntegrityError) as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Count file must be UTF-8 encoded")
+
+
 # ============================================================================
 # UTILITY ENDPOINTS
 # ============================================================================
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
@@ -5,6 +6,8 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query
 
 from app.domain.entities.users import User
 from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_reservations import StockHoldRequest
+from app.domain.entities.stock_availability import AvailabilityRequestLine
 from app.domain.exceptions.stock_docs.stock_doc_exceptions import (
     StockDocValidationError,
     InsufficientStockError,
@@ -21,7 +24,11 @@ from app.presentation.schemas.stock_levels.input_schemas import (
     StockAlertRequest,
     BulkAvailabilityCheckRequest,
     VehicleStockReservationRequest,
-    ReservationConfirmationRequest
+    ReservationConfirmationRequest,
+    StockHoldsRequest,
+    StockHoldsReleaseRequest,
+    AvailabilityCheckRequest,
+    ReorderPointRequest
 )
 from app.presentation.schemas.stock_levels.output_schemas import (
     StockLevelResponse,
@@ -44,10 +51,23 @@ from app.presentation.schemas.stock_levels.output_schemas import (
     BulkAvailabilityCheckItem,
     VehicleStockReservationResponse,
     VehicleReservationItem,
-    ReservationConfirmationResponse
+    ReservationConfirmationResponse,
+    StockBalanceResponse,
+    StockBalanceListResponse,
+    StockMovementResponse,
+    StockMovementReportResponse,
+    StockLedgerEntryResponse,
+    StockLedgerResponse,
+    StockHoldResponse,
+    StockHoldListResponse,
+    StockHoldsReleaseResponse,
+    AvailabilityCheckResponse,
+    ReorderPointResponse,
+    ReorderPointListResponse
 )
 from app.services.stock_levels.stock_level_service import StockLevelService
-from app.services.dependencies.stock_levels import get_stock_level_service
+from app.services.stock_levels.stock_alert_service import StockAlertService
+from app.services.dependencies.stock_levels import get_stock_level_service, get_stock_alert_service
 from app.core.auth_utils import current_user
 from app.infrastucture.logs.logger import get_logger
 
@@ -468,6 +488,102 @@ async def release_stock_reservation(
         )
 
 
+@router.post("/reservations", response_model=StockHoldListResponse, status_code=status.HTTP_201_CREATED)
+async def place_stock_holds(
+    request: StockHoldsRequest,
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Hold stock for every line until released or expired, or for none if any line is short"""
+    try:
+        holds = await stock_level_service.place_stock_holds(
+            current_user,
+            [
+                StockHoldRequest(
+                    warehouse_id=line.warehouse_id,
+                    variant_id=line.variant_id,
+                    quantity=line.quantity,
+                    stock_status=line.stock_status,
+                    order_line_id=line.order_line_id
+                )
+                for line in request.lines
+            ],
+            order_id=request.order_id,
+            hold_for=timedelta(minutes=request.hold_minutes) if request.hold_minutes else None
+        )
+
+        logger.info(
+            "Stock holds placed",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            order_id=str(request.order_id) if request.order_id else None,
+            holds=len(holds)
+        )
+
+        return StockHoldListResponse(holds=[StockHoldResponse.from_entity(hold) for hold in holds])
+
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (StockDocValidationError, InvalidStockOperationError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(
+            "Failed to place stock holds - unexpected error",
+            user_id=str(current_user.id),
+            tenant_id=str(current_user.tenant_id),
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.get("/reservations", response_model=StockHoldListResponse)
+async def get_stock_holds(
+    order_id: Optional[UUID] = Query(None, description="Filter by order"),
+    warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse"),
+    variant_id: Optional[UUID] = Query(None, description="Filter by variant"),
+    active_only: bool = Query(True, description="Only holds that are still active"),
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Get stock reservation holds"""
+    try:
+        holds = await stock_level_service.get_stock_holds(
+            current_user.tenant_id, order_id, warehouse_id, variant_id, active_only
+        )
+        return StockHoldListResponse(holds=[StockHoldResponse.from_entity(hold) for hold in holds])
+
+    except InvalidStockOperationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.post("/reservations/release", response_model=StockHoldsReleaseResponse)
+async def release_stock_holds(
+    request: StockHoldsReleaseRequest,
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Release stock holds by ID or every active hold of an order"""
+    try:
+        released = await stock_level_service.release_stock_holds(
+            current_user, request.reservation_ids, request.order_id
+        )
+        return StockHoldsReleaseResponse(released=released)
+
+    except (StockDocValidationError, InvalidStockOperationError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.post("/transfer-warehouses", response_model=StockTransferResponse)
 async def transfer_stock_between_warehouses(
     request: StockTransferRequest,
@@ -593,38 +709,62 @@ async def reconcile_physical_count(
 
 @router.get("/alerts/low-stock", response_model=StockAlertsResponse)
 async def get_low_stock_alerts(
-    minimum_threshold: Decimal = Query(Decimal('10'), description="Minimum stock threshold"),
+    minimum_threshold: Optional[Decimal] = Query(
+        None, description="Ad hoc threshold for every bucket; omit to use the reorder points"
+    ),
+    warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse ID"),
     stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    stock_alert_service: StockAlertService = Depends(get_stock_alert_service),
     current_user: User = current_user
 ):
     """Get low stock alerts"""
     try:
-        low_stock_levels = await stock_level_service.get_low_stock_alerts(
-            current_user.tenant_id, minimum_threshold
-        )
-
-        alerts = []
-        for level in low_stock_levels:
-            severity = "critical" if level.available_qty <= 0 else "low"
-            
-            alert = LowStockAlert(
-                warehouse_id=level.warehouse_id,
-                variant_id=level.variant_id,
-                stock_status=level.stock_status,
-                current_quantity=level.quantity,
-                available_quantity=level.available_qty,
-                threshold=minimum_threshold,
-                severity=severity
+        if minimum_threshold is None:
+            # Active alerts against each bucket's reorder point, kept in memory as stock changes
+            active_alerts = await stock_alert_service.get_active_alerts(current_user.tenant_id, warehouse_id)
+            alerts = [
+                LowStockAlert(
+                    warehouse_id=alert.warehouse_id,
+                    variant_id=alert.variant_id,
+                    stock_status=alert.stock_status,
+                    current_quantity=alert.quantity,
+                    available_quantity=alert.available_qty,
+                    threshold=alert.reorder_point,
+                    severity=alert.severity.value
+                )
+                for alert in active_alerts
+            ]
+        else:
+            low_stock_levels = await stock_level_service.get_low_stock_alerts(
+                current_user.tenant_id, minimum_threshold
             )
-            alerts.append(alert)
+
+            alerts = []
+            for level in low_stock_levels:
+                if warehouse_id and level.warehouse_id != warehouse_id:
+                    continue
+                severity = "critical" if level.available_qty <= 0 else "low"
+
+                alert = LowStockAlert(
+                    warehouse_id=level.warehouse_id,
+                    variant_id=level.variant_id,
+                    stock_status=level.stock_status,
+                    current_quantity=level.quantity,
+                    available_quantity=level.available_qty,
+                    threshold=minimum_threshold,
+                    severity=severity
+                )
+                alerts.append(alert)
 
         return StockAlertsResponse(
             alerts=alerts,
             total_alerts=len(alerts),
             low_stock_count=len([a for a in alerts if a.severity == "low"]),
-            negative_stock_count=len([a for a in alerts if a.severity == "critical"])
+            negative_stock_count=len([a for a in alerts if a.severity != "low"])
         )
 
+    except StockDocValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -634,23 +774,21 @@ async def get_low_stock_alerts(
 
 @router.get("/alerts/negative-stock", response_model=NegativeStockReportResponse)
 async def get_negative_stock_report(
-    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    stock_alert_service: StockAlertService = Depends(get_stock_alert_service),
     current_user: User = current_user
 ):
     """Get negative stock report"""
     try:
-        negative_levels = await stock_level_service.get_negative_stock_report(
-            current_user.tenant_id
-        )
+        negative_positions = await stock_alert_service.get_negative_stock(current_user.tenant_id)
 
         negative_stocks = []
-        for level in negative_levels:
+        for position in negative_positions:
             report_item = NegativeStockReport(
-                warehouse_id=level.warehouse_id,
-                variant_id=level.variant_id,
-                stock_status=level.stock_status,
-                negative_quantity=level.quantity,
-                last_transaction_date=level.last_transaction_date
+                warehouse_id=position.warehouse_id,
+                variant_id=position.variant_id,
+                stock_status=position.stock_status,
+                negative_quantity=position.quantity,
+                last_transaction_date=position.last_transaction_date
             )
             negative_stocks.append(report_item)
 
@@ -666,6 +804,196 @@ async def get_negative_stock_report(
         )
 
 
+@router.get("/alerts/reorder-points", response_model=ReorderPointListResponse)
+async def get_reorder_points(
+    stock_alert_service: StockAlertService = Depends(get_stock_alert_service),
+    current_user: User = current_user
+):
+    """Get the reorder points low stock alerts are raised against"""
+    try:
+        reorder_points = await stock_alert_service.get_reorder_points(current_user.tenant_id)
+        return ReorderPointListResponse(
+            reorder_points=[ReorderPointResponse.from_entity(point) for point in reorder_points],
+            total=len(reorder_points)
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.put("/alerts/reorder-points", response_model=ReorderPointResponse)
+async def set_reorder_point(
+    request: ReorderPointRequest,
+    stock_alert_service: StockAlertService = Depends(get_stock_alert_service),
+    current_user: User = current_user
+):
+    """Set the reorder point of a variant in one warehouse or in all warehouses"""
+    try:
+        reorder_point = await stock_alert_service.set_reorder_point(
+            current_user, request.variant_id, request.reorder_point, request.warehouse_id
+        )
+        return ReorderPointResponse.from_entity(reorder_point)
+
+    except StockDocValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.delete("/alerts/reorder-points/{variant_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_reorder_point(
+    variant_id: UUID,
+    warehouse_id: Optional[UUID] = Query(None, description="Warehouse ID; omit for the all-warehouse reorder point"),
+    stock_alert_service: StockAlertService = Depends(get_stock_alert_service),
+    current_user: User = current_user
+):
+    """Remove a reorder point so the variant falls back to the wider one"""
+    try:
+        deleted = await stock_alert_service.delete_reorder_point(current_user, variant_id, warehouse_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reorder point not found")
+
+
+@router.get("/as-of", response_model=StockBalanceListResponse)
+async def get_stock_as_of(
+    as_of: datetime = Query(..., description="Point in time, e.g. month end"),
+    warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse"),
+    variant_id: Optional[UUID] = Query(None, description="Filter by variant"),
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Get stock balances and valuation as of a point in time from the stock ledger"""
+    try:
+        balances = await stock_level_service.get_stock_as_of(
+            current_user.tenant_id, as_of, warehouse_id, variant_id
+        )
+
+        return StockBalanceListResponse(
+            as_of=as_of,
+            balances=[
+                StockBalanceResponse(
+                    warehouse_id=balance.warehouse_id,
+                    variant_id=balance.variant_id,
+                    stock_status=balance.stock_status,
+                    quantity=balance.quantity,
+                    unit_cost=balance.unit_cost,
+                    total_value=balance.total_value
+                )
+                for balance in balances
+            ],
+            total_value=sum((balance.total_value for balance in balances), Decimal('0'))
+        )
+
+    except InvalidStockOperationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.get("/movements", response_model=StockMovementReportResponse)
+async def get_stock_movements(
+    start: datetime = Query(..., description="Period start (exclusive)"),
+    end: datetime = Query(..., description="Period end (inclusive)"),
+    warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse"),
+    variant_id: Optional[UUID] = Query(None, description="Filter by variant"),
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Get opening, in, out and closing quantities per stock bucket for a period"""
+    try:
+        movements = await stock_level_service.get_stock_movements(
+            current_user.tenant_id, start, end, warehouse_id, variant_id
+        )
+
+        return StockMovementReportResponse(
+            start=start,
+            end=end,
+            movements=[
+                StockMovementResponse(
+                    warehouse_id=movement.warehouse_id,
+                    variant_id=movement.variant_id,
+                    stock_status=movement.stock_status,
+                    opening_qty=movement.opening_qty,
+                    qty_in=movement.qty_in,
+                    qty_out=movement.qty_out,
+                    closing_qty=movement.closing_qty
+                )
+                for movement in movements
+            ]
+        )
+
+    except (StockDocValidationError, InvalidStockOperationError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.get("/ledger", response_model=StockLedgerResponse)
+async def get_stock_ledger(
+    warehouse_id: Optional[UUID] = Query(None, description="Filter by warehouse"),
+    variant_id: Optional[UUID] = Query(None, description="Filter by variant"),
+    start: Optional[datetime] = Query(None, description="Only entries after this time"),
+    end: Optional[datetime] = Query(None, description="Only entries up to this time"),
+    limit: int = Query(500, ge=1, le=5000, description="Page size"),
+    offset: int = Query(0, ge=0, description="Page offset"),
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Get stock ledger entries for audit reconciliation"""
+    try:
+        entries = await stock_level_service.get_stock_ledger_entries(
+            current_user.tenant_id, warehouse_id, variant_id, start, end, limit, offset
+        )
+
+        return StockLedgerResponse(
+            entries=[
+                StockLedgerEntryResponse(
+                    id=entry.id,
+                    warehouse_id=entry.warehouse_id,
+                    variant_id=entry.variant_id,
+                    stock_status=entry.stock_status,
+                    quantity_change=entry.quantity_change,
+                    balance_after=entry.balance_after,
+                    unit_cost=entry.unit_cost,
+                    movement_type=entry.movement_type.value,
+                    ref_doc_id=entry.ref_doc_id,
+                    ref_doc_type=entry.ref_doc_type,
+                    notes=entry.notes,
+                    created_by=entry.created_by,
+                    occurred_at=entry.occurred_at
+                )
+                for entry in entries
+            ],
+            limit=limit,
+            offset=offset
+        )
+
+    except InvalidStockOperationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.post("/bulk-check-availability", response_model=BulkAvailabilityCheckResponse)
 async def bulk_check_availability(
     request: BulkAvailabilityCheckRequest,
@@ -716,6 +1044,38 @@ async def bulk_check_availability(
         )
 
 
+@router.post("/availability/check", response_model=AvailabilityCheckResponse)
+async def check_lines_availability(
+    request: AvailabilityCheckRequest,
+    stock_level_service: StockLevelService = Depends(get_stock_level_service),
+    current_user: User = current_user
+):
+    """Check every line of an order or trip load against available stock in one call"""
+    try:
+        check = await stock_level_service.check_lines_availability(
+            current_user.tenant_id,
+            [
+                AvailabilityRequestLine(
+                    warehouse_id=line.warehouse_id,
+                    variant_id=line.variant_id,
+                    quantity=line.quantity,
+                    stock_status=line.stock_status
+                )
+                for line in request.lines
+            ]
+        )
+        return AvailabilityCheckResponse.from_entity(check)
+
+    except StockDocValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to check availability: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.post("/reserve-for-vehicle", response_model=VehicleStockReservationResponse)
 async def reserve_stock_for_vehicle(
     request: VehicleStockReservationRequest,
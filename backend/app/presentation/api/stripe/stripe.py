@@ -3,6 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
+from stripe.error import SignatureVerificationError
 
 from app.domain.entities.users import User
 from app.domain.entities.stripe_entities import StripePlanTier
@@ -450,7 +451,7 @@ async def stripe_webhook(
     request: Request,
     stripe_service: StripeService = Depends(get_stripe_service)
 ):
-    """Handle Stripe webhook events"""
+    """Receive Stripe webhook events; they are verified and queued, then handled by the webhook worker"""
     try:
         # Get the raw body
         body = await request.body()
@@ -462,19 +463,21 @@ async def stripe_webhook(
                 detail="Missing stripe-signature header"
             )
         
-        # Process the webhook
-        success = await stripe_service.process_webhook_event(
+        # Verify and queue the webhook
+        queued = await stripe_service.process_webhook_event(
             body.decode('utf-8'), signature
         )
         
-        if success:
-            return {"status": "success"}
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to process webhook"
-            )
+        return {"status": "queued" if queued else "duplicate"}
         
+    except HTTPException:
+        raise
+    except SignatureVerificationError as e:
+        logger.warning(f"Invalid webhook signature: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid webhook signature"
+        )
     except Exception as e:
         logger.error(f"Error processing webhook: {str(e)}")
         raise HTTPException(
@@ -482,6 +485,61 @@ async def stripe_webhook(
             detail="Webhook processing failed"
         )
 
+@router.get("/webhooks/dead-letter")
+async def get_dead_lettered_webhooks(
+    limit: int = 100,
+    current_user: User = Depends(get_current_user),
+    stripe_service: StripeService = Depends(get_stripe_service)
+):
+    """Get webhook events that exhausted their retries"""
+    try:
+        events = await stripe_service.stripe_repo.get_dead_lettered_webhook_events(limit)
+        return {
+            "events": [
+                {
+                    "stripe_event_id": event.stripe_event_id,
+                    "event_type": event.event_type,
+                    "ordering_key": event.ordering_key,
+                    "attempts": event.attempts,
+                    "last_error": event.last_error,
+                    "dead_lettered_at": event.dead_lettered_at
+                }
+                for event in events
+            ]
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting dead-lettered webhooks: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get dead-lettered webhooks"
+        )
+
+@router.post("/webhooks/{stripe_event_id}/retry")
+async def retry_dead_lettered_webhook(
+    stripe_event_id: str,
+    current_user: User = Depends(get_current_user),
+    stripe_service: StripeService = Depends(get_stripe_service)
+):
+    """Requeue a dead-lettered webhook event"""
+    try:
+        event = await stripe_service.retry_dead_lettered_webhook_event(stripe_event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Dead-lettered webhook event not found"
+            )
+        return {"status": "requeued", "stripe_event_id": stripe_event_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error requeueing webhook: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to requeue webhook"
+        )
+
 # Tenant Information Endpoints
 @router.get("/tenants/{tenant_id}", response_model=TenantResponse)
 async def get_tenant_info(
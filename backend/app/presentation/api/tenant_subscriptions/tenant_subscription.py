@@ -25,6 +25,10 @@ from app.services.dependencies.tenant_subscriptions import get_tenant_subscripti
 from app.services.dependencies.auth import get_current_user
 from app.domain.entities.users import User
 from app.infrastucture.logs.logger import default_logger as logger
+from app.infrastucture.database.reference_cache import (
+    invalidate_all_entitlements, invalidate_tenant_entitlements
+)
+from app.services.stripe.stripe_service import stripe_object_tenant_id
 
 router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"])
 
@@ -907,12 +911,24 @@ async def stripe_webhook(
         else:
             logger.info(f"Unhandled event type: {event['type']}")
         
+        if event['type'] != 'checkout.session.completed':
+            # Status and billing changes alter what the tenant is entitled to
+            invalidate_stripe_entitlements(event['data']['object'])
+        
         return {"status": "success"}
         
     except Exception as e:
         logger.error(f"Webhook error: {str(e)}")
         raise HTTPException(status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Webhook processing failed")
 
+def invalidate_stripe_entitlements(stripe_object: dict):
+    """Drop the cached entitlements of the tenant named in a Stripe object's metadata, or all of them"""
+    tenant_id = stripe_object_tenant_id(stripe_object)
+    if tenant_id is None:
+        invalidate_all_entitlements()
+    else:
+        invalidate_tenant_entitlements(tenant_id)
+
 async def handle_checkout_session_completed(session_data: dict, service: TenantSubscriptionService):
     """Handle checkout session completion for subscription upgrades"""
     try:
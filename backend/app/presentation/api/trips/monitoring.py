@@ -4,7 +4,7 @@ from uuid import UUID
 from datetime import date
 from app.services.trips.trip_monitoring_service import TripMonitoringService
 from app.services.trips.trip_service import TripService
-from app.services.dependencies.trips import get_trip_service
+from app.services.dependencies.trips import get_trip_service, get_trip_reporting_service
 from app.services.dependencies.auth import get_current_user
 from app.domain.entities.users import User
 from app.infrastucture.logs.logger import default_logger
@@ -14,6 +14,9 @@ router = APIRouter(prefix="/monitoring", tags=["trip-monitoring"])
 def get_trip_monitoring_service(trip_service: TripService = Depends(get_trip_service)) -> TripMonitoringService:
     return TripMonitoringService(trip_service)
 
+def get_trip_reporting_monitoring_service(trip_service: TripService = Depends(get_trip_reporting_service)) -> TripMonitoringService:
+    return TripMonitoringService(trip_service)
+
 @router.get("/dashboard", status_code=200)
 async def get_active_trips_dashboard(
     current_user: User = Depends(get_current_user),
@@ -33,7 +36,7 @@ async def get_trip_performance_metrics(
     start_date: Optional[date] = Query(None, description="Start date for metrics"),
     end_date: Optional[date] = Query(None, description="End date for metrics"),
     current_user: User = Depends(get_current_user),
-    monitoring_service: TripMonitoringService = Depends(get_trip_monitoring_service)
+    monitoring_service: TripMonitoringService = Depends(get_trip_reporting_monitoring_service)
 ):
     """Get trip performance metrics for a date range"""
     try:
@@ -52,7 +55,7 @@ async def get_trip_performance_metrics(
 async def get_driver_performance(
     driver_id: UUID,
     current_user: User = Depends(get_current_user),
-    monitoring_service: TripMonitoringService = Depends(get_trip_monitoring_service)
+    monitoring_service: TripMonitoringService = Depends(get_trip_reporting_monitoring_service)
 ):
     """Get performance metrics for a specific driver"""
     try:
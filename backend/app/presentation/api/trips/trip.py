@@ -3,7 +3,8 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime
 from app.services.trips.trip_service import TripService
-from app.services.dependencies.trips import get_trip_service, get_trip_order_integration_service
+from app.services.dependencies.trips import get_trip_service, get_trip_order_integration_service, get_dispatch_planning_service
+from app.services.trips.dispatch_planning_service import DispatchPlanningService
 from app.services.dependencies.auth import get_current_user
 from app.services.trips.trip_order_integration_service import TripOrderIntegrationService
 from app.domain.entities.users import User
@@ -13,7 +14,8 @@ from app.presentation.schemas.trips.input_schemas import (
     UpdateTripRequest,
     CreateTripStopRequest,
     UpdateTripStopRequest,
-    TripQueryParams
+    TripQueryParams,
+    DispatchPlanRequest
 )
 from app.presentation.schemas.trips.output_schemas import (
     TripResponse,
@@ -35,7 +37,8 @@ from app.domain.exceptions.trips.trip_exceptions import (
     TripUpdateError,
     TripDeletionError,
     TripStopNotFoundError,
-    TripStopValidationError
+    TripStopValidationError,
+    TripServiceError
 )
 from app.infrastucture.logs.logger import default_logger
 from decimal import Decimal
@@ -108,6 +111,30 @@ async def get_trips_dashboard_summary(
         default_logger.error(f"Error getting trips dashboard summary: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get trips summary")
 
+@router.post("/dispatch-plan", status_code=200)
+async def create_dispatch_plan(
+    request: DispatchPlanRequest,
+    current_user: User = Depends(get_current_user),
+    dispatch_planning_service: DispatchPlanningService = Depends(get_dispatch_planning_service)
+):
+    """
+    Assign all approved orders for a date to the available vehicles
+    Returns draft trips with sequenced stops; persists them when create_trips is true
+    """
+    try:
+        return await dispatch_planning_service.plan_dispatch(
+            user=current_user,
+            planned_date=request.planned_date,
+            vehicle_ids=request.vehicle_ids,
+            max_stops_per_trip=request.max_stops_per_trip,
+            create_trips=request.create_trips
+        )
+    except TripServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        default_logger.error(f"Unexpected error building dispatch plan: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.post("/", response_model=TripResponse, status_code=201)
 async def create_trip(
     request: CreateTripRequest,
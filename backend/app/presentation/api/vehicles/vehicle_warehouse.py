@@ -101,7 +101,8 @@ async def unload_vehicle_as_warehouse(
             destination_warehouse_id=request.destination_warehouse_id,
             actual_inventory=request.actual_inventory,
             expected_inventory=request.expected_inventory,
-            unloaded_by=current_user.id
+            unloaded_by=current_user.id,
+            user=current_user
         )
         
         return UnloadVehicleResponse(
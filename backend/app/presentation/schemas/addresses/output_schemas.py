@@ -27,4 +27,27 @@ class AddressListResponse(BaseModel):
     addresses: List[AddressResponse]
     total: int
     limit: int
-    offset: int 
\ No newline at end of file
+    offset: int 
+
+class AddressLocationResponse(BaseModel):
+    address_id: UUID
+    customer_id: UUID
+    address_type: str
+    longitude: float
+    latitude: float
+    street: str
+    city: str
+    is_primary_delivery: bool
+    distance_km: Optional[float] = None
+
+class AddressLocationListResponse(BaseModel):
+    addresses: List[AddressLocationResponse]
+    total: int
+
+class NearestDepotResponse(BaseModel):
+    address_id: UUID
+    warehouse_id: Optional[UUID] = None
+    name: Optional[str] = None
+    code: Optional[str] = None
+    type: Optional[str] = None
+    distance_km: Optional[float] = None
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class DashboardSnapshotResponse(BaseModel):
+    """Schema for the tenant landing dashboard KPIs"""
+    tenant_id: UUID = Field(..., description="Tenant ID")
+    version: int = Field(..., description="Snapshot version; moves on only when a KPI changes")
+    generated_at: datetime = Field(..., description="When the snapshot was computed")
+    orders: Dict[str, Any] = Field(..., description="Order counts by stage")
+    trips: Dict[str, Any] = Field(..., description="Trip counts by stage")
+    invoices: Dict[str, Any] = Field(..., description="Invoice counts by status")
+    payments: Dict[str, Any] = Field(..., description="Payment counts and amounts by status")
+    stock: Dict[str, Any] = Field(..., description="On-hand stock bucket counts by availability")
+
+    @classmethod
+    def from_entity(cls, snapshot) -> "DashboardSnapshotResponse":
+        """Create response from domain entity"""
+        return cls(
+            tenant_id=snapshot.tenant_id,
+            version=snapshot.version,
+            generated_at=snapshot.generated_at,
+            **{section: dict(values) for section, values in snapshot.kpis.items()}
+        )
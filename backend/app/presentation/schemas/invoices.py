@@ -33,6 +33,18 @@ class CreateInvoiceRequest(BaseModel):
     invoice_lines: List[InvoiceLineRequest] = Field(..., description="Invoice lines")
 
 
+class BulkInvoiceFromOrdersRequest(BaseModel):
+    order_ids: List[str] = Field(..., min_length=1, max_length=5000, description="Delivered order IDs to invoice")
+    invoice_date: Optional[date] = Field(None, description="Invoice date (defaults to today)")
+    due_date: Optional[date] = Field(None, description="Due date (defaults to 30 days from invoice date)")
+    payment_terms: Optional[str] = Field(None, description="Payment terms")
+
+
+class InvoicePdfBundleRequest(BaseModel):
+    invoice_ids: List[str] = Field(..., min_length=1, max_length=500, description="Invoice IDs to render")
+    merge: bool = Field(False, description="Return one merged PDF instead of a zip of PDFs")
+
+
 class InvoiceFromOrderRequest(BaseModel):
     order_id: str = Field(..., description="Order ID to generate invoice from")
     invoice_date: Optional[date] = Field(None, description="Invoice date (defaults to today)")
@@ -150,6 +162,20 @@ class InvoiceListResponse(BaseModel):
         from_attributes = True
 
 
+class BulkInvoiceFailure(BaseModel):
+    order_id: str = Field(..., description="Order ID")
+    order_no: Optional[str] = Field(None, description="Order number")
+    error: str = Field(..., description="Why no invoice was created")
+
+
+class BulkInvoiceGenerationResponse(BaseModel):
+    invoices: List[InvoiceResponse] = Field(..., description="Created invoices")
+    failed: List[BulkInvoiceFailure] = Field(..., description="Orders that were not invoiced")
+    requested_count: int = Field(..., description="Number of orders requested")
+    created_count: int = Field(..., description="Number of invoices created")
+    failed_count: int = Field(..., description="Number of orders that failed")
+
+
 class InvoiceSummaryResponse(BaseModel):
     draft_invoices: int = Field(..., description="Draft invoices count")
     sent_invoices: int = Field(..., description="Sent invoices count")
@@ -55,6 +55,19 @@ class CompleteOrderPaymentRequest(BaseModel):
     auto_generate_invoice: bool = Field(True, description="Auto-generate invoice")
 
 
+class PaymentPostingLineRequest(BaseModel):
+    reference: str = Field(..., min_length=1, description="Invoice or order number quoted on the statement")
+    amount: Decimal = Field(..., gt=0, description="Payment amount")
+    payment_date: Optional[date] = Field(None, description="Payment date (defaults to today)")
+    external_transaction_id: Optional[str] = Field(None, description="Bank or M-Pesa transaction ID, used to skip lines already posted")
+    description: Optional[str] = Field(None, description="Payment description")
+
+
+class PostPaymentBatchRequest(BaseModel):
+    payment_method: PaymentMethod = Field(..., description="Payment method of every line")
+    lines: List[PaymentPostingLineRequest] = Field(..., min_length=1, max_length=2000, description="Statement lines")
+
+
 # ============================================================================
 # OUTPUT SCHEMAS (Responses)
 # ============================================================================
@@ -136,6 +149,25 @@ class OrderPaymentCycleResponse(BaseModel):
         from_attributes = True
 
 
+class RejectedPaymentLine(BaseModel):
+    line: int = Field(..., description="Index of the line in the request")
+    reference: str = Field(..., description="Reference of the line")
+    amount: float = Field(..., description="Amount of the line")
+    reason: str = Field(..., description="Why the line was not posted")
+
+
+class PaymentBatchResponse(BaseModel):
+    posted: List[PaymentResponse] = Field(..., description="Payments created")
+    rejected: List[RejectedPaymentLine] = Field(..., description="Lines that were not posted")
+    total_posted_amount: float = Field(..., description="Sum of posted payments")
+    invoices_updated: int = Field(..., description="Invoices that received a payment")
+    invoices_paid: int = Field(..., description="Invoices fully paid by this batch")
+    orders_closed: int = Field(..., description="Delivered orders closed because their invoice was paid")
+
+    class Config:
+        from_attributes = True
+
+
 class PaymentStatusResponse(BaseModel):
     payment_id: str = Field(..., description="Payment ID")
     status: PaymentStatus = Field(..., description="New status")
@@ -123,6 +123,11 @@ class StockDocGetRequest(BaseModel):
     status: Optional[StockDocStatus] = Field(None, description="Filter by document status")
 
 
+class StockDocLinesRequest(BaseModel):
+    """Schema for loading the lines of several stock documents at once"""
+    doc_ids: List[UUID] = Field(..., min_length=1, max_length=500, description="Stock document IDs")
+
+
 class StockMovementsSummaryRequest(BaseModel):
     """Schema for stock movements summary request"""
     warehouse_id: Optional[UUID] = Field(None, description="Filter by warehouse")
@@ -119,6 +119,7 @@ class StockDocSummaryResponse(BaseModel):
     updated_at: datetime = Field(..., description="Last update timestamp")
     updated_by: Optional[UUID] = Field(None, description="User who last updated the document")
     line_count: int = Field(..., description="Number of lines in the document")
+    total_value: Optional[float] = Field(None, description="Sum of line quantity times unit cost")
 
     class Config:
         from_attributes = True
@@ -144,7 +145,8 @@ class StockDocSummaryResponse(BaseModel):
             created_by=stock_doc.created_by,
             updated_at=stock_doc.updated_at,
             updated_by=stock_doc.updated_by,
-            line_count=len(stock_doc.stock_doc_lines)
+            line_count=stock_doc.line_count if stock_doc.line_count is not None else len(stock_doc.stock_doc_lines),
+            total_value=float(stock_doc.total_value) if stock_doc.total_value is not None else None
         )
 
 
@@ -278,4 +280,46 @@ class TruckOperationResponse(BaseModel):
     warehouse_id: UUID = Field(..., description="Warehouse ID")
     trip_id: Optional[UUID] = Field(None, description="Associated trip ID")
     truck_id: Optional[str] = Field(None, description="Truck identifier")
-    total_items: int = Field(..., description="Number of items in operation")
\ No newline at end of file
+    total_items: int = Field(..., description="Number of items in operation")
+
+class StockTakeLineResponse(BaseModel):
+    """Schema for one compared line of a stock take"""
+    variant_id: UUID = Field(..., description="Variant ID")
+    stock_status: str = Field(..., description="Stock bucket")
+    system_qty: float = Field(..., description="Quantity on record")
+    counted_qty: float = Field(..., description="Physically counted quantity")
+    variance: float = Field(..., description="Counted minus system quantity")
+    variance_value: float = Field(..., description="Variance valued at unit cost")
+
+
+class StockTakeResponse(BaseModel):
+    """Schema for stock take response"""
+    warehouse_id: UUID = Field(..., description="Counted warehouse ID")
+    counted_items: int = Field(..., description="Distinct variant/status buckets in the count file")
+    variance_count: int = Field(..., description="Number of lines with a variance")
+    total_variance_value: float = Field(..., description="Net value of all variances")
+    stock_doc: Optional[StockDocResponse] = Field(None, description="Created variance document, if any ON_HAND variance was found")
+    variances: List[StockTakeLineResponse] = Field(default_factory=list, description="Lines with a variance")
+
+    @classmethod
+    def from_result(cls, result) -> "StockTakeResponse":
+        """Create response from a StockTakeResult"""
+        variance_lines = result.variance_lines
+        return cls(
+            warehouse_id=result.warehouse_id,
+            counted_items=result.counted_items,
+            variance_count=len(variance_lines),
+            total_variance_value=float(sum(line.variance_value for line in variance_lines)),
+            stock_doc=StockDocResponse.from_entity(result.stock_doc) if result.stock_doc else None,
+            variances=[
+                StockTakeLineResponse(
+                    variant_id=line.variant_id,
+                    stock_status=line.stock_status.value,
+                    system_qty=float(line.system_qty),
+                    counted_qty=float(line.counted_qty),
+                    variance=float(line.variance),
+                    variance_value=float(line.variance_value)
+                )
+                for line in variance_lines
+            ]
+        )
@@ -73,6 +73,13 @@ class StockAlertRequest(BaseModel):
     include_negative: bool = Field(True, description="Include negative stock")
 
 
+class ReorderPointRequest(BaseModel):
+    """Schema for setting a variant's reorder point"""
+    variant_id: UUID = Field(..., description="Variant ID")
+    warehouse_id: Optional[UUID] = Field(None, description="Warehouse ID; omit to cover every warehouse without its own")
+    reorder_point: Decimal = Field(..., ge=0, description="Available quantity below which a low stock alert is raised")
+
+
 class BulkAvailabilityCheckItem(BaseModel):
     """Schema for individual item in bulk availability check"""
     variant_id: UUID = Field(..., description="Variant ID to check")
@@ -115,4 +122,38 @@ class ReservationConfirmationItem(BaseModel):
 class ReservationConfirmationRequest(BaseModel):
     """Schema for confirming a stock reservation"""
     reservation_id: str = Field(..., description="Reservation ID to confirm")
-    actual_items: Optional[list[ReservationConfirmationItem]] = Field(None, description="Actual items if different from reserved")
\ No newline at end of file
+    actual_items: Optional[list[ReservationConfirmationItem]] = Field(None, description="Actual items if different from reserved")
+
+class StockHoldLineRequest(BaseModel):
+    """Schema for one line of a stock hold request"""
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    quantity: Decimal = Field(..., description="Quantity to hold", gt=0)
+    stock_status: StockStatus = Field(StockStatus.ON_HAND, description="Stock status bucket")
+    order_line_id: Optional[UUID] = Field(None, description="Order line the hold is for")
+
+
+class StockHoldsRequest(BaseModel):
+    """Schema for placing expiring stock holds, all lines or none"""
+    order_id: Optional[UUID] = Field(None, description="Order the holds are for")
+    lines: list[StockHoldLineRequest] = Field(..., description="Lines to hold", min_length=1)
+    hold_minutes: Optional[int] = Field(None, description="Minutes until the holds expire", ge=1, le=43200)
+
+
+class StockHoldsReleaseRequest(BaseModel):
+    """Schema for releasing stock holds by ID or by order"""
+    reservation_ids: Optional[list[UUID]] = Field(None, description="Holds to release")
+    order_id: Optional[UUID] = Field(None, description="Release every active hold of this order")
+
+
+class AvailabilityLineRequest(BaseModel):
+    """Schema for one line of an availability check"""
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    quantity: Decimal = Field(..., description="Quantity needed", gt=0)
+    stock_status: StockStatus = Field(StockStatus.ON_HAND, description="Stock status bucket")
+
+
+class AvailabilityCheckRequest(BaseModel):
+    """Schema for checking every line of an order or trip load at once"""
+    lines: list[AvailabilityLineRequest] = Field(..., description="Lines to check", min_length=1, max_length=1000)
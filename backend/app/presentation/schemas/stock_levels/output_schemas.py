@@ -153,6 +153,31 @@ class NegativeStockReportResponse(BaseModel):
     total_count: int = Field(..., description="Total count of negative stock items")
 
 
+class ReorderPointResponse(BaseModel):
+    """Schema for a reorder point"""
+    id: UUID = Field(..., description="Reorder point ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    warehouse_id: Optional[UUID] = Field(None, description="Warehouse ID, empty when it covers every warehouse")
+    reorder_point: Decimal = Field(..., description="Available quantity below which a low stock alert is raised")
+    updated_at: Optional[datetime] = Field(None, description="Last update")
+
+    @classmethod
+    def from_entity(cls, reorder_point) -> "ReorderPointResponse":
+        return cls(
+            id=reorder_point.id,
+            variant_id=reorder_point.variant_id,
+            warehouse_id=reorder_point.warehouse_id,
+            reorder_point=reorder_point.reorder_point,
+            updated_at=reorder_point.updated_at
+        )
+
+
+class ReorderPointListResponse(BaseModel):
+    """Schema for reorder point list response"""
+    reorder_points: List[ReorderPointResponse] = Field(..., description="Reorder points")
+    total: int = Field(..., description="Number of reorder points")
+
+
 class BulkStockUpdateResponse(BaseModel):
     """Schema for bulk stock update response"""
     success: bool = Field(..., description="Whether bulk update was successful")
@@ -212,4 +237,136 @@ class ReservationConfirmationResponse(BaseModel):
     success: bool = Field(..., description="Whether confirmation was successful")
     reservation_id: str = Field(..., description="Confirmed reservation ID")
     status: str = Field(..., description="Updated reservation status")
-    message: str = Field(..., description="Confirmation result message")
\ No newline at end of file
+    message: str = Field(..., description="Confirmation result message")
+
+class StockBalanceResponse(BaseModel):
+    """Schema for a point-in-time stock balance"""
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    stock_status: StockStatus = Field(..., description="Stock status bucket")
+    quantity: Decimal = Field(..., description="Quantity at the requested time")
+    unit_cost: Decimal = Field(..., description="Unit cost at the requested time")
+    total_value: Decimal = Field(..., description="Quantity valued at unit cost")
+
+
+class StockBalanceListResponse(BaseModel):
+    """Schema for stock balances as of a point in time"""
+    as_of: datetime = Field(..., description="Point in time of the balances")
+    balances: List[StockBalanceResponse] = Field(..., description="Non-zero balances")
+    total_value: Decimal = Field(..., description="Total stock value")
+
+
+class StockMovementResponse(BaseModel):
+    """Schema for the movement of one stock bucket over a period"""
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    stock_status: StockStatus = Field(..., description="Stock status bucket")
+    opening_qty: Decimal = Field(..., description="Quantity at the start of the period")
+    qty_in: Decimal = Field(..., description="Quantity added during the period")
+    qty_out: Decimal = Field(..., description="Quantity removed during the period")
+    closing_qty: Decimal = Field(..., description="Quantity at the end of the period")
+
+
+class StockMovementReportResponse(BaseModel):
+    """Schema for a stock movement report"""
+    start: datetime = Field(..., description="Period start (exclusive)")
+    end: datetime = Field(..., description="Period end (inclusive)")
+    movements: List[StockMovementResponse] = Field(..., description="Movements per stock bucket")
+
+
+class StockLedgerEntryResponse(BaseModel):
+    """Schema for a stock ledger entry"""
+    id: UUID = Field(..., description="Ledger entry ID")
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    stock_status: StockStatus = Field(..., description="Stock status bucket")
+    quantity_change: Decimal = Field(..., description="Signed quantity change")
+    balance_after: Decimal = Field(..., description="Bucket quantity after the change")
+    unit_cost: Decimal = Field(..., description="Unit cost after the change")
+    movement_type: str = Field(..., description="Kind of change")
+    ref_doc_id: Optional[UUID] = Field(None, description="Stock document that caused the change")
+    ref_doc_type: Optional[str] = Field(None, description="Type of the referenced document")
+    notes: Optional[str] = Field(None, description="Reason given for the change")
+    created_by: Optional[UUID] = Field(None, description="User who made the change")
+    occurred_at: Optional[datetime] = Field(None, description="Time of the change")
+
+
+class StockLedgerResponse(BaseModel):
+    """Schema for a page of stock ledger entries"""
+    entries: List[StockLedgerEntryResponse] = Field(..., description="Ledger entries in occurrence order")
+    limit: int = Field(..., description="Page size")
+    offset: int = Field(..., description="Page offset")
+
+
+class StockHoldResponse(BaseModel):
+    """Schema for a stock reservation hold"""
+    id: UUID = Field(..., description="Reservation hold ID")
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    stock_status: StockStatus = Field(..., description="Stock status bucket")
+    quantity: Decimal = Field(..., description="Quantity held")
+    order_id: Optional[UUID] = Field(None, description="Order the hold is for")
+    order_line_id: Optional[UUID] = Field(None, description="Order line the hold is for")
+    status: str = Field(..., description="active, released or expired")
+    expires_at: datetime = Field(..., description="When the hold expires")
+    released_at: Optional[datetime] = Field(None, description="When the hold was released or expired")
+
+    @classmethod
+    def from_entity(cls, hold) -> "StockHoldResponse":
+        """Create response from domain entity"""
+        return cls(
+            id=hold.id,
+            warehouse_id=hold.warehouse_id,
+            variant_id=hold.variant_id,
+            stock_status=hold.stock_status,
+            quantity=hold.quantity,
+            order_id=hold.order_id,
+            order_line_id=hold.order_line_id,
+            status=hold.status.value,
+            expires_at=hold.expires_at,
+            released_at=hold.released_at
+        )
+
+
+class StockHoldListResponse(BaseModel):
+    """Schema for a list of stock reservation holds"""
+    holds: List[StockHoldResponse] = Field(..., description="Reservation holds")
+
+
+class StockHoldsReleaseResponse(BaseModel):
+    """Schema for the result of releasing stock holds"""
+    released: int = Field(..., description="Number of holds released")
+
+
+class AvailabilityLineResponse(BaseModel):
+    """Schema for the availability of one bucket; lines on the same bucket are combined"""
+    warehouse_id: UUID = Field(..., description="Warehouse ID")
+    variant_id: UUID = Field(..., description="Variant ID")
+    stock_status: StockStatus = Field(..., description="Stock status bucket")
+    requested: Decimal = Field(..., description="Quantity requested")
+    available: Decimal = Field(..., description="Available quantity")
+    shortfall: Decimal = Field(..., description="Quantity missing, zero when available")
+
+
+class AvailabilityCheckResponse(BaseModel):
+    """Schema for the result of a multi-line availability check"""
+    is_available: bool = Field(..., description="Whether every line can be served")
+    lines: List[AvailabilityLineResponse] = Field(..., description="Availability per bucket")
+
+    @classmethod
+    def from_entity(cls, check) -> "AvailabilityCheckResponse":
+        """Create response from domain entity"""
+        return cls(
+            is_available=check.is_available,
+            lines=[
+                AvailabilityLineResponse(
+                    warehouse_id=line.warehouse_id,
+                    variant_id=line.variant_id,
+                    stock_status=line.stock_status,
+                    requested=line.requested,
+                    available=line.available,
+                    shortfall=line.shortfall
+                )
+                for line in check.lines
+            ]
+        )
@@ -83,6 +83,26 @@ class TripPlanningRequest(BaseModel):
     order_details: List[Dict[str, Any]] = Field(default_factory=list, description="Detailed order information")
 
 
+class DispatchPlanRequest(BaseModel):
+    """
+    Schema for bulk dispatch planning of a delivery date
+    
+    **Business Rules:**
+    - All approved orders for the date that are not yet on a trip are considered
+    - Only active vehicles are used; optionally restricted to vehicle_ids
+    - Orders are packed by weight and volume, zoned by depot and swept by geography
+    - With create_trips=true a DRAFT trip with stops is created per used vehicle
+    
+    **Expected Responses:**
+    - 200: Dispatch plan built (and trips created if requested)
+    - 422: Validation error
+    """
+    planned_date: date = Field(..., description="Delivery date to plan")
+    vehicle_ids: Optional[List[UUID]] = Field(None, description="Restrict planning to these vehicles")
+    max_stops_per_trip: Optional[int] = Field(None, gt=0, description="Maximum number of stops per trip")
+    create_trips: bool = Field(False, description="Persist draft trips instead of returning a preview")
+
+
 class TruckLoadingRequest(BaseModel):
     """
     Schema for truck loading operation
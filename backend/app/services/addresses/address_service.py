@@ -1,8 +1,20 @@
-from typing import Optional, List
+from dataclasses import replace
+from typing import Optional, List, Dict, Any
 from uuid import UUID
-from app.domain.entities.addresses import Address, AddressType
+from app.domain.entities.addresses import Address, AddressType, AddressLocation
 from app.domain.repositories.address_repository import AddressRepository
 from app.domain.exceptions.addresses.addresses_exceptions import AddressNotFoundError, AddressAlreadyExistsError
+from app.infrastucture.database.reference_cache import address_tile_cache
+from app.services.addresses.geo_utils import (
+    BBox, geohash_cell_size, geohash_tiles, geohash_bbox, radius_bbox, in_bbox, haversine_km
+)
+
+# Geohash precisions tried from finest (~1.2 km cells) to coarsest (~156 km cells)
+_TILE_PRECISIONS = (6, 5, 4, 3)
+# Queries that would need more tiles than this go straight to the database
+MAX_TILES_PER_QUERY = 16
+# A tile with this many addresses is too dense to cache as a whole
+MAX_ADDRESSES_PER_TILE = 5000
 
 class AddressService:
     def __init__(self, address_repository: AddressRepository):
@@ -78,4 +90,85 @@ class AddressService:
             primary_billing_addresses = [addr for addr in primary_billing_addresses if str(addr.id) != address_id_to_exclude]
             primary_delivery_addresses = [addr for addr in primary_delivery_addresses if str(addr.id) != address_id_to_exclude]
         
-        return len(primary_billing_addresses) <= 1 and len(primary_delivery_addresses) <= 1 
\ No newline at end of file
+        return len(primary_billing_addresses) <= 1 and len(primary_delivery_addresses) <= 1
+
+    async def get_addresses_in_bbox(
+        self,
+        tenant_id: UUID,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float
+    ) -> List[AddressLocation]:
+        """Geocoded addresses for the map view, served from cached geohash tiles when possible"""
+        bbox = (min_lon, min_lat, max_lon, max_lat)
+        candidates = await self._load_tiles(tenant_id, bbox)
+        if candidates is None:
+            return await self.address_repository.get_address_locations_in_bbox(tenant_id, *bbox)
+        return [location for location in candidates if in_bbox((location.longitude, location.latitude), bbox)]
+
+    async def get_addresses_within_radius(
+        self,
+        tenant_id: UUID,
+        longitude: float,
+        latitude: float,
+        radius_km: float,
+        limit: int = 500
+    ) -> List[AddressLocation]:
+        """Geocoded addresses within radius_km of a point, nearest first"""
+        candidates = await self._load_tiles(tenant_id, radius_bbox(longitude, latitude, radius_km))
+        if candidates is None:
+            return await self.address_repository.get_address_locations_within_radius(
+                tenant_id, longitude, latitude, radius_km, limit
+            )
+        
+        nearby = []
+        for location in candidates:
+            distance_km = haversine_km((longitude, latitude), (location.longitude, location.latitude))
+            if distance_km <= radius_km:
+                nearby.append(replace(location, distance_km=distance_km))
+        nearby.sort(key=lambda location: location.distance_km)
+        return nearby[:limit]
+
+    async def get_nearest_depot(self, tenant_id: UUID, address_id: str) -> Optional[Dict[str, Any]]:
+        address = await self.get_address_by_id(address_id)
+        if address.tenant_id != tenant_id:
+            raise AddressNotFoundError(address_id)
+        return await self.address_repository.get_nearest_depot(address_id)
+
+    async def _load_tiles(self, tenant_id: UUID, bbox: BBox) -> Optional[List[AddressLocation]]:
+        """
+        Addresses of every geohash tile covering the bbox, or None when the area
+        is too large or too dense to serve from tiles.
+        """
+        precision = self._tile_precision(bbox)
+        if precision is None:
+            return None
+        
+        locations: Dict[UUID, AddressLocation] = {}
+        for tile in geohash_tiles(bbox, precision):
+            tile_locations = address_tile_cache.get(tenant_id, tile)
+            if tile_locations is None:
+                fetched = await self.address_repository.get_address_locations_in_bbox(
+                    tenant_id, *geohash_bbox(tile), limit=MAX_ADDRESSES_PER_TILE
+                )
+                if len(fetched) >= MAX_ADDRESSES_PER_TILE:
+                    return None
+                tile_locations = tuple(fetched)
+                address_tile_cache.set(tenant_id, tile, tile_locations)
+            # Points on a tile border belong to both neighbours
+            for location in tile_locations:
+                locations[location.address_id] = location
+        return list(locations.values())
+
+    @staticmethod
+    def _tile_precision(bbox: BBox) -> Optional[int]:
+        """Finest geohash precision that covers the bbox with at most MAX_TILES_PER_QUERY tiles"""
+        min_lon, min_lat, max_lon, max_lat = bbox
+        for precision in _TILE_PRECISIONS:
+            width, height = geohash_cell_size(precision)
+            columns = int((max_lon - min_lon) / width) + 2
+            rows = int((max_lat - min_lat) / height) + 2
+            if columns * rows <= MAX_TILES_PER_QUERY * 4 and len(geohash_tiles(bbox, precision)) <= MAX_TILES_PER_QUERY:
+                return precision
+        return None
@@ -0,0 +1,145 @@
+import math
+import re
+from typing import Optional, Set, Tuple
+
+Point = Tuple[float, float]  # (longitude, latitude)
+BBox = Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
+
+_WKT_POINT = re.compile(r"POINT\s*\(\s*(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?)\s*\)", re.IGNORECASE)
+_LAT_LNG_PAIR = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def parse_point(value) -> Optional[Point]:
+    """
+    Parse a location into a (longitude, latitude) tuple.
+
+    Accepts WKT points as returned by the address repository ("POINT (lon lat)"),
+    "lat,lng" strings, GeoJSON-like dicts and (lon, lat) sequences. Returns None
+    for anything that is missing or outside valid coordinate ranges.
+    """
+    if value is None:
+        return None
+
+    lon = lat = None
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        lon, lat = value
+    elif isinstance(value, dict):
+        if "coordinates" in value:
+            return parse_point(value["coordinates"])
+        lon = value.get("longitude", value.get("lng"))
+        lat = value.get("latitude", value.get("lat"))
+    elif isinstance(value, str):
+        match = _WKT_POINT.search(value)
+        if match:
+            lon, lat = match.group(1), match.group(2)
+        else:
+            match = _LAT_LNG_PAIR.match(value)
+            if match:
+                lat, lon = match.group(1), match.group(2)
+
+    try:
+        lon, lat = float(lon), float(lat)
+    except (TypeError, ValueError):
+        return None
+
+    if not (-180 <= lon <= 180) or not (-90 <= lat <= 90) or (lon == 0 and lat == 0):
+        return None
+    return lon, lat
+
+
+def haversine_km(a: Point, b: Point) -> float:
+    """Great-circle distance in km between two (longitude, latitude) points"""
+    lon1, lat1, lon2, lat2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(longitude: float, latitude: float, precision: int) -> str:
+    """Standard base32 geohash of a point"""
+    lon_range = [-180.0, 180.0]
+    lat_range = [-90.0, 90.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value_range, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """(width, height) in degrees of a geohash cell"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = (5 * precision) // 2
+    return 360.0 / (2 ** lon_bits), 180.0 / (2 ** lat_bits)
+
+
+def geohash_bbox(geohash: str) -> BBox:
+    """Bounding box covered by a geohash cell"""
+    lon_range = [-180.0, 180.0]
+    lat_range = [-90.0, 90.0]
+    even = True
+    for char in geohash:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (value >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+    return lon_range[0], lat_range[0], lon_range[1], lat_range[1]
+
+
+def geohash_tiles(bbox: BBox, precision: int) -> Set[str]:
+    """All geohash cells of the given precision that intersect the bounding box"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    width, height = geohash_cell_size(precision)
+    tiles = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            tiles.add(geohash_encode(min(lon, max_lon), min(lat, max_lat), precision))
+            if lon >= max_lon:
+                break
+            lon += width
+        if lat >= max_lat:
+            break
+        lat += height
+    return tiles
+
+
+def radius_bbox(longitude: float, latitude: float, radius_km: float) -> BBox:
+    """Bounding box that contains a circle of radius_km around the point"""
+    lat_delta = radius_km / 111.32
+    lon_delta = radius_km / (111.32 * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        max(longitude - lon_delta, -180.0),
+        max(latitude - lat_delta, -90.0),
+        min(longitude + lon_delta, 180.0),
+        min(latitude + lat_delta, 90.0)
+    )
+
+
+def in_bbox(point: Point, bbox: BBox) -> bool:
+    return bbox[0] <= point[0] <= bbox[2] and bbox[1] <= point[1] <= bbox[3]
@@ -0,0 +1,110 @@
+"""
+Background worker keeping the dashboard snapshots of tenants in use current
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from decouple import config
+
+from app.infrastucture.database.dashboard_cache import DashboardSnapshotCache, dashboard_cache
+from app.infrastucture.logs.logger import get_logger
+from app.services.dashboard.dashboard_snapshot_service import DashboardSnapshotService
+
+logger = get_logger("dashboard_refresh_worker")
+
+
+class DashboardRefreshWorker:
+    """
+    Rebuilds stale or aged dashboard snapshots between views.
+
+    Only tenants whose dashboard has been viewed recently are refreshed, so
+    the landing page is normally answered from memory without the viewer
+    waiting on a rebuild.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 30.0,
+        cache: Optional[DashboardSnapshotCache] = None,
+        services=None
+    ):
+        self.poll_interval = poll_interval
+        self.cache = cache or dashboard_cache
+        self.services = services or _dashboard_service
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def run_once(self) -> int:
+        """Refresh every snapshot that is due; returns the number refreshed"""
+        tenant_ids = self.cache.tenants_to_refresh()
+        if not tenant_ids:
+            return 0
+
+        refreshed = 0
+        async with self.services() as dashboard:
+            for tenant_id in tenant_ids:
+                try:
+                    await dashboard.refresh(tenant_id)
+                    refreshed += 1
+                except Exception as e:
+                    logger.error(f"Dashboard snapshot refresh failed: {str(e)}", tenant_id=str(tenant_id))
+        return refreshed
+
+    async def run(self) -> None:
+        """Refresh due snapshots every poll_interval seconds until stop()"""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Dashboard refresh failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+
+@asynccontextmanager
+async def _dashboard_service() -> AsyncIterator[DashboardSnapshotService]:
+    """Open a database session for one worker pass"""
+    from app.services.dependencies.common import get_db_session
+    from app.services.dependencies.dashboard import get_dashboard_snapshot_service
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        yield get_dashboard_snapshot_service(session)
+    finally:
+        await sessions.aclose()
+
+
+_worker: Optional[DashboardRefreshWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_dashboard_refresh_worker() -> asyncio.Task:
+    global _worker, _worker_task
+    if _worker is None:
+        _worker = DashboardRefreshWorker(
+            poll_interval=config("DASHBOARD_REFRESH_INTERVAL_SECONDS", default=30.0, cast=float)
+        )
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_worker.run())
+    return _worker_task
+
+
+async def stop_dashboard_refresh_worker() -> None:
+    global _worker_task
+    if _worker is not None:
+        _worker.stop()
+    if _worker_task is not None:
+        try:
+            await asyncio.wait_for(_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            _worker_task.cancel()
+        _worker_task = None
@@ -0,0 +1,99 @@
+"""
+Tenant landing dashboard KPIs, precomputed and served from memory
+"""
+
+import asyncio
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.domain.entities.dashboard import DashboardSnapshot
+from app.domain.entities.stock_alerts import DEFAULT_REORDER_POINT, StockAlertSeverity
+from app.domain.repositories.invoice_repository import InvoiceRepository
+from app.domain.repositories.order_repository import OrderRepository
+from app.domain.repositories.payment_repository import PaymentRepository
+from app.domain.repositories.trip_repository import TripRepository
+from app.infrastucture.database.dashboard_cache import DashboardSnapshotCache, dashboard_cache
+from app.infrastucture.logs.logger import get_logger
+from app.services.stock_levels.availability_service import AvailabilityService
+from app.services.stock_levels.stock_alert_service import StockAlertService
+
+logger = get_logger("dashboard_snapshot_service")
+
+# One rebuild per tenant at a time; concurrent readers wait for it and share the result
+_refresh_locks: Dict[str, asyncio.Lock] = {}
+
+
+class DashboardSnapshotService:
+    """
+    Builds the order, trip, invoice, payment and stock KPIs of a tenant's
+    dashboard as one versioned snapshot.
+
+    Each subsystem is read with its aggregate summary query (stock from the
+    cached availability matrix, judged against the stock alert book's reorder
+    points), so a rebuild is a handful of queries and a dashboard view that
+    finds a current snapshot costs none.
+    """
+
+    def __init__(
+        self,
+        order_repository: OrderRepository,
+        trip_repository: TripRepository,
+        invoice_repository: InvoiceRepository,
+        payment_repository: PaymentRepository,
+        availability_service: AvailabilityService,
+        stock_alert_service: Optional[StockAlertService] = None,
+        cache: Optional[DashboardSnapshotCache] = None
+    ):
+        self.order_repository = order_repository
+        self.trip_repository = trip_repository
+        self.invoice_repository = invoice_repository
+        self.payment_repository = payment_repository
+        self.availability_service = availability_service
+        self.stock_alert_service = stock_alert_service
+        self.cache = cache or dashboard_cache
+
+    async def get_snapshot(self, tenant_id: UUID) -> DashboardSnapshot:
+        snapshot = self.cache.get(tenant_id)
+        if snapshot is not None and self.cache.is_current(tenant_id):
+            return snapshot
+        return await self.refresh(tenant_id)
+
+    async def refresh(self, tenant_id: UUID) -> DashboardSnapshot:
+        """Rebuild the tenant's snapshot unless another caller already has"""
+        lock = _refresh_locks.setdefault(str(tenant_id), asyncio.Lock())
+        async with lock:
+            if self.cache.is_current(tenant_id):
+                return self.cache.peek(tenant_id)
+
+            change_count = self.cache.change_count(tenant_id)
+            payments = await self.payment_repository.get_payment_summary(tenant_id)
+            kpis = {
+                "orders": await self.order_repository.get_orders_summary(tenant_id),
+                "trips": await self.trip_repository.get_trips_summary(tenant_id),
+                "invoices": await self.invoice_repository.get_invoice_summary(tenant_id),
+                "payments": payments.to_dict(),
+                "stock": await self._stock_kpis(tenant_id)
+            }
+            snapshot = DashboardSnapshot.build(tenant_id, kpis, self.cache.peek(tenant_id))
+            self.cache.store(snapshot, change_count)
+
+        logger.info("Dashboard snapshot refreshed", tenant_id=str(tenant_id), version=snapshot.version)
+        return snapshot
+
+    async def _stock_kpis(self, tenant_id: UUID) -> dict:
+        """On-hand bucket counts by alert severity, judged against the same reorder points as the stock alerts"""
+        matrix = await self.availability_service.get_matrix(tenant_id)
+        book = await self.stock_alert_service.get_book(tenant_id) if self.stock_alert_service else None
+        buckets = matrix.buckets()
+        severities = [
+            StockAlertSeverity.evaluate(
+                available, book.reorder_point(warehouse_id, variant_id) if book else DEFAULT_REORDER_POINT
+            )
+            for (warehouse_id, variant_id), available in buckets.items()
+        ]
+        return {
+            "stock_buckets": len(buckets),
+            "low_stock_count": severities.count(StockAlertSeverity.LOW),
+            "out_of_stock_count": severities.count(StockAlertSeverity.CRITICAL),
+            "negative_stock_count": severities.count(StockAlertSeverity.NEGATIVE)
+        }
@@ -7,6 +7,7 @@ from uuid import UUID
 from app.domain.entities.deliveries import Delivery, DeliveryStatus
 from app.domain.entities.orders import Order, OrderLine
 from app.domain.entities.variants import Variant
+from app.domain.entities.load_model import LoadModel
 from app.domain.entities.stock_docs import StockDoc, StockDocType
 from app.domain.entities.audit_events import AuditEvent, AuditEventType, AuditObjectType
 from app.domain.repositories.delivery_repository import DeliveryRepository
@@ -144,31 +145,37 @@ class DeliveryService:
             # Get all order lines
             order_lines = await self.order_repo.get_order_lines_by_order(str(order_id))
             
-            total_weight_kg = Decimal('0')
-            total_volume_m3 = Decimal('0')
-            line_details = []
+            # Fetch all variants in one query instead of one lookup per line
+            variant_ids = list({line.variant_id for line in order_lines if line.variant_id})
+            variants = {
+                variant.id: variant
+                for variant in await self.variant_repo.get_variants_by_ids(variant_ids)
+            } if variant_ids else {}
             
+            load = LoadModel()
+            weighed_lines = []
             for line in order_lines:
-                if line.variant_id:
-                    variant = await self.variant_repo.get_variant_by_id(line.variant_id)
-                    if variant:
-                        # Calculate weight: qty × unit_weight_kg (fallback to gross_weight_kg)
-                        weight_per_unit = variant.unit_weight_kg or variant.gross_weight_kg or Decimal('0')
-                        line_weight = line.qty_ordered * weight_per_unit
-                        line_volume = line.qty_ordered * (variant.unit_volume_m3 or Decimal('0'))
-                        
-                        total_weight_kg += line_weight
-                        total_volume_m3 += line_volume
-                        
-                        line_details.append({
-                            'variant_sku': variant.sku,
-                            'qty_ordered': float(line.qty_ordered),
-                            'unit_weight_kg': float(variant.unit_weight_kg) if variant.unit_weight_kg else None,
-                            'gross_weight_kg': float(variant.gross_weight_kg) if variant.gross_weight_kg else None,
-                            'unit_volume_m3': float(variant.unit_volume_m3) if variant.unit_volume_m3 else None,
-                            'line_weight_kg': float(line_weight),
-                            'line_volume_m3': float(line_volume)
-                        })
+                variant = variants.get(line.variant_id) if line.variant_id else None
+                if variant:
+                    # Calculate weight: qty × unit_weight_kg (fallback to gross_weight_kg)
+                    weight_per_unit = variant.unit_weight_kg or variant.gross_weight_kg or Decimal('0')
+                    load.set_item(line.id, weight_per_unit, variant.unit_volume_m3 or Decimal('0'), quantity=line.qty_ordered)
+                    weighed_lines.append((line, variant))
+            
+            total_weight_kg = load.total_weight_kg
+            total_volume_m3 = load.total_volume_m3
+            line_details = [
+                {
+                    'variant_sku': variant.sku,
+                    'qty_ordered': float(line.qty_ordered),
+                    'unit_weight_kg': float(variant.unit_weight_kg) if variant.unit_weight_kg else None,
+                    'gross_weight_kg': float(variant.gross_weight_kg) if variant.gross_weight_kg else None,
+                    'unit_volume_m3': float(variant.unit_volume_m3) if variant.unit_volume_m3 else None,
+                    'line_weight_kg': float(load.get_line_weight_kg(line.id)),
+                    'line_volume_m3': float(load.get_line_volume_m3(line.id))
+                }
+                for line, variant in weighed_lines
+            ]
             
             return {
                 'order_id': str(order_id),
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.domain.repositories.audit_repository import AuditRepository
 from app.infrastucture.database.repositories.audit_repository import AuditRepositoryImpl
 from app.services.dependencies.common import get_db_session
+from app.services.dependencies.read_sessions import get_tenant_read_session
 from app.services.audit.audit_service import AuditService
 
 
@@ -19,4 +20,11 @@ async def get_audit_service(
     audit_repository: Annotated[AuditRepository, Depends(get_audit_repository)]
 ) -> AuditService:
     """Get audit service instance"""
-    return AuditService(audit_repository) 
\ No newline at end of file
+    return AuditService(audit_repository)
+
+
+async def get_audit_reporting_service(
+    session: AsyncSession = Depends(get_tenant_read_session)
+) -> AuditService:
+    """Get an audit service reading from the reporting session, for summaries and exports"""
+    return AuditService(AuditRepositoryImpl(session))
@@ -1,5 +1,6 @@
-from typing import AsyncGenerator
-from app.infrastucture.database.connection import get_supabase_client, direct_db_connection
+from typing import AsyncGenerator, Optional
+from uuid import UUID
+from app.infrastucture.database.connection import get_supabase_client, direct_db_connection, configure_direct_database
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -10,6 +11,26 @@ async def get_database():
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session - uses appropriate connection method based on environment"""
+    await _ensure_direct_database()
+    async for session in direct_db_connection.get_session():
+        yield session
+
+
+async def get_read_db_session(
+    tenant_id: Optional[UUID] = None,
+    consistent: bool = False
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a read-only reporting session, from the read replica when the tenant's
+    recent writes have reached it; pass consistent=True to read your own writes
+    """
+    await _ensure_direct_database()
+    async for session in direct_db_connection.get_read_session(tenant_id, consistent):
+        yield session
+
+
+async def _ensure_direct_database() -> None:
+    """Configure the direct connection on first use"""
     from app.services.dependencies.railway_users import should_use_railway_mode
     from decouple import config
     from fastapi import HTTPException
@@ -39,19 +60,12 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         
         # Configure direct connection if not already done
         if not direct_db_connection._sessionmaker:
-            direct_db_connection.configure(database_url)
-        
-        # Use the configured direct connection
-        async for session in direct_db_connection.get_session():
-            yield session
+            configure_direct_database(database_url)
     else:
         # Local development - use existing direct connection
         if not direct_db_connection._sessionmaker:
             # Initialize if not already done
             await init_direct_database()
-        
-        async for session in direct_db_connection.get_session():
-            yield session
 
 
 # Import here to avoid circular imports
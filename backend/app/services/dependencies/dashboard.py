@@ -0,0 +1,32 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastucture.database.invoice_repository_impl import InvoiceRepositoryImpl
+from app.infrastucture.database.payment_repository_impl import PaymentRepositoryImpl
+from app.infrastucture.database.repositories.order_repository import SQLAlchemyOrderRepository
+from app.infrastucture.database.repositories.stock_alert_repository import SQLAlchemyStockAlertRepository
+from app.infrastucture.database.repositories.stock_level_repository import SQLAlchemyStockLevelRepository
+from app.infrastucture.database.repositories.trip_repository import SQLAlchemyTripRepository
+from app.services.dashboard.dashboard_snapshot_service import DashboardSnapshotService
+from app.services.dependencies.common import get_db_session
+from app.services.dependencies.read_sessions import get_tenant_read_session
+from app.services.stock_levels.availability_service import AvailabilityService
+from app.services.stock_levels.stock_alert_service import StockAlertService
+
+
+def get_dashboard_snapshot_service(
+    session: AsyncSession = Depends(get_db_session),
+    read_session: AsyncSession = Depends(get_tenant_read_session)
+) -> DashboardSnapshotService:
+    """Dependency injection for DashboardSnapshotService"""
+    # KPI summaries read from the reporting session. The availability matrix is
+    # shared with order entry and kept current in place, so it loads from the primary,
+    # as does the stock alert book whose reorder points grade the stock buckets.
+    return DashboardSnapshotService(
+        order_repository=SQLAlchemyOrderRepository(read_session),
+        trip_repository=SQLAlchemyTripRepository(read_session),
+        invoice_repository=InvoiceRepositoryImpl(),
+        payment_repository=PaymentRepositoryImpl(read_session),
+        availability_service=AvailabilityService(SQLAlchemyStockLevelRepository(session)),
+        stock_alert_service=StockAlertService(SQLAlchemyStockAlertRepository(session))
+    )
@@ -0,0 +1,15 @@
+from typing import AsyncGenerator
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.users import User
+from app.services.dependencies.auth import get_current_user
+from app.services.dependencies.common import get_read_db_session
+
+
+async def get_tenant_read_session(
+    current_user: User = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only reporting session routed for the current user's tenant"""
+    async for session in get_read_db_session(current_user.tenant_id):
+        yield session
@@ -2,7 +2,10 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.stock_levels.stock_level_service import StockLevelService
+from app.services.stock_levels.availability_service import AvailabilityService
+from app.services.stock_levels.stock_alert_service import StockAlertService
 from app.infrastucture.database.repositories.stock_level_repository import SQLAlchemyStockLevelRepository
+from app.infrastucture.database.repositories.stock_alert_repository import SQLAlchemyStockAlertRepository
 from app.services.dependencies.common import get_db_session
 
 
@@ -18,4 +21,16 @@ async def get_stock_level_service(
 ) -> StockLevelService:
     """Dependency injection for StockLevelService"""
     stock_level_repository = SQLAlchemyStockLevelRepository(session)
-    return StockLevelService(stock_level_repository)
\ No newline at end of file
+    return StockLevelService(
+        stock_level_repository,
+        stock_level_repository.ledger,
+        stock_level_repository.reservations,
+        AvailabilityService(stock_level_repository)
+    )
+
+
+async def get_stock_alert_service(
+    session: AsyncSession = Depends(get_db_session)
+) -> StockAlertService:
+    """Dependency injection for StockAlertService"""
+    return StockAlertService(SQLAlchemyStockAlertRepository(session))
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.trips.trip_service import TripService
 from app.services.trips.trip_order_integration_service import TripOrderIntegrationService
 from app.services.trips.trip_status_automation_service import TripStatusAutomationService
+from app.services.trips.dispatch_planning_service import DispatchPlanningService
 from app.services.dependencies.repositories import (
     get_trip_repository,
     get_order_repository,
@@ -13,10 +14,16 @@ from app.services.dependencies.repositories import (
 from app.services.dependencies.stock_levels import get_stock_level_service
 from app.services.dependencies.orders import get_order_service
 from app.services.dependencies.vehicles import get_vehicle_warehouse_service
+from app.services.dependencies.products import get_variant_repository
+from app.services.dependencies.addresses import get_address_repository
+from app.services.dependencies.read_sessions import get_tenant_read_session
+from app.infrastucture.database.repositories.trip_repository import SQLAlchemyTripRepository
 from app.domain.repositories.trip_repository import TripRepository
 from app.domain.repositories.order_repository import OrderRepository
 from app.domain.repositories.warehouse_repository import WarehouseRepository
 from app.domain.repositories.vehicle_repository import VehicleRepository
+from app.domain.repositories.variant_repository import VariantRepository
+from app.domain.repositories.address_repository import AddressRepository
 from app.services.stock_levels.stock_level_service import StockLevelService
 from app.services.orders.order_service import OrderService
 from app.services.vehicles.vehicle_warehouse_service import VehicleWarehouseService
@@ -35,6 +42,19 @@ def get_trip_service(
     )
 
 
+def get_trip_reporting_service(
+    read_session: AsyncSession = Depends(get_tenant_read_session),
+    warehouse_repository: WarehouseRepository = Depends(get_warehouse_repository),
+    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository)
+) -> TripService:
+    """Get a trip service whose trip reads go to the reporting session, for performance metrics"""
+    return TripService(
+        trip_repository=SQLAlchemyTripRepository(read_session),
+        warehouse_repository=warehouse_repository,
+        vehicle_repository=vehicle_repository
+    )
+
+
 def get_trip_status_automation_service(
     trip_repository: TripRepository = Depends(get_trip_repository),
     order_repository: OrderRepository = Depends(get_order_repository),
@@ -64,4 +84,21 @@ def get_trip_order_integration_service(
         stock_level_service=stock_level_service,
         order_service=order_service,
         trip_service=trip_service
-    ) 
\ No newline at end of file
+    )
+
+
+def get_dispatch_planning_service(
+    trip_service: TripService = Depends(get_trip_service),
+    trip_repository: TripRepository = Depends(get_trip_repository),
+    order_repository: OrderRepository = Depends(get_order_repository),
+    variant_repository: VariantRepository = Depends(get_variant_repository),
+    address_repository: AddressRepository = Depends(get_address_repository)
+) -> DispatchPlanningService:
+    """Get dispatch planning service instance"""
+    return DispatchPlanningService(
+        trip_service=trip_service,
+        trip_repository=trip_repository,
+        order_repository=order_repository,
+        variant_repository=variant_repository,
+        address_repository=address_repository
+    )
@@ -1,6 +1,8 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastucture.database.repositories.vehicle_repository import VehicleRepositoryImpl
+from app.infrastucture.database.repositories.vehicle_load_repository import SQLAlchemyVehicleLoadRepository
+from app.infrastucture.database.repositories.truck_reconciliation_repository import SQLAlchemyTruckReconciliationRepository
 from app.services.vehicles.vehicle_service import VehicleService
 from app.services.vehicles.vehicle_warehouse_service import VehicleWarehouseService
 from app.services.dependencies.common import get_db_session
@@ -15,17 +17,27 @@ def get_vehicle_repository(db: AsyncSession = Depends(get_db_session)):
 def get_vehicle_service(vehicle_repository=Depends(get_vehicle_repository)):
     return VehicleService(vehicle_repository)
 
+def get_vehicle_load_repository(db: AsyncSession = Depends(get_db_session)):
+    return SQLAlchemyVehicleLoadRepository(db)
+
+def get_truck_reconciliation_repository(db: AsyncSession = Depends(get_db_session)):
+    return SQLAlchemyTruckReconciliationRepository(db)
+
 def get_vehicle_warehouse_service(
     stock_doc_service=Depends(get_stock_doc_service),
     stock_level_service=Depends(get_stock_level_service),
     vehicle_service=Depends(get_vehicle_service),
     variant_service=Depends(get_variant_service),
-    truck_inventory_repository=Depends(get_truck_inventory_repository)
+    truck_inventory_repository=Depends(get_truck_inventory_repository),
+    vehicle_load_repository=Depends(get_vehicle_load_repository),
+    truck_reconciliation_repository=Depends(get_truck_reconciliation_repository)
 ):
     return VehicleWarehouseService(
         stock_doc_service=stock_doc_service,
         stock_level_service=stock_level_service,
         vehicle_service=vehicle_service,
         variant_service=variant_service,
-        truck_inventory_repository=truck_inventory_repository
+        truck_inventory_repository=truck_inventory_repository,
+        vehicle_load_repository=vehicle_load_repository,
+        truck_reconciliation_repository=truck_reconciliation_repository
     ) 
\ No newline at end of file
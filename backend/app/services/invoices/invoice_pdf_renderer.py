@@ -0,0 +1,433 @@
+import asyncio
+import hashlib
+import io
+import os
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence
+
+from pypdf import PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+
+from app.domain.entities.invoices import Invoice
+from app.infrastucture.logs.logger import default_logger
+
+# ============================================================================
+# TEMPLATE (built once per process)
+# ============================================================================
+
+_styles = getSampleStyleSheet()
+
+COMPANY_STYLE = ParagraphStyle(
+    'CompanyStyle',
+    parent=_styles['Heading1'],
+    fontSize=24,
+    spaceAfter=5,
+    alignment=1,  # Center
+    textColor=colors.HexColor('#1e40af')  # Blue color
+)
+
+TAGLINE_STYLE = ParagraphStyle(
+    'TaglineStyle',
+    parent=_styles['Normal'],
+    fontSize=12,
+    spaceAfter=20,
+    alignment=1,  # Center
+    textColor=colors.HexColor('#6b7280')  # Gray color
+)
+
+INVOICE_TITLE_STYLE = ParagraphStyle(
+    'InvoiceTitle',
+    parent=_styles['Heading1'],
+    fontSize=28,
+    spaceAfter=30,
+    alignment=1,  # Center
+    textColor=colors.HexColor('#1f2937')  # Dark gray
+)
+
+SECTION_STYLE = ParagraphStyle(
+    'SectionStyle',
+    parent=_styles['Heading2'],
+    fontSize=14,
+    spaceAfter=10,
+    textColor=colors.HexColor('#374151')  # Medium gray
+)
+
+FOOTER_STYLE = ParagraphStyle(
+    'FooterStyle',
+    parent=_styles['Normal'],
+    fontSize=10,
+    alignment=1,  # Center
+    textColor=colors.HexColor('#6b7280'),  # Gray color
+    fontName='Helvetica'
+)
+
+FOOTER_BOLD_STYLE = ParagraphStyle(
+    'FooterBoldStyle',
+    parent=_styles['Normal'],
+    fontSize=12,
+    alignment=1,  # Center
+    textColor=colors.HexColor('#1e40af'),  # Blue color
+    fontName='Helvetica-Bold'
+)
+
+NORMAL_STYLE = _styles['Normal']
+
+DETAILS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+LINES_TABLE_STYLE = TableStyle([
+    # Header styling
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+
+    # Data rows styling
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+    ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+    ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Description left-aligned
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+])
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+    ('FONTNAME', (0, -3), (1, -3), 'Helvetica-Bold'),  # Total Amount
+    ('FONTNAME', (0, -1), (1, -1), 'Helvetica-Bold'),  # Balance Due
+    ('FONTSIZE', (0, -3), (1, -3), 16),  # Larger font for total
+    ('FONTSIZE', (0, -1), (1, -1), 16),  # Larger font for balance
+    ('TEXTCOLOR', (0, -3), (1, -3), colors.HexColor('#1e40af')),  # Blue for total
+    ('TEXTCOLOR', (0, -1), (1, -1), colors.HexColor('#dc2626')),  # Red for balance due
+    ('BACKGROUND', (0, -3), (1, -3), colors.HexColor('#eff6ff')),  # Light blue background for total
+    ('BACKGROUND', (0, -1), (1, -1), colors.HexColor('#fef2f2')),  # Light red background for balance
+    ('GRID', (0, -3), (1, -3), 1, colors.HexColor('#1e40af')),  # Border for total
+    ('GRID', (0, -1), (1, -1), 1, colors.HexColor('#dc2626')),  # Border for balance
+])
+
+PAYMENT_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),  # Light gray background for labels
+])
+
+SEPARATOR_STYLE = TableStyle([
+    ('LINEABOVE', (0, 0), (0, 0), 1, colors.HexColor('#e5e7eb')),
+])
+
+COMPANY_INFO = [
+    "123 Innovation Drive, Tech Park",
+    "Dublin, Ireland D01 1234",
+    "Phone: +353 1 234 5678",
+    "Email: info@circl.team",
+    "Website: www.circl.team",
+    "VAT Number: IE1234567A"
+]
+
+BANK_DETAILS = [
+    ['Bank:', 'AIB Bank'],
+    ['Account Name:', 'Circl Technologies Ltd'],
+    ['Account Number:', '12345678'],
+    ['IBAN:', 'IE64AIBK12345678901234'],
+    ['BIC:', 'AIBKIE2D'],
+]
+
+LINE_COL_WIDTHS = [0.5*inch, 2.5*inch, 0.6*inch, 1*inch, 0.8*inch, 1*inch, 1.2*inch]
+
+
+# ============================================================================
+# RENDERING (runs inside the worker processes)
+# ============================================================================
+
+def build_invoice_story(invoice: Invoice) -> list:
+    """Flowables for one invoice with Circl Technologies branding"""
+    story = []
+
+    # Header with company branding
+    story.append(Paragraph("CIRCL TECHNOLOGIES", COMPANY_STYLE))
+    story.append(Paragraph("Innovative Solutions for Tomorrow", TAGLINE_STYLE))
+    for info in COMPANY_INFO:
+        story.append(Paragraph(info, NORMAL_STYLE))
+    story.append(Spacer(1, 30))
+
+    # Invoice title and details
+    story.append(Paragraph(f"INVOICE #{invoice.invoice_no}", INVOICE_TITLE_STYLE))
+    invoice_details_data = [
+        ['Invoice Date:', invoice.invoice_date.strftime('%B %d, %Y')],
+        ['Due Date:', invoice.due_date.strftime('%B %d, %Y')],
+        ['Invoice Status:', invoice.invoice_status.value.upper()],
+        ['Currency:', invoice.currency]
+    ]
+    invoice_details_table = Table(invoice_details_data, colWidths=[2*inch, 3*inch])
+    invoice_details_table.setStyle(DETAILS_TABLE_STYLE)
+    story.append(invoice_details_table)
+    story.append(Spacer(1, 20))
+
+    # Bill To section
+    story.append(Paragraph("BILL TO:", SECTION_STYLE))
+    story.append(Paragraph(invoice.customer_name, NORMAL_STYLE))
+    story.append(Paragraph(invoice.customer_address, NORMAL_STYLE))
+    if invoice.customer_tax_id:
+        story.append(Paragraph(f"Tax ID: {invoice.customer_tax_id}", NORMAL_STYLE))
+    story.append(Spacer(1, 20))
+
+    # Invoice lines table
+    if invoice.invoice_lines:
+        table_data = [
+            ['Item', 'Description', 'Qty', 'Unit Price', 'Tax Rate', 'Tax Amount', 'Line Total']
+        ]
+        for i, line in enumerate(invoice.invoice_lines, 1):
+            table_data.append([
+                str(i),
+                line.description,
+                str(line.quantity),
+                f"€{line.unit_price:.2f}",
+                f"{line.tax_rate:.1f}%",
+                f"€{line.tax_amount:.2f}",
+                f"€{line.gross_amount:.2f}"
+            ])
+        table = Table(table_data, colWidths=LINE_COL_WIDTHS)
+        table.setStyle(LINES_TABLE_STYLE)
+        story.append(table)
+        story.append(Spacer(1, 20))
+
+    # Summary table (always shown, even without invoice lines)
+    summary_data = [
+        ['', ''],
+        ['Subtotal:', f"€{invoice.subtotal:.2f}"],
+        ['Tax Total:', f"€{invoice.total_tax:.2f}"],
+        ['', ''],
+        ['Total Amount:', f"€{invoice.total_amount:.2f}"],
+        ['Amount Paid:', f"€{invoice.paid_amount:.2f}"],
+        ['', ''],
+        ['Balance Due:', f"€{invoice.balance_due:.2f}"]
+    ]
+    summary_table = Table(summary_data, colWidths=[4*inch, 2*inch])
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
+    story.append(summary_table)
+    story.append(Spacer(1, 30))
+
+    # Payment information
+    story.append(Paragraph("PAYMENT INFORMATION", SECTION_STYLE))
+    payment_table = Table(BANK_DETAILS + [['Reference:', invoice.invoice_no]], colWidths=[2*inch, 4*inch])
+    payment_table.setStyle(PAYMENT_TABLE_STYLE)
+    story.append(payment_table)
+    story.append(Spacer(1, 25))
+
+    # Terms and conditions
+    if invoice.payment_terms:
+        story.append(Paragraph("PAYMENT TERMS", SECTION_STYLE))
+        story.append(Paragraph(invoice.payment_terms, NORMAL_STYLE))
+        story.append(Spacer(1, 20))
+
+    # Notes
+    if invoice.notes:
+        story.append(Paragraph("NOTES", SECTION_STYLE))
+        story.append(Paragraph(invoice.notes, NORMAL_STYLE))
+        story.append(Spacer(1, 20))
+
+    # Footer
+    story.append(Spacer(1, 40))
+    separator = Table([['']], colWidths=[6*inch])
+    separator.setStyle(SEPARATOR_STYLE)
+    story.append(separator)
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("Thank you for your business!", FOOTER_BOLD_STYLE))
+    story.append(Paragraph("Circl Technologies - Innovative Solutions for Tomorrow", FOOTER_STYLE))
+    story.append(Paragraph("For any questions, please contact us at info@circl.team", FOOTER_STYLE))
+
+    return story
+
+
+def render_invoices_pdf(invoices: Sequence[Invoice]) -> bytes:
+    """Render one or more invoices into a single A4 document, one invoice per page group"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=1*inch,
+        rightMargin=1*inch,
+        topMargin=1*inch,
+        bottomMargin=1*inch
+    )
+    story = []
+    for index, invoice in enumerate(invoices):
+        if index:
+            story.append(PageBreak())
+        story.extend(build_invoice_story(invoice))
+    doc.build(story)
+    pdf_content = buffer.getvalue()
+    buffer.close()
+    return pdf_content
+
+
+# ============================================================================
+# RENDERER (pool + cache)
+# ============================================================================
+
+def invoice_pdf_cache_key(invoice: Invoice) -> str:
+    """Content address of an invoice revision: any update bumps updated_at and so the key"""
+    updated_at = invoice.updated_at.isoformat() if invoice.updated_at else ""
+    return hashlib.sha256(f"{invoice.id}:{updated_at}".encode()).hexdigest()
+
+
+class PdfCache:
+    """LRU cache of rendered PDFs bounded by total size in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+
+    def set(self, key: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = content
+        self.size += len(content)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+class InvoicePdfRenderer:
+    """
+    Renders invoice PDFs off the event loop.
+
+    reportlab layout is CPU bound, so documents are built in a process pool
+    (created lazily) instead of blocking the request. Rendered documents are
+    cached by invoice id + updated_at, so repeated downloads of an unchanged
+    invoice are served from memory.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        executor: Optional[Executor] = None
+    ):
+        self.max_workers = max_workers
+        self.cache = PdfCache(cache_max_bytes)
+        self._executor: Optional[Executor] = executor
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, invoices: List[Invoice]) -> bytes:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), render_invoices_pdf, invoices)
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool; start a fresh one for the next call
+            default_logger.error("Invoice PDF worker pool broken, restarting")
+            self._executor = None
+            return await loop.run_in_executor(self._get_executor(), render_invoices_pdf, invoices)
+
+    async def render(self, invoice: Invoice) -> bytes:
+        """PDF for one invoice, from cache when the invoice has not changed"""
+        key = invoice_pdf_cache_key(invoice)
+        content = self.cache.get(key)
+        if content is None:
+            content = await self._run([invoice])
+            self.cache.set(key, content)
+        return content
+
+    async def render_zip(self, invoices: Sequence[Invoice]) -> bytes:
+        """Zip archive with one invoice-<no>.pdf per invoice, rendered in parallel"""
+        documents = await asyncio.gather(*(self.render(invoice) for invoice in invoices))
+        buffer = io.BytesIO()
+        # PDFs are already compressed, so the archive only stores them
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            for invoice, content in zip(invoices, documents):
+                archive.writestr(f"invoice-{invoice.invoice_no}.pdf", content)
+        return buffer.getvalue()
+
+    async def render_merged(self, invoices: Sequence[Invoice]) -> bytes:
+        """One print-ready PDF with every invoice starting on a new page"""
+        # Each invoice is laid out on its own worker (or served from cache); only
+        # the cheap page concatenation happens here
+        documents = await asyncio.gather(*(self.render(invoice) for invoice in invoices))
+        return merge_pdfs(documents)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def merge_pdfs(documents: Sequence[bytes]) -> bytes:
+    """Concatenate rendered PDFs, in order, into one document"""
+    writer = PdfWriter()
+    for content in documents:
+        writer.append(io.BytesIO(content))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    writer.close()
+    return buffer.getvalue()
+
+
+_renderer: Optional[InvoicePdfRenderer] = None
+
+
+def get_invoice_pdf_renderer() -> InvoicePdfRenderer:
+    """Process-wide renderer; pool size can be set with INVOICE_PDF_WORKERS"""
+    global _renderer
+    if _renderer is None:
+        workers = os.getenv("INVOICE_PDF_WORKERS")
+        _renderer = InvoicePdfRenderer(max_workers=int(workers) if workers else None)
+    return _renderer
+
+
+def shutdown_invoice_pdf_renderer() -> None:
+    """Stop the worker pool of the process-wide renderer, if one was started"""
+    if _renderer is not None:
+        _renderer.shutdown()
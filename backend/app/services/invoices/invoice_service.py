@@ -1,13 +1,8 @@
+import base64
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 
 from app.domain.entities.invoices import Invoice, InvoiceLine, InvoiceStatus, InvoiceType
 from app.domain.entities.orders import Order, OrderLine, OrderStatus
@@ -24,6 +19,9 @@ from app.domain.exceptions.invoices import (
     InvoicePermissionError,
     InvoiceGenerationError
 )
+from app.services.invoices.invoice_pdf_renderer import get_invoice_pdf_renderer
+from app.infrastucture.database.reference_cache import summary_cache
+from app.infrastucture.logs.logger import default_logger
 
 
 class InvoiceService:
@@ -105,49 +103,111 @@ class InvoiceService:
         invoice_no = await self.invoice_repository.get_next_invoice_number(user.tenant_id, "INV")
 
         # Get tenant currency
-        currency = 'KES'  # Default to KES
-        if self.tenant_service:
-            try:
-                tenant = await self.tenant_service.get_tenant_by_id(str(user.tenant_id))
-                currency = tenant.base_currency
-            except Exception as e:
-                # Log error but continue with default currency
-                print(f"Warning: Could not get tenant currency, using default KES: {e}")
+        currency = await self._get_tenant_currency(user.tenant_id)
 
         # Get customer information
         customer = await self.customer_repository.get_by_id(str(order.customer_id))
         if not customer:
             raise InvoiceNotFoundError(f"Customer {order.customer_id} not found")
-            
-        customer_name = customer.name
+
+        invoice = self._build_invoice_from_order(
+            user=user,
+            order=order,
+            customer=customer,
+            invoice_no=invoice_no,
+            invoice_date=invoice_date,
+            due_date=due_date,
+            currency=currency,
+            payment_terms=payment_terms,
+            invoice_amount=invoice_amount
+        )
+
+        # Save the invoice
+        saved_invoice = await self.invoice_repository.create_invoice(invoice)
+        
+        # Mark as generated (ready for payment)
+        saved_invoice.mark_as_generated(user.id)
+        await self.invoice_repository.update_invoice(str(saved_invoice.id), saved_invoice)
         
-        # Build customer address from addresses list or use a default
-        customer_address = "Address not specified"
-        if customer.addresses and len(customer.addresses) > 0:
-            # Use the first address
-            address = customer.addresses[0]
-            address_parts = []
-            if address.address_line_1:
-                address_parts.append(address.address_line_1)
-            if address.address_line_2:
-                address_parts.append(address.address_line_2)
-            if address.city:
-                address_parts.append(address.city)
-            if address.postal_code:
-                address_parts.append(address.postal_code)
-            if address.country:
-                address_parts.append(address.country)
-            
-            if address_parts:
-                customer_address = ", ".join(address_parts)
+        return saved_invoice
 
-        # Create the invoice
+    async def generate_invoice_pdf(self, invoice: Invoice) -> bytes:
+        """Generate professional PDF content for an invoice with Circl Technologies branding"""
+        return await get_invoice_pdf_renderer().render(invoice)
+
+    async def generate_invoices_pdf_bundle(self, user: User, invoice_ids: List[str], merge: bool = False) -> bytes:
+        """
+        Render many invoices in one job.
+
+        Returns a zip with one PDF per invoice, or a single merged PDF when
+        merge=True. Unknown invoice ids raise InvoiceNotFoundError.
+        """
+        invoices = await self.invoice_repository.get_invoices_by_ids(invoice_ids, user.tenant_id)
+        found = {str(invoice.id) for invoice in invoices}
+        missing = [invoice_id for invoice_id in invoice_ids if invoice_id not in found]
+        if missing:
+            raise InvoiceNotFoundError(f"Invoice {missing[0]} not found")
+
+        # Keep the requested order in the bundle
+        position = {invoice_id: index for index, invoice_id in enumerate(invoice_ids)}
+        invoices.sort(key=lambda invoice: position[str(invoice.id)])
+
+        renderer = get_invoice_pdf_renderer()
+        if merge:
+            return await renderer.render_merged(invoices)
+        return await renderer.render_zip(invoices)
+
+    async def _get_tenant_currency(self, tenant_id: UUID) -> str:
+        """Tenant base currency, KES when the tenant cannot be loaded"""
+        if self.tenant_service:
+            try:
+                tenant = await self.tenant_service.get_tenant_by_id(str(tenant_id))
+                return tenant.base_currency
+            except Exception as e:
+                default_logger.warning(
+                    "Could not get tenant currency, using default KES",
+                    tenant_id=str(tenant_id),
+                    error=str(e)
+                )
+        return 'KES'
+
+    def _format_customer_address(self, customer: Customer) -> str:
+        """Billing address from the customer's first address"""
+        if not customer.addresses:
+            return "Address not specified"
+
+        address = customer.addresses[0]
+        address_parts = [
+            part for part in (
+                address.address_line_1,
+                address.address_line_2,
+                address.city,
+                address.postal_code,
+                address.country
+            )
+            if part
+        ]
+        return ", ".join(address_parts) if address_parts else "Address not specified"
+
+    def _build_invoice_from_order(
+        self,
+        user: User,
+        order: Order,
+        customer: Customer,
+        invoice_no: str,
+        invoice_date: date,
+        due_date: date,
+        currency: str,
+        payment_terms: Optional[str] = None,
+        invoice_amount: Optional[float] = None
+    ) -> Invoice:
+        """Build an invoice and its lines in memory from an order"""
         invoice = Invoice.create(
             tenant_id=user.tenant_id,
             invoice_no=invoice_no,
             customer_id=order.customer_id,
-            customer_name=customer_name,
-            customer_address=customer_address,
+            customer_name=customer.name,
+            customer_address=self._format_customer_address(customer),
             invoice_date=invoice_date,
             due_date=due_date,
             order_id=order.id,
@@ -157,12 +217,9 @@ class InvoiceService:
             created_by=user.id
         )
 
-        # Convert order lines to invoice lines
-        print(f"DEBUG: invoice_amount received: {invoice_amount}, type: {type(invoice_amount)}")
         if invoice_amount and invoice_amount > 0:
-            print(f"DEBUG: Creating invoice with custom amount: {invoice_amount}")
             # If a specific invoice amount is provided, create a single line with that amount (no tax)
-            invoice_line = InvoiceLine.create(
+            invoice.add_line(InvoiceLine.create(
                 invoice_id=invoice.id,
                 order_line_id=None,
                 description=f"Invoice for Order {order.order_no}",
@@ -171,14 +228,11 @@ class InvoiceService:
                 tax_code='TX_STD',
                 tax_rate=Decimal('0.00'),  # No tax - amount is already inclusive
                 component_type='STANDARD'
-            )
-            invoice.add_line(invoice_line)
-            print(f"DEBUG: Invoice line created with unit_price: {invoice_line.unit_price}")
+            ))
         else:
-            print(f"DEBUG: Using original order lines, invoice_amount was: {invoice_amount}")
             # Use original order lines
             for order_line in order.order_lines:
-                invoice_line = InvoiceLine.create(
+                invoice.add_line(InvoiceLine.create(
                     invoice_id=invoice.id,
                     order_line_id=order_line.id,
                     description=self._generate_line_description(order_line),
@@ -188,336 +242,13 @@ class InvoiceService:
                     tax_rate=order_line.tax_rate,
                     component_type=order_line.component_type,
                     variant_sku=order_line.variant_id  # Would get SKU from variant service
-                )
-                invoice.add_line(invoice_line)
+                ))
 
         # Set delivery date from order
-        if hasattr(order, 'delivery_date') and order.delivery_date:
+        if getattr(order, 'delivery_date', None):
             invoice.delivery_date = order.delivery_date
 
-        # Save the invoice
-        saved_invoice = await self.invoice_repository.create_invoice(invoice)
-        print(f"DEBUG: Invoice saved with total_amount: {saved_invoice.total_amount}")
-        print(f"DEBUG: Invoice lines count: {len(saved_invoice.invoice_lines)}")
-        for i, line in enumerate(saved_invoice.invoice_lines):
-            print(f"DEBUG: Line {i}: unit_price={line.unit_price}, line_total={line.line_total}")
-        
-        # Mark as generated (ready for payment)
-        saved_invoice.mark_as_generated(user.id)
-        await self.invoice_repository.update_invoice(str(saved_invoice.id), saved_invoice)
-        
-        return saved_invoice
-
-    async def generate_invoice_pdf(self, invoice: Invoice) -> bytes:
-        """Generate professional PDF content for an invoice with Circl Technologies branding"""
-        # Create a buffer to store the PDF
-        buffer = io.BytesIO()
-        
-        # Create the PDF document with margins
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=A4,
-            leftMargin=1*inch,
-            rightMargin=1*inch,
-            topMargin=1*inch,
-            bottomMargin=1*inch
-        )
-        story = []
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        company_style = ParagraphStyle(
-            'CompanyStyle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=5,
-            alignment=1,  # Center
-            textColor=colors.HexColor('#1e40af')  # Blue color
-        )
-        
-        tagline_style = ParagraphStyle(
-            'TaglineStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            spaceAfter=20,
-            alignment=1,  # Center
-            textColor=colors.HexColor('#6b7280')  # Gray color
-        )
-        
-        invoice_title_style = ParagraphStyle(
-            'InvoiceTitle',
-            parent=styles['Heading1'],
-            fontSize=28,
-            spaceAfter=30,
-            alignment=1,  # Center
-            textColor=colors.HexColor('#1f2937')  # Dark gray
-        )
-        
-        section_style = ParagraphStyle(
-            'SectionStyle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10,
-            textColor=colors.HexColor('#374151')  # Medium gray
-        )
-        
-        # Header with company branding
-        story.append(Paragraph("CIRCL TECHNOLOGIES", company_style))
-        story.append(Paragraph("Innovative Solutions for Tomorrow", tagline_style))
-        
-        # Company information
-        company_info = [
-            "123 Innovation Drive, Tech Park",
-            "Dublin, Ireland D01 1234",
-            "Phone: +353 1 234 5678",
-            "Email: info@circl.team",
-            "Website: www.circl.team",
-            "VAT Number: IE1234567A"
-        ]
-        
-        for info in company_info:
-            story.append(Paragraph(info, styles['Normal']))
-        
-        story.append(Spacer(1, 30))
-        
-        # Invoice title and number
-        story.append(Paragraph(f"INVOICE #{invoice.invoice_no}", invoice_title_style))
-        
-        # Invoice details in a table
-        invoice_details_data = [
-            ['Invoice Date:', invoice.invoice_date.strftime('%B %d, %Y')],
-            ['Due Date:', invoice.due_date.strftime('%B %d, %Y')],
-            ['Invoice Status:', invoice.invoice_status.value.upper()],
-            ['Currency:', invoice.currency]
-        ]
-        
-        invoice_details_table = Table(invoice_details_data, colWidths=[2*inch, 3*inch])
-        invoice_details_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        story.append(invoice_details_table)
-        story.append(Spacer(1, 20))
-        
-        # Bill To section
-        story.append(Paragraph("BILL TO:", section_style))
-        story.append(Paragraph(invoice.customer_name, styles['Normal']))
-        story.append(Paragraph(invoice.customer_address, styles['Normal']))
-        if invoice.customer_tax_id:
-            story.append(Paragraph(f"Tax ID: {invoice.customer_tax_id}", styles['Normal']))
-        
-        story.append(Spacer(1, 20))
-        
-
-        
-        # Invoice lines table
-        if invoice.invoice_lines:
-            # Prepare table data with better formatting
-            table_data = [
-                ['Item', 'Description', 'Qty', 'Unit Price', 'Tax Rate', 'Tax Amount', 'Line Total']
-            ]
-            
-            for i, line in enumerate(invoice.invoice_lines, 1):
-                table_data.append([
-                    str(i),
-                    line.description,
-                    str(line.quantity),
-                    f"€{line.unit_price:.2f}",
-                    f"{line.tax_rate:.1f}%",
-                    f"€{line.tax_amount:.2f}",
-                    f"€{line.gross_amount:.2f}"
-                ])
-            
-            # Create table with better styling
-            table = Table(table_data, colWidths=[0.5*inch, 2.5*inch, 0.6*inch, 1*inch, 0.8*inch, 1*inch, 1.2*inch])
-            table.setStyle(TableStyle([
-                # Header styling
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('TOPPADDING', (0, 0), (-1, 0), 12),
-                
-                # Data rows styling
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Description left-aligned
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ]))
-            
-            story.append(table)
-            story.append(Spacer(1, 20))
-            
-            # Summary table
-            summary_data = [
-                ['', ''],
-                ['Subtotal:', f"€{invoice.subtotal:.2f}"],
-                ['Tax Total:', f"€{invoice.total_tax:.2f}"],
-                ['', ''],
-                ['Total Amount:', f"€{invoice.total_amount:.2f}"],
-                ['Amount Paid:', f"€{invoice.paid_amount:.2f}"],
-                ['', ''],
-                ['Balance Due:', f"€{invoice.balance_due:.2f}"]
-            ]
-            
-            summary_table = Table(summary_data, colWidths=[4*inch, 2*inch])
-            summary_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                ('FONTNAME', (0, -3), (1, -3), 'Helvetica-Bold'),  # Total Amount
-                ('FONTNAME', (0, -1), (1, -1), 'Helvetica-Bold'),  # Balance Due
-                ('FONTSIZE', (0, -3), (1, -3), 16),  # Larger font for total
-                ('FONTSIZE', (0, -1), (1, -1), 16),  # Larger font for balance
-                ('TEXTCOLOR', (0, -3), (1, -3), colors.HexColor('#1e40af')),  # Blue for total
-                ('TEXTCOLOR', (0, -1), (1, -1), colors.HexColor('#dc2626')),  # Red for balance due
-                ('BACKGROUND', (0, -3), (1, -3), colors.HexColor('#eff6ff')),  # Light blue background for total
-                ('BACKGROUND', (0, -1), (1, -1), colors.HexColor('#fef2f2')),  # Light red background for balance
-                ('GRID', (0, -3), (1, -3), 1, colors.HexColor('#1e40af')),  # Border for total
-                ('GRID', (0, -1), (1, -1), 1, colors.HexColor('#dc2626')),  # Border for balance
-            ]))
-            
-            story.append(summary_table)
-            story.append(Spacer(1, 30))
-        
-        # Summary table (always show, even without invoice lines)
-        if not invoice.invoice_lines:
-            summary_data = [
-                ['', ''],
-                ['Subtotal:', f"€{invoice.subtotal:.2f}"],
-                ['Tax Total:', f"€{invoice.total_tax:.2f}"],
-                ['', ''],
-                ['Total Amount:', f"€{invoice.total_amount:.2f}"],
-                ['Amount Paid:', f"€{invoice.paid_amount:.2f}"],
-                ['', ''],
-                ['Balance Due:', f"€{invoice.balance_due:.2f}"]
-            ]
-            
-            summary_table = Table(summary_data, colWidths=[4*inch, 2*inch])
-            summary_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                ('FONTNAME', (0, -3), (1, -3), 'Helvetica-Bold'),  # Total Amount
-                ('FONTNAME', (0, -1), (1, -1), 'Helvetica-Bold'),  # Balance Due
-                ('FONTSIZE', (0, -3), (1, -3), 16),  # Larger font for total
-                ('FONTSIZE', (0, -1), (1, -1), 16),  # Larger font for balance
-                ('TEXTCOLOR', (0, -3), (1, -3), colors.HexColor('#1e40af')),  # Blue for total
-                ('TEXTCOLOR', (0, -1), (1, -1), colors.HexColor('#dc2626')),  # Red for balance due
-                ('BACKGROUND', (0, -3), (1, -3), colors.HexColor('#eff6ff')),  # Light blue background for total
-                ('BACKGROUND', (0, -1), (1, -1), colors.HexColor('#fef2f2')),  # Light red background for balance
-                ('GRID', (0, -3), (1, -3), 1, colors.HexColor('#1e40af')),  # Border for total
-                ('GRID', (0, -1), (1, -1), 1, colors.HexColor('#dc2626')),  # Border for balance
-            ]))
-            
-            story.append(summary_table)
-            story.append(Spacer(1, 30))
-        
-        # Payment information with professional styling
-        story.append(Paragraph("PAYMENT INFORMATION", section_style))
-        
-        payment_info_data = [
-            ['Bank:', 'AIB Bank'],
-            ['Account Name:', 'Circl Technologies Ltd'],
-            ['Account Number:', '12345678'],
-            ['IBAN:', 'IE64AIBK12345678901234'],
-            ['BIC:', 'AIBKIE2D'],
-            ['Reference:', invoice.invoice_no]
-        ]
-        
-        payment_table = Table(payment_info_data, colWidths=[2*inch, 4*inch])
-        payment_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),  # Light gray background for labels
-        ]))
-        
-        story.append(payment_table)
-        story.append(Spacer(1, 25))
-        
-        # Terms and conditions
-        if invoice.payment_terms:
-            story.append(Paragraph("PAYMENT TERMS", section_style))
-            story.append(Paragraph(invoice.payment_terms, styles['Normal']))
-            story.append(Spacer(1, 20))
-        
-        # Notes
-        if invoice.notes:
-            story.append(Paragraph("NOTES", section_style))
-            story.append(Paragraph(invoice.notes, styles['Normal']))
-            story.append(Spacer(1, 20))
-        
-        # Professional footer with styling
-        story.append(Spacer(1, 40))
-        
-        # Add a separator line
-        separator = Table([['']], colWidths=[6*inch])
-        separator.setStyle(TableStyle([
-            ('LINEABOVE', (0, 0), (0, 0), 1, colors.HexColor('#e5e7eb')),
-        ]))
-        story.append(separator)
-        story.append(Spacer(1, 20))
-        
-        footer_style = ParagraphStyle(
-            'FooterStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,  # Center
-            textColor=colors.HexColor('#6b7280'),  # Gray color
-            fontName='Helvetica'
-        )
-        
-        footer_bold_style = ParagraphStyle(
-            'FooterBoldStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            alignment=1,  # Center
-            textColor=colors.HexColor('#1e40af'),  # Blue color
-            fontName='Helvetica-Bold'
-        )
-        
-        story.append(Paragraph("Thank you for your business!", footer_bold_style))
-        story.append(Paragraph("Circl Technologies - Innovative Solutions for Tomorrow", footer_style))
-        story.append(Paragraph("For any questions, please contact us at info@circl.team", footer_style))
-        
-        # Build the PDF
-        doc.build(story)
-        
-        # Get the PDF content
-        pdf_content = buffer.getvalue()
-        buffer.close()
-        
-        return pdf_content
+        return invoice
 
     def _generate_line_description(self, order_line: OrderLine) -> str:
         """Generate a description for an invoice line based on order line"""
@@ -759,10 +490,12 @@ class InvoiceService:
         )
 
     async def get_invoice_summary(self, user: User) -> Dict[str, Any]:
-        """Get optimized invoice summary statistics (single query)"""
-        
-        # Use optimized repository method that does everything in one query
-        return await self.invoice_repository.get_invoice_summary(user.tenant_id)
+        """Get invoice summary statistics (aggregated in the database, cached per tenant)"""
+        summary = summary_cache.get(user.tenant_id, "invoices")
+        if summary is None:
+            summary = await self.invoice_repository.get_invoice_summary(user.tenant_id)
+            summary_cache.set(user.tenant_id, "invoices", summary)
+        return summary
 
     # ============================================================================
     # BULK OPERATIONS
@@ -772,66 +505,152 @@ class InvoiceService:
         self,
         user: User,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[Order]:
-        """Get orders that are ready for invoicing (delivered or closed) and don't have invoices yet"""
-        
-        # Get all delivered or closed orders
-        orders = await self.order_repository.get_orders_by_statuses(
-            [OrderStatus.DELIVERED, OrderStatus.CLOSED],
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Order], Optional[str]]:
+        """
+        Get delivered or closed orders that have no paid invoice yet.
+
+        Filtering happens in the database with an anti-join, so every page is
+        full. Pass the returned cursor to get the next page; offset is only
+        used when no cursor is given. Raises ValueError for a malformed cursor.
+        """
+        orders = await self.order_repository.get_orders_ready_for_invoicing(
             user.tenant_id,
-            limit=limit * 2,  # Get more to account for filtering
+            limit=limit,
+            after=self._decode_order_cursor(cursor) if cursor else None,
             offset=offset
         )
-        
-        # Filter out orders that already have invoices or are already paid
-        orders_ready_for_invoicing = []
-        for order in orders:
-            # Check if order already has an invoice
-            existing_invoices = await self.invoice_repository.get_invoices_by_order(
-                order_id=order.id,
-                tenant_id=user.tenant_id
-            )
-            
-            # Check if any existing invoice is already paid
-            has_paid_invoice = False
-            if existing_invoices:
-                for invoice in existing_invoices:
-                    if invoice.invoice_status == InvoiceStatus.PAID:
-                        has_paid_invoice = True
-                        break
-            
-            # Only include orders that don't have any invoices OR don't have paid invoices
-            if not existing_invoices or not has_paid_invoice:
-                orders_ready_for_invoicing.append(order)
-                
-                # Stop if we have enough orders
-                if len(orders_ready_for_invoicing) >= limit:
-                    break
-        
-        return orders_ready_for_invoicing
+
+        next_cursor = None
+        if len(orders) == limit:
+            last = orders[-1]
+            next_cursor = self._encode_order_cursor(last.created_at, last.id)
+
+        return orders, next_cursor
+
+    @staticmethod
+    def _encode_order_cursor(created_at: datetime, order_id: UUID) -> str:
+        raw = f"{created_at.isoformat()}|{order_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_order_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        try:
+            created_at, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), UUID(order_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
 
     async def generate_invoices_for_delivered_orders(
         self,
         user: User,
         order_ids: List[str],
         invoice_date: Optional[date] = None,
-        due_date: Optional[date] = None
-    ) -> List[Invoice]:
-        """Generate invoices for multiple delivered orders"""
-        
-        invoices = []
+        due_date: Optional[date] = None,
+        payment_terms: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate invoices for many delivered orders in one batch.
+
+        Orders, customers and existing invoices are loaded in bulk, invoice
+        numbers are allocated as one block and all invoices are saved with a
+        bulk insert. Orders that cannot be invoiced are reported in "failed"
+        without stopping the run.
+        """
+        if not self.can_create_invoice(user):
+            raise InvoicePermissionError("User does not have permission to create invoices")
+
+        if not invoice_date:
+            invoice_date = date.today()
+        if not due_date:
+            due_date = invoice_date + timedelta(days=30)
+
+        failed: List[Dict[str, Any]] = []
+
+        def fail(order_id: Any, error: str, order_no: Optional[str] = None):
+            failed.append({"order_id": str(order_id), "order_no": order_no, "error": error})
+
+        # Parse and de-duplicate the requested ids, keeping their order
+        requested: Dict[UUID, str] = {}
         for order_id in order_ids:
             try:
-                invoice = await self.generate_invoice_from_order(
-                    user=user,
-                    order_id=order_id,
-                    invoice_date=invoice_date,
-                    due_date=due_date
-                )
-                invoices.append(invoice)
-            except Exception as e:
-                # Log error but continue with other orders
-                print(f"Failed to generate invoice for order {order_id}: {e}")
-        
-        return invoices
\ No newline at end of file
+                requested.setdefault(UUID(str(order_id)), order_id)
+            except ValueError:
+                fail(order_id, "Invalid order ID")
+
+        orders = {
+            order.id: order
+            for order in await self.order_repository.get_orders_by_ids(list(requested))
+            if order.tenant_id == user.tenant_id
+        }
+        invoiced = set(await self.invoice_repository.get_invoiced_order_ids(list(orders), user.tenant_id))
+
+        candidates: List[Order] = []
+        for order_uuid, order_id in requested.items():
+            order = orders.get(order_uuid)
+            if not order:
+                fail(order_id, f"Order {order_id} not found")
+            elif order.order_status not in [OrderStatus.DELIVERED, OrderStatus.CLOSED]:
+                fail(order_id, f"Order must be delivered to generate invoice. Current status: {order.order_status}", order.order_no)
+            elif order_uuid in invoiced:
+                fail(order_id, f"Invoice already exists for order {order.order_no}", order.order_no)
+            else:
+                candidates.append(order)
+
+        customers = {
+            customer.id: customer
+            for customer in await self.customer_repository.get_by_ids(list({order.customer_id for order in candidates}))
+        }
+        ready: List[Order] = []
+        for order in candidates:
+            if order.customer_id in customers:
+                ready.append(order)
+            else:
+                fail(order.id, f"Customer {order.customer_id} not found", order.order_no)
+
+        invoices: List[Invoice] = []
+        if ready:
+            currency = await self._get_tenant_currency(user.tenant_id)
+            invoice_numbers = await self.invoice_repository.get_next_invoice_numbers(user.tenant_id, "INV", len(ready))
+
+            for order, invoice_no in zip(ready, invoice_numbers):
+                try:
+                    invoice = self._build_invoice_from_order(
+                        user=user,
+                        order=order,
+                        customer=customers[order.customer_id],
+                        invoice_no=invoice_no,
+                        invoice_date=invoice_date,
+                        due_date=due_date,
+                        currency=currency,
+                        payment_terms=payment_terms
+                    )
+                    # Saved directly as generated (ready for payment)
+                    invoice.mark_as_generated(user.id)
+                    invoices.append(invoice)
+                except Exception as e:
+                    fail(order.id, f"Failed to build invoice: {str(e)}", order.order_no)
+
+            saved = await self.invoice_repository.create_invoices(invoices)
+            saved_ids = {invoice.id for invoice in saved}
+            for invoice in invoices:
+                if invoice.id not in saved_ids:
+                    fail(invoice.order_id, "Failed to save invoice", invoice.order_no)
+            invoices = saved
+
+        default_logger.info(
+            "Bulk invoice generation finished",
+            tenant_id=str(user.tenant_id),
+            requested_count=len(order_ids),
+            created_count=len(invoices),
+            failed_count=len(failed)
+        )
+
+        return {
+            "invoices": invoices,
+            "failed": failed,
+            "requested_count": len(order_ids),
+            "created_count": len(invoices),
+            "failed_count": len(failed)
+        }
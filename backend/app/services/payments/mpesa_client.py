@@ -0,0 +1,214 @@
+"""
+Async HTTP client for the Safaricom Daraja (M-PESA) API
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("mpesa_client")
+
+SANDBOX_URL = "https://sandbox.safaricom.co.ke"
+PRODUCTION_URL = "https://api.safaricom.co.ke"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Failures before the request reached Daraja, so resending cannot repeat it
+CONNECT_PHASE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class MpesaApiError(Exception):
+    """Raised when Daraja rejects a request or cannot be reached"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: Optional[str] = None):
+        self.message = message
+        self.status_code = status_code
+        self.body = body
+        super().__init__(self.message)
+
+
+class DarajaClient:
+    """
+    Shared, non-blocking Daraja client.
+
+    - one pooled httpx.AsyncClient (keep-alive connections are reused)
+    - the OAuth token is cached and refreshed refresh_margin seconds before
+      it expires; concurrent callers wait for a single refresh
+    - at most max_concurrency requests are in flight at once
+    - idempotent requests (the token and status queries) are retried on
+      transport errors, 429 and 5xx with exponential backoff and jitter;
+      requests that move money or prompt the customer (STK push, B2C) are
+      only retried when the connection was never made, because Daraja may
+      have accepted a request whose response was lost. Those failures are
+      left to the reconciliation of pending payments
+    - a 401 drops the cached token and retries once with a new one
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        consumer_key: Optional[str],
+        consumer_secret: Optional[str],
+        max_concurrency: int = 20,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        timeout: float = 30.0,
+        refresh_margin: int = 300,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+        self._transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock = asyncio.Lock()
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                transport=self._transport
+            )
+        return self._client
+
+    async def get_access_token(self, force_refresh: bool = False) -> str:
+        """Cached OAuth token, refreshed shortly before expiry"""
+        if not force_refresh and self._token_is_fresh():
+            return self._access_token
+
+        async with self._token_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not force_refresh and self._token_is_fresh():
+                return self._access_token
+
+            response = await self._send(
+                "GET",
+                "/oauth/v1/generate",
+                params={"grant_type": "client_credentials"},
+                auth=(self.consumer_key or "", self.consumer_secret or "")
+            )
+            if response.status_code != 200:
+                logger.error(f"Failed to get M-PESA access token: {response.status_code} - {response.text}")
+                raise MpesaApiError(
+                    f"M-PESA authentication failed: {response.status_code}",
+                    status_code=response.status_code,
+                    body=response.text
+                )
+
+            data = response.json()
+            self._access_token = data.get("access_token")
+            expires_in = int(data.get("expires_in") or 3599)
+            self._token_expires_at = time.monotonic() + expires_in
+            logger.info("M-PESA access token obtained successfully")
+            return self._access_token
+
+    def _token_is_fresh(self) -> bool:
+        return bool(self._access_token) and time.monotonic() < self._token_expires_at - self.refresh_margin
+
+    async def post(self, path: str, payload: Dict[str, Any], idempotent: bool = False) -> Dict[str, Any]:
+        """
+        POST an authenticated JSON request and return the decoded response.
+        Only pass idempotent=True for requests that are safe to repeat, such as status queries.
+        """
+        token = await self.get_access_token()
+        response = await self._send(
+            "POST", path, idempotent=idempotent, json=payload, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code == 401:
+            # A rejected token means the request was not processed, so it is safe to resend
+            token = await self.get_access_token(force_refresh=True)
+            response = await self._send(
+                "POST", path, idempotent=idempotent, json=payload, headers={"Authorization": f"Bearer {token}"}
+            )
+
+        if response.status_code != 200:
+            raise MpesaApiError(
+                f"M-PESA request to {path} failed: {response.status_code}",
+                status_code=response.status_code,
+                body=response.text
+            )
+        return response.json()
+
+    async def _send(self, method: str, path: str, idempotent: bool = True, **kwargs) -> httpx.Response:
+        """
+        Send with bounded concurrency, retrying transient failures. Requests
+        that are not idempotent are only retried when they never reached Daraja.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self._get_client().request(method, path, **kwargs)
+                if (
+                    not idempotent
+                    or response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                retryable = idempotent or isinstance(e, CONNECT_PHASE_ERRORS)
+                if not retryable or attempt >= self.max_retries:
+                    raise MpesaApiError(f"M-PESA request to {path} failed: {str(e)}")
+                reason = type(e).__name__
+
+            delay = self._backoff_delay(attempt)
+            logger.warning(f"Retrying M-PESA request to {path} in {delay:.2f}s ({reason})")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # Full jitter keeps retries from many workers from synchronising
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_daraja_client: Optional[DarajaClient] = None
+
+
+def get_daraja_client() -> DarajaClient:
+    """Process-wide Daraja client configured from settings"""
+    global _daraja_client
+    if _daraja_client is None:
+        environment = settings.mpesa_environment or "sandbox"
+        _daraja_client = DarajaClient(
+            base_url=PRODUCTION_URL if environment == "production" else SANDBOX_URL,
+            consumer_key=settings.mpesa_consumer_key,
+            consumer_secret=settings.mpesa_consumer_secret
+        )
+    return _daraja_client
+
+
+async def close_daraja_client() -> None:
+    global _daraja_client
+    if _daraja_client is not None:
+        await _daraja_client.aclose()
+        _daraja_client = None
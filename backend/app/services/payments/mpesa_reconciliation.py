@@ -0,0 +1,370 @@
+"""
+Background reconciliation of pending M-PESA STK push payments
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from decouple import config
+
+from app.domain.entities.invoices import InvoiceStatus
+from app.domain.entities.orders import OrderStatus
+from app.domain.entities.payments import PaymentStatus
+from app.domain.repositories.order_repository import OrderRepository
+from app.domain.repositories.payment_repository import PaymentRepository
+from app.infrastucture.logs.logger import get_logger
+from app.services.payments.mpesa_service import MpesaService
+
+logger = get_logger("mpesa_reconciliation")
+
+GATEWAY_PROVIDER = "mpesa"
+
+
+@dataclass
+class PendingCheckout:
+    """A checkout request waiting for its final M-PESA result"""
+    checkout_request_id: str
+    payment_id: UUID
+    first_seen: float
+    next_check_at: float
+    attempts: int = 0
+
+
+@dataclass
+class ReconciliationRepositories:
+    """Repositories used for one reconciliation batch"""
+    payments: PaymentRepository
+    orders: OrderRepository
+
+
+@asynccontextmanager
+async def _database_repositories() -> AsyncIterator[ReconciliationRepositories]:
+    """Repositories on a fresh database session, outside any request"""
+    from app.services.dependencies.common import get_db_session
+    from app.infrastucture.database.payment_repository_impl import PaymentRepositoryImpl
+    from app.infrastucture.database.repositories.order_repository import SQLAlchemyOrderRepository
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        yield ReconciliationRepositories(
+            payments=PaymentRepositoryImpl(session),
+            orders=SQLAlchemyOrderRepository(session)
+        )
+    finally:
+        await sessions.aclose()
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class MpesaReconciliationWorker:
+    """
+    Resolves pending STK pushes without relying on callbacks or client polling.
+
+    Checkout requests sit in a heap ordered by their next check time. Each pass
+    takes the due entries (at most batch_size), queries Daraja for them at no
+    more than requests_per_second, and then:
+    - finalises completed/failed payments and applies the completed ones to
+      their invoices in one transaction
+    - closes delivered orders whose invoice became paid
+    - reschedules requests that are still processing with exponential backoff
+
+    Pending payments are re-seeded from the database every seed_interval seconds,
+    which picks up checkouts whose callback never arrived or that were started
+    by another process. Requests older than max_age are dropped from the queue
+    and left pending for manual review.
+    """
+
+    def __init__(
+        self,
+        mpesa_service: Optional[MpesaService] = None,
+        repositories: Callable[[], Any] = _database_repositories,
+        batch_size: int = 20,
+        requests_per_second: float = 5.0,
+        initial_delay: float = 20.0,
+        backoff_base: float = 15.0,
+        backoff_max: float = 600.0,
+        max_age: float = 24 * 3600,
+        seed_interval: float = 300.0,
+        idle_interval: float = 5.0
+    ):
+        self._mpesa_service = mpesa_service
+        self.repositories = repositories
+        self.batch_size = batch_size
+        self.initial_delay = initial_delay
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_age = max_age
+        self.seed_interval = seed_interval
+        self.idle_interval = idle_interval
+
+        self._rate_limiter = _RateLimiter(requests_per_second)
+        self._pending: Dict[str, PendingCheckout] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def mpesa_service(self) -> MpesaService:
+        if self._mpesa_service is None:
+            self._mpesa_service = MpesaService()
+        return self._mpesa_service
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    def track(self, checkout_request_id: str, payment_id: UUID, age: float = 0.0) -> None:
+        """Start tracking a checkout request; the first check waits initial_delay"""
+        if not checkout_request_id or checkout_request_id in self._pending:
+            return
+        now = time.monotonic()
+        checkout = PendingCheckout(
+            checkout_request_id=checkout_request_id,
+            payment_id=payment_id,
+            first_seen=now - age,
+            next_check_at=now + max(0.0, self.initial_delay - age)
+        )
+        self._pending[checkout_request_id] = checkout
+        self._schedule(checkout)
+
+    def expedite(self, checkout_request_id: str) -> None:
+        """Check a tracked request on the next pass"""
+        checkout = self._pending.get(checkout_request_id)
+        if checkout is None:
+            return
+        checkout.next_check_at = time.monotonic()
+        self._schedule(checkout)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _schedule(self, checkout: PendingCheckout) -> None:
+        # Superseded heap entries are skipped when popped
+        heapq.heappush(self._queue, (checkout.next_check_at, next(self._sequence), checkout.checkout_request_id))
+
+    def _pop_due(self, now: float) -> List[PendingCheckout]:
+        due = []
+        while self._queue and len(due) < self.batch_size and self._queue[0][0] <= now:
+            check_at, _, checkout_request_id = heapq.heappop(self._queue)
+            checkout = self._pending.get(checkout_request_id)
+            if checkout is None or checkout.next_check_at != check_at:
+                continue
+            due.append(checkout)
+        return due
+
+    def _reschedule(self, checkout: PendingCheckout, now: float) -> None:
+        checkout.attempts += 1
+        if now - checkout.first_seen >= self.max_age:
+            del self._pending[checkout.checkout_request_id]
+            logger.warning(
+                "M-PESA checkout still unresolved, left pending for review",
+                checkout_request_id=checkout.checkout_request_id,
+                payment_id=str(checkout.payment_id),
+                attempts=checkout.attempts
+            )
+            return
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (checkout.attempts - 1)))
+        checkout.next_check_at = now + delay
+        self._schedule(checkout)
+
+    def seconds_until_next_check(self) -> Optional[float]:
+        while self._queue:
+            check_at, _, checkout_request_id = self._queue[0]
+            checkout = self._pending.get(checkout_request_id)
+            if checkout is not None and checkout.next_check_at == check_at:
+                return max(0.0, check_at - time.monotonic())
+            heapq.heappop(self._queue)
+        return None
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    async def seed(self) -> int:
+        """Track pending M-PESA payments from the database; returns how many were added"""
+        created_after = datetime.utcnow() - timedelta(seconds=self.max_age)
+        async with self.repositories() as repositories:
+            payments = await repositories.payments.get_pending_gateway_payments(
+                gateway_provider=GATEWAY_PROVIDER,
+                created_after=created_after
+            )
+
+        before = len(self._pending)
+        now = datetime.utcnow()
+        for payment in payments:
+            age = (now - payment.created_at).total_seconds() if payment.created_at else 0.0
+            self.track(payment.external_transaction_id, payment.id, age=max(0.0, age))
+        return len(self._pending) - before
+
+    async def run_once(self) -> Dict[str, int]:
+        """Check every due request once and persist the final results"""
+        due = self._pop_due(time.monotonic())
+        if not due:
+            return {"checked": 0, "completed": 0, "failed": 0, "pending": 0}
+
+        results = await asyncio.gather(*(self._query(checkout) for checkout in due))
+
+        now = time.monotonic()
+        outcomes: Dict[UUID, Tuple[PaymentStatus, Dict[str, Any]]] = {}
+        resolved: List[PendingCheckout] = []
+        for checkout, result in zip(due, results):
+            status = self._classify(result)
+            if status is None:
+                self._reschedule(checkout, now)
+            else:
+                outcomes[checkout.payment_id] = (status, result)
+                resolved.append(checkout)
+
+        if outcomes:
+            try:
+                await self._apply(outcomes)
+            except Exception as e:
+                logger.error(f"Failed to persist M-PESA reconciliation results: {str(e)}")
+                for checkout in resolved:
+                    self._reschedule(checkout, now)
+                raise
+            for checkout in resolved:
+                self._pending.pop(checkout.checkout_request_id, None)
+
+        completed = sum(1 for status, _ in outcomes.values() if status == PaymentStatus.COMPLETED)
+        return {
+            "checked": len(due),
+            "completed": completed,
+            "failed": len(outcomes) - completed,
+            "pending": len(due) - len(outcomes)
+        }
+
+    async def _query(self, checkout: PendingCheckout) -> Dict[str, Any]:
+        await self._rate_limiter.acquire()
+        return await self.mpesa_service.check_transaction_status(checkout.checkout_request_id)
+
+    @staticmethod
+    def _classify(result: Dict[str, Any]) -> Optional[PaymentStatus]:
+        """Final status for a status query result, None while it is still processing"""
+        # Daraja answers requests that are still in flight with an error instead of a ResultCode
+        if not result.get("success") or result.get("result_code") is None:
+            return None
+        if str(result["result_code"]) == "0":
+            return PaymentStatus.COMPLETED
+        return PaymentStatus.FAILED
+
+    async def _apply(self, outcomes: Dict[UUID, Tuple[PaymentStatus, Dict[str, Any]]]) -> None:
+        async with self.repositories() as repositories:
+            payments, updated_invoices = await repositories.payments.finalize_gateway_payments(outcomes)
+
+            paid_order_ids = list({
+                row["order_id"] for row in updated_invoices
+                if row["order_id"] and InvoiceStatus(row["invoice_status"]) == InvoiceStatus.PAID
+            })
+            closed_orders = []
+            if paid_order_ids:
+                try:
+                    closed_orders = await repositories.orders.bulk_transition_orders(
+                        order_ids=paid_order_ids,
+                        from_status=OrderStatus.DELIVERED,
+                        to_status=OrderStatus.CLOSED
+                    )
+                except Exception as e:
+                    # Payments and invoices are committed; orders can still be closed individually
+                    logger.error(f"Failed to close orders after M-PESA reconciliation: {str(e)}")
+
+        logger.info(
+            "M-PESA reconciliation batch applied",
+            payments=len(payments),
+            invoices=len(updated_invoices),
+            closed_orders=len(closed_orders)
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        """Reconcile until stop() is called"""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        next_seed = 0.0
+
+        while not self._stopping:
+            try:
+                if time.monotonic() >= next_seed:
+                    added = await self.seed()
+                    if added:
+                        logger.info(f"Tracking {added} pending M-PESA checkouts from the database")
+                    next_seed = time.monotonic() + self.seed_interval
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"M-PESA reconciliation pass failed: {str(e)}")
+
+            wait = self.seconds_until_next_check()
+            wait = self.idle_interval if wait is None else min(wait, self.idle_interval)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+_worker: Optional[MpesaReconciliationWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def get_mpesa_reconciliation_worker() -> MpesaReconciliationWorker:
+    """Process-wide reconciliation worker configured from the environment"""
+    global _worker
+    if _worker is None:
+        _worker = MpesaReconciliationWorker(
+            batch_size=config("MPESA_RECONCILIATION_BATCH_SIZE", default=20, cast=int),
+            requests_per_second=config("MPESA_RECONCILIATION_RATE", default=5.0, cast=float)
+        )
+    return _worker
+
+
+def start_mpesa_reconciliation() -> asyncio.Task:
+    global _worker_task
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(get_mpesa_reconciliation_worker().run())
+    return _worker_task
+
+
+async def stop_mpesa_reconciliation() -> None:
+    global _worker_task
+    if _worker is not None:
+        _worker.stop()
+    if _worker_task is not None:
+        try:
+            await asyncio.wait_for(_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            _worker_task.cancel()
+        _worker_task = None
@@ -3,17 +3,13 @@ M-PESA Service for handling mobile money payments
 """
 
 import base64
-import hashlib
-import json
-import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from decimal import Decimal
-import requests
-from requests.auth import HTTPBasicAuth
 
 from app.core.config import settings
 from app.infrastucture.logs.logger import get_logger
+from app.services.payments.mpesa_client import DarajaClient, get_daraja_client
 
 logger = get_logger("mpesa_service")
 
@@ -21,52 +17,18 @@ logger = get_logger("mpesa_service")
 class MpesaService:
     """M-PESA payment service for mobile money transactions"""
     
-    def __init__(self):
-        self.consumer_key = settings.mpesa_consumer_key
-        self.consumer_secret = settings.mpesa_consumer_secret
+    def __init__(self, client: Optional[DarajaClient] = None):
         self.shortcode = settings.mpesa_shortcode or "174379"  # Default sandbox shortcode
         self.passkey = settings.mpesa_passkey or "bfb279f9aa9bdbcf158e97dd71a467cd2e0c893059b10f78e6b72ada1ed2c919"
         self.environment = settings.mpesa_environment or "sandbox"  # sandbox or production
         
-        # Base URLs
-        if self.environment == "production":
-            self.base_url = "https://api.safaricom.co.ke"
-        else:
-            self.base_url = "https://sandbox.safaricom.co.ke"
-        
-        self.access_token = None
-        self.token_expiry = None
+        # Shared pooled client: connections and the access token outlive this service instance
+        self.client = client or get_daraja_client()
     
     async def get_access_token(self) -> str:
-        """Get M-PESA access token"""
+        """Get M-PESA access token (cached by the shared client until shortly before expiry)"""
         try:
-            # Check if we have a valid token
-            if self.access_token and self.token_expiry and datetime.now() < self.token_expiry:
-                return self.access_token
-            
-            # Get new token
-            url = f"{self.base_url}/oauth/v1/generate?grant_type=client_credentials"
-            
-            response = requests.get(
-                url,
-                auth=HTTPBasicAuth(self.consumer_key, self.consumer_secret),
-                headers={'Content-Type': 'application/json'}
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get M-PESA access token: {response.status_code} - {response.text}")
-                raise Exception(f"M-PESA authentication failed: {response.status_code}")
-            
-            data = response.json()
-            self.access_token = data.get('access_token')
-            
-            # Set expiry (tokens typically last 1 hour)
-            from datetime import timedelta
-            self.token_expiry = datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=55)  # 5 min buffer
-            
-            logger.info("M-PESA access token obtained successfully")
-            return self.access_token
-            
+            return await self.client.get_access_token()
         except Exception as e:
             logger.error(f"Error getting M-PESA access token: {str(e)}")
             raise Exception(f"Failed to authenticate with M-PESA: {str(e)}")
@@ -99,9 +61,6 @@ class MpesaService:
     ) -> Dict[str, Any]:
         """Initiate STK Push for payment"""
         try:
-            # Get access token
-            access_token = await self.get_access_token()
-            
             # Generate timestamp and password
             timestamp = self.generate_timestamp()
             password = self.generate_password(self.shortcode, self.passkey, timestamp)
@@ -124,22 +83,9 @@ class MpesaService:
                 "TransactionDesc": description
             }
             
-            # Make API call
-            url = f"{self.base_url}/mpesa/stkpush/v1/processrequest"
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
             logger.info(f"Initiating M-PESA STK Push for {formatted_phone}, amount: {amount}")
             
-            response = requests.post(url, json=payload, headers=headers)
-            
-            if response.status_code != 200:
-                logger.error(f"M-PESA STK Push failed: {response.status_code} - {response.text}")
-                raise Exception(f"M-PESA STK Push failed: {response.status_code}")
-            
-            result = response.json()
+            result = await self.client.post("/mpesa/stkpush/v1/processrequest", payload)
             
             # Log the response
             logger.info(f"M-PESA STK Push initiated successfully: {result.get('CheckoutRequestID')}")
@@ -167,9 +113,6 @@ class MpesaService:
     async def check_transaction_status(self, checkout_request_id: str) -> Dict[str, Any]:
         """Check transaction status using CheckoutRequestID"""
         try:
-            # Get access token
-            access_token = await self.get_access_token()
-            
             # Generate timestamp and password
             timestamp = self.generate_timestamp()
             password = self.generate_password(self.shortcode, self.passkey, timestamp)
@@ -182,22 +125,9 @@ class MpesaService:
                 "CheckoutRequestID": checkout_request_id
             }
             
-            # Make API call
-            url = f"{self.base_url}/mpesa/stkpushquery/v1/query"
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
             logger.info(f"Checking M-PESA transaction status for: {checkout_request_id}")
             
-            response = requests.post(url, json=payload, headers=headers)
-            
-            if response.status_code != 200:
-                logger.error(f"M-PESA status check failed: {response.status_code} - {response.text}")
-                raise Exception(f"M-PESA status check failed: {response.status_code}")
-            
-            result = response.json()
+            result = await self.client.post("/mpesa/stkpushquery/v1/query", payload, idempotent=True)
             
             logger.info(f"M-PESA status check result: {result.get('ResultCode')}")
             
@@ -320,9 +250,6 @@ class MpesaService:
     ) -> Dict[str, Any]:
         """Refund a payment (B2C API)"""
         try:
-            # Get access token
-            access_token = await self.get_access_token()
-            
             # Generate timestamp and password
             timestamp = self.generate_timestamp()
             password = self.generate_password(self.shortcode, self.passkey, timestamp)
@@ -344,22 +271,9 @@ class MpesaService:
                 "Occasion": reference
             }
             
-            # Make API call
-            url = f"{self.base_url}/mpesa/b2c/v1/paymentrequest"
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
             logger.info(f"Initiating M-PESA refund for {formatted_phone}, amount: {amount}")
             
-            response = requests.post(url, json=payload, headers=headers)
-            
-            if response.status_code != 200:
-                logger.error(f"M-PESA refund failed: {response.status_code} - {response.text}")
-                raise Exception(f"M-PESA refund failed: {response.status_code}")
-            
-            result = response.json()
+            result = await self.client.post("/mpesa/b2c/v1/paymentrequest", payload)
             
             logger.info(f"M-PESA refund initiated successfully: {result.get('ConversationID')}")
             
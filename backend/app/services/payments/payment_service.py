@@ -3,12 +3,16 @@ from decimal import Decimal
 from typing import List, Optional, Dict, Any
 from uuid import UUID, uuid4
 
-from app.domain.entities.payments import Payment, PaymentStatus, PaymentMethod, PaymentType, PaymentSummary
+from app.domain.entities.payments import (
+    Payment, PaymentStatus, PaymentMethod, PaymentType, PaymentSummary, PaymentPostingLine
+)
 from app.domain.entities.users import User, UserRoleType
-from app.domain.entities.invoices import Invoice
+from app.domain.entities.invoices import Invoice, InvoiceStatus
+from app.domain.entities.orders import OrderStatus
 from app.domain.repositories.payment_repository import PaymentRepository
 from app.services.invoices.invoice_service import InvoiceService
 from app.services.audit.audit_service import AuditService
+from app.infrastucture.database.reference_cache import summary_cache
 from app.domain.entities.audit_events import AuditObjectType, AuditEventType, AuditActorType
 from app.domain.exceptions.payments import (
     PaymentNotFoundError,
@@ -427,37 +431,17 @@ class PaymentService:
         from_date: Optional[date] = None,
         to_date: Optional[date] = None
     ) -> PaymentSummary:
-        """Get payment summary for reporting"""
-        
-        payments = await self.search_payments(
-            user=user,
-            from_date=from_date,
-            to_date=to_date,
-            limit=10000  # Get all for summary
-        )
-
-        total_payments = len(payments)
-        total_amount = sum(p.amount for p in payments if p.amount > 0)  # Exclude refunds
-        
-        completed_payments = [p for p in payments if p.payment_status == PaymentStatus.COMPLETED and p.amount > 0]
-        completed_amount = sum(p.amount for p in completed_payments)
-        
-        pending_payments = [p for p in payments if p.payment_status == PaymentStatus.PENDING]
-        pending_amount = sum(p.amount for p in pending_payments)
-        
-        failed_payments = [p for p in payments if p.payment_status == PaymentStatus.FAILED]
-        failed_amount = sum(p.amount for p in failed_payments)
-
-        return PaymentSummary(
-            total_payments=total_payments,
-            total_amount=total_amount,
-            completed_payments=len(completed_payments),
-            completed_amount=completed_amount,
-            pending_payments=len(pending_payments),
-            pending_amount=pending_amount,
-            failed_payments=len(failed_payments),
-            failed_amount=failed_amount
-        )
+        """Get payment summary for reporting (aggregated in the database, cached per tenant)"""
+        cache_key = ("payments", from_date, to_date)
+        summary = summary_cache.get(user.tenant_id, cache_key)
+        if summary is None:
+            summary = await self.payment_repository.get_payment_summary(
+                user.tenant_id,
+                from_date=from_date,
+                to_date=to_date
+            )
+            summary_cache.set(user.tenant_id, cache_key, summary)
+        return summary
 
     # ============================================================================
     # INTEGRATION METHODS
@@ -516,4 +500,146 @@ class PaymentService:
         except Exception as e:
             results["errors"].append(f"Order payment cycle failed: {e}")
 
-        return results
\ No newline at end of file
+        return results
+
+    async def post_payment_batch(
+        self,
+        user: User,
+        lines: List[PaymentPostingLine],
+        payment_method: PaymentMethod
+    ) -> Dict[str, Any]:
+        """
+        Post a statement batch (bank export, M-Pesa statement, driver cash-up) as completed payments.
+
+        Lines are matched to payable invoices by invoice or order number in memory,
+        using one invoice lookup for the whole batch. Lines that cannot be posted are
+        returned as rejected with a reason; the rest are inserted and applied to their
+        invoices in a single transaction, and orders whose invoice became paid are
+        closed in one bulk transition.
+        """
+        if not self.can_process_payment(user):
+            raise PaymentPermissionError("User does not have permission to process payments")
+
+        rejected: List[Dict[str, Any]] = []
+
+        def reject(index: int, line: PaymentPostingLine, reason: str) -> None:
+            rejected.append({"line": index, "reference": line.reference, "amount": float(line.amount), "reason": reason})
+
+        # Transaction ids that were already posted, by an earlier import or within this batch
+        external_ids = [line.external_transaction_id for line in lines if line.external_transaction_id]
+        seen_external_ids = await self.payment_repository.get_existing_external_transaction_ids(
+            user.tenant_id, list(set(external_ids))
+        )
+
+        references = {line.normalized_reference for line in lines if line.normalized_reference}
+        invoices = await self.invoice_service.invoice_repository.get_payable_invoices_by_references(
+            sorted(references), user.tenant_id
+        )
+        # Oldest due first, so payments quoting an order number settle its earliest invoice
+        invoices.sort(key=lambda invoice: (invoice.due_date, invoice.invoice_no))
+        invoices_by_reference: Dict[str, List[Invoice]] = {}
+        for invoice in invoices:
+            invoices_by_reference.setdefault(invoice.invoice_no.upper(), []).append(invoice)
+            if invoice.order_no:
+                invoices_by_reference.setdefault(invoice.order_no.upper(), []).append(invoice)
+        remaining = {invoice.id: invoice.balance_due for invoice in invoices}
+
+        matched = []
+        for index, line in enumerate(lines):
+            if line.amount <= Decimal('0'):
+                reject(index, line, "Payment amount must be positive")
+                continue
+            if line.external_transaction_id:
+                if line.external_transaction_id in seen_external_ids:
+                    reject(index, line, f"Transaction {line.external_transaction_id} has already been posted")
+                    continue
+                seen_external_ids.add(line.external_transaction_id)
+
+            candidates = invoices_by_reference.get(line.normalized_reference)
+            if not candidates:
+                reject(index, line, "No payable invoice matches the reference")
+                continue
+            invoice = next((candidate for candidate in candidates if remaining[candidate.id] >= line.amount), None)
+            if invoice is None:
+                balance = sum(remaining[candidate.id] for candidate in candidates)
+                reject(index, line, f"Payment amount ({line.amount}) exceeds balance due ({balance})")
+                continue
+
+            remaining[invoice.id] -= line.amount
+            matched.append((line, invoice))
+
+        payments: List[Payment] = []
+        if matched:
+            payment_numbers = await self.payment_repository.get_next_payment_numbers(user.tenant_id, "PAY", len(matched))
+            for payment_no, (line, invoice) in zip(payment_numbers, matched):
+                payment = Payment.create(
+                    tenant_id=user.tenant_id,
+                    payment_no=payment_no,
+                    amount=line.amount,
+                    payment_method=payment_method,
+                    payment_date=line.payment_date or date.today(),
+                    customer_id=invoice.customer_id,
+                    invoice_id=invoice.id,
+                    order_id=invoice.order_id,
+                    reference_number=line.reference,
+                    external_transaction_id=line.external_transaction_id,
+                    description=line.description or f"Payment for invoice {invoice.invoice_no}",
+                    currency=invoice.currency,
+                    created_by=user.id
+                )
+                payment.mark_as_completed(processed_by=user.id)
+                payments.append(payment)
+
+        updated_invoices = []
+        if payments:
+            try:
+                updated_invoices = await self.payment_repository.post_payments(payments)
+            except ValueError as e:
+                raise PaymentValidationError(f"Payment batch was not posted: {e}")
+
+        paid_order_ids = list({
+            row["order_id"] for row in updated_invoices
+            if row["order_id"] and InvoiceStatus(row["invoice_status"]) == InvoiceStatus.PAID
+        })
+        closed_orders = []
+        if paid_order_ids:
+            try:
+                closed_orders = await self.invoice_service.order_repository.bulk_transition_orders(
+                    order_ids=paid_order_ids,
+                    from_status=OrderStatus.DELIVERED,
+                    to_status=OrderStatus.CLOSED,
+                    updated_by=user.id
+                )
+            except Exception as e:
+                # Payments are posted; orders can still be closed individually
+                print(f"Failed to close orders after batch payment: {e}")
+
+        if self.audit_service and payments:
+            try:
+                await self.audit_service.log_event(
+                    tenant_id=user.tenant_id,
+                    actor_id=user.id,
+                    actor_type=AuditActorType.USER,
+                    object_type=AuditObjectType.PAYMENT,
+                    object_id=None,
+                    event_type=AuditEventType.PAYMENT_PROCESSED,
+                    context={
+                        "payment_batch": True,
+                        "payment_method": payment_method.value,
+                        "payment_nos": [payment.payment_no for payment in payments],
+                        "total_amount": float(sum(payment.amount for payment in payments)),
+                        "rejected_lines": len(rejected)
+                    }
+                )
+            except Exception as audit_error:
+                # Don't fail payment processing if audit logging fails
+                print(f"Failed to log payment batch to audit: {audit_error}")
+
+        return {
+            "posted": [payment.to_dict() for payment in payments],
+            "rejected": rejected,
+            "total_posted_amount": float(sum(payment.amount for payment in payments)),
+            "invoices_updated": len(updated_invoices),
+            "invoices_paid": sum(1 for row in updated_invoices if InvoiceStatus(row["invoice_status"]) == InvoiceStatus.PAID),
+            "orders_closed": len(closed_orders)
+        }
@@ -0,0 +1,87 @@
+"""
+Streaming parser for physical stock count files
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, Iterator
+from uuid import UUID
+
+from app.domain.entities.stock_docs import StockCount, StockStatus
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import StockDocLineValidationError
+
+QUANTITY_FIELDS = ('counted_qty', 'quantity', 'qty')
+
+
+def parse_stock_counts(stream: BinaryIO) -> Iterator[StockCount]:
+    """
+    Yield StockCount rows from a CSV, JSON array or JSON lines count file.
+
+    CSV and JSON lines are read row by row, so a full depot count is never held
+    in memory as text. Columns/keys: variant_id, counted_qty (or quantity/qty)
+    and an optional stock_status defaulting to on_hand.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    first_line = text.readline()
+    lines = _chain(first_line, text)
+
+    if first_line.lstrip().startswith('['):
+        # A JSON array has to be decoded as a whole
+        try:
+            rows = json.loads(''.join(lines))
+        except json.JSONDecodeError as e:
+            raise StockDocLineValidationError("file", f"invalid JSON ({e.msg})")
+        for row_number, row in enumerate(rows, start=1):
+            yield _to_stock_count(row, row_number)
+
+    elif first_line.lstrip().startswith('{'):
+        for row_number, line in enumerate(lines, start=1):
+            if line.strip():
+                yield _to_stock_count(_load_json_line(line, row_number), row_number)
+
+    else:
+        # Header is line 1, so data rows start at 2
+        for row_number, row in enumerate(csv.DictReader(lines), start=2):
+            if not any((value or '').strip() for value in row.values() if isinstance(value, str)):
+                continue
+            yield _to_stock_count(row, row_number)
+
+
+def _chain(first_line: str, rest) -> Iterator[str]:
+    yield first_line
+    yield from rest
+
+
+def _load_json_line(line: str, row_number: int) -> Dict[str, Any]:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise StockDocLineValidationError(f"row {row_number}", f"invalid JSON ({e.msg})")
+
+
+def _to_stock_count(row: Dict[str, Any], row_number: int) -> StockCount:
+    if not isinstance(row, dict):
+        raise StockDocLineValidationError(f"row {row_number}", "expected an object")
+
+    try:
+        variant_id = UUID(str(row.get('variant_id', '')).strip())
+    except ValueError:
+        raise StockDocLineValidationError(f"row {row_number}", "invalid variant_id")
+
+    raw_qty = next((row[key] for key in QUANTITY_FIELDS if row.get(key) not in (None, '')), None)
+    try:
+        counted_qty = Decimal(str(raw_qty).strip())
+    except (InvalidOperation, ValueError):
+        raise StockDocLineValidationError(f"row {row_number}", "invalid counted quantity")
+    if not counted_qty.is_finite() or counted_qty < 0:
+        raise StockDocLineValidationError(f"row {row_number}", "counted quantity must be zero or more")
+
+    raw_status = str(row.get('stock_status') or StockStatus.ON_HAND.value).strip().lower()
+    try:
+        stock_status = StockStatus(raw_status)
+    except ValueError:
+        raise StockDocLineValidationError(f"row {row_number}", f"unknown stock_status '{raw_status}'")
+
+    return StockCount(variant_id=variant_id, counted_qty=counted_qty, stock_status=stock_status)
@@ -1,9 +1,13 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from app.domain.entities.stock_docs import StockDoc, StockDocLine, StockDocType, StockDocStatus, StockStatus
+from app.domain.entities.stock_docs import (
+    StockDoc, StockDocLine, StockDocType, StockDocStatus, StockStatus,
+    StockCount, StockTakeLine, StockTakeResult
+)
+from app.domain.entities.stock_ledger import stock_movement_source
 from app.domain.entities.users import User
 from app.domain.repositories.stock_doc_repository import StockDocRepository
 from app.domain.repositories.stock_level_repository import StockLevelRepository
@@ -240,26 +244,44 @@ class StockDocService:
     # QUERY OPERATIONS
     # ============================================================================
 
-    async def get_stock_docs_by_type(self, doc_type: StockDocType, tenant_id: UUID) -> List[StockDoc]:
-        """Get stock documents by type"""
-        return await self.stock_doc_repository.get_stock_docs_by_type(doc_type, tenant_id)
+    async def get_stock_docs_by_type(
+        self,
+        doc_type: StockDocType,
+        tenant_id: UUID,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[StockDoc]:
+        """Get a page of stock documents by type, without lines"""
+        return await self.stock_doc_repository.get_stock_docs_by_type(doc_type, tenant_id, limit, offset)
 
-    async def get_stock_docs_by_status(self, status: StockDocStatus, tenant_id: UUID) -> List[StockDoc]:
-        """Get stock documents by status"""
-        return await self.stock_doc_repository.get_stock_docs_by_status(status, tenant_id)
+    async def get_stock_docs_by_status(
+        self,
+        status: StockDocStatus,
+        tenant_id: UUID,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[StockDoc]:
+        """Get a page of stock documents by status, without lines"""
+        return await self.stock_doc_repository.get_stock_docs_by_status(status, tenant_id, limit, offset)
 
     async def get_stock_docs_by_warehouse(
         self, 
         warehouse_id: UUID, 
         tenant_id: UUID,
         include_source: bool = True,
-        include_dest: bool = True
+        include_dest: bool = True,
+        limit: int = 100,
+        offset: int = 0
     ) -> List[StockDoc]:
-        """Get stock documents by warehouse"""
+        """Get a page of stock documents by warehouse, without lines"""
         return await self.stock_doc_repository.get_stock_docs_by_warehouse(
-            warehouse_id, tenant_id, include_source, include_dest
+            warehouse_id, tenant_id, include_source, include_dest, limit, offset
         )
 
+    async def get_stock_doc_lines_for_docs(self, doc_ids: List[UUID], tenant_id: UUID) -> Dict[UUID, List[StockDocLine]]:
+        """Get the lines of several of the tenant's stock documents, keyed by document ID"""
+        return await self.stock_doc_repository.get_stock_doc_lines_for_docs(doc_ids, tenant_id)
+
     async def search_stock_docs(
         self,
         tenant_id: UUID,
@@ -371,22 +393,28 @@ class StockDocService:
         """Validate stock availability for issue operations"""
         if not stock_doc.source_wh_id:
             return  # No source warehouse to check
-        
+
+        # Checked against stock_levels rather than the availability cache, which may
+        # be behind writes made by other processes; lines for the same item add up
+        required: Dict[Tuple[Optional[UUID], Optional[str]], Decimal] = {}
         for line in stock_doc.stock_doc_lines:
+            key = (line.variant_id, line.gas_type)
+            required[key] = required.get(key, Decimal('0')) + Decimal(str(line.quantity))
+
+        for (variant_id, gas_type), quantity in required.items():
             available = await self.stock_doc_repository.validate_stock_availability(
                 warehouse_id=stock_doc.source_wh_id,
-                variant_id=line.variant_id,
-                gas_type=line.gas_type,
-                required_quantity=float(line.quantity)
+                variant_id=variant_id,
+                gas_type=gas_type,
+                required_quantity=float(quantity)
             )
-            
+
             if not available:
-                item_desc = f"variant {line.variant_id}" if line.variant_id else f"gas type {line.gas_type}"
                 raise StockDocInsufficientStockError(
                     warehouse_id=str(stock_doc.source_wh_id),
-                    variant_id=str(line.variant_id) if line.variant_id else None,
-                    gas_type=line.gas_type,
-                    required_qty=float(line.quantity)
+                    variant_id=str(variant_id) if variant_id else None,
+                    gas_type=gas_type,
+                    required_qty=float(quantity)
                 )
 
     # ============================================================================
@@ -412,7 +440,12 @@ class StockDocService:
             # Update stock levels if stock level repository is available
             if self.stock_level_repository:
                 try:
-                    await self._update_stock_levels_for_posting(user, stock_doc)
+                    with stock_movement_source(
+                        ref_doc_id=stock_doc.id,
+                        ref_doc_type=stock_doc.doc_type.value,
+                        created_by=user.id
+                    ):
+                        await self._update_stock_levels_for_posting(user, stock_doc)
                 except Exception as e:
                     raise StockDocPostingError(doc_id, f"Failed to update stock levels: {str(e)}")
 
@@ -573,6 +606,100 @@ class StockDocService:
             doc_id, StockDocStatus.SHIPPED, user.id
         )
 
+    # ============================================================================
+    # STOCK TAKES
+    # ============================================================================
+
+    async def create_stock_take_variance(
+        self,
+        user: User,
+        warehouse_id: UUID,
+        counts: Iterable[StockCount],
+        full_count: bool = False,
+        notes: Optional[str] = None
+    ) -> StockTakeResult:
+        """
+        Compare a physical count with system stock and record the differences.
+
+        Counts are aggregated per variant/status as they stream in, the
+        warehouse's stock levels are read in one query and the ON_HAND variances
+        are written as one ADJ_VARIANCE document with signed lines, inserted in
+        bulk. Variances in other buckets are reported but not adjusted, since
+        posting a variance only moves ON_HAND stock. With full_count, items
+        held in the system but missing from the count are counted as zero.
+        """
+        if not self.stock_level_repository:
+            raise StockDocInventoryError("Stock levels are not available for stock takes")
+
+        has_permission = await self.stock_doc_repository.validate_warehouse_permissions(
+            user.id, warehouse_id, "destination"
+        )
+        if not has_permission:
+            raise StockDocPermissionError(f"No permission for destination warehouse {warehouse_id}")
+
+        counted: Dict[Tuple[UUID, StockStatus], Decimal] = {}
+        for count in counts:
+            key = (count.variant_id, count.stock_status)
+            counted[key] = counted.get(key, Decimal('0')) + count.counted_qty
+
+        snapshot = await self.stock_level_repository.get_warehouse_stock_snapshot(user.tenant_id, warehouse_id)
+
+        keys = set(counted)
+        if full_count:
+            keys.update(key for key, (quantity, _) in snapshot.items() if quantity != 0)
+
+        no_stock = (Decimal('0'), Decimal('0'))
+        lines = [
+            StockTakeLine(
+                variant_id=variant_id,
+                stock_status=stock_status,
+                system_qty=snapshot.get((variant_id, stock_status), no_stock)[0],
+                counted_qty=counted.get((variant_id, stock_status), Decimal('0')),
+                unit_cost=snapshot.get((variant_id, stock_status), no_stock)[1]
+            )
+            for variant_id, stock_status in sorted(keys, key=lambda key: (str(key[0]), key[1].value))
+        ]
+        result = StockTakeResult(warehouse_id=warehouse_id, counted_items=len(counted), lines=lines)
+
+        adjustments = [
+            line for line in result.variance_lines
+            if line.stock_status == StockStatus.ON_HAND
+        ]
+        if not adjustments:
+            return result
+
+        try:
+            doc_no = await self.stock_doc_repository.generate_doc_number(user.tenant_id, StockDocType.ADJ_VARIANCE)
+            stock_doc = StockDoc.create(
+                tenant_id=user.tenant_id,
+                doc_no=doc_no,
+                doc_type=StockDocType.ADJ_VARIANCE,
+                dest_wh_id=warehouse_id,
+                ref_doc_type="STOCK_TAKE",
+                notes=notes,
+                created_by=user.id
+            )
+            stock_doc.stock_doc_lines = [
+                StockDocLine.create(
+                    stock_doc_id=stock_doc.id,
+                    variant_id=line.variant_id,
+                    quantity=line.variance,
+                    unit_cost=line.unit_cost,
+                    created_by=user.id
+                )
+                for line in adjustments
+            ]
+            # Lines are signed, so the document total is the gross quantity adjusted
+            stock_doc.total_qty = sum((abs(line.variance) for line in adjustments), Decimal('0'))
+
+            result.stock_doc = await self.stock_doc_repository.create_stock_doc_with_lines(stock_doc)
+        except StockDocAlreadyExistsError:
+            raise
+        except Exception as e:
+            raise StockDocIntegrityError(f"Failed to create stock take variance: {str(e)}")
+
+        return result
+
     # ============================================================================
     # UTILITY METHODS
     # ============================================================================
@@ -0,0 +1,72 @@
+"""
+Available-to-promise (ATP) answers from the cached per-tenant availability matrix
+"""
+
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.domain.entities.stock_availability import AvailabilityCheck, AvailabilityRequestLine
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.repositories.stock_level_repository import StockLevelRepository
+from app.infrastucture.database.availability_cache import AvailabilityCache, AvailabilityMatrix, availability_cache
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("availability_service")
+
+
+class AvailabilityService:
+    """
+    Answers availability checks for whole orders, trip loads and stock documents.
+
+    The tenant's matrix of available quantities is read from stock_levels in
+    one query the first time it is needed and afterwards kept current by the
+    stock level and reservation repositories, so a check costs no queries.
+    Answers are for read-only ATP queries: writes made by other processes are
+    only seen once the TTL expires, so validation ahead of a stock write
+    (stock documents, transfers, reservations) reads stock_levels instead.
+    """
+
+    def __init__(self, stock_level_repository: StockLevelRepository, cache: Optional[AvailabilityCache] = None):
+        self.stock_level_repository = stock_level_repository
+        self.cache = cache or availability_cache
+
+    async def get_matrix(self, tenant_id: UUID) -> AvailabilityMatrix:
+        matrix = self.cache.get(tenant_id)
+        if matrix is None:
+            available = await self.stock_level_repository.get_available_quantities(tenant_id)
+            matrix = AvailabilityMatrix(available)
+            self.cache.store(tenant_id, matrix)
+            logger.info("Availability matrix loaded", tenant_id=str(tenant_id), buckets=len(available))
+        return matrix
+
+    async def get_available_quantity(
+        self,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus = StockStatus.ON_HAND
+    ) -> Decimal:
+        matrix = await self.get_matrix(tenant_id)
+        return matrix.get(warehouse_id, variant_id, stock_status)
+
+    async def get_total_available_quantity(
+        self,
+        tenant_id: UUID,
+        variant_id: UUID,
+        stock_status: StockStatus = StockStatus.ON_HAND
+    ) -> Decimal:
+        matrix = await self.get_matrix(tenant_id)
+        return matrix.total(variant_id, stock_status)
+
+    async def check_availability(
+        self,
+        tenant_id: UUID,
+        lines: Iterable[AvailabilityRequestLine]
+    ) -> AvailabilityCheck:
+        """Check every line of a request at once; lines drawing on the same bucket are added up"""
+        check = AvailabilityCheck.for_lines(lines)
+        matrix = await self.get_matrix(tenant_id)
+        for result in check.lines:
+            result.available = matrix.get(result.warehouse_id, result.variant_id, result.stock_status)
+        return check
@@ -0,0 +1,104 @@
+"""
+Low and negative stock alerts from the in-memory alert book of each tenant
+"""
+
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.stock_alerts import DEFAULT_REORDER_POINT, StockAlert, StockPosition, StockReorderPoint
+from app.domain.entities.users import User
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import StockDocValidationError
+from app.domain.repositories.stock_alert_repository import StockAlertRepository
+from app.infrastucture.database.dashboard_cache import invalidate_tenant_dashboard
+from app.infrastucture.database.stock_alert_engine import StockAlertBook, StockAlertEngine, stock_alert_engine
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("stock_alert_service")
+
+
+class StockAlertService:
+    """
+    Serves the active stock alerts and manages the reorder points they use.
+
+    The tenant's stock positions and reorder points are read in one pass the
+    first time alerts are asked for; from then on stock writes are evaluated
+    as they commit, so polling alerts for every depot reads memory instead
+    of scanning stock_levels.
+    """
+
+    def __init__(
+        self,
+        stock_alert_repository: StockAlertRepository,
+        engine: Optional[StockAlertEngine] = None,
+        default_reorder_point: Decimal = DEFAULT_REORDER_POINT
+    ):
+        self.stock_alert_repository = stock_alert_repository
+        self.engine = engine or stock_alert_engine
+        self.default_reorder_point = default_reorder_point
+
+    async def get_book(self, tenant_id: UUID) -> StockAlertBook:
+        book = self.engine.get(tenant_id)
+        if book is None:
+            reorder_points = await self.stock_alert_repository.get_reorder_points(tenant_id)
+            positions = await self.stock_alert_repository.get_stock_positions(tenant_id)
+            book = StockAlertBook(tenant_id, positions, reorder_points, self.default_reorder_point)
+            self.engine.store(book)
+            logger.info(
+                "Stock alert book loaded",
+                tenant_id=str(tenant_id),
+                buckets=len(positions),
+                reorder_points=len(reorder_points)
+            )
+        return book
+
+    async def get_active_alerts(self, tenant_id: UUID, warehouse_id: Optional[UUID] = None) -> List[StockAlert]:
+        """On-hand buckets below their reorder point, optionally for one warehouse"""
+        book = await self.get_book(tenant_id)
+        return book.alerts(warehouse_id)
+
+    async def get_negative_stock(self, tenant_id: UUID) -> List[StockPosition]:
+        """Buckets of any status holding a negative quantity"""
+        book = await self.get_book(tenant_id)
+        return book.negative_positions()
+
+    async def get_reorder_points(self, tenant_id: UUID) -> List[StockReorderPoint]:
+        return await self.stock_alert_repository.get_reorder_points(tenant_id)
+
+    async def set_reorder_point(
+        self,
+        user: User,
+        variant_id: UUID,
+        reorder_point: Decimal,
+        warehouse_id: Optional[UUID] = None
+    ) -> StockReorderPoint:
+        """Set the reorder point of a variant in one warehouse, or in every warehouse without its own"""
+        if reorder_point < 0:
+            raise StockDocValidationError("Reorder point cannot be negative")
+
+        saved = await self.stock_alert_repository.set_reorder_point(StockReorderPoint(
+            tenant_id=user.tenant_id,
+            warehouse_id=warehouse_id,
+            variant_id=variant_id,
+            reorder_point=reorder_point,
+            created_by=user.id,
+            updated_by=user.id
+        ))
+        self.engine.set_reorder_point(user.tenant_id, warehouse_id, variant_id, saved.reorder_point)
+        # The dashboard's low stock count is graded against the same reorder points
+        invalidate_tenant_dashboard(user.tenant_id)
+        logger.info(
+            "Reorder point set",
+            tenant_id=str(user.tenant_id),
+            warehouse_id=str(warehouse_id) if warehouse_id else None,
+            variant_id=str(variant_id),
+            reorder_point=str(saved.reorder_point)
+        )
+        return saved
+
+    async def delete_reorder_point(self, user: User, variant_id: UUID, warehouse_id: Optional[UUID] = None) -> bool:
+        deleted = await self.stock_alert_repository.delete_reorder_point(user.tenant_id, variant_id, warehouse_id)
+        if deleted:
+            self.engine.set_reorder_point(user.tenant_id, warehouse_id, variant_id, None)
+            invalidate_tenant_dashboard(user.tenant_id)
+        return deleted
@@ -1,12 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
 
 from app.domain.entities.stock_levels import StockLevel, StockLevelSummary
 from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_ledger import (
+    StockBalance, StockLedgerEntry, StockMovement, StockMovementType, stock_movement_source
+)
+from app.domain.entities.stock_reservations import DEFAULT_RESERVATION_HOLD, StockHoldRequest, StockReservation
+from app.domain.entities.stock_availability import AvailabilityCheck, AvailabilityRequestLine
 from app.domain.entities.users import User
 from app.domain.repositories.stock_level_repository import StockLevelRepository
+from app.domain.repositories.stock_ledger_repository import StockLedgerRepository
+from app.domain.repositories.stock_reservation_repository import StockReservationRepository
+from app.services.stock_levels.availability_service import AvailabilityService
 from app.domain.exceptions.stock_docs.stock_doc_exceptions import (
     StockDocValidationError,
     InsufficientStockError,
@@ -17,8 +25,18 @@ from app.domain.exceptions.stock_docs.stock_doc_exceptions import (
 class StockLevelService:
     """Business logic service for stock level management"""
 
-    def __init__(self, stock_level_repository: StockLevelRepository):
+    def __init__(
+        self,
+        stock_level_repository: StockLevelRepository,
+        stock_ledger_repository: Optional[StockLedgerRepository] = None,
+        stock_reservation_repository: Optional[StockReservationRepository] = None,
+        availability_service: Optional[AvailabilityService] = None
+    ):
         self.stock_level_repository = stock_level_repository
+        self.stock_ledger_repository = stock_ledger_repository
+        self.stock_reservation_repository = stock_reservation_repository
+        # Answers availability reads from the cached matrix when configured
+        self.availability_service = availability_service
 
     async def get_current_stock_level(
         self,
@@ -67,6 +85,10 @@ class StockLevelService:
         stock_status: StockStatus = StockStatus.ON_HAND
     ) -> Decimal:
         """Get available quantity for allocation"""
+        if self.availability_service:
+            return await self.availability_service.get_available_quantity(
+                tenant_id, warehouse_id, variant_id, stock_status
+            )
         return await self.stock_level_repository.get_available_stock(
             tenant_id, warehouse_id, variant_id, stock_status
         )
@@ -77,6 +99,8 @@ class StockLevelService:
         variant_id: UUID
     ) -> Decimal:
         """Get total available quantity across all warehouses"""
+        if self.availability_service:
+            return await self.availability_service.get_total_available_quantity(tenant_id, variant_id)
         return await self.stock_level_repository.get_total_available_stock(
             tenant_id, variant_id
         )
@@ -93,10 +117,31 @@ class StockLevelService:
         if required_quantity <= 0:
             raise StockDocValidationError("Required quantity must be positive")
 
+        # Guards stock writes, so it reads stock_levels rather than the availability cache
         return await self.stock_level_repository.validate_stock_availability(
             tenant_id, warehouse_id, variant_id, required_quantity, stock_status
         )
 
+    async def check_lines_availability(
+        self,
+        tenant_id: UUID,
+        lines: List[AvailabilityRequestLine]
+    ) -> AvailabilityCheck:
+        """Check every line of an order, trip load or stock document in one call"""
+        if any(line.quantity <= 0 for line in lines):
+            raise StockDocValidationError("Required quantity must be positive")
+
+        if self.availability_service:
+            return await self.availability_service.check_availability(tenant_id, lines)
+
+        # Without the cache each distinct bucket is read once
+        check = AvailabilityCheck.for_lines(lines)
+        for result in check.lines:
+            result.available = await self.stock_level_repository.get_available_stock(
+                tenant_id, result.warehouse_id, result.variant_id, result.stock_status
+            )
+        return check
+
     async def receive_stock(
         self,
         user: User,
@@ -147,12 +192,23 @@ class StockLevelService:
         warehouse_id: UUID,
         variant_id: UUID,
         quantity: Decimal,
-        stock_status: StockStatus = StockStatus.ON_HAND
+        stock_status: StockStatus = StockStatus.ON_HAND,
+        order_id: Optional[UUID] = None,
+        order_line_id: Optional[UUID] = None
     ) -> bool:
         """Reserve stock for order allocation"""
         if quantity <= 0:
             raise StockDocValidationError("Reserved quantity must be positive")
 
+        if self.stock_reservation_repository:
+            # The hold is placed with a conditional update, which is the availability check
+            await self.place_stock_holds(
+                user,
+                [StockHoldRequest(warehouse_id, variant_id, quantity, stock_status, order_line_id)],
+                order_id=order_id
+            )
+            return True
+
         # Check if sufficient stock is available
         if not await self.check_stock_availability(
             user.tenant_id, warehouse_id, variant_id, quantity, stock_status
@@ -291,14 +347,16 @@ class StockLevelService:
         if adjustment_quantity <= 0:
             raise StockDocValidationError("Adjustment quantity must be positive")
 
-        # Apply adjustment (only positive quantities allowed)
-        updated_level = await self.stock_level_repository.update_stock_quantity(
-            user.tenant_id, warehouse_id, variant_id, stock_status, 
-            adjustment_quantity
-        )
-
-        # TODO: Create audit log entry for manual adjustment
-        # This would typically create a stock document or audit record
+        # Apply adjustment (only positive quantities allowed); the stock ledger keeps the reason
+        with stock_movement_source(
+            movement_type=StockMovementType.ADJUSTMENT,
+            notes=reason,
+            created_by=user.id
+        ):
+            updated_level = await self.stock_level_repository.update_stock_quantity(
+                user.tenant_id, warehouse_id, variant_id, stock_status, 
+                adjustment_quantity
+            )
         
         return updated_level
 
@@ -398,4 +456,116 @@ class StockLevelService:
             stock_level = await self.stock_level_repository.create_or_update_stock_level(stock_level_entity)
             created_stock_levels.append(stock_level)
         
-        return created_stock_levels
\ No newline at end of file
+        return created_stock_levels
+
+    # ============================================================================
+    # STOCK RESERVATIONS
+    # ============================================================================
+
+    def _require_reservations(self) -> StockReservationRepository:
+        if not self.stock_reservation_repository:
+            raise InvalidStockOperationError("Stock reservations are not available")
+        return self.stock_reservation_repository
+
+    async def place_stock_holds(
+        self,
+        user: User,
+        requests: List[StockHoldRequest],
+        order_id: Optional[UUID] = None,
+        hold_for: Optional[timedelta] = None
+    ) -> List[StockReservation]:
+        """Hold stock for every line, or for none of them if any line lacks available stock"""
+        if not requests:
+            raise StockDocValidationError("At least one line is required to reserve stock")
+        if any(request.quantity <= 0 for request in requests):
+            raise StockDocValidationError("Reserved quantity must be positive")
+        if hold_for is not None and hold_for <= timedelta(0):
+            raise StockDocValidationError("Reservation hold time must be positive")
+
+        expires_at = datetime.now(timezone.utc) + (hold_for or DEFAULT_RESERVATION_HOLD)
+        holds = [
+            StockReservation(
+                tenant_id=user.tenant_id,
+                warehouse_id=request.warehouse_id,
+                variant_id=request.variant_id,
+                stock_status=request.stock_status,
+                quantity=request.quantity,
+                expires_at=expires_at,
+                order_id=order_id,
+                order_line_id=request.order_line_id,
+                created_by=user.id
+            )
+            for request in requests
+        ]
+        return await self._require_reservations().place_holds(holds)
+
+    async def release_stock_holds(
+        self,
+        user: User,
+        reservation_ids: Optional[List[UUID]] = None,
+        order_id: Optional[UUID] = None
+    ) -> int:
+        """Release active holds by ID or for a whole order; returns the number released"""
+        if reservation_ids is None and order_id is None:
+            raise StockDocValidationError("Reservation IDs or an order ID are required")
+        return await self._require_reservations().release_holds(user.tenant_id, reservation_ids, order_id)
+
+    async def get_stock_holds(
+        self,
+        tenant_id: UUID,
+        order_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        active_only: bool = True
+    ) -> List[StockReservation]:
+        """Get reservation holds, oldest first"""
+        return await self._require_reservations().get_holds(
+            tenant_id, order_id, warehouse_id, variant_id, active_only
+        )
+
+    # ============================================================================
+    # STOCK LEDGER
+    # ============================================================================
+
+    def _require_ledger(self) -> StockLedgerRepository:
+        if not self.stock_ledger_repository:
+            raise InvalidStockOperationError("Stock ledger is not available")
+        return self.stock_ledger_repository
+
+    async def get_stock_as_of(
+        self,
+        tenant_id: UUID,
+        as_of: datetime,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None
+    ) -> List[StockBalance]:
+        """Get stock balances at a point in time, e.g. for month-end valuation"""
+        return await self._require_ledger().get_balances_as_of(tenant_id, as_of, warehouse_id, variant_id)
+
+    async def get_stock_movements(
+        self,
+        tenant_id: UUID,
+        start: datetime,
+        end: datetime,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None
+    ) -> List[StockMovement]:
+        """Get opening, in, out and closing quantities per bucket for a period"""
+        if start >= end:
+            raise StockDocValidationError("Movement period start must be before its end")
+        return await self._require_ledger().get_movements(tenant_id, start, end, warehouse_id, variant_id)
+
+    async def get_stock_ledger_entries(
+        self,
+        tenant_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        variant_id: Optional[UUID] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 500,
+        offset: int = 0
+    ) -> List[StockLedgerEntry]:
+        """Get individual ledger entries for audit"""
+        return await self._require_ledger().get_entries(
+            tenant_id, warehouse_id, variant_id, start, end, limit, offset
+        )
@@ -0,0 +1,110 @@
+"""
+Background worker releasing stock reservation holds that have passed their expiry
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from decouple import config
+
+from app.domain.repositories.stock_reservation_repository import StockReservationRepository
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("stock_reservation_expirer")
+
+
+class StockReservationExpirer:
+    """
+    Expires abandoned reservation holds in batches.
+
+    Each batch marks its holds expired and takes their quantity off the
+    buckets' reserved quantity in one statement, so available stock returns
+    without a separate clean-up job. Holds locked by a concurrent release are
+    skipped and picked up by a later pass.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        poll_interval: float = 60.0,
+        repositories=None
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.repositories = repositories or _reservation_repository
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Expire every hold that is due, one batch per transaction; returns the number expired"""
+        now = now or datetime.now(timezone.utc)
+        expired = 0
+        async with self.repositories() as reservations:
+            while True:
+                batch = await reservations.expire_holds(now, self.batch_size)
+                expired += batch
+                if batch < self.batch_size:
+                    break
+
+        if expired:
+            logger.info("Expired stock reservation holds", expired=expired)
+        return expired
+
+    async def run(self) -> None:
+        """Expire due holds every poll_interval seconds until stop()"""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Stock reservation expiry failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+
+@asynccontextmanager
+async def _reservation_repository() -> AsyncIterator[StockReservationRepository]:
+    """Open a database session for one worker pass"""
+    from app.services.dependencies.common import get_db_session
+    from app.infrastucture.database.repositories.stock_reservation_repository import SQLAlchemyStockReservationRepository
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        yield SQLAlchemyStockReservationRepository(session)
+    finally:
+        await sessions.aclose()
+
+
+_worker: Optional[StockReservationExpirer] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_stock_reservation_expirer() -> asyncio.Task:
+    global _worker, _worker_task
+    if _worker is None:
+        _worker = StockReservationExpirer(
+            poll_interval=config("STOCK_RESERVATION_EXPIRY_INTERVAL_SECONDS", default=60.0, cast=float)
+        )
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_worker.run())
+    return _worker_task
+
+
+async def stop_stock_reservation_expirer() -> None:
+    global _worker_task
+    if _worker is not None:
+        _worker.stop()
+    if _worker_task is not None:
+        try:
+            await asyncio.wait_for(_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            _worker_task.cancel()
+        _worker_task = None
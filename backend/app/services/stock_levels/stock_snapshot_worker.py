@@ -0,0 +1,121 @@
+"""
+Background worker taking periodic stock balance snapshots from the stock ledger
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from decouple import config
+
+from app.domain.repositories.stock_ledger_repository import StockLedgerRepository
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("stock_snapshot_worker")
+
+
+def snapshot_due_at(now: datetime, period: timedelta, settle: timedelta) -> datetime:
+    """
+    Latest period boundary (aligned to the Unix epoch, so daily periods fall
+    on UTC midnight) that is at least settle old, leaving transactions that
+    started before the boundary time to commit their ledger entries.
+    """
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    elapsed = now - settle - epoch
+    return epoch + period * (elapsed // period)
+
+
+class StockSnapshotWorker:
+    """
+    Snapshots every tenant's stock balances once per period.
+
+    A snapshot is built from the previous snapshot plus the ledger entries
+    since then, so as-of and movement queries only read the ledger tail after
+    the latest snapshot. Snapshots missed while the service was down are not
+    back-filled; the next one simply covers a longer tail.
+    """
+
+    def __init__(
+        self,
+        period: timedelta = timedelta(days=1),
+        settle: timedelta = timedelta(minutes=10),
+        poll_interval: float = 900.0,
+        repositories=None
+    ):
+        self.period = period
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.repositories = repositories or _ledger_repository
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def run_once(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Take the snapshot that is due, if any; returns the number of balances written"""
+        due_at = snapshot_due_at(now or datetime.now(timezone.utc), self.period, self.settle)
+        async with self.repositories() as ledger:
+            latest = await ledger.get_latest_snapshot_time()
+            if latest is not None and latest >= due_at:
+                return None
+            balance_count = await ledger.create_balance_snapshot(due_at)
+
+        if balance_count is not None:
+            logger.info("Stock balance snapshot taken", snapshot_at=due_at.isoformat(), balances=balance_count)
+        return balance_count
+
+    async def run(self) -> None:
+        """Check for a due snapshot every poll_interval seconds until stop()"""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Stock balance snapshot failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+
+@asynccontextmanager
+async def _ledger_repository() -> AsyncIterator[StockLedgerRepository]:
+    """Open a database session for one worker pass"""
+    from app.services.dependencies.common import get_db_session
+    from app.infrastucture.database.repositories.stock_ledger_repository import SQLAlchemyStockLedgerRepository
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        yield SQLAlchemyStockLedgerRepository(session)
+    finally:
+        await sessions.aclose()
+
+
+_worker: Optional[StockSnapshotWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_stock_snapshot_worker() -> asyncio.Task:
+    global _worker, _worker_task
+    if _worker is None:
+        _worker = StockSnapshotWorker(
+            period=timedelta(hours=config("STOCK_SNAPSHOT_PERIOD_HOURS", default=24, cast=int))
+        )
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_worker.run())
+    return _worker_task
+
+
+async def stop_stock_snapshot_worker() -> None:
+    global _worker_task
+    if _worker is not None:
+        _worker.stop()
+    if _worker_task is not None:
+        try:
+            await asyncio.wait_for(_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            _worker_task.cancel()
+        _worker_task = None
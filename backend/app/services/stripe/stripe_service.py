@@ -26,9 +26,31 @@ from app.domain.repositories.stripe_repository import StripeRepository
 from app.domain.repositories.audit_repository import AuditRepository
 from app.domain.entities.audit_events import AuditEvent, AuditObjectType, AuditEventType, AuditActorType
 from app.domain.entities.users import User
+from app.services.tenant_subscriptions.usage_meter import usage_meter
+from app.infrastucture.database.reference_cache import (
+    invalidate_all_entitlements, invalidate_tenant_entitlements
+)
 
 logger = logging.getLogger(__name__)
 
+# Webhook queue retry policy: 30s, 1m, 2m, ... capped at 1h, dead-lettered after 8 attempts
+WEBHOOK_MAX_ATTEMPTS = 8
+WEBHOOK_RETRY_BASE_DELAY = 30
+WEBHOOK_RETRY_MAX_DELAY = 3600
+
+
+def stripe_object_tenant_id(stripe_object: Dict[str, Any]) -> Optional[UUID]:
+    """tenant_id from the metadata of a Stripe subscription or invoice, if present"""
+    metadata = stripe_object.get('metadata') or {}
+    tenant_id = metadata.get('tenant_id')
+    if not tenant_id:
+        # Invoices carry the subscription's metadata under subscription_details
+        tenant_id = ((stripe_object.get('subscription_details') or {}).get('metadata') or {}).get('tenant_id')
+    try:
+        return UUID(str(tenant_id)) if tenant_id else None
+    except ValueError:
+        return None
+
 
 class StripeService:
     """Service for handling Stripe billing and tenant management"""
@@ -188,6 +210,8 @@ class StripeService:
                 'metadata': {**customer.metadata, 'status': 'suspended'}
             })
             
+            invalidate_tenant_entitlements(tenant_id)
+            
             # Audit event
             await self._audit_tenant_suspension(tenant_id, actor_id)
             
@@ -220,6 +244,8 @@ class StripeService:
             if plan:
                 await self.stripe_repo.update_tenant_plan(plan.id, {'is_active': False})
             
+            invalidate_tenant_entitlements(tenant_id)
+            
             # Audit event
             await self._audit_tenant_termination(tenant_id, actor_id)
             
@@ -371,6 +397,77 @@ class StripeService:
             logger.error(f"Error recording usage: {str(e)}")
             raise
     
+    async def report_usage_batch(
+        self,
+        increments: Dict[UUID, Dict[str, int]],
+        flush_id: str,
+        reported_at: int
+    ) -> Dict[UUID, Dict[str, int]]:
+        """
+        Report aggregated usage as one Stripe usage record per tenant and metric.
+
+        Metered subscription items are matched to metrics by their 'metric' metadata
+        (default 'orders'). Idempotency keys are derived from flush_id, and Stripe
+        rejects a reused key whose parameters differ, so the caller must retry
+        rejected increments with the same flush_id, reported_at (unix seconds) and
+        quantities for Stripe to count each record once. Returns the increments
+        that could not be reported.
+        """
+        unreported: Dict[UUID, Dict[str, int]] = {}
+        now = datetime.utcnow()
+        usage_time = datetime.utcfromtimestamp(reported_at)
+        
+        for tenant_id, metrics in increments.items():
+            try:
+                subscription = await self.stripe_repo.get_subscription_by_tenant_id(tenant_id)
+                if not subscription:
+                    continue
+                items = await self.stripe_repo.get_subscription_items_by_subscription_id(subscription.id)
+                metered_items = {
+                    (item.metadata or {}).get('metric', 'orders'): item
+                    for item in items
+                    if item.usage_type == StripeUsageType.METERED
+                }
+            except Exception as e:
+                logger.error(f"Error loading metered items for tenant {tenant_id}: {str(e)}")
+                unreported[tenant_id] = dict(metrics)
+                continue
+            
+            for metric, quantity in metrics.items():
+                item = metered_items.get(metric)
+                if item is None or quantity <= 0:
+                    continue
+                try:
+                    stripe_usage_record = await asyncio.to_thread(
+                        stripe.SubscriptionItem.create_usage_record,
+                        item.stripe_subscription_item_id,
+                        quantity=quantity,
+                        timestamp=reported_at,
+                        action='increment',
+                        idempotency_key=f"usage-{flush_id}-{item.stripe_subscription_item_id}"
+                    )
+                except Exception as e:
+                    logger.error(f"Error reporting {metric} usage for tenant {tenant_id}: {str(e)}")
+                    unreported.setdefault(tenant_id, {})[metric] = quantity
+                    continue
+                
+                # Stripe already counted it, so a failed local copy must not be retried
+                try:
+                    await self.stripe_repo.create_usage_record(StripeUsageRecord(
+                        id=uuid4(),
+                        subscription_item_id=item.id,
+                        stripe_usage_record_id=stripe_usage_record.id,
+                        quantity=quantity,
+                        timestamp=usage_time,
+                        action='increment',
+                        created_at=now,
+                        metadata={'flush_id': flush_id, 'metric': metric}
+                    ))
+                except Exception as e:
+                    logger.error(f"Error storing usage record for tenant {tenant_id}: {str(e)}")
+        
+        return unreported
+    
     async def track_tenant_usage(
         self,
         tenant_id: UUID,
@@ -381,6 +478,16 @@ class StripeService:
     ) -> TenantUsage:
         """Track tenant usage metrics"""
         try:
+            # Limit checks read the meter, which also batches these into the subscription and Stripe
+            if orders_count:
+                usage_meter.record(tenant_id, 'orders', orders_count)
+            if api_calls_count:
+                usage_meter.record(tenant_id, 'api_calls', api_calls_count)
+            if active_drivers_count:
+                usage_meter.set_gauge(tenant_id, 'drivers', active_drivers_count)
+            if storage_used_gb:
+                usage_meter.set_gauge(tenant_id, 'storage', int(storage_used_gb))
+            
             # Get current usage period
             now = datetime.utcnow()
             period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -421,18 +528,23 @@ class StripeService:
     
     # Webhook Processing
     async def process_webhook_event(self, payload: str, signature: str) -> bool:
-        """Process Stripe webhook event"""
+        """
+        Fast path for the webhook endpoint: verify the signature and queue the event.
+
+        Handling happens in process_pending_webhook_events, so Stripe gets its 2xx
+        immediately even during renewal bursts. Returns False for a redelivery of
+        an event that is already queued.
+        """
         try:
             # Verify webhook signature
             event = stripe.Webhook.construct_event(
                 payload, signature, self.stripe_webhook_secret
             )
             
-            # Check if event already processed
-            existing_event = await self.stripe_repo.get_webhook_event_by_stripe_id(event.id)
-            if existing_event:
-                logger.info(f"Webhook event {event.id} already processed")
-                return True
+            # API versions since 2017 send request as {id, idempotency_key}, older ones as a plain id
+            request = event.get('request') or {}
+            if isinstance(request, str):
+                request = {'id': request}
             
             # Create webhook event entity
             webhook_event = StripeWebhookEvent(
@@ -443,31 +555,100 @@ class StripeService:
                 created=datetime.fromtimestamp(event.created),
                 livemode=event.livemode,
                 pending_webhooks=event.pending_webhooks,
-                request_id=event.request_id,
-                request_idempotency_key=event.request_idempotency_key,
+                request_id=request.get('id'),
+                request_idempotency_key=request.get('idempotency_key'),
                 data=event.data,
                 processed=False,
                 processed_at=None,
+                ordering_key=self._webhook_ordering_key(event.data),
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow()
             )
             
-            await self.stripe_repo.create_webhook_event(webhook_event)
+            queued = await self.stripe_repo.enqueue_webhook_event(webhook_event)
+            if not queued:
+                logger.info(f"Webhook event {event.id} already received")
+            return queued
             
-            # Process event based on type
-            await self._handle_webhook_event(event)
+        except Exception as e:
+            logger.error(f"Error queueing webhook event: {str(e)}")
+            raise
+    
+    async def process_pending_webhook_events(
+        self,
+        batch_size: int = 50,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        lease_seconds: int = 300
+    ) -> Dict[str, int]:
+        """
+        Handle one batch of queued webhook events.
+
+        Failed events are retried with exponential backoff and dead-lettered after
+        max_attempts; a retrying event holds back later events of its subscription.
+        """
+        events = await self.stripe_repo.claim_webhook_events(limit=batch_size, lease_seconds=lease_seconds)
+        stats = {"claimed": len(events), "processed": 0, "retried": 0, "dead_lettered": 0}
+        
+        for webhook_event in events:
+            try:
+                event = stripe.Event.construct_from({
+                    "id": webhook_event.stripe_event_id,
+                    "object": "event",
+                    "type": webhook_event.event_type,
+                    "data": webhook_event.data
+                }, self.stripe_secret_key)
+                await self._handle_webhook_event(event)
+            except Exception as e:
+                now = datetime.utcnow()
+                failure = {'last_error': str(e)[:2000]}
+                if webhook_event.attempts >= max_attempts:
+                    failure['dead_lettered_at'] = now
+                    failure['next_attempt_at'] = None
+                    stats["dead_lettered"] += 1
+                    logger.error(
+                        f"Webhook event {webhook_event.stripe_event_id} dead-lettered after "
+                        f"{webhook_event.attempts} attempts: {str(e)}"
+                    )
+                else:
+                    failure['next_attempt_at'] = now + self._webhook_retry_delay(webhook_event.attempts)
+                    stats["retried"] += 1
+                    logger.warning(f"Webhook event {webhook_event.stripe_event_id} failed, will retry: {str(e)}")
+                await self.stripe_repo.update_webhook_event(webhook_event.id, failure)
+                continue
             
             # Mark as processed
             await self.stripe_repo.update_webhook_event(webhook_event.id, {
                 'processed': True,
-                'processed_at': datetime.utcnow()
+                'processed_at': datetime.utcnow(),
+                'next_attempt_at': None,
+                'last_error': None
             })
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error processing webhook event: {str(e)}")
-            raise
+            stats["processed"] += 1
+        
+        return stats
+    
+    async def retry_dead_lettered_webhook_event(self, stripe_event_id: str) -> Optional[StripeWebhookEvent]:
+        """Put a dead-lettered event back on the queue with a fresh retry budget"""
+        webhook_event = await self.stripe_repo.get_webhook_event_by_stripe_id(stripe_event_id)
+        if not webhook_event or webhook_event.dead_lettered_at is None:
+            return None
+        return await self.stripe_repo.update_webhook_event(webhook_event.id, {
+            'dead_lettered_at': None,
+            'attempts': 0,
+            'next_attempt_at': None
+        })
+    
+    @staticmethod
+    def _webhook_ordering_key(data: Dict[str, Any]) -> Optional[str]:
+        """Subscription the event belongs to, falling back to the customer"""
+        obj = (data or {}).get('object') or {}
+        if obj.get('object') == 'subscription':
+            return obj.get('id')
+        return obj.get('subscription') or obj.get('customer')
+    
+    @staticmethod
+    def _webhook_retry_delay(attempts: int) -> timedelta:
+        return timedelta(seconds=min(WEBHOOK_RETRY_MAX_DELAY, WEBHOOK_RETRY_BASE_DELAY * (2 ** max(0, attempts - 1))))
     
     # Analytics and Reporting
     async def get_tenant_billing_summary(self, tenant_id: UUID, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
@@ -598,28 +779,35 @@ class StripeService:
     
     async def _handle_subscription_created(self, subscription_data: Dict[str, Any]) -> None:
         """Handle subscription created event"""
-        # Implementation for subscription created
-        pass
+        await self._invalidate_entitlements(subscription_data, subscription_data.get('id'))
     
     async def _handle_subscription_updated(self, subscription_data: Dict[str, Any]) -> None:
         """Handle subscription updated event"""
-        # Implementation for subscription updated
-        pass
+        await self._invalidate_entitlements(subscription_data, subscription_data.get('id'))
     
     async def _handle_subscription_deleted(self, subscription_data: Dict[str, Any]) -> None:
         """Handle subscription deleted event"""
-        # Implementation for subscription deleted
-        pass
+        await self._invalidate_entitlements(subscription_data, subscription_data.get('id'))
     
     async def _handle_invoice_payment_succeeded(self, invoice_data: Dict[str, Any]) -> None:
         """Handle invoice payment succeeded event"""
-        # Implementation for invoice payment succeeded
-        pass
+        await self._invalidate_entitlements(invoice_data, invoice_data.get('subscription'))
     
     async def _handle_invoice_payment_failed(self, invoice_data: Dict[str, Any]) -> None:
         """Handle invoice payment failed event"""
-        # Implementation for invoice payment failed
-        pass
+        await self._invalidate_entitlements(invoice_data, invoice_data.get('subscription'))
+    
+    async def _invalidate_entitlements(self, stripe_object: Dict[str, Any], stripe_subscription_id: Optional[str]) -> None:
+        """Drop the cached entitlements of the tenant a subscription or invoice event belongs to"""
+        tenant_id = stripe_object_tenant_id(stripe_object)
+        if tenant_id is None and stripe_subscription_id:
+            subscription = await self.stripe_repo.get_subscription_by_stripe_id(stripe_subscription_id)
+            tenant_id = subscription.tenant_id if subscription else None
+        if tenant_id is None:
+            # Unknown owner: a stale snapshot would outlive the status change, so drop all of them
+            invalidate_all_entitlements()
+        else:
+            invalidate_tenant_entitlements(tenant_id)
     
     # Audit methods
     async def _audit_tenant_creation(self, tenant_id: UUID, actor_id: Optional[UUID]) -> None:
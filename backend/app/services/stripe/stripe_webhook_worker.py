@@ -0,0 +1,106 @@
+"""
+Background worker draining the Stripe webhook event queue
+"""
+
+import asyncio
+import os
+from typing import Dict, Optional
+
+from decouple import config
+
+from app.infrastucture.logs.logger import get_logger
+from app.services.stripe.stripe_service import StripeService, WEBHOOK_MAX_ATTEMPTS
+
+logger = get_logger("stripe_webhook_worker")
+
+
+class StripeWebhookWorker:
+    """
+    Handles queued StripeWebhookEvent rows outside the webhook request.
+
+    Each pass opens its own database session and processes one claimed batch.
+    Full batches are followed immediately by the next one so bursts drain
+    quickly; otherwise the worker sleeps poll_interval seconds.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        poll_interval: float = 2.0
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def run_once(self) -> Dict[str, int]:
+        from app.services.dependencies.common import get_db_session
+        from app.infrastucture.database.repositories.stripe_repository_impl import StripeRepositoryImpl
+        from app.infrastucture.database.repositories.audit_repository import AuditRepositoryImpl
+
+        sessions = get_db_session()
+        session = await sessions.__anext__()
+        try:
+            stripe_service = StripeService(
+                stripe_repo=StripeRepositoryImpl(session),
+                audit_repo=AuditRepositoryImpl(session),
+                stripe_secret_key=os.getenv('STRIPE_SECRET_KEY'),
+                stripe_webhook_secret=os.getenv('STRIPE_WEBHOOK_SECRET')
+            )
+            return await stripe_service.process_pending_webhook_events(
+                batch_size=self.batch_size,
+                max_attempts=self.max_attempts
+            )
+        finally:
+            await sessions.aclose()
+
+    async def run(self) -> None:
+        """Drain the queue until stop() is called"""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            claimed = 0
+            try:
+                stats = await self.run_once()
+                claimed = stats["claimed"]
+                if claimed:
+                    logger.info("Stripe webhook batch handled", **stats)
+            except Exception as e:
+                logger.error(f"Stripe webhook worker pass failed: {str(e)}")
+
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+
+_worker: Optional[StripeWebhookWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_stripe_webhook_worker() -> asyncio.Task:
+    global _worker, _worker_task
+    if _worker is None:
+        _worker = StripeWebhookWorker(
+            batch_size=config("STRIPE_WEBHOOK_BATCH_SIZE", default=50, cast=int)
+        )
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_worker.run())
+    return _worker_task
+
+
+async def stop_stripe_webhook_worker() -> None:
+    global _worker_task
+    if _worker is not None:
+        _worker.stop()
+    if _worker_task is not None:
+        try:
+            await asyncio.wait_for(_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            _worker_task.cancel()
+        _worker_task = None
@@ -13,7 +13,7 @@ from uuid import UUID
 
 from app.domain.entities.tenant_subscriptions import (
     TenantSubscription, TenantPlan, TenantSubscriptionSummary,
-    TenantSubscriptionStatus, BillingCycle, PlanTier
+    TenantSubscriptionStatus, BillingCycle, PlanTier, TenantEntitlements
 )
 from app.domain.repositories.tenant_subscription_repository import TenantSubscriptionRepository
 from app.domain.exceptions.tenant_subscriptions.tenant_subscription_exceptions import (
@@ -23,6 +23,8 @@ from app.domain.exceptions.tenant_subscriptions.tenant_subscription_exceptions i
     TenantSubscriptionLimitExceededException
 )
 from app.core.config import settings
+from app.infrastucture.database.reference_cache import entitlement_cache
+from app.services.tenant_subscriptions.usage_meter import usage_meter
 
 
 class TenantSubscriptionService:
@@ -367,6 +369,18 @@ class TenantSubscriptionService:
     # USAGE TRACKING & LIMITS
     # ============================================================================
 
+    async def get_tenant_entitlements(self, tenant_id: UUID) -> TenantEntitlements:
+        """Plan limits, status and features of the tenant's active subscription, cached per tenant"""
+        entitlements = entitlement_cache.get(tenant_id, "entitlements")
+        if entitlements is None:
+            subscription = await self.get_tenant_subscription_by_tenant_id(tenant_id)
+            if not subscription:
+                raise TenantSubscriptionNotFoundException(f"No active subscription found for tenant {tenant_id}")
+            plan = await self.get_tenant_plan_by_id(subscription.plan_id)
+            entitlements = TenantEntitlements.from_subscription(subscription, plan)
+            entitlement_cache.set(tenant_id, "entitlements", entitlements)
+        return entitlements
+
     async def check_tenant_limits(
         self,
         tenant_id: UUID,
@@ -374,26 +388,13 @@ class TenantSubscriptionService:
         requested_count: int = 1
     ) -> bool:
         """Check if tenant is within their usage limits"""
-        subscription = await self.get_tenant_subscription_by_tenant_id(tenant_id)
-        if not subscription:
-            raise TenantSubscriptionNotFoundException(f"No active subscription found for tenant {tenant_id}")
-
-        # Get the plan limits
-        plan = await self.get_tenant_plan_by_id(subscription.plan_id)
-        
-        # Map usage types to plan limits
-        limit_mapping = {
-            'orders': plan.max_orders_per_month,
-            'drivers': plan.max_active_drivers,
-            'storage': plan.max_storage_gb,
-            'api_calls': plan.max_api_requests_per_minute
-        }
+        entitlements = await self.get_tenant_entitlements(tenant_id)
         
-        limit = limit_mapping.get(usage_type)
+        limit = entitlements.limit_for(usage_type)
         if limit is None:
             return True  # No limit for this usage type
         
-        current_usage = subscription.current_usage.get(usage_type, 0)
+        current_usage = (await self._current_usage(tenant_id)).get(usage_type, 0)
         return (current_usage + requested_count) <= limit
 
     async def update_tenant_usage(
@@ -402,49 +403,52 @@ class TenantSubscriptionService:
         usage_type: str,
         count: int
     ) -> None:
-        """Update tenant usage for a specific metric"""
-        subscription = await self.get_tenant_subscription_by_tenant_id(tenant_id)
-        if not subscription:
-            raise TenantSubscriptionNotFoundException(f"No active subscription found for tenant {tenant_id}")
-        
-        subscription.update_usage(usage_type, count)
-        await self.tenant_subscription_repository.update_subscription(subscription)
+        """
+        Record tenant usage for a specific metric.
+
+        Usage is aggregated in memory and flushed periodically as atomic increments,
+        so this does not write the subscription row.
+        """
+        # Raises when the tenant has no active subscription
+        await self.get_tenant_entitlements(tenant_id)
+        usage_meter.record(tenant_id, usage_type, count)
+
+    async def _current_usage(self, tenant_id: UUID) -> Dict[str, int]:
+        """Usage including deltas not yet flushed; a stale meter baseline is refreshed from the database"""
+        usage = usage_meter.usage(tenant_id)
+        if usage is None:
+            usage_meter.prime(tenant_id, await self.tenant_subscription_repository.get_usage_summary(tenant_id))
+            usage = usage_meter.usage(tenant_id)
+        return usage
 
     async def get_tenant_usage_summary(
         self,
         tenant_id: UUID
     ) -> Dict[str, Any]:
         """Get tenant usage summary"""
-        subscription = await self.get_tenant_subscription_by_tenant_id(tenant_id)
-        if not subscription:
-            raise TenantSubscriptionNotFoundException(f"No active subscription found for tenant {tenant_id}")
+        entitlements = await self.get_tenant_entitlements(tenant_id)
+        current_usage = await self._current_usage(tenant_id)
+        
+        subscription_data = dict(entitlements.subscription_data)
+        subscription_data['current_usage'] = current_usage
         
-        plan = await self.get_tenant_plan_by_id(subscription.plan_id)
+        def usage_entry(usage_type: str) -> Dict[str, Any]:
+            current = current_usage.get(usage_type, 0)
+            limit = entitlements.limit_for(usage_type)
+            return {
+                'current': current,
+                'limit': limit,
+                'percentage': 0.0 if not limit else min(100.0, (current / limit) * 100)
+            }
         
         return {
-            'subscription': subscription.to_dict(),
-            'plan': plan.to_dict(),
+            'subscription': subscription_data,
+            'plan': dict(entitlements.plan_data),
             'usage': {
-                'orders': {
-                    'current': subscription.current_usage.get('orders', 0),
-                    'limit': plan.max_orders_per_month,
-                    'percentage': subscription.get_usage_percentage('orders', plan.max_orders_per_month)
-                },
-                'drivers': {
-                    'current': subscription.current_usage.get('drivers', 0),
-                    'limit': plan.max_active_drivers,
-                    'percentage': subscription.get_usage_percentage('drivers', plan.max_active_drivers)
-                },
-                'storage': {
-                    'current': subscription.current_usage.get('storage', 0),
-                    'limit': plan.max_storage_gb,
-                    'percentage': subscription.get_usage_percentage('storage', plan.max_storage_gb)
-                },
-                'api_calls': {
-                    'current': subscription.current_usage.get('api_calls', 0),
-                    'limit': plan.max_api_requests_per_minute,
-                    'percentage': subscription.get_usage_percentage('api_calls', plan.max_api_requests_per_minute)
-                }
+                'orders': usage_entry('orders'),
+                'drivers': usage_entry('drivers'),
+                'storage': usage_entry('storage'),
+                'api_calls': usage_entry('api_calls')
             }
         }
 
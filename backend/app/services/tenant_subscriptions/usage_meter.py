@@ -0,0 +1,244 @@
+"""
+In-process usage metering for tenant subscriptions
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID, uuid4
+
+from decouple import config
+
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("usage_meter")
+
+# Counters accumulate between flushes; gauges (current level) keep only the latest value
+COUNTER_METRICS = ('orders', 'api_calls')
+GAUGE_METRICS = ('drivers', 'storage')
+
+UsageBatch = Dict[UUID, Dict[str, int]]
+PersistHandler = Callable[[UsageBatch, UsageBatch], Awaitable[None]]
+ReportHandler = Callable[[UsageBatch, str, int], Awaitable[UsageBatch]]
+
+
+class UsageMeter:
+    """
+    Aggregates tenant usage in memory and flushes it in batches.
+
+    record() and set_gauge() only touch dicts, so hot paths such as order creation
+    add no database writes. flush() swaps the pending batch out and
+    - persists it with one atomic increment statement for all tenants
+    - reports counter deltas to Stripe as one usage record per tenant and metric
+
+    A report batch keeps its flush_id and timestamp until Stripe has acknowledged
+    all of it: the records Stripe did not accept are re-sent with the same
+    flush_id (and so the same idempotency keys) and timestamp on the next flush, and deltas recorded meanwhile
+    wait for a new batch instead of being merged into the one in flight.
+
+    usage() answers limit checks from the last persisted baseline plus pending
+    deltas. Baselines older than baseline_ttl are treated as unknown so usage
+    flushed by other processes is picked up.
+    """
+
+    def __init__(
+        self,
+        persist: Optional[PersistHandler] = None,
+        report: Optional[ReportHandler] = None,
+        flush_interval: float = 30.0,
+        baseline_ttl: float = 60.0
+    ):
+        self.persist = persist or _persist_usage
+        self.report = report or _report_stripe_usage
+        self.flush_interval = flush_interval
+        self.baseline_ttl = baseline_ttl
+
+        self._counters: UsageBatch = defaultdict(lambda: defaultdict(int))
+        self._gauges: UsageBatch = defaultdict(dict)
+        self._unreported: UsageBatch = defaultdict(lambda: defaultdict(int))
+        self._report_batch: Optional[Tuple[str, int, UsageBatch]] = None
+        self._baselines: Dict[UUID, Tuple[Dict[str, int], float]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._stop_event: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------
+    # Recording and reading
+    # ------------------------------------------------------------------
+
+    def record(self, tenant_id: UUID, metric: str, count: int = 1) -> None:
+        """Add to a counter metric; gauge metrics are set to count"""
+        if metric in GAUGE_METRICS:
+            self.set_gauge(tenant_id, metric, count)
+            return
+        self._counters[tenant_id][metric] += count
+
+    def set_gauge(self, tenant_id: UUID, metric: str, value: int) -> None:
+        self._gauges[tenant_id][metric] = value
+
+    def prime(self, tenant_id: UUID, persisted_usage: Dict[str, int]) -> None:
+        """Set the persisted usage of a tenant as read from its subscription"""
+        self._baselines[tenant_id] = (dict(persisted_usage or {}), time.monotonic())
+
+    def usage(self, tenant_id: UUID) -> Optional[Dict[str, int]]:
+        """Current usage including unflushed deltas, or None when the baseline is unknown or stale"""
+        baseline = self._baselines.get(tenant_id)
+        if baseline is None or time.monotonic() - baseline[1] >= self.baseline_ttl:
+            return None
+        usage = dict(baseline[0])
+        for metric, count in self._counters.get(tenant_id, {}).items():
+            usage[metric] = usage.get(metric, 0) + count
+        usage.update(self._gauges.get(tenant_id, {}))
+        return usage
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _drain(self) -> Tuple[UsageBatch, UsageBatch]:
+        counters = {tenant_id: dict(metrics) for tenant_id, metrics in self._counters.items() if metrics}
+        gauges = {tenant_id: dict(metrics) for tenant_id, metrics in self._gauges.items() if metrics}
+        self._counters = defaultdict(lambda: defaultdict(int))
+        self._gauges = defaultdict(dict)
+        return counters, gauges
+
+    def _restore(self, counters: UsageBatch, gauges: UsageBatch) -> None:
+        for tenant_id, metrics in counters.items():
+            for metric, count in metrics.items():
+                self._counters[tenant_id][metric] += count
+        for tenant_id, metrics in gauges.items():
+            for metric, value in metrics.items():
+                # A newer reading recorded during the flush wins
+                self._gauges[tenant_id].setdefault(metric, value)
+
+    async def flush(self) -> Dict[str, int]:
+        """Persist and report everything recorded since the last flush"""
+        async with self._flush_lock:
+            counters, gauges = self._drain()
+            if counters or gauges:
+                try:
+                    await self.persist(counters, gauges)
+                except Exception:
+                    self._restore(counters, gauges)
+                    raise
+                self._advance_baselines(counters, gauges)
+
+            for tenant_id, metrics in counters.items():
+                for metric, count in metrics.items():
+                    self._unreported[tenant_id][metric] += count
+            await self._report_pending()
+            if self._report_batch is None and self._unreported:
+                batch = {tenant_id: dict(metrics) for tenant_id, metrics in self._unreported.items() if metrics}
+                self._unreported = defaultdict(lambda: defaultdict(int))
+                if batch:
+                    self._report_batch = (uuid4().hex, int(time.time()), batch)
+                    await self._report_pending()
+
+            unreported = set(self._unreported)
+            if self._report_batch is not None:
+                unreported |= set(self._report_batch[2])
+            return {
+                "tenants": len(set(counters) | set(gauges)),
+                "unreported_tenants": len(unreported)
+            }
+
+    async def _report_pending(self) -> None:
+        """Send the batch in flight; what Stripe did not accept stays in flight under the same flush_id and timestamp"""
+        if self._report_batch is None:
+            return
+        flush_id, reported_at, batch = self._report_batch
+        try:
+            rejected = await self.report(batch, flush_id, reported_at)
+        except Exception as e:
+            logger.error(f"Reporting usage to Stripe failed: {str(e)}", flush_id=flush_id)
+            return
+        rejected = {tenant_id: dict(metrics) for tenant_id, metrics in rejected.items() if metrics}
+        self._report_batch = (flush_id, reported_at, rejected) if rejected else None
+
+    def _advance_baselines(self, counters: UsageBatch, gauges: UsageBatch) -> None:
+        # Keep fresh baselines consistent with what was just persisted
+        for tenant_id in set(counters) | set(gauges):
+            baseline = self._baselines.get(tenant_id)
+            if baseline is None:
+                continue
+            usage, loaded_at = baseline
+            for metric, count in counters.get(tenant_id, {}).items():
+                usage[metric] = usage.get(metric, 0) + count
+            usage.update(gauges.get(tenant_id, {}))
+            self._baselines[tenant_id] = (usage, loaded_at)
+
+    async def run(self) -> None:
+        """Flush every flush_interval seconds until stop(); flushes once more on the way out"""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Usage flush failed: {str(e)}")
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+
+async def _persist_usage(increments: UsageBatch, gauges: UsageBatch) -> None:
+    from app.services.dependencies.common import get_db_session
+    from app.infrastucture.database.repositories.tenant_subscription_repository import TenantSubscriptionRepositoryImpl
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        await TenantSubscriptionRepositoryImpl(session).apply_usage_batch(increments, gauges)
+    finally:
+        await sessions.aclose()
+
+
+async def _report_stripe_usage(increments: UsageBatch, flush_id: str, reported_at: int) -> UsageBatch:
+    stripe_secret_key = os.getenv('STRIPE_SECRET_KEY')
+    if not stripe_secret_key:
+        return {}
+
+    from app.services.dependencies.common import get_db_session
+    from app.infrastucture.database.repositories.stripe_repository_impl import StripeRepositoryImpl
+    from app.infrastucture.database.repositories.audit_repository import AuditRepositoryImpl
+    from app.services.stripe.stripe_service import StripeService
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        stripe_service = StripeService(
+            stripe_repo=StripeRepositoryImpl(session),
+            audit_repo=AuditRepositoryImpl(session),
+            stripe_secret_key=stripe_secret_key,
+            stripe_webhook_secret=os.getenv('STRIPE_WEBHOOK_SECRET')
+        )
+        return await stripe_service.report_usage_batch(increments, flush_id, reported_at)
+    finally:
+        await sessions.aclose()
+
+
+usage_meter = UsageMeter(flush_interval=config("USAGE_FLUSH_INTERVAL", default=30.0, cast=float))
+_flush_task: Optional[asyncio.Task] = None
+
+
+def start_usage_meter() -> asyncio.Task:
+    global _flush_task
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(usage_meter.run())
+    return _flush_task
+
+
+async def stop_usage_meter() -> None:
+    global _flush_task
+    usage_meter.stop()
+    if _flush_task is not None:
+        try:
+            await asyncio.wait_for(_flush_task, timeout=10)
+        except asyncio.TimeoutError:
+            _flush_task.cancel()
+        _flush_task = None
@@ -0,0 +1,161 @@
+import math
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.entities.dispatch_planning import DispatchOrder, DispatchVehicle, DispatchRoute, DispatchPlan
+from app.services.addresses.geo_utils import Point, haversine_km
+
+# Zone key for orders that could not be assigned to a specific depot
+_SHARED_ZONE = "shared"
+
+
+class DispatchPlanner:
+    """
+    Assign a day's orders to a fleet with a sweep + best-fit heuristic.
+
+    1. Orders with a location are zoned to the nearest depot that has vehicles.
+    2. Within each zone orders are swept by polar angle around the depot and
+       packed into the zone's vehicles (largest first) by weight and volume.
+    3. Whatever is left is placed best-fit-decreasing into any vehicle with
+       spare capacity, preferring the order's own zone.
+    4. Each route's stops are sequenced nearest-neighbour from the depot.
+
+    Everything runs in memory on floats, so a planning run costs O(orders x vehicles)
+    instead of one TripPlan validation per trial assignment.
+    """
+
+    def __init__(self, max_stops_per_trip: Optional[int] = None):
+        self.max_stops_per_trip = max_stops_per_trip
+
+    def plan(
+        self,
+        planned_date: date,
+        orders: List[DispatchOrder],
+        vehicles: List[DispatchVehicle]
+    ) -> DispatchPlan:
+        routes = [
+            DispatchRoute(vehicle=vehicle)
+            for vehicle in sorted(vehicles, key=lambda v: (v.capacity_kg, v.capacity_m3), reverse=True)
+            if vehicle.capacity_kg > 0
+        ]
+        plan = DispatchPlan(planned_date=planned_date, routes=routes)
+        if not routes:
+            plan.unassigned = list(orders)
+            return plan
+
+        routes_by_depot: Dict[Optional[UUID], List[DispatchRoute]] = defaultdict(list)
+        for route in routes:
+            routes_by_depot[route.vehicle.depot_id].append(route)
+
+        zones = self._zone_orders(orders, routes_by_depot)
+
+        leftovers: List[Tuple[Optional[UUID], DispatchOrder]] = []
+        # Depot zones are packed before the shared pool so local orders get first pick of their vehicles
+        for depot_id, zone_orders in sorted(zones.items(), key=lambda item: item[0] == _SHARED_ZONE):
+            zone_routes = routes_by_depot.get(depot_id, routes)
+            centre = self._zone_centre(zone_routes, zone_orders)
+            swept = sorted(zone_orders, key=lambda o: self._sweep_angle(centre, o))
+            remaining = self._sweep_fill(swept, zone_routes)
+            leftovers.extend((depot_id, order) for order in remaining)
+
+        leftovers.sort(key=lambda item: (item[1].weight_kg, item[1].volume_m3), reverse=True)
+        for depot_id, order in leftovers:
+            route = self._best_fit(order, routes_by_depot.get(depot_id, [])) or self._best_fit(order, routes)
+            if route:
+                route.add(order)
+            else:
+                plan.unassigned.append(order)
+
+        for route in routes:
+            route.orders = self._sequence_stops(route)
+
+        return plan
+
+    def _zone_orders(
+        self,
+        orders: List[DispatchOrder],
+        routes_by_depot: Dict[Optional[UUID], List[DispatchRoute]]
+    ) -> Dict[Optional[UUID], List[DispatchOrder]]:
+        """Group orders by nearest depot; orders that cannot be zoned share the whole fleet"""
+        depot_points = {
+            depot_id: depot_routes[0].vehicle.depot_location
+            for depot_id, depot_routes in routes_by_depot.items()
+            if depot_routes[0].vehicle.depot_location
+        }
+
+        zones: Dict[Optional[UUID], List[DispatchOrder]] = defaultdict(list)
+        for order in orders:
+            if order.location and depot_points:
+                depot_id = min(depot_points, key=lambda d: haversine_km(depot_points[d], order.location))
+                zones[depot_id].append(order)
+            elif len(routes_by_depot) == 1:
+                zones[next(iter(routes_by_depot))].append(order)
+            else:
+                zones[_SHARED_ZONE].append(order)
+        return zones
+
+    def _zone_centre(self, routes: List[DispatchRoute], orders: List[DispatchOrder]) -> Optional[Point]:
+        for route in routes:
+            if route.vehicle.depot_location:
+                return route.vehicle.depot_location
+        located = [order.location for order in orders if order.location]
+        if not located:
+            return None
+        return (
+            sum(point[0] for point in located) / len(located),
+            sum(point[1] for point in located) / len(located)
+        )
+
+    @staticmethod
+    def _sweep_angle(centre: Optional[Point], order: DispatchOrder) -> float:
+        if centre is None or order.location is None:
+            return math.inf
+        return math.atan2(order.location[1] - centre[1], order.location[0] - centre[0])
+
+    def _has_stop_capacity(self, route: DispatchRoute) -> bool:
+        return self.max_stops_per_trip is None or len(route.orders) < self.max_stops_per_trip
+
+    def _sweep_fill(self, swept: List[DispatchOrder], routes: List[DispatchRoute]) -> List[DispatchOrder]:
+        """Fill routes one by one along the sweep; returns orders that did not fit"""
+        remaining = swept
+        for route in routes:
+            if not remaining:
+                break
+            skipped = []
+            for order in remaining:
+                if self._has_stop_capacity(route) and route.fits(order):
+                    route.add(order)
+                else:
+                    skipped.append(order)
+            remaining = skipped
+        return remaining
+
+    def _best_fit(self, order: DispatchOrder, routes: List[DispatchRoute]) -> Optional[DispatchRoute]:
+        """Route that fits the order with the least spare weight capacity afterwards"""
+        best = None
+        best_slack = math.inf
+        for route in routes:
+            if not self._has_stop_capacity(route) or not route.fits(order):
+                continue
+            slack = route.vehicle.capacity_kg - route.total_weight_kg - order.weight_kg
+            if slack < best_slack:
+                best, best_slack = route, slack
+        return best
+
+    def _sequence_stops(self, route: DispatchRoute) -> List[DispatchOrder]:
+        """Nearest-neighbour ordering from the depot; unlocated stops go last"""
+        located = [order for order in route.orders if order.location]
+        unlocated = [order for order in route.orders if not order.location]
+        if not located:
+            return unlocated
+
+        current = route.vehicle.depot_location or located[0].location
+        sequence = []
+        while located:
+            nearest = min(located, key=lambda o: haversine_km(current, o.location))
+            located.remove(nearest)
+            sequence.append(nearest)
+            current = nearest.location
+        return sequence + unlocated
@@ -0,0 +1,224 @@
+from typing import List, Optional, Dict, Any
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+
+from app.domain.entities.orders import Order, OrderStatus
+from app.domain.entities.trip_stops import TripStop
+from app.domain.entities.dispatch_planning import DispatchOrder, DispatchVehicle, DispatchPlan
+from app.domain.entities.users import User
+from app.domain.repositories.trip_repository import TripRepository
+from app.domain.repositories.order_repository import OrderRepository
+from app.domain.repositories.variant_repository import VariantRepository
+from app.domain.repositories.address_repository import AddressRepository
+from app.domain.exceptions.trips.trip_exceptions import TripServiceError
+from app.services.trips.trip_service import TripService
+from app.services.trips.dispatch_planner import DispatchPlanner
+from app.services.addresses.geo_utils import parse_point
+from app.infrastucture.logs.logger import default_logger
+
+# Fallback weight for gas lines without a variant (same default as trip load calculation)
+DEFAULT_GAS_LINE_WEIGHT_KG = 27.0
+
+
+class DispatchPlanningService:
+    """Builds draft trips for a delivery date from all approved orders and the available fleet"""
+
+    def __init__(
+        self,
+        trip_service: TripService,
+        trip_repository: TripRepository,
+        order_repository: OrderRepository,
+        variant_repository: VariantRepository,
+        address_repository: AddressRepository
+    ):
+        self.trip_service = trip_service
+        self.trip_repository = trip_repository
+        self.order_repository = order_repository
+        self.variant_repository = variant_repository
+        self.address_repository = address_repository
+
+    async def plan_dispatch(
+        self,
+        user: User,
+        planned_date: date,
+        vehicle_ids: Optional[List[UUID]] = None,
+        max_stops_per_trip: Optional[int] = None,
+        create_trips: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Assign the day's approved orders to vehicles.
+
+        With create_trips=False the plan is only returned for review. With
+        create_trips=True a DRAFT trip with stops is persisted for every used
+        vehicle; orders stay APPROVED until the planner allocates the trip.
+        """
+        try:
+            orders = await self._load_dispatch_orders(user.tenant_id, planned_date)
+            vehicles = await self._load_dispatch_vehicles(user.tenant_id, vehicle_ids)
+
+            planner = DispatchPlanner(max_stops_per_trip=max_stops_per_trip)
+            plan = planner.plan(planned_date, orders, vehicles)
+
+            errors: List[Dict[str, Any]] = []
+            if create_trips:
+                errors = await self._create_draft_trips(user, plan)
+
+            result = plan.to_dict()
+            result["created"] = create_trips
+            result["errors"] = errors
+
+            default_logger.info(
+                "Dispatch plan built",
+                tenant_id=str(user.tenant_id),
+                planned_date=planned_date.isoformat(),
+                order_count=len(orders),
+                vehicle_count=len(vehicles),
+                trip_count=result["trip_count"],
+                unassigned_count=result["unassigned_order_count"]
+            )
+            return result
+
+        except Exception as e:
+            default_logger.error(f"Failed to build dispatch plan: {str(e)}", planned_date=planned_date.isoformat())
+            raise TripServiceError(f"Failed to build dispatch plan: {str(e)}")
+
+    async def _load_dispatch_orders(self, tenant_id: UUID, planned_date: date) -> List[DispatchOrder]:
+        """Load approved, unassigned orders with weight, volume and location in a fixed number of queries"""
+        orders = await self.order_repository.get_orders_for_dispatch(
+            tenant_id, planned_date, [OrderStatus.APPROVED]
+        )
+        if not orders:
+            return []
+
+        assigned = set(await self.trip_repository.get_assigned_order_ids([order.id for order in orders]))
+        orders = [order for order in orders if order.id not in assigned and order.order_lines]
+
+        variant_ids = list({line.variant_id for order in orders for line in order.order_lines if line.variant_id})
+        variants = {
+            variant.id: variant
+            for variant in await self.variant_repository.get_variants_by_ids(variant_ids)
+        }
+
+        addresses = await self.address_repository.get_primary_delivery_addresses(
+            list({order.customer_id for order in orders})
+        )
+        customer_locations = {
+            address.customer_id: parse_point(address.coordinates)
+            for address in addresses
+        }
+
+        dispatch_orders = []
+        for order in orders:
+            weight_kg, volume_m3 = self._order_load(order, variants)
+            order_address = order.get_order_specific_address()
+            location = parse_point(order_address) if order_address else None
+            dispatch_orders.append(DispatchOrder(
+                order_id=order.id,
+                order_no=order.order_no,
+                customer_id=order.customer_id,
+                weight_kg=weight_kg,
+                volume_m3=volume_m3,
+                location=location or customer_locations.get(order.customer_id)
+            ))
+        return dispatch_orders
+
+    def _order_load(self, order: Order, variants: Dict[UUID, Any]) -> tuple:
+        """Total (weight_kg, volume_m3) of an order from its lines and variant master data"""
+        weight_kg = 0.0
+        volume_m3 = 0.0
+        for line in order.order_lines:
+            qty = float(line.qty_ordered)
+            variant = variants.get(line.variant_id) if line.variant_id else None
+            if variant:
+                unit_weight = variant.unit_weight_kg or variant.gross_weight_kg
+                weight_kg += qty * float(unit_weight or 0)
+                volume_m3 += qty * float(variant.unit_volume_m3 or 0)
+            elif line.gas_type:
+                weight_kg += qty * DEFAULT_GAS_LINE_WEIGHT_KG
+
+        # Trust the stored order weight when lines could not be weighed
+        if weight_kg == 0 and order.total_weight_kg:
+            weight_kg = float(order.total_weight_kg)
+        return weight_kg, volume_m3
+
+    async def _load_dispatch_vehicles(
+        self,
+        tenant_id: UUID,
+        vehicle_ids: Optional[List[UUID]] = None
+    ) -> List[DispatchVehicle]:
+        vehicles = await self.trip_service.get_vehicles_with_depots(tenant_id)
+        selected = {str(vehicle_id) for vehicle_id in vehicle_ids} if vehicle_ids else None
+
+        dispatch_vehicles = []
+        for vehicle in vehicles:
+            if not vehicle["active"]:
+                continue
+            if selected is not None and vehicle["id"] not in selected:
+                continue
+            depot = vehicle.get("depot")
+            dispatch_vehicles.append(DispatchVehicle(
+                vehicle_id=UUID(vehicle["id"]),
+                plate=vehicle["plate"],
+                capacity_kg=float(vehicle["capacity_kg"] or 0),
+                capacity_m3=float(vehicle.get("capacity_m3") or 0),
+                depot_id=UUID(depot["id"]) if depot else None,
+                depot_location=parse_point(depot.get("location")) if depot else None
+            ))
+        return dispatch_vehicles
+
+    async def _create_draft_trips(self, user: User, plan: DispatchPlan) -> List[Dict[str, Any]]:
+        """Persist one DRAFT trip per used route; failures are reported per route"""
+        errors = []
+        sequence = 0
+        for route in plan.routes:
+            if not route.orders:
+                continue
+            sequence += 1
+            try:
+                trip_no = await self._next_trip_no(user.tenant_id, plan.planned_date, sequence)
+                trip = await self.trip_service.create_trip(
+                    tenant_id=user.tenant_id,
+                    trip_no=trip_no,
+                    created_by=user.id,
+                    vehicle_id=route.vehicle.vehicle_id,
+                    planned_date=plan.planned_date,
+                    start_wh_id=route.vehicle.depot_id,
+                    end_wh_id=route.vehicle.depot_id,
+                    gross_loaded_kg=Decimal(str(round(route.total_weight_kg, 3))),
+                    notes="Created by dispatch planner"
+                )
+                stops = [
+                    TripStop.create(
+                        trip_id=trip.id,
+                        stop_no=index + 1,
+                        created_by=user.id,
+                        order_id=order.order_id,
+                        location=order.location
+                    )
+                    for index, order in enumerate(route.orders)
+                ]
+                await self.trip_repository.create_trip_stops(stops)
+                route.trip_id = trip.id
+                route.trip_no = trip.trip_no
+            except Exception as e:
+                default_logger.error(
+                    f"Failed to create dispatch trip: {str(e)}",
+                    vehicle_id=str(route.vehicle.vehicle_id)
+                )
+                errors.append({
+                    "vehicle_id": str(route.vehicle.vehicle_id),
+                    "plate": route.vehicle.plate,
+                    "error": str(e)
+                })
+        return errors
+
+    async def _next_trip_no(self, tenant_id: UUID, planned_date: date, sequence: int) -> str:
+        """Generate a trip number that is not yet used by the tenant"""
+        base = f"DSP-{planned_date.strftime('%Y%m%d')}-{sequence:02d}"
+        trip_no = base
+        suffix = 1
+        while await self.trip_repository.get_trip_by_no(tenant_id, trip_no):
+            suffix += 1
+            trip_no = f"{base}-{suffix}"
+        return trip_no
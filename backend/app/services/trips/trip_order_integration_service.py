@@ -7,6 +7,7 @@ from app.domain.entities.trips import Trip, TripStatus
 from app.domain.entities.orders import Order, OrderStatus
 from app.domain.entities.trip_stops import TripStop
 from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_availability import AvailabilityRequestLine
 from app.domain.entities.users import User
 from app.domain.repositories.trip_repository import TripRepository
 from app.domain.repositories.order_repository import OrderRepository
@@ -351,7 +352,9 @@ class TripOrderIntegrationService:
                         warehouse_id=warehouse_id,
                         variant_id=line.variant_id,
                         quantity=line.qty_ordered,
-                        stock_status=StockStatus.ON_HAND
+                        stock_status=StockStatus.ON_HAND,
+                        order_id=order.id,
+                        order_line_id=line.id
                     )
                     
                     if success:
@@ -395,12 +398,16 @@ class TripOrderIntegrationService:
         order: Order
     ) -> None:
         """Release all stock reservations for an order"""
+        try:
+            # Holds record the warehouse and bucket they were placed on, so the order's
+            # holds can be released without knowing where its stock was reserved
+            await self.stock_level_service.release_stock_holds(user, order_id=order.id)
+        except Exception as e:
+            default_logger.warning(f"Failed to release stock holds for order {order.id}: {str(e)}")
+
         for line in order.order_lines:
             if line.variant_id and line.qty_allocated > 0:
                 try:
-                    # This would need to be implemented to find the warehouse where stock was reserved
-                    # For now, we'll need to add warehouse tracking to order lines or use a different approach
-                    
                     # Reset order line allocation
                     line.qty_allocated = Decimal('0')
                     line.updated_by = user.id
@@ -529,39 +536,39 @@ class TripOrderIntegrationService:
         if not warehouse_id:
             return {"all_available": False, "details": []}
         
-        availability_details = []
-        all_available = True
-        
-        for line in order.order_lines:
-            if line.variant_id and line.qty_ordered > 0:
-                try:
-                    available = await self.stock_level_service.check_stock_availability(
-                        tenant_id=tenant_id,
-                        warehouse_id=warehouse_id,
-                        variant_id=line.variant_id,
-                        required_quantity=line.qty_ordered,
-                        stock_status=StockStatus.ON_HAND
-                    )
-                    
-                    availability_details.append({
-                        "line_id": str(line.id),
-                        "variant_id": str(line.variant_id),
-                        "qty_required": float(line.qty_ordered),
-                        "available": available
-                    })
-                    
-                    if not available:
-                        all_available = False
-                        
-                except Exception as e:
-                    availability_details.append({
+        lines = [line for line in order.order_lines if line.variant_id and line.qty_ordered > 0]
+        try:
+            # One check for the whole order; lines of the same variant draw on the same bucket
+            check = await self.stock_level_service.check_lines_availability(tenant_id, [
+                AvailabilityRequestLine(warehouse_id, line.variant_id, line.qty_ordered, StockStatus.ON_HAND)
+                for line in lines
+            ])
+        except Exception as e:
+            return {
+                "all_available": False,
+                "details": [
+                    {
                         "line_id": str(line.id),
                         "variant_id": str(line.variant_id),
                         "qty_required": float(line.qty_ordered),
                         "available": False,
                         "error": str(e)
-                    })
-                    all_available = False
+                    }
+                    for line in lines
+                ]
+            }
+
+        short_variants = {result.variant_id for result in check.shortfalls}
+        availability_details = [
+            {
+                "line_id": str(line.id),
+                "variant_id": str(line.variant_id),
+                "qty_required": float(line.qty_ordered),
+                "available": line.variant_id not in short_variants
+            }
+            for line in lines
+        ]
+        all_available = check.is_available
         
         return {
             "all_available": all_available,
@@ -22,6 +22,7 @@ from app.domain.exceptions.trips.trip_exceptions import (
     TripStopValidationError,
     TripServiceError
 )
+from app.infrastucture.database.reference_cache import reference_cache
 from app.infrastucture.logs.logger import default_logger
 
 if TYPE_CHECKING:
@@ -426,20 +427,16 @@ class TripService:
         return True
 
     async def get_trips_summary(self, tenant_id: UUID) -> dict:
-        """Get trips summary for dashboard"""
+        """Get trips summary for dashboard, counted over all of the tenant's trips in the database"""
         try:
-            trips = await self.trip_repository.get_trips_by_tenant(tenant_id, limit=10)
-            
-            # Calculate summary statistics
-            total_trips = len(trips)
-            active_trips = len([t for t in trips if t.trip_status in [TripStatus.PLANNED, TripStatus.LOADED, TripStatus.IN_PROGRESS]])
-            completed_trips = len([t for t in trips if t.trip_status == TripStatus.COMPLETED])
+            counts = await self.trip_repository.get_trips_summary(tenant_id)
+            trips = await self.trip_repository.get_trips_by_tenant(tenant_id, limit=5)
             
             return {
-                "total_trips": total_trips,
-                "active_trips": active_trips,
-                "completed_trips": completed_trips,
-                "recent_trips": [trip.to_dict() for trip in trips[:5]]
+                "total_trips": counts["total"],
+                "active_trips": counts["active"],
+                "completed_trips": counts["completed"],
+                "recent_trips": [trip.to_dict() for trip in trips]
             }
         except Exception as e:
             default_logger.error(f"Error getting trips summary: {str(e)}")
@@ -448,6 +445,10 @@ class TripService:
     async def get_available_warehouses(self, tenant_id: UUID) -> List[dict]:
         """Get available warehouses for trip creation"""
         try:
+            cached = reference_cache.get(tenant_id, "available_warehouses")
+            if cached is not None:
+                return cached
+            
             warehouses = await self.warehouse_repository.get_warehouses_by_tenant(str(tenant_id), limit=10)
             
             warehouse_list = []
@@ -459,6 +460,7 @@ class TripService:
                     "type": warehouse.type.value if warehouse.type else None
                 })
             
+            reference_cache.set(tenant_id, "available_warehouses", warehouse_list)
             return warehouse_list
         except Exception as e:
             default_logger.error(f"Error getting available warehouses: {str(e)}")
@@ -467,31 +469,38 @@ class TripService:
     async def get_vehicles_with_depots(self, tenant_id: UUID) -> List[dict]:
         """Get vehicles with their depot information for trip creation"""
         try:
+            cached = reference_cache.get(tenant_id, "vehicles_with_depots")
+            if cached is not None:
+                return cached
+            
             vehicles = await self.vehicle_repository.get_vehicles_by_tenant(tenant_id, limit=100)
             
+            # Load all depots in one query instead of one lookup per vehicle
+            depot_ids = list({str(vehicle.depot_id) for vehicle in vehicles if vehicle.depot_id})
+            depots = {
+                str(depot.id): {
+                    "id": str(depot.id),
+                    "name": depot.name,
+                    "code": depot.code,
+                    "location": depot.location
+                }
+                for depot in await self.warehouse_repository.get_by_ids(depot_ids)
+            }
+            
             vehicles_with_depots = []
             for vehicle in vehicles:
-                # Get depot information for this vehicle
-                depot = None
-                if vehicle.depot_id:
-                    depot_entity = await self.warehouse_repository.get_by_id(str(vehicle.depot_id))
-                    if depot_entity:
-                        depot = {
-                            "id": str(depot_entity.id),
-                            "name": depot_entity.name,
-                            "code": depot_entity.code
-                        }
-                
                 vehicle_data = {
                     "id": str(vehicle.id),
                     "plate": vehicle.plate,
                     "vehicle_type": vehicle.vehicle_type.value,
                     "capacity_kg": float(vehicle.capacity_kg),
+                    "capacity_m3": float(vehicle.capacity_m3) if vehicle.capacity_m3 else None,
                     "active": vehicle.active,
-                    "depot": depot
+                    "depot": depots.get(str(vehicle.depot_id)) if vehicle.depot_id else None
                 }
                 vehicles_with_depots.append(vehicle_data)
             
+            reference_cache.set(tenant_id, "vehicles_with_depots", vehicles_with_depots)
             return vehicles_with_depots
         except Exception as e:
             default_logger.error(f"Error getting vehicles with depots: {str(e)}")
@@ -1,13 +1,14 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
 
 from app.domain.entities.trips import Trip, TripStatus
-from app.domain.entities.orders import Order, OrderStatus
+from app.domain.entities.orders import Order, OrderStatus, OrderTransition
 from app.domain.entities.users import User
 from app.domain.entities.stock_docs import StockStatus
 from app.domain.entities.truck_inventory import TruckInventory
+from app.domain.entities.audit_events import AuditEvent, AuditActorType, AuditObjectType, AuditEventType
 from app.domain.repositories.trip_repository import TripRepository
 from app.domain.repositories.order_repository import OrderRepository
 from app.services.stock_levels.stock_level_service import StockLevelService
@@ -105,8 +106,10 @@ class TripStatusAutomationService:
         1. Update all order statuses to LOADED
         2. Transfer stock from warehouse to truck (create truck inventory)
         3. Update stock levels to TRUCK_STOCK status
+
+        The orders move to LOADED in the same transaction as the stock, so an
+        order is never LOADED without its cylinders on the truck.
         """
-        order_updates = []
         stock_movements = []
         truck_inventory = []
         
@@ -122,54 +125,60 @@ class TripStatusAutomationService:
                         "order_id": order.id
                     })
         
+        if not (inventory_items and trip.vehicle_id and trip.start_wh_id):
+            order_updates = await self._transition_orders(
+                user, trip, orders, OrderStatus.ALLOCATED, OrderStatus.LOADED
+            )
+            return {
+                "order_updates": order_updates,
+                "stock_movements": stock_movements,
+                "truck_inventory": truck_inventory
+            }
+        
         # Load vehicle as mobile warehouse
-        if inventory_items and trip.vehicle_id and trip.start_wh_id:
-            try:
-                loading_result = await self.vehicle_warehouse_service.load_vehicle_as_warehouse(
-                    vehicle_id=trip.vehicle_id,
-                    trip_id=trip.id,
-                    source_warehouse_id=trip.start_wh_id,
-                    inventory_items=inventory_items,
-                    loaded_by=user.id
-                )
-                
-                truck_inventory.append({
-                    "vehicle_id": str(trip.vehicle_id),
-                    "items_loaded": len(inventory_items),
-                    "stock_doc_id": loading_result.get("stock_doc_id"),
-                    "success": True
-                })
-                
-            except Exception as e:
-                default_logger.warning(f"Failed to load vehicle warehouse: {str(e)}")
-                truck_inventory.append({
-                    "vehicle_id": str(trip.vehicle_id),
-                    "success": False,
-                    "error": str(e)
-                })
+        transition = self._order_transition(user, trip, orders, OrderStatus.ALLOCATED, OrderStatus.LOADED)
+        try:
+            loading_result = await self.vehicle_warehouse_service.load_vehicle_as_warehouse(
+                vehicle_id=trip.vehicle_id,
+                trip_id=trip.id,
+                source_warehouse_id=trip.start_wh_id,
+                inventory_items=inventory_items,
+                loaded_by=user.id,
+                user=user,
+                order_transition=transition
+            )
+        except Exception as e:
+            default_logger.warning(f"Failed to load vehicle warehouse: {str(e)}")
+            truck_inventory.append({
+                "vehicle_id": str(trip.vehicle_id),
+                "success": False,
+                "error": str(e)
+            })
+            # Nothing was written, so the orders stay ALLOCATED
+            order_updates = self._failed_order_updates(
+                orders, transition, f"Vehicle could not be loaded: {str(e)}"
+            )
+            return {
+                "order_updates": order_updates,
+                "stock_movements": stock_movements,
+                "truck_inventory": truck_inventory
+            }
         
-        # Update order statuses to LOADED
-        for order in orders:
-            try:
-                if order.order_status == OrderStatus.ALLOCATED:
-                    order.update_status(OrderStatus.LOADED, user.id)
-                    await self.order_repository.update_order(str(order.id), order)
-                    
-                    order_updates.append({
-                        "order_id": str(order.id),
-                        "order_no": order.order_no,
-                        "previous_status": "ALLOCATED",
-                        "new_status": "LOADED",
-                        "success": True
-                    })
-                    
-            except Exception as e:
-                order_updates.append({
-                    "order_id": str(order.id),
-                    "order_no": order.order_no,
-                    "success": False,
-                    "error": str(e)
-                })
+        truck_inventory.append({
+            "vehicle_id": str(trip.vehicle_id),
+            "items_loaded": len(inventory_items),
+            "stock_doc_id": loading_result.get("stock_doc_id"),
+            "success": True
+        })
+        
+        transitioned = loading_result.get("transitioned_order_ids")
+        if transitioned is None:
+            # The vehicle was loaded without a shared transaction; move the orders now
+            order_updates = await self._transition_orders(
+                user, trip, orders, OrderStatus.ALLOCATED, OrderStatus.LOADED
+            )
+        else:
+            order_updates = self._order_updates(user, orders, transition, set(transitioned))
         
         return {
             "order_updates": order_updates,
@@ -187,29 +196,9 @@ class TripStatusAutomationService:
         Handle trip status change to IN_PROGRESS:
         1. Update all order statuses to IN_TRANSIT
         """
-        order_updates = []
-        
-        for order in orders:
-            try:
-                if order.order_status == OrderStatus.LOADED:
-                    order.update_status(OrderStatus.IN_TRANSIT, user.id)
-                    await self.order_repository.update_order(str(order.id), order)
-                    
-                    order_updates.append({
-                        "order_id": str(order.id),
-                        "order_no": order.order_no,
-                        "previous_status": "LOADED",
-                        "new_status": "IN_TRANSIT",
-                        "success": True
-                    })
-                    
-            except Exception as e:
-                order_updates.append({
-                    "order_id": str(order.id),
-                    "order_no": order.order_no,
-                    "success": False,
-                    "error": str(e)
-                })
+        order_updates = await self._transition_orders(
+            user, trip, orders, OrderStatus.LOADED, OrderStatus.IN_TRANSIT
+        )
         
         return {
             "order_updates": order_updates,
@@ -229,47 +218,144 @@ class TripStatusAutomationService:
         2. Update delivered quantities based on actual deliveries
         3. Handle empties collection and returns
         """
-        order_updates = []
+        # For now, assume full delivery - in reality this would be based on delivery records
+        order_updates = await self._transition_orders(
+            user, trip, orders, OrderStatus.IN_TRANSIT, OrderStatus.DELIVERED, mark_delivered=True
+        )
         
+        return {
+            "order_updates": order_updates,
+            "stock_movements": [],
+            "truck_inventory": []
+        }
+    
+    async def _transition_orders(
+        self,
+        user: User,
+        trip: Trip,
+        orders: List[Order],
+        from_status: OrderStatus,
+        to_status: OrderStatus,
+        mark_delivered: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Move every order of the trip that is in from_status to to_status with one
+        set-based update; audit events are written in the same transaction.
+        """
+        transition = self._order_transition(user, trip, orders, from_status, to_status, mark_delivered)
+        if transition is None:
+            return []
+        
+        try:
+            transitioned = set(await self.order_repository.bulk_transition_orders(
+                order_ids=transition.order_ids,
+                from_status=from_status,
+                to_status=to_status,
+                updated_by=user.id,
+                mark_delivered=mark_delivered,
+                audit_events=transition.audit_events
+            ))
+        except Exception as e:
+            default_logger.error(f"Failed to transition trip orders: {str(e)}", trip_id=str(trip.id))
+            return self._failed_order_updates(orders, transition, str(e))
+        
+        return self._order_updates(user, orders, transition, transitioned)
+    
+    def _order_transition(
+        self,
+        user: User,
+        trip: Trip,
+        orders: List[Order],
+        from_status: OrderStatus,
+        to_status: OrderStatus,
+        mark_delivered: bool = False
+    ) -> Optional[OrderTransition]:
+        """Transition of the trip's orders that are in from_status, None when there are none"""
+        eligible = [order for order in orders if order.order_status == from_status]
+        if not eligible:
+            return None
+        
+        return OrderTransition(
+            order_ids=[order.id for order in eligible],
+            from_status=from_status,
+            to_status=to_status,
+            updated_by=user.id,
+            mark_delivered=mark_delivered,
+            audit_events=[
+                AuditEvent.create(
+                    tenant_id=order.tenant_id,
+                    actor_id=user.id,
+                    actor_type=AuditActorType.USER,
+                    object_type=AuditObjectType.ORDER,
+                    object_id=order.id,
+                    event_type=AuditEventType.STATUS_CHANGE,
+                    field_name="order_status",
+                    old_value={"order_status": from_status.value},
+                    new_value={"order_status": to_status.value},
+                    context={"trip_id": str(trip.id), "source": "trip_status_automation"}
+                )
+                for order in eligible
+            ]
+        )
+    
+    @staticmethod
+    def _failed_order_updates(
+        orders: List[Order],
+        transition: Optional[OrderTransition],
+        error: str
+    ) -> List[Dict[str, Any]]:
+        if transition is None:
+            return []
+        order_ids = set(transition.order_ids)
+        return [
+            {
+                "order_id": str(order.id),
+                "order_no": order.order_no,
+                "success": False,
+                "error": error
+            }
+            for order in orders
+            if order.id in order_ids
+        ]
+    
+    def _order_updates(
+        self,
+        user: User,
+        orders: List[Order],
+        transition: Optional[OrderTransition],
+        transitioned: Set[UUID]
+    ) -> List[Dict[str, Any]]:
+        """Per-order results of a transition, updating the orders that moved in memory"""
+        if transition is None:
+            return []
+        order_ids = set(transition.order_ids)
+        order_updates = []
         for order in orders:
-            try:
-                if order.order_status == OrderStatus.IN_TRANSIT:
-                    # For now, assume full delivery - in reality this would be based on delivery records
-                    for line in order.order_lines:
-                        if line.qty_allocated > 0:
-                            line.qty_delivered = line.qty_allocated
-                            line.updated_by = user.id
-                            line.updated_at = datetime.utcnow()
-                    
-                    order.update_status(OrderStatus.DELIVERED, user.id)
-                    order.executed = True
-                    order.executed_at = datetime.utcnow()
-                    order.executed_by = user.id
-                    
-                    await self.order_repository.update_order(str(order.id), order)
-                    
-                    order_updates.append({
-                        "order_id": str(order.id),
-                        "order_no": order.order_no,
-                        "previous_status": "IN_TRANSIT",
-                        "new_status": "DELIVERED",
-                        "executed": True,
-                        "success": True
-                    })
-                    
-            except Exception as e:
+            if order.id not in order_ids:
+                continue
+            if order.id not in transitioned:
                 order_updates.append({
                     "order_id": str(order.id),
                     "order_no": order.order_no,
                     "success": False,
-                    "error": str(e)
+                    "error": f"Order is no longer {transition.from_status.value}"
                 })
+                continue
+            
+            order.update_status(transition.to_status, user.id)
+            order_update = {
+                "order_id": str(order.id),
+                "order_no": order.order_no,
+                "previous_status": transition.from_status.name,
+                "new_status": transition.to_status.name,
+                "success": True
+            }
+            if transition.mark_delivered:
+                order.executed = True
+                order_update["executed"] = True
+            order_updates.append(order_update)
         
-        return {
-            "order_updates": order_updates,
-            "stock_movements": [],
-            "truck_inventory": []
-        }
+        return order_updates
     
     async def handle_order_delivery_completion(
         self,
@@ -333,13 +419,14 @@ class TripStatusAutomationService:
         try:
             # Get trip stops for this trip
             trip_stops = await self.trip_repository.get_trip_stops_by_trip(trip_id)
+            order_ids = list(dict.fromkeys(stop.order_id for stop in trip_stops if stop.order_id))
             
-            orders = []
-            for stop in trip_stops:
-                if stop.order_id:
-                    order = await self.order_repository.get_order_by_id(stop.order_id)
-                    if order:
-                        orders.append(order)
+            # Load all orders in one query and keep stop sequence
+            orders_by_id = {
+                order.id: order
+                for order in await self.order_repository.get_orders_by_ids(order_ids)
+            }
+            orders = [orders_by_id[order_id] for order_id in order_ids if order_id in orders_by_id]
             
             return orders
             
@@ -0,0 +1,128 @@
+"""
+End-of-trip reconciliation of the stock vehicles bring back against what they should be carrying
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.stock_docs import StockDoc, StockDocLine, StockDocStatus, StockDocType, StockStatus
+from app.domain.entities.stock_ledger import StockMovementType, stock_movement_source
+from app.domain.entities.stock_levels import StockBucketChange
+from app.domain.entities.truck_reconciliation import TruckReconciliation
+from app.domain.repositories.stock_doc_repository import StockDocRepository
+from app.domain.repositories.truck_reconciliation_repository import TruckReconciliationRepository
+from app.domain.repositories.vehicle_load_repository import VehicleLoadRepository
+from app.infrastucture.logs.logger import get_logger
+
+logger = get_logger("truck_reconciliation_service")
+
+
+class TruckReconciliationService:
+    """
+    Reconciles trips against their load manifest, deliveries and empties collected.
+
+    Expected stock is aggregated for all the trips being reconciled in one
+    query and diffed against the count in one pass. Each trip's variances
+    are written off its depot's truck stock under one consolidated
+    ADJ_VARIANCE document with a signed line per variant.
+    """
+
+    def __init__(
+        self,
+        stock_doc_repository: StockDocRepository,
+        vehicle_load_repository: VehicleLoadRepository,
+        truck_reconciliation_repository: TruckReconciliationRepository
+    ):
+        self.stock_doc_repository = stock_doc_repository
+        self.vehicle_load_repository = vehicle_load_repository
+        self.truck_reconciliation_repository = truck_reconciliation_repository
+
+    async def reconcile_fleet(self, completed_from: datetime, completed_to: datetime) -> List[StockDoc]:
+        """
+        Reconcile every trip completed in the window that was unloaded without
+        a variance document, one transaction per trip so a failing trip does
+        not hold back the rest of the fleet. Every worker process runs this pass,
+        so each trip is claimed before posting and skipped if another process
+        reconciled it first. Returns the variance documents written.
+        """
+        reconciliations = await self.truck_reconciliation_repository.get_unreconciled_trips(completed_from, completed_to)
+        variance_docs = []
+        for reconciliation in reconciliations:
+            if not reconciliation.has_variance:
+                continue
+            try:
+                variance_doc = await self.post_variances(reconciliation)
+            except Exception as e:
+                logger.error(
+                    f"Truck reconciliation failed: {str(e)}",
+                    trip_id=str(reconciliation.trip_id),
+                    tenant_id=str(reconciliation.tenant_id)
+                )
+                continue
+            if variance_doc is not None:
+                variance_docs.append(variance_doc)
+
+        logger.info(
+            "Fleet truck reconciliation completed",
+            trips=len(reconciliations),
+            variance_docs=len(variance_docs)
+        )
+        return variance_docs
+
+    async def post_variances(self, reconciliation: TruckReconciliation, created_by: Optional[UUID] = None) -> Optional[StockDoc]:
+        """
+        Write the trip's variances off its depot's truck stock under one posted
+        ADJ_VARIANCE document; None when the trip was already reconciled
+        """
+        doc_no = await self.stock_doc_repository.generate_doc_number(reconciliation.tenant_id, StockDocType.ADJ_VARIANCE)
+        if not await self.truck_reconciliation_repository.claim_trip_for_reconciliation(reconciliation.trip_id):
+            logger.info(
+                "Trip already reconciled, skipping",
+                trip_id=str(reconciliation.trip_id),
+                tenant_id=str(reconciliation.tenant_id)
+            )
+            return None
+        variance_doc = variance_document(reconciliation, doc_no, created_by)
+        changes = [
+            StockBucketChange(position.variant_id, StockStatus.TRUCK_STOCK, position.variance_qty)
+            for position in reconciliation.variances
+        ]
+        # As on unload, truck stock is written off as counted even when the bucket goes negative
+        with stock_movement_source(
+            ref_doc_id=variance_doc.id, ref_doc_type=variance_doc.doc_type.value, created_by=created_by
+        ):
+            await self.vehicle_load_repository.apply_vehicle_movement(
+                reconciliation.tenant_id, reconciliation.warehouse_id, [variance_doc], changes, [],
+                StockMovementType.ADJUSTMENT, allow_negative=True
+            )
+        return variance_doc
+
+
+def variance_document(reconciliation: TruckReconciliation, doc_no: str, created_by: Optional[UUID] = None) -> StockDoc:
+    """Posted ADJ_VARIANCE document with a signed line per variant that differs from the expected stock"""
+    stock_doc = StockDoc.create(
+        tenant_id=reconciliation.tenant_id,
+        doc_no=doc_no,
+        doc_type=StockDocType.ADJ_VARIANCE,
+        dest_wh_id=reconciliation.warehouse_id,
+        ref_doc_id=reconciliation.trip_id,
+        ref_doc_type="TRIP",
+        notes=f"Truck stock variance for vehicle {reconciliation.vehicle_id} on trip {reconciliation.trip_id}",
+        created_by=created_by
+    )
+    stock_doc.stock_doc_lines = [
+        StockDocLine.create(
+            stock_doc_id=stock_doc.id,
+            variant_id=position.variant_id,
+            quantity=position.variance_qty,
+            unit_cost=Decimal('0'),
+            created_by=created_by
+        )
+        for position in reconciliation.variances
+    ]
+    stock_doc.total_qty = sum((abs(line.quantity) for line in stock_doc.stock_doc_lines), Decimal('0'))
+    stock_doc.doc_status = StockDocStatus.POSTED
+    stock_doc.posted_date = datetime.utcnow()
+    return stock_doc
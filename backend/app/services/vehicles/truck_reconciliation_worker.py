@@ -0,0 +1,120 @@
+"""
+Background worker running the end-of-day truck stock reconciliation for the whole fleet
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from decouple import config
+
+from app.infrastucture.logs.logger import get_logger
+from app.services.stock_levels.stock_snapshot_worker import snapshot_due_at
+from app.services.vehicles.truck_reconciliation_service import TruckReconciliationService
+
+logger = get_logger("truck_reconciliation_worker")
+
+
+class TruckReconciliationWorker:
+    """
+    Reconciles the trips of each day once the day has closed.
+
+    One pass covers every trip of every tenant completed in the period and
+    unloaded without a variance document; trips reconciled at unload are
+    skipped, so re-running a period after a restart writes nothing twice.
+    """
+
+    def __init__(
+        self,
+        period: timedelta = timedelta(days=1),
+        settle: timedelta = timedelta(minutes=30),
+        poll_interval: float = 900.0,
+        services=None
+    ):
+        self.period = period
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.services = services or _reconciliation_service
+        self._reconciled_until: Optional[datetime] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    async def run_once(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Reconcile the period that closed last, if not done yet; returns the number of variance documents written"""
+        due_at = snapshot_due_at(now or datetime.now(timezone.utc), self.period, self.settle)
+        if self._reconciled_until is not None and self._reconciled_until >= due_at:
+            return None
+        async with self.services() as reconciliation:
+            variance_docs = await reconciliation.reconcile_fleet(due_at - self.period, due_at)
+        self._reconciled_until = due_at
+
+        logger.info(
+            "End-of-day truck reconciliation run",
+            period_end=due_at.isoformat(),
+            variance_docs=len(variance_docs)
+        )
+        return len(variance_docs)
+
+    async def run(self) -> None:
+        """Check for a closed period every poll_interval seconds until stop()"""
+        self._stop_event = asyncio.Event()
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"End-of-day truck reconciliation failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+
+@asynccontextmanager
+async def _reconciliation_service() -> AsyncIterator[TruckReconciliationService]:
+    """Open a database session for one worker pass"""
+    from app.services.dependencies.common import get_db_session
+    from app.infrastucture.database.repositories.stock_doc_repository import SQLAlchemyStockDocRepository
+    from app.infrastucture.database.repositories.truck_reconciliation_repository import SQLAlchemyTruckReconciliationRepository
+    from app.infrastucture.database.repositories.vehicle_load_repository import SQLAlchemyVehicleLoadRepository
+
+    sessions = get_db_session()
+    session = await sessions.__anext__()
+    try:
+        yield TruckReconciliationService(
+            SQLAlchemyStockDocRepository(session),
+            SQLAlchemyVehicleLoadRepository(session),
+            SQLAlchemyTruckReconciliationRepository(session)
+        )
+    finally:
+        await sessions.aclose()
+
+
+_worker: Optional[TruckReconciliationWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_truck_reconciliation_worker() -> asyncio.Task:
+    global _worker, _worker_task
+    if _worker is None:
+        _worker = TruckReconciliationWorker(
+            period=timedelta(hours=config("TRUCK_RECONCILIATION_PERIOD_HOURS", default=24, cast=int))
+        )
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_worker.run())
+    return _worker_task
+
+
+async def stop_truck_reconciliation_worker() -> None:
+    global _worker_task
+    if _worker is not None:
+        _worker.stop()
+    if _worker_task is not None:
+        try:
+            await asyncio.wait_for(_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            _worker_task.cancel()
+        _worker_task = None
@@ -1,14 +1,22 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from decimal import Decimal
 from app.domain.entities.vehicles import Vehicle
+from app.domain.entities.orders import OrderTransition
 from app.domain.entities.truck_inventory import TruckInventory
-from app.domain.entities.stock_docs import StockDoc, StockDocLine, StockDocType, StockStatus
-from app.domain.entities.stock_levels import StockLevel
+from app.domain.entities.stock_docs import StockDoc, StockDocLine, StockDocType, StockDocStatus, StockStatus
+from app.domain.entities.stock_ledger import StockMovementType, stock_movement_source
+from app.domain.entities.stock_levels import StockBucketChange, StockLevel
+from app.domain.entities.truck_reconciliation import TruckReconciliation
+from app.domain.entities.vehicle_loads import VehicleManifestLine
+from app.domain.repositories.truck_reconciliation_repository import TruckReconciliationRepository
+from app.domain.repositories.vehicle_load_repository import VehicleLoadRepository
 from app.domain.entities.users import User
+from app.domain.entities.load_model import LoadModel
 from app.services.stock_docs.stock_doc_service import StockDocService
 from app.services.stock_levels.stock_level_service import StockLevelService
+from app.services.vehicles.truck_reconciliation_service import variance_document
 from app.infrastucture.logs.logger import default_logger
 
 
@@ -21,13 +29,19 @@ class VehicleWarehouseService:
         stock_level_service: StockLevelService,
         vehicle_service=None,
         variant_service=None,
-        truck_inventory_repository=None
+        truck_inventory_repository=None,
+        vehicle_load_repository: Optional[VehicleLoadRepository] = None,
+        truck_reconciliation_repository: Optional[TruckReconciliationRepository] = None
     ):
         self.stock_doc_service = stock_doc_service
         self.stock_level_service = stock_level_service
         self.vehicle_service = vehicle_service
         self.variant_service = variant_service
         self.truck_inventory_repository = truck_inventory_repository
+        # Applies whole manifests as set-based writes in one transaction when configured
+        self.vehicle_load_repository = vehicle_load_repository
+        # Derives the stock expected back at unload from the trip's manifest and deliveries when configured
+        self.truck_reconciliation_repository = truck_reconciliation_repository
     
     async def load_vehicle_as_warehouse(
         self,
@@ -36,7 +50,8 @@ class VehicleWarehouseService:
         source_warehouse_id: UUID,
         inventory_items: List[Any],  # Can be List[Dict] or List[InventoryItem]
         loaded_by: UUID,
-        user: Optional[User] = None
+        user: Optional[User] = None,
+        order_transition: Optional[OrderTransition] = None
     ) -> Dict[str, Any]:
         """
         Load vehicle with inventory, treating it as a mobile warehouse
@@ -45,8 +60,26 @@ class VehicleWarehouseService:
         1. Stock document (TRF_TRUCK) from warehouse to vehicle
         2. Stock level records for vehicle inventory
         3. Truck inventory records for trip tracking
+
+        With the bulk load path an order_transition is applied in the same
+        transaction and the result lists the "transitioned_order_ids"; without
+        it the key is absent and the caller has to transition the orders itself.
         """
         try:
+            if self.vehicle_load_repository:
+                stock_doc, truck_inventory_records, transitioned = await self._load_vehicle_in_bulk(
+                    vehicle_id=vehicle_id,
+                    trip_id=trip_id,
+                    source_warehouse_id=source_warehouse_id,
+                    inventory_items=inventory_items,
+                    loaded_by=loaded_by,
+                    user=user,
+                    order_transition=order_transition
+                )
+                result = self._load_result(vehicle_id, trip_id, stock_doc, truck_inventory_records, inventory_items)
+                result["transitioned_order_ids"] = transitioned
+                return result
+
             # Create stock document for transfer from warehouse to vehicle
             stock_doc = await self._create_warehouse_to_vehicle_transfer(
                 vehicle_id=vehicle_id,
@@ -91,45 +124,39 @@ class VehicleWarehouseService:
                 for record in truck_inventory_records:
                     default_logger.info(f"Truck inventory record: {record.to_dict()}")
             
-            default_logger.info(
-                f"Vehicle loaded as warehouse",
-                vehicle_id=str(vehicle_id),
-                trip_id=str(trip_id),
-                stock_doc_id=str(stock_doc.id),
-                items_count=len(inventory_items)
-            )
-            
-            # Calculate totals safely
-            total_weight_kg = 0.0
-            total_volume_m3 = 0.0
-            
-            for item in inventory_items:
-                # Handle both dict and Pydantic model
-                if hasattr(item, 'quantity') and hasattr(item, 'unit_weight_kg') and hasattr(item, 'unit_volume_m3'):
-                    # Pydantic model
-                    qty = float(item.quantity)
-                    unit_weight = float(item.unit_weight_kg)
-                    unit_volume = float(item.unit_volume_m3)
-                else:
-                    # Dict
-                    qty = float(item.get("quantity", 0))
-                    unit_weight = float(item.get("unit_weight_kg", 0))
-                    unit_volume = float(item.get("unit_volume_m3", 0))
-                
-                total_weight_kg += qty * unit_weight
-                total_volume_m3 += qty * unit_volume
-            
-            return {
-                "success": True,
-                "stock_doc_id": str(stock_doc.id),
-                "truck_inventory_count": len(truck_inventory_records),
-                "total_weight_kg": total_weight_kg,
-                "total_volume_m3": total_volume_m3
-            }
+            return self._load_result(vehicle_id, trip_id, stock_doc, truck_inventory_records, inventory_items)
             
         except Exception as e:
             default_logger.error(f"Failed to load vehicle as warehouse: {str(e)}")
             raise
+
+    def _load_result(
+        self,
+        vehicle_id: UUID,
+        trip_id: UUID,
+        stock_doc: StockDoc,
+        truck_inventory_records: List[TruckInventory],
+        inventory_items: List[Any]
+    ) -> Dict[str, Any]:
+        default_logger.info(
+            f"Vehicle loaded as warehouse",
+            vehicle_id=str(vehicle_id),
+            trip_id=str(trip_id),
+            stock_doc_id=str(stock_doc.id),
+            items_count=len(inventory_items)
+        )
+        
+        load = self._build_load_model(inventory_items)
+        total_weight_kg = float(load.total_weight_kg)
+        total_volume_m3 = float(load.total_volume_m3)
+        
+        return {
+            "success": True,
+            "stock_doc_id": str(stock_doc.id),
+            "truck_inventory_count": len(truck_inventory_records),
+            "total_weight_kg": total_weight_kg,
+            "total_volume_m3": total_volume_m3
+        }
     
     async def unload_vehicle_as_warehouse(
         self,
@@ -150,40 +177,51 @@ class VehicleWarehouseService:
         3. Updates stock levels
         """
         try:
-            # Calculate variances
-            variances = self._calculate_inventory_variances(
-                actual_inventory=actual_inventory,
-                expected_inventory=expected_inventory
-            )
-            
-            # Create stock document for transfer from vehicle to warehouse
-            stock_doc = await self._create_vehicle_to_warehouse_transfer(
-                vehicle_id=vehicle_id,
-                trip_id=trip_id,
-                destination_warehouse_id=destination_warehouse_id,
-                actual_inventory=actual_inventory,
-                created_by=unloaded_by
-            )
-            
-            # Handle variances if any
-            variance_docs = []
-            if variances:
-                variance_docs = await self._create_variance_adjustments(
+            if self.vehicle_load_repository:
+                stock_doc, variance_docs, reconciliation = await self._unload_vehicle_in_bulk(
                     vehicle_id=vehicle_id,
                     trip_id=trip_id,
                     destination_warehouse_id=destination_warehouse_id,
-                    variances=variances,
-                    created_by=unloaded_by,
+                    actual_inventory=actual_inventory,
+                    expected_inventory=expected_inventory,
+                    user=user
+                )
+                variances = [position.to_variance_dict() for position in reconciliation.variances]
+            else:
+                # Calculate variances
+                variances = self._calculate_inventory_variances(
+                    actual_inventory=actual_inventory,
+                    expected_inventory=expected_inventory
+                )
+
+                # Create stock document for transfer from vehicle to warehouse
+                stock_doc = await self._create_vehicle_to_warehouse_transfer(
+                    vehicle_id=vehicle_id,
+                    trip_id=trip_id,
+                    destination_warehouse_id=destination_warehouse_id,
+                    actual_inventory=actual_inventory,
+                    created_by=unloaded_by
+                )
+                
+                # Handle variances if any
+                variance_docs = []
+                if variances:
+                    variance_docs = await self._create_variance_adjustments(
+                        vehicle_id=vehicle_id,
+                        trip_id=trip_id,
+                        destination_warehouse_id=destination_warehouse_id,
+                        variances=variances,
+                        created_by=unloaded_by,
+                        user=user
+                    )
+                
+                # Update stock levels
+                await self._update_stock_levels_for_unloading(
+                    vehicle_id=vehicle_id,
+                    destination_warehouse_id=destination_warehouse_id,
+                    actual_inventory=actual_inventory,
                     user=user
                 )
-            
-            # Update stock levels
-            await self._update_stock_levels_for_unloading(
-                vehicle_id=vehicle_id,
-                destination_warehouse_id=destination_warehouse_id,
-                actual_inventory=actual_inventory,
-                user=user
-            )
             
             default_logger.info(
                 f"Vehicle unloaded as warehouse",
@@ -383,24 +421,9 @@ class VehicleWarehouseService:
         Validate if inventory items fit within vehicle capacity
         """
         try:
-            total_weight_kg = Decimal("0")
-            total_volume_m3 = Decimal("0")
-            
-            for item in inventory_items:
-                # Handle both dict and Pydantic model
-                if hasattr(item, 'quantity'):
-                    # Pydantic model
-                    qty = Decimal(str(item.quantity))
-                    unit_weight = Decimal(str(item.unit_weight_kg))
-                    unit_volume = Decimal(str(item.unit_volume_m3))
-                else:
-                    # Dict
-                    qty = Decimal(str(item.get("quantity", 0)))
-                    unit_weight = Decimal(str(item.get("unit_weight_kg", 0)))
-                    unit_volume = Decimal(str(item.get("unit_volume_m3", 0)))
-                
-                total_weight_kg += qty * unit_weight
-                total_volume_m3 += qty * unit_volume
+            load = self._build_load_model(inventory_items)
+            total_weight_kg = load.total_weight_kg
+            total_volume_m3 = load.total_volume_m3
             
             # Check weight capacity
             weight_capacity = Decimal(str(vehicle.capacity_kg))
@@ -445,6 +468,251 @@ class VehicleWarehouseService:
             default_logger.error(f"Failed to validate vehicle capacity: {str(e)}")
             raise
     
+    async def evaluate_vehicle_load_options(
+        self,
+        vehicle: Vehicle,
+        candidate_loads: List[List[Any]]  # Each candidate is a List[Dict] or List[InventoryItem]
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate many candidate loads for one vehicle in a single pass
+        """
+        try:
+            # Register every variant once, then score each candidate as a delta on an empty load
+            load = LoadModel()
+            candidates = []
+            for candidate in candidate_loads:
+                quantities: Dict[str, Decimal] = {}
+                for key, qty, unit_weight, unit_volume in self._load_item_values(candidate):
+                    if key not in load:
+                        load.set_item(key, unit_weight, unit_volume)
+                    quantities[key] = quantities.get(key, Decimal("0")) + Decimal(str(qty))
+                candidates.append(quantities)
+            
+            results = load.evaluate_candidates(candidates, vehicle.capacity_kg, vehicle.capacity_m3)
+            return [
+                {
+                    "candidate_index": index,
+                    "fits": result["fits"],
+                    "weight_kg": float(result["weight_kg"]),
+                    "volume_m3": float(result["volume_m3"])
+                }
+                for index, result in enumerate(results)
+            ]
+            
+        except Exception as e:
+            default_logger.error(f"Failed to evaluate vehicle load options: {str(e)}")
+            raise
+    
+    def _build_load_model(self, inventory_items: List[Any]) -> LoadModel:
+        """Build a fixed-point load model from inventory items (dicts or pydantic models)"""
+        return LoadModel.from_items(self._load_item_values(inventory_items))
+    
+    @staticmethod
+    def _load_item_values(inventory_items: List[Any]) -> List[tuple]:
+        """(key, quantity, unit_weight_kg, unit_volume_m3) per item; lines of the same variant share a key"""
+        values = []
+        for index, item in enumerate(inventory_items):
+            # Handle both dict and Pydantic model
+            if hasattr(item, 'quantity'):
+                key = getattr(item, 'variant_id', None) or index
+                values.append((str(key), item.quantity, item.unit_weight_kg, item.unit_volume_m3))
+            else:
+                key = item.get("variant_id") or index
+                values.append((
+                    str(key),
+                    item.get("quantity", 0),
+                    item.get("unit_weight_kg", 0),
+                    item.get("unit_volume_m3", 0)
+                ))
+        return values
+    
+    async def _load_vehicle_in_bulk(
+        self,
+        vehicle_id: UUID,
+        trip_id: UUID,
+        source_warehouse_id: UUID,
+        inventory_items: List[Any],
+        loaded_by: UUID,
+        user: Optional[User],
+        order_transition: Optional[OrderTransition] = None
+    ) -> Tuple[StockDoc, List[TruckInventory], List[UUID]]:
+        """
+        Move a whole manifest onto a vehicle in one transaction.
+
+        The depot's ON_HAND buckets go down and its TRUCK_STOCK buckets up,
+        the posted TRF_TRUCK document, the trip's truck inventory and the
+        status change of the orders on board are written alongside, all as
+        set-based statements. Nothing is written if any variant is short.
+        """
+        if user is None:
+            raise ValueError("User context is required for stock document creation. Please provide a valid user.")
+
+        lines = self._manifest_lines(inventory_items)
+        doc_no = await self.stock_doc_service.generate_doc_number(user.tenant_id, StockDocType.TRF_TRUCK)
+        stock_doc = self._posted_truck_doc(
+            user, doc_no, StockDocType.TRF_TRUCK, trip_id,
+            notes=f"Load vehicle {vehicle_id} for trip {trip_id}",
+            lines=[(line.variant_id, line.quantity, line.unit_cost) for line in lines],
+            source_wh_id=source_warehouse_id
+        )
+
+        changes = []
+        for line in lines:
+            changes.append(StockBucketChange(line.variant_id, StockStatus.ON_HAND, -line.quantity))
+            changes.append(StockBucketChange(line.variant_id, StockStatus.TRUCK_STOCK, line.quantity, line.unit_cost))
+
+        truck_inventory = [
+            TruckInventory.create(
+                trip_id=trip_id,
+                vehicle_id=vehicle_id,
+                product_id=line.product_id,
+                variant_id=line.variant_id,
+                loaded_qty=line.quantity,
+                empties_expected_qty=line.empties_expected_qty,
+                created_by=loaded_by
+            )
+            for line in lines
+        ]
+
+        with stock_movement_source(ref_doc_id=stock_doc.id, ref_doc_type=stock_doc.doc_type.value, created_by=user.id):
+            transitioned = await self.vehicle_load_repository.apply_vehicle_movement(
+                user.tenant_id, source_warehouse_id, [stock_doc], changes, truck_inventory,
+                StockMovementType.STATUS_TRANSFER, order_transition=order_transition
+            )
+        return stock_doc, truck_inventory, transitioned
+
+    async def _unload_vehicle_in_bulk(
+        self,
+        vehicle_id: UUID,
+        trip_id: UUID,
+        destination_warehouse_id: UUID,
+        actual_inventory: List[Any],
+        expected_inventory: List[Any],
+        user: Optional[User]
+    ) -> Tuple[StockDoc, List[StockDoc], TruckReconciliation]:
+        """
+        Return a vehicle's stock to the depot in one transaction.
+
+        What came back moves from TRUCK_STOCK to ON_HAND under a TRF_TRUCK
+        document. The difference from what the vehicle should be carrying is
+        written off the truck stock under one ADJ_VARIANCE document with
+        signed lines.
+        """
+        if user is None:
+            raise ValueError("User context is required for stock level operations. Please provide a valid user.")
+
+        actual = {line.variant_id: line for line in self._manifest_lines(actual_inventory)}
+        reconciliation = await self._expected_truck_stock(trip_id, expected_inventory)
+        reconciliation.tenant_id = user.tenant_id
+        reconciliation.vehicle_id = vehicle_id
+        reconciliation.warehouse_id = destination_warehouse_id
+        reconciliation.record_counts({variant_id: line.quantity for variant_id, line in actual.items()})
+
+        transfer_no = await self.stock_doc_service.generate_doc_number(user.tenant_id, StockDocType.TRF_TRUCK)
+        transfer = self._posted_truck_doc(
+            user, transfer_no, StockDocType.TRF_TRUCK, trip_id,
+            notes=f"Unload vehicle {vehicle_id} from trip {trip_id}",
+            lines=[(line.variant_id, line.quantity, line.unit_cost) for line in actual.values() if line.quantity],
+            dest_wh_id=destination_warehouse_id
+        )
+        stock_docs = [transfer]
+
+        changes = []
+        for line in actual.values():
+            changes.append(StockBucketChange(line.variant_id, StockStatus.TRUCK_STOCK, -line.quantity))
+            changes.append(StockBucketChange(line.variant_id, StockStatus.ON_HAND, line.quantity, line.unit_cost))
+
+        variance_docs = []
+        if reconciliation.has_variance:
+            variance_no = await self.stock_doc_service.generate_doc_number(user.tenant_id, StockDocType.ADJ_VARIANCE)
+            variance_docs.append(variance_document(reconciliation, variance_no, user.id))
+            stock_docs.extend(variance_docs)
+            changes.extend(
+                StockBucketChange(position.variant_id, StockStatus.TRUCK_STOCK, position.variance_qty)
+                for position in reconciliation.variances
+            )
+
+        # Truck stock is returned as counted, so a short or stale bucket may go negative
+        # and shows up in the negative stock report rather than blocking the unload
+        with stock_movement_source(ref_doc_id=transfer.id, ref_doc_type=transfer.doc_type.value, created_by=user.id):
+            await self.vehicle_load_repository.apply_vehicle_movement(
+                user.tenant_id, destination_warehouse_id, stock_docs, changes, [],
+                StockMovementType.STATUS_TRANSFER, allow_negative=True
+            )
+        return transfer, variance_docs, reconciliation
+
+    async def _expected_truck_stock(self, trip_id: UUID, expected_inventory: List[Any]) -> TruckReconciliation:
+        """Stock the vehicle should bring back, from the trip's manifest and deliveries when they are on record"""
+        if self.truck_reconciliation_repository:
+            reconciliation = await self.truck_reconciliation_repository.get_trip_reconciliation(trip_id)
+            if reconciliation is not None:
+                return reconciliation
+        expected = {line.variant_id: line.quantity for line in self._manifest_lines(expected_inventory)}
+        return TruckReconciliation.from_manifests(trip_id, expected, {})
+
+    def _posted_truck_doc(
+        self,
+        user: User,
+        doc_no: str,
+        doc_type: StockDocType,
+        trip_id: UUID,
+        notes: str,
+        lines: List[Tuple[UUID, Decimal, Decimal]],
+        source_wh_id: Optional[UUID] = None,
+        dest_wh_id: Optional[UUID] = None
+    ) -> StockDoc:
+        """Build a document for stock moved as part of a trip, posted since its stock changes are written with it"""
+        stock_doc = StockDoc.create(
+            tenant_id=user.tenant_id,
+            doc_no=doc_no,
+            doc_type=doc_type,
+            source_wh_id=source_wh_id,
+            dest_wh_id=dest_wh_id,
+            ref_doc_id=trip_id,
+            ref_doc_type="TRIP",
+            notes=notes,
+            created_by=user.id
+        )
+        stock_doc.stock_doc_lines = [
+            StockDocLine.create(
+                stock_doc_id=stock_doc.id,
+                variant_id=variant_id,
+                quantity=quantity,
+                unit_cost=unit_cost,
+                created_by=user.id
+            )
+            for variant_id, quantity, unit_cost in lines
+        ]
+        stock_doc.total_qty = sum((abs(quantity) for _, quantity, _ in lines), Decimal('0'))
+        stock_doc.doc_status = StockDocStatus.POSTED
+        stock_doc.posted_date = datetime.utcnow()
+        return stock_doc
+
+    @staticmethod
+    def _item_value(item: Any, name: str, default: Any = None) -> Any:
+        """Field of a manifest item given either as a dict or as a request model"""
+        if isinstance(item, dict):
+            return item.get(name, default)
+        return getattr(item, name, default)
+
+    def _manifest_lines(self, inventory_items: List[Any]) -> List[VehicleManifestLine]:
+        """Manifest items combined per variant, so each bucket is written once"""
+        lines: Dict[UUID, VehicleManifestLine] = {}
+        for item in inventory_items:
+            variant_id = UUID(str(self._item_value(item, "variant_id")))
+            line = lines.get(variant_id)
+            if line is None:
+                product_id = self._item_value(item, "product_id")
+                line = lines[variant_id] = VehicleManifestLine(
+                    variant_id=variant_id,
+                    quantity=Decimal('0'),
+                    product_id=UUID(str(product_id)) if product_id else None,
+                    unit_cost=Decimal(str(self._item_value(item, "unit_cost", 0) or 0))
+                )
+            line.quantity += Decimal(str(self._item_value(item, "quantity", 0)))
+            line.empties_expected_qty += Decimal(str(self._item_value(item, "empties_expected_qty", 0) or 0))
+        return list(lines.values())
+
     async def _create_warehouse_to_vehicle_transfer(
         self,
         vehicle_id: UUID,
@@ -777,30 +1045,10 @@ class VehicleWarehouseService:
         expected_inventory: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Calculate variances between expected and actual inventory"""
-        variances = []
-        
-        # Create lookup dictionaries
-        actual_lookup = {item["variant_id"]: item for item in actual_inventory}
-        expected_lookup = {item["variant_id"]: item for item in expected_inventory}
-        
-        # Check all variants
-        all_variants = set(actual_lookup.keys()) | set(expected_lookup.keys())
-        
-        for variant_id in all_variants:
-            actual_qty = Decimal(str(actual_lookup.get(variant_id, {}).get("quantity", 0)))
-            expected_qty = Decimal(str(expected_lookup.get(variant_id, {}).get("quantity", 0)))
-            
-            if actual_qty != expected_qty:
-                variance = {
-                    "variant_id": variant_id,
-                    "expected_qty": float(expected_qty),
-                    "actual_qty": float(actual_qty),
-                    "variance_qty": float(actual_qty - expected_qty),
-                    "variance_pct": float(((actual_qty - expected_qty) / expected_qty * 100) if expected_qty > 0 else 0)
-                }
-                variances.append(variance)
-        
-        return variances
+        expected = {line.variant_id: line.quantity for line in self._manifest_lines(expected_inventory)}
+        actual = {line.variant_id: line.quantity for line in self._manifest_lines(actual_inventory)}
+        reconciliation = TruckReconciliation.from_manifests(None, expected, actual)
+        return [position.to_variance_dict() for position in reconciliation.variances]
     
     async def _create_variance_adjustments(
         self,
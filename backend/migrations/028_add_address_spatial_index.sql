@@ -0,0 +1,21 @@
+-- Migration: Spatial index for address proximity queries
+-- Supports "addresses within N km", nearest depot and map bounding-box lookups
+
+-- Clear placeholder points so they never show up in proximity results
+UPDATE addresses
+SET coordinates = NULL
+WHERE coordinates IS NOT NULL AND (
+    ST_IsEmpty(coordinates::geometry) OR
+    (ST_X(coordinates::geometry) = 0 AND ST_Y(coordinates::geometry) = 0)
+);
+
+-- GiST index on live, geocoded addresses (ST_DWithin / ST_Intersects / KNN)
+CREATE INDEX IF NOT EXISTS addresses_coordinates_gist_idx
+ON addresses USING GIST (coordinates)
+WHERE coordinates IS NOT NULL AND deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS addresses_tenant_id_idx
+ON addresses (tenant_id)
+WHERE deleted_at IS NULL;
+
+COMMENT ON INDEX addresses_coordinates_gist_idx IS 'Proximity and bounding-box lookups for dispatch and map views';
@@ -0,0 +1,18 @@
+-- Migration: Indexes for the orders-ready-for-invoicing work queue
+-- The queue is an anti-join of delivered/closed orders against paid invoices,
+-- paginated by (created_at, id)
+
+-- Invoice lookups by order (existing-invoice checks, anti-join)
+CREATE INDEX IF NOT EXISTS idx_invoices_order_id
+ON invoices (order_id)
+WHERE order_id IS NOT NULL;
+
+-- Paid invoices only, probed by the NOT EXISTS in the work queue
+CREATE INDEX IF NOT EXISTS idx_invoices_paid_order_id
+ON invoices (order_id)
+WHERE invoice_status = 'paid';
+
+-- Keyset pagination over invoiceable orders
+CREATE INDEX IF NOT EXISTS idx_orders_invoicing_queue
+ON orders (tenant_id, created_at DESC, id DESC)
+WHERE order_status IN ('delivered', 'closed') AND deleted_at IS NULL;
@@ -0,0 +1,29 @@
+-- Migration: Server-side invoice summary for the dashboard
+-- Replaces downloading every invoice row of a tenant and counting in the API
+
+CREATE OR REPLACE FUNCTION get_invoice_summary(p_tenant_id UUID, p_today DATE DEFAULT CURRENT_DATE)
+RETURNS TABLE (
+    draft_invoices BIGINT,
+    sent_invoices BIGINT,
+    paid_invoices BIGINT,
+    overdue_invoices BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        count(*) FILTER (WHERE invoice_status = 'draft'),
+        count(*) FILTER (WHERE invoice_status = 'sent'),
+        count(*) FILTER (WHERE invoice_status = 'paid'),
+        count(*) FILTER (WHERE invoice_status IN ('sent', 'partial_paid') AND due_date < p_today)
+    FROM invoices
+    WHERE tenant_id = p_tenant_id;
+$$;
+
+-- Lets the summary run as an index-only scan per tenant
+CREATE INDEX IF NOT EXISTS idx_invoices_tenant_status_due
+ON invoices (tenant_id, invoice_status, due_date);
+
+-- Payment summary (conditional aggregates per tenant and date range)
+CREATE INDEX IF NOT EXISTS idx_payments_tenant_payment_date
+ON payments (tenant_id, payment_date);
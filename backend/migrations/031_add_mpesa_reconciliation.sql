@@ -0,0 +1,42 @@
+-- Migration: Support for the M-PESA STK push reconciliation worker
+-- Applies a batch of confirmed payments to their invoices in one statement
+
+CREATE OR REPLACE FUNCTION apply_invoice_payments(p_payments JSONB)
+RETURNS TABLE (
+    invoice_id UUID,
+    tenant_id UUID,
+    order_id UUID,
+    invoice_status invoice_status
+)
+LANGUAGE sql
+AS $$
+    WITH applied AS (
+        SELECT (item->>'invoice_id')::uuid AS invoice_id,
+               sum((item->>'amount')::numeric) AS amount
+        FROM jsonb_array_elements(p_payments) AS item
+        GROUP BY 1
+    )
+    UPDATE invoices i
+    SET paid_amount = i.paid_amount + a.amount,
+        balance_due = i.total_amount - (i.paid_amount + a.amount),
+        invoice_status = CASE
+            WHEN i.total_amount - (i.paid_amount + a.amount) <= 0 THEN 'paid'::invoice_status
+            ELSE 'partial_paid'::invoice_status
+        END,
+        paid_at = CASE
+            WHEN i.total_amount - (i.paid_amount + a.amount) <= 0 THEN now()
+            ELSE i.paid_at
+        END,
+        updated_at = now()
+    FROM applied a
+    WHERE i.id = a.invoice_id
+      AND i.invoice_status IN ('sent', 'generated', 'partial_paid', 'overdue')
+      AND a.amount > 0
+      AND a.amount <= i.balance_due
+    RETURNING i.id, i.tenant_id, i.order_id, i.invoice_status;
+$$;
+
+-- Pending gateway payments are seeded into the reconciliation queue on startup
+CREATE INDEX IF NOT EXISTS idx_payments_pending_gateway
+ON payments (gateway_provider, created_at)
+WHERE payment_status IN ('pending', 'processing') AND external_transaction_id IS NOT NULL;
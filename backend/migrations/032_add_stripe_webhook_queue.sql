@@ -0,0 +1,25 @@
+-- Migration: Queue state for asynchronous Stripe webhook processing
+-- The webhook endpoint only verifies and inserts; a worker drains the queue in order per subscription
+
+ALTER TABLE stripe_webhook_events
+    ADD COLUMN IF NOT EXISTS ordering_key VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS last_error TEXT,
+    ADD COLUMN IF NOT EXISTS dead_lettered_at TIMESTAMP WITH TIME ZONE;
+
+-- Pending events in delivery order, and the per-subscription "older pending event" check
+CREATE INDEX IF NOT EXISTS idx_stripe_webhook_events_queue
+ON stripe_webhook_events (created, created_at)
+WHERE processed = FALSE AND dead_lettered_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_stripe_webhook_events_ordering
+ON stripe_webhook_events (ordering_key, created, created_at)
+WHERE processed = FALSE AND dead_lettered_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_stripe_webhook_events_dead_letter
+ON stripe_webhook_events (dead_lettered_at)
+WHERE dead_lettered_at IS NOT NULL;
+
+COMMENT ON COLUMN stripe_webhook_events.ordering_key IS 'Stripe subscription (or customer) the event belongs to; events of one key are processed in order';
+COMMENT ON COLUMN stripe_webhook_events.dead_lettered_at IS 'Set when the event exhausted its retries; cleared when requeued';
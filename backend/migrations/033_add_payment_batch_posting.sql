@@ -0,0 +1,11 @@
+-- Migration: Support for bulk payment posting from statement batches
+-- Statement lines are matched to invoices by invoice or order number, and
+-- already-posted transaction ids are looked up per tenant in one query
+
+CREATE INDEX IF NOT EXISTS idx_invoices_tenant_order_no
+ON invoices (tenant_id, order_no)
+WHERE order_no IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_payments_tenant_external_transaction_id
+ON payments (tenant_id, external_transaction_id)
+WHERE external_transaction_id IS NOT NULL;
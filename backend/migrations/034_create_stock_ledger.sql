@@ -0,0 +1,82 @@
+-- Migration 034: Append-only stock ledger with periodic balance snapshots
+-- Every change to stock_levels is recorded in stock_ledger in the same transaction.
+-- Balances as of a time T are the latest snapshot at or before T plus the ledger entries after it.
+
+CREATE TABLE IF NOT EXISTS stock_ledger (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    tenant_id UUID NOT NULL REFERENCES tenants(id),
+    warehouse_id UUID NOT NULL REFERENCES warehouses(id),
+    variant_id UUID NOT NULL REFERENCES variants(id),
+    stock_status stock_status_type NOT NULL,
+
+    quantity_change DECIMAL(15,3) NOT NULL,
+    balance_after DECIMAL(15,3) NOT NULL,
+    unit_cost DECIMAL(15,6) NOT NULL DEFAULT 0,
+
+    movement_type VARCHAR(30) NOT NULL,
+    ref_doc_id UUID,
+    ref_doc_type VARCHAR(50),
+    notes TEXT,
+
+    created_by UUID REFERENCES users(id),
+    occurred_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_ledger_bucket_time
+ON stock_ledger (tenant_id, warehouse_id, variant_id, stock_status, occurred_at);
+
+CREATE INDEX IF NOT EXISTS idx_stock_ledger_tenant_time
+ON stock_ledger (tenant_id, occurred_at);
+
+CREATE INDEX IF NOT EXISTS idx_stock_ledger_ref_doc
+ON stock_ledger (ref_doc_id)
+WHERE ref_doc_id IS NOT NULL;
+
+-- The ledger is append-only: corrections are new entries
+CREATE OR REPLACE FUNCTION prevent_stock_ledger_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'stock_ledger is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stock_ledger_append_only ON stock_ledger;
+CREATE TRIGGER stock_ledger_append_only
+BEFORE UPDATE OR DELETE ON stock_ledger
+FOR EACH ROW EXECUTE FUNCTION prevent_stock_ledger_changes();
+
+-- Balances per bucket at each snapshot time (zero balances are omitted)
+CREATE TABLE IF NOT EXISTS stock_balance_snapshots (
+    tenant_id UUID NOT NULL REFERENCES tenants(id),
+    snapshot_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    warehouse_id UUID NOT NULL REFERENCES warehouses(id),
+    variant_id UUID NOT NULL REFERENCES variants(id),
+    stock_status stock_status_type NOT NULL,
+    quantity DECIMAL(15,3) NOT NULL,
+    unit_cost DECIMAL(15,6) NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, snapshot_at, warehouse_id, variant_id, stock_status)
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_balance_snapshots_time
+ON stock_balance_snapshots (snapshot_at);
+
+-- One row per completed snapshot, including snapshots with no balances
+CREATE TABLE IF NOT EXISTS stock_snapshot_runs (
+    snapshot_at TIMESTAMP WITH TIME ZONE PRIMARY KEY,
+    balance_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Opening balances so the ledger starts from the current stock levels
+INSERT INTO stock_ledger (
+    tenant_id, warehouse_id, variant_id, stock_status,
+    quantity_change, balance_after, unit_cost, movement_type, notes
+)
+SELECT tenant_id, warehouse_id, variant_id, stock_status,
+       quantity, quantity, unit_cost, 'opening_balance', 'Balance when the stock ledger was introduced'
+FROM stock_levels
+WHERE quantity <> 0
+  AND NOT EXISTS (SELECT 1 FROM stock_ledger);
+
+COMMENT ON TABLE stock_ledger IS 'Append-only history of stock_levels changes, written in the same transaction as each change';
+COMMENT ON TABLE stock_balance_snapshots IS 'Periodic balances built from the previous snapshot plus the stock ledger';
@@ -0,0 +1,10 @@
+-- Migration 035: Indexes for paginated stock document listings
+-- Listings page through a tenant's documents newest first, optionally filtered by type or status.
+
+CREATE INDEX IF NOT EXISTS stock_docs_tenant_created_idx
+ON stock_docs (tenant_id, created_at DESC)
+WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS stock_docs_tenant_status_created_idx
+ON stock_docs (tenant_id, doc_status, created_at DESC)
+WHERE deleted_at IS NULL;
@@ -0,0 +1,47 @@
+-- Migration 036: Individual stock reservation holds with expiry
+-- stock_levels.reserved_qty is the sum of the active holds on each bucket and is
+-- adjusted in the same statement that places, releases or expires a hold.
+
+CREATE TABLE IF NOT EXISTS stock_reservations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    tenant_id UUID NOT NULL REFERENCES tenants(id),
+    warehouse_id UUID NOT NULL REFERENCES warehouses(id),
+    variant_id UUID NOT NULL REFERENCES variants(id),
+    stock_status stock_status_type NOT NULL,
+    quantity DECIMAL(15,3) NOT NULL,
+
+    order_id UUID,
+    order_line_id UUID,
+
+    status VARCHAR(20) NOT NULL DEFAULT 'active',
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    released_at TIMESTAMP WITH TIME ZONE,
+
+    created_by UUID REFERENCES users(id),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT stock_reservations_quantity_positive CHECK (quantity > 0),
+    CONSTRAINT stock_reservations_status_valid CHECK (status IN ('active', 'released', 'expired'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_active_expiry
+ON stock_reservations (expires_at)
+WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_active_bucket
+ON stock_reservations (tenant_id, warehouse_id, variant_id, stock_status)
+WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_order
+ON stock_reservations (tenant_id, order_id)
+WHERE order_id IS NOT NULL;
+
+-- Reservations made before holds existed become one hold per bucket, so they
+-- can be released and expire like any other
+INSERT INTO stock_reservations (
+    tenant_id, warehouse_id, variant_id, stock_status, quantity, expires_at
+)
+SELECT tenant_id, warehouse_id, variant_id, stock_status, reserved_qty, NOW() + INTERVAL '7 days'
+FROM stock_levels
+WHERE reserved_qty > 0
+  AND NOT EXISTS (SELECT 1 FROM stock_reservations);
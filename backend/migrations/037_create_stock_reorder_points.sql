@@ -0,0 +1,26 @@
+-- Migration 037: Reorder points per variant and warehouse for stock alerts
+-- A reorder point without a warehouse applies to the variant in every warehouse
+-- that has no reorder point of its own.
+
+CREATE TABLE IF NOT EXISTS stock_reorder_points (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    tenant_id UUID NOT NULL REFERENCES tenants(id),
+    warehouse_id UUID REFERENCES warehouses(id),
+    variant_id UUID NOT NULL REFERENCES variants(id),
+    reorder_point DECIMAL(15,3) NOT NULL,
+
+    created_by UUID REFERENCES users(id),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_by UUID REFERENCES users(id),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT stock_reorder_points_non_negative CHECK (reorder_point >= 0)
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stock_reorder_points_warehouse
+ON stock_reorder_points (tenant_id, variant_id, warehouse_id)
+WHERE warehouse_id IS NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stock_reorder_points_variant
+ON stock_reorder_points (tenant_id, variant_id)
+WHERE warehouse_id IS NULL;
@@ -0,0 +1,62 @@
+-- Migration: Report the part of a payment batch that could not be applied
+-- apply_invoice_payments used to skip an invoice whose summed payments exceeded
+-- its balance, so money already collected (e.g. a completed M-PESA push) was not
+-- credited at all. Amounts are now capped at the balance due and every requested
+-- invoice is returned with the amount applied and the amount left unapplied.
+
+DROP FUNCTION IF EXISTS apply_invoice_payments(JSONB);
+
+CREATE FUNCTION apply_invoice_payments(p_payments JSONB)
+RETURNS TABLE (
+    invoice_id UUID,
+    tenant_id UUID,
+    order_id UUID,
+    invoice_status invoice_status,
+    applied_amount NUMERIC,
+    unapplied_amount NUMERIC
+)
+LANGUAGE sql
+AS $$
+    WITH requested AS (
+        SELECT (item->>'invoice_id')::uuid AS invoice_id,
+               sum((item->>'amount')::numeric) AS amount
+        FROM jsonb_array_elements(p_payments) AS item
+        GROUP BY 1
+    ),
+    payable AS (
+        -- Locking first makes the balance read here the one the update applies to
+        SELECT i.id,
+               LEAST(r.amount, GREATEST(i.balance_due, 0)) AS amount
+        FROM invoices i
+        JOIN requested r ON r.invoice_id = i.id
+        WHERE i.invoice_status IN ('sent', 'generated', 'partial_paid', 'overdue')
+          AND r.amount > 0
+        FOR UPDATE OF i
+    ),
+    updated AS (
+        UPDATE invoices i
+        SET paid_amount = i.paid_amount + p.amount,
+            balance_due = i.total_amount - (i.paid_amount + p.amount),
+            invoice_status = CASE
+                WHEN i.total_amount - (i.paid_amount + p.amount) <= 0 THEN 'paid'::invoice_status
+                ELSE 'partial_paid'::invoice_status
+            END,
+            paid_at = CASE
+                WHEN i.total_amount - (i.paid_amount + p.amount) <= 0 THEN now()
+                ELSE i.paid_at
+            END,
+            updated_at = now()
+        FROM payable p
+        WHERE i.id = p.id
+          AND p.amount > 0
+        RETURNING i.id, i.tenant_id, i.order_id, i.invoice_status, p.amount AS applied_amount
+    )
+    SELECT r.invoice_id,
+           u.tenant_id,
+           u.order_id,
+           u.invoice_status,
+           COALESCE(u.applied_amount, 0),
+           r.amount - COALESCE(u.applied_amount, 0)
+    FROM requested r
+    LEFT JOIN updated u ON u.id = r.invoice_id;
+$$;
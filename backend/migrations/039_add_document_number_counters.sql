@@ -0,0 +1,64 @@
+-- Migration: Allocate document numbers in the database
+-- Numbers used to be read as MAX(invoice_no) + 1 by the application, so two
+-- concurrent allocations could hand out the same block and fail on
+-- UNIQUE (invoice_no, tenant_id). A per-tenant counter row is now incremented
+-- by the whole block in one statement; its row lock serialises allocations.
+
+CREATE TABLE IF NOT EXISTS document_number_counters (
+    tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+    document_type TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    last_number BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (tenant_id, document_type, prefix)
+);
+
+-- Returns the first number of a block of p_count consecutive numbers
+CREATE OR REPLACE FUNCTION allocate_document_numbers(
+    p_document_type TEXT,
+    p_tenant_id UUID,
+    p_prefix TEXT,
+    p_count INTEGER
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_last_number BIGINT;
+BEGIN
+    IF p_count IS NULL OR p_count <= 0 THEN
+        RAISE EXCEPTION 'p_count must be positive';
+    END IF;
+
+    -- The first allocation continues from the highest number already issued;
+    -- once the counter row exists the UPDATE below is the only statement run
+    IF NOT EXISTS (
+        SELECT 1 FROM document_number_counters
+        WHERE tenant_id = p_tenant_id
+          AND document_type = p_document_type
+          AND prefix = p_prefix
+    ) THEN
+        IF p_document_type = 'invoice' THEN
+            INSERT INTO document_number_counters (tenant_id, document_type, prefix, last_number)
+            SELECT p_tenant_id, p_document_type, p_prefix,
+                   COALESCE(MAX(substring(invoice_no FROM '-(\d+)$')::bigint), 0)
+            FROM invoices
+            WHERE tenant_id = p_tenant_id
+              AND invoice_no LIKE p_prefix || '-%'
+            ON CONFLICT (tenant_id, document_type, prefix) DO NOTHING;
+        ELSE
+            RAISE EXCEPTION 'Unknown document type %', p_document_type;
+        END IF;
+    END IF;
+
+    UPDATE document_number_counters
+    SET last_number = last_number + p_count,
+        updated_at = now()
+    WHERE tenant_id = p_tenant_id
+      AND document_type = p_document_type
+      AND prefix = p_prefix
+    RETURNING last_number INTO v_last_number;
+
+    RETURN v_last_number - p_count + 1;
+END;
+$$;
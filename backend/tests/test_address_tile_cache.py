@@ -0,0 +1,104 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.addresses import AddressLocation, AddressType
+from app.infrastucture.database.reference_cache import address_tile_cache, invalidate_tenant_addresses
+from app.services.addresses import address_service
+from app.services.addresses.address_service import AddressService
+from app.services.addresses.geo_utils import in_bbox
+
+NAIROBI = (36.8219, -1.2921)
+
+
+class InMemoryAddressLocations:
+    """Address repository stand-in answering the spatial queries from a list, counting the calls"""
+
+    def __init__(self, locations_by_tenant):
+        self.locations_by_tenant = locations_by_tenant
+        self.bbox_calls = []
+        self.radius_calls = 0
+
+    async def get_address_locations_in_bbox(self, tenant_id, min_lon, min_lat, max_lon, max_lat, limit=5000):
+        self.bbox_calls.append((min_lon, min_lat, max_lon, max_lat))
+        bbox = (min_lon, min_lat, max_lon, max_lat)
+        return [
+            location for location in self.locations_by_tenant.get(tenant_id, [])
+            if in_bbox((location.longitude, location.latitude), bbox)
+        ][:limit]
+
+    async def get_address_locations_within_radius(self, tenant_id, longitude, latitude, radius_km, limit=500):
+        self.radius_calls += 1
+        return []
+
+
+def make_location(longitude, latitude, street="Moi Avenue"):
+    return AddressLocation(
+        address_id=uuid4(), customer_id=uuid4(), address_type=AddressType.DELIVERY,
+        longitude=longitude, latitude=latitude, street=street, city="Nairobi", is_primary_delivery=True
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_tile_cache():
+    address_tile_cache.clear()
+    yield
+    address_tile_cache.clear()
+
+
+class TestAddressTileCache:
+    """Test cases for serving address proximity queries from geohash tiles."""
+
+    def test_repeated_lookups_are_served_from_cached_tiles(self):
+        tenant_id, other_tenant = uuid4(), uuid4()
+        near = make_location(NAIROBI[0] + 0.005, NAIROBI[1], "Kenyatta Avenue")
+        nearest = make_location(NAIROBI[0] + 0.001, NAIROBI[1], "Moi Avenue")
+        far = make_location(NAIROBI[0] + 0.05, NAIROBI[1], "Thika Road")
+        repository = InMemoryAddressLocations({tenant_id: [near, nearest, far], other_tenant: [far]})
+        service = AddressService(repository)
+
+        first = asyncio.run(service.get_addresses_within_radius(tenant_id, *NAIROBI, radius_km=1))
+        tiles_fetched = len(repository.bbox_calls)
+        second = asyncio.run(service.get_addresses_within_radius(tenant_id, *NAIROBI, radius_km=1))
+
+        assert [location.address_id for location in first] == [nearest.address_id, near.address_id]
+        assert first[0].distance_km < first[1].distance_km <= 1
+        assert tiles_fetched > 0 and len(repository.bbox_calls) == tiles_fetched
+        assert [location.address_id for location in second] == [location.address_id for location in first]
+        # Tiles are cached per tenant
+        assert asyncio.run(service.get_addresses_within_radius(other_tenant, *NAIROBI, radius_km=1)) == []
+        assert len(repository.bbox_calls) == 2 * tiles_fetched
+
+    def test_address_writes_drop_the_tenants_tiles(self):
+        tenant_id, other_tenant = uuid4(), uuid4()
+        repository = InMemoryAddressLocations({tenant_id: [make_location(*NAIROBI)]})
+        service = AddressService(repository)
+        bbox = (NAIROBI[0] - 0.01, NAIROBI[1] - 0.01, NAIROBI[0] + 0.01, NAIROBI[1] + 0.01)
+        asyncio.run(service.get_addresses_in_bbox(tenant_id, *bbox))
+        asyncio.run(service.get_addresses_in_bbox(other_tenant, *bbox))
+        tiles_fetched = len(repository.bbox_calls) // 2
+
+        added = make_location(NAIROBI[0] + 0.002, NAIROBI[1])
+        repository.locations_by_tenant[tenant_id].append(added)
+        assert len(asyncio.run(service.get_addresses_in_bbox(tenant_id, *bbox))) == 1
+
+        invalidate_tenant_addresses(tenant_id)
+        refreshed = asyncio.run(service.get_addresses_in_bbox(tenant_id, *bbox))
+        asyncio.run(service.get_addresses_in_bbox(other_tenant, *bbox))
+
+        assert added.address_id in {location.address_id for location in refreshed}
+        assert len(repository.bbox_calls) == 3 * tiles_fetched
+
+    def test_large_or_dense_areas_go_to_the_database(self, monkeypatch):
+        tenant_id = uuid4()
+        repository = InMemoryAddressLocations({tenant_id: [make_location(*NAIROBI), make_location(NAIROBI[0] + 0.001, NAIROBI[1])]})
+        service = AddressService(repository)
+
+        # Most of Kenya needs more tiles than a query may use, even at the coarsest precision
+        asyncio.run(service.get_addresses_in_bbox(tenant_id, 34.0, -4.5, 41.0, 4.5))
+        assert repository.bbox_calls == [(34.0, -4.5, 41.0, 4.5)]
+
+        monkeypatch.setattr(address_service, "MAX_ADDRESSES_PER_TILE", 2)
+        asyncio.run(service.get_addresses_within_radius(tenant_id, *NAIROBI, radius_km=1))
+        assert repository.radius_calls == 1
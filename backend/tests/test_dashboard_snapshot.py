@@ -0,0 +1,174 @@
+import asyncio
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from uuid import uuid4
+
+from app.domain.entities.payments import PaymentSummary
+from app.domain.entities.stock_alerts import StockReorderPoint
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.users import User, UserRoleType
+from app.infrastucture.database.availability_cache import AvailabilityCache
+from app.infrastucture.database import dashboard_cache as dashboard_cache_module
+from app.infrastucture.database.dashboard_cache import DashboardSnapshotCache
+from app.infrastucture.database.stock_alert_engine import StockAlertEngine
+from app.services.dashboard.dashboard_refresh_worker import DashboardRefreshWorker
+from app.services.dashboard.dashboard_snapshot_service import DashboardSnapshotService
+from app.services.stock_levels.availability_service import AvailabilityService
+from app.services.stock_levels.stock_alert_service import StockAlertService
+from app.services.trips.trip_service import TripService
+
+
+class CountingSummaries:
+    """The order, trip, invoice, payment and stock level summary calls a snapshot makes"""
+
+    def __init__(self):
+        self.orders = {"total": 4, "pending": 1, "completed": 2, "in_progress": 1}
+        self.available = {}
+        self.calls = 0
+
+    async def get_orders_summary(self, tenant_id):
+        self.calls += 1
+        return dict(self.orders)
+
+    async def get_trips_summary(self, tenant_id):
+        return {"total": 12, "pending": 3, "active": 2, "completed": 6, "cancelled": 1}
+
+    async def get_trips_by_tenant(self, tenant_id, limit=100, offset=0):
+        return []
+
+    async def get_invoice_summary(self, tenant_id):
+        return {"draft_invoices": 1, "sent_invoices": 0, "paid_invoices": 3, "overdue_invoices": 0, "total_invoices": 4}
+
+    async def get_payment_summary(self, tenant_id, from_date=None, to_date=None):
+        return PaymentSummary(2, Decimal("150"), 2, Decimal("150"), 0, Decimal("0"), 0, Decimal("0"))
+
+    async def get_available_quantities(self, tenant_id):
+        return dict(self.available)
+
+
+class ReorderPoints:
+    """Stock alert repository stand-in with prepared reorder points and no positions"""
+
+    def __init__(self, reorder_points):
+        self.reorder_points = list(reorder_points)
+
+    async def get_reorder_points(self, tenant_id):
+        return list(self.reorder_points)
+
+    async def get_stock_positions(self, tenant_id):
+        return []
+
+    async def set_reorder_point(self, reorder_point):
+        self.reorder_points.append(reorder_point)
+        return reorder_point
+
+
+def make_service(summaries, cache, stock_alert_service=None):
+    return DashboardSnapshotService(
+        summaries, summaries, summaries, summaries,
+        AvailabilityService(summaries, cache=AvailabilityCache()),
+        stock_alert_service=stock_alert_service,
+        cache=cache
+    )
+
+
+class TestDashboardSnapshot:
+    """Test cases for the materialized tenant dashboard snapshot."""
+
+    def test_snapshot_is_served_from_memory_until_a_write(self):
+        tenant_id, warehouse_id = uuid4(), uuid4()
+        summaries = CountingSummaries()
+        summaries.available = {
+            (warehouse_id, uuid4(), StockStatus.ON_HAND): Decimal("4"),
+            (warehouse_id, uuid4(), StockStatus.ON_HAND): Decimal("-2"),
+            (warehouse_id, uuid4(), StockStatus.ON_HAND): Decimal("40"),
+            (warehouse_id, uuid4(), StockStatus.ON_HAND): Decimal("0"),
+            (warehouse_id, uuid4(), StockStatus.TRUCK_STOCK): Decimal("1")
+        }
+        cache = DashboardSnapshotCache()
+        service = make_service(summaries, cache)
+
+        first = asyncio.run(service.get_snapshot(tenant_id))
+        second = asyncio.run(service.get_snapshot(tenant_id))
+
+        assert second is first and summaries.calls == 1
+        # An empty bucket is out of stock, not low
+        assert first.kpis["stock"] == {
+            "stock_buckets": 4, "low_stock_count": 1, "out_of_stock_count": 1, "negative_stock_count": 1
+        }
+        assert first.kpis["payments"]["completed_amount"] == 150.0
+
+        # A write that changes nothing visible rebuilds but keeps the version and ETag
+        cache.mark_stale(tenant_id)
+        unchanged = asyncio.run(service.get_snapshot(tenant_id))
+        assert summaries.calls == 2 and (unchanged.version, unchanged.etag) == (first.version, first.etag)
+
+        summaries.orders["pending"] = 2
+        cache.mark_stale(tenant_id)
+        changed = asyncio.run(service.get_snapshot(tenant_id))
+        assert changed.version == first.version + 1 and changed.etag != first.etag
+
+    def test_low_stock_uses_the_alert_reorder_points(self, monkeypatch):
+        tenant_id, depot = uuid4(), uuid4()
+        cylinder, regulator, hose = uuid4(), uuid4(), uuid4()
+        summaries = CountingSummaries()
+        summaries.available = {
+            (depot, cylinder, StockStatus.ON_HAND): Decimal("40"),
+            (depot, regulator, StockStatus.ON_HAND): Decimal("4"),
+            (depot, hose, StockStatus.ON_HAND): Decimal("8")
+        }
+        alerts = StockAlertService(ReorderPoints([
+            StockReorderPoint(tenant_id, cylinder, Decimal("50")),
+            StockReorderPoint(tenant_id, regulator, Decimal("3"), warehouse_id=depot)
+        ]), engine=StockAlertEngine())
+        cache = DashboardSnapshotCache()
+        monkeypatch.setattr(dashboard_cache_module, "dashboard_cache", cache)
+        service = make_service(summaries, cache, alerts)
+
+        # The cylinder is below its own reorder point, the regulator above its depot's, the hose below the default
+        assert asyncio.run(service.get_snapshot(tenant_id)).kpis["stock"]["low_stock_count"] == 2
+
+        user = User.create(email="stores@example.com", full_name="Stores", role=UserRoleType.TENANT_ADMIN, tenant_id=tenant_id)
+        asyncio.run(alerts.set_reorder_point(user, cylinder, Decimal("20")))
+        assert not cache.is_current(tenant_id)
+        assert asyncio.run(service.get_snapshot(tenant_id)).kpis["stock"]["low_stock_count"] == 1
+
+    def test_write_during_a_rebuild_leaves_the_snapshot_stale(self):
+        tenant_id = uuid4()
+        cache = DashboardSnapshotCache()
+
+        class WrittenDuringRebuild(CountingSummaries):
+            async def get_orders_summary(self, tenant_id):
+                cache.mark_stale(tenant_id)
+                return await super().get_orders_summary(tenant_id)
+
+        summaries = WrittenDuringRebuild()
+        service = make_service(summaries, cache)
+
+        asyncio.run(service.get_snapshot(tenant_id))
+        assert not cache.is_current(tenant_id)
+        assert cache.tenants_to_refresh() == [tenant_id]
+
+    def test_worker_refreshes_stale_tenants_and_drops_idle_ones(self):
+        viewed, idle = uuid4(), uuid4()
+        summaries = CountingSummaries()
+        cache = DashboardSnapshotCache(idle_after=600)
+        service = make_service(summaries, cache)
+        asyncio.run(service.get_snapshot(viewed))
+        asyncio.run(service.get_snapshot(idle))
+        cache._read_at[str(idle)] -= 601
+
+        @asynccontextmanager
+        async def services():
+            yield service
+
+        worker = DashboardRefreshWorker(cache=cache, services=services)
+        assert asyncio.run(worker.run_once()) == 0
+        assert cache.peek(idle) is None
+
+        cache.mark_stale(viewed)
+        assert asyncio.run(worker.run_once()) == 1 and cache.is_current(viewed)
+
+        # The trips dashboard counts every trip, not just a recent page
+        trips = asyncio.run(TripService(summaries).get_trips_summary(viewed))
+        assert (trips["total_trips"], trips["active_trips"], trips["completed_trips"]) == (12, 2, 6)
@@ -0,0 +1,85 @@
+from uuid import uuid4
+from datetime import date
+
+from app.domain.entities.dispatch_planning import DispatchOrder, DispatchVehicle
+from app.services.trips.dispatch_planner import DispatchPlanner
+from app.services.addresses.geo_utils import parse_point
+
+
+NAIROBI = (36.82, -1.29)
+MOMBASA = (39.67, -4.04)
+
+
+def make_order(weight_kg: float, location=None, volume_m3: float = 0.0) -> DispatchOrder:
+    return DispatchOrder(
+        order_id=uuid4(),
+        order_no=f"ORD-{uuid4().hex[:6]}",
+        customer_id=uuid4(),
+        weight_kg=weight_kg,
+        volume_m3=volume_m3,
+        location=location
+    )
+
+
+class TestDispatchPlanner:
+    """Test cases for the multi-vehicle dispatch heuristic."""
+
+    def test_parse_point_formats(self):
+        assert parse_point("POINT (36.82 -1.29)") == NAIROBI
+        assert parse_point("-1.29,36.82") == NAIROBI
+        assert parse_point({"coordinates": [36.82, -1.29]}) == NAIROBI
+        assert parse_point("Industrial Area, Nairobi") is None
+        assert parse_point("POINT (0 0)") is None
+
+    def test_respects_weight_and_volume_capacity(self):
+        vehicles = [
+            DispatchVehicle(vehicle_id=uuid4(), plate="KAA 001", capacity_kg=1000, capacity_m3=2.0),
+            DispatchVehicle(vehicle_id=uuid4(), plate="KAA 002", capacity_kg=500)
+        ]
+        orders = [make_order(300, volume_m3=0.8) for _ in range(5)]
+
+        plan = DispatchPlanner().plan(date.today(), orders, vehicles)
+
+        for route in plan.routes:
+            assert route.total_weight_kg <= route.vehicle.capacity_kg
+            if route.vehicle.capacity_m3:
+                assert route.total_volume_m3 <= route.vehicle.capacity_m3
+        assigned = sum(len(route.orders) for route in plan.routes)
+        assert assigned + len(plan.unassigned) == len(orders)
+        assert assigned == 3
+
+    def test_orders_zoned_to_nearest_depot(self):
+        nairobi_depot, mombasa_depot = uuid4(), uuid4()
+        vehicles = [
+            DispatchVehicle(vehicle_id=uuid4(), plate="NBO", capacity_kg=5000,
+                            depot_id=nairobi_depot, depot_location=NAIROBI),
+            DispatchVehicle(vehicle_id=uuid4(), plate="MSA", capacity_kg=5000,
+                            depot_id=mombasa_depot, depot_location=MOMBASA)
+        ]
+        nairobi_orders = [make_order(100, (36.80 + i * 0.01, -1.30)) for i in range(3)]
+        mombasa_orders = [make_order(100, (39.60 + i * 0.01, -4.00)) for i in range(3)]
+
+        plan = DispatchPlanner().plan(date.today(), nairobi_orders + mombasa_orders, vehicles)
+
+        by_plate = {route.vehicle.plate: {o.order_id for o in route.orders} for route in plan.routes}
+        assert by_plate["NBO"] == {o.order_id for o in nairobi_orders}
+        assert by_plate["MSA"] == {o.order_id for o in mombasa_orders}
+
+    def test_max_stops_and_unlocated_orders_last(self):
+        vehicle = DispatchVehicle(vehicle_id=uuid4(), plate="KAA 003", capacity_kg=10000)
+        located = [make_order(10, (36.8 + i * 0.01, -1.3)) for i in range(3)]
+        unlocated = make_order(10)
+
+        plan = DispatchPlanner(max_stops_per_trip=3).plan(date.today(), [unlocated] + located, [vehicle])
+
+        route = plan.routes[0]
+        assert len(route.orders) == 3
+        assert len(plan.unassigned) == 1
+
+    def test_no_vehicles_leaves_everything_unassigned(self):
+        orders = [make_order(10) for _ in range(2)]
+
+        plan = DispatchPlanner().plan(date.today(), orders, [])
+
+        assert plan.unassigned == orders
+        assert plan.to_dict()["trip_count"] == 0
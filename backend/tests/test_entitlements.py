@@ -0,0 +1,100 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.domain.entities.tenant_subscriptions import BillingCycle, PlanTier, TenantPlan, TenantSubscription
+from app.infrastucture.database.reference_cache import entitlement_cache, invalidate_tenant_entitlements
+from app.services.tenant_subscriptions.tenant_subscription_service import TenantSubscriptionService
+
+
+class CountingRepository:
+    """Serves one subscription and plan and counts how often they are loaded"""
+
+    def __init__(self, subscription, plan):
+        self.subscription = subscription
+        self.plan = plan
+        self.subscription_loads = 0
+
+    async def get_active_subscription_by_tenant(self, tenant_id):
+        self.subscription_loads += 1
+        return self.subscription
+
+    async def get_plan_by_id(self, plan_id):
+        return self.plan
+
+    async def get_usage_summary(self, tenant_id):
+        return {'orders': 9}
+
+
+def make_repository(max_orders=10):
+    plan = TenantPlan.create(
+        plan_name="Professional",
+        plan_tier=PlanTier.PROFESSIONAL,
+        description="Professional plan",
+        billing_cycle=BillingCycle.MONTHLY,
+        base_amount=Decimal("99"),
+        max_orders_per_month=max_orders,
+        max_active_drivers=5,
+        max_storage_gb=10,
+        max_api_requests_per_minute=100,
+        features=["routing"]
+    )
+    now = datetime.now(timezone.utc)
+    subscription = TenantSubscription.create(
+        tenant_id=uuid4(),
+        plan_id=plan.id,
+        plan_name=plan.plan_name,
+        plan_tier=plan.plan_tier,
+        billing_cycle=BillingCycle.MONTHLY,
+        base_amount=plan.base_amount,
+        start_date=date.today(),
+        current_period_start=now,
+        current_period_end=now + timedelta(days=30)
+    )
+    return CountingRepository(subscription, plan)
+
+
+class TestTenantEntitlements:
+    """Test cases for cached per-tenant entitlement snapshots."""
+
+    def test_snapshot_is_loaded_once(self):
+        repository = make_repository()
+        service = TenantSubscriptionService(repository)
+        tenant_id = repository.subscription.tenant_id
+
+        async def checks():
+            return [await service.check_tenant_limits(tenant_id, 'orders') for _ in range(3)]
+
+        assert asyncio.run(checks()) == [True, True, True]
+        assert repository.subscription_loads == 1
+
+        entitlements = asyncio.run(service.get_tenant_entitlements(tenant_id))
+        assert entitlements.has_feature("routing")
+        assert entitlements.limit_for('orders') == 10
+
+    def test_invalidation_reloads_plan_limits(self):
+        repository = make_repository(max_orders=10)
+        service = TenantSubscriptionService(repository)
+        tenant_id = repository.subscription.tenant_id
+        asyncio.run(service.get_tenant_entitlements(tenant_id))
+
+        repository.plan.max_orders_per_month = 9
+        invalidate_tenant_entitlements(tenant_id)
+
+        assert asyncio.run(service.check_tenant_limits(tenant_id, 'orders')) is False
+        assert repository.subscription_loads == 2
+
+    def test_snapshot_expires_after_the_ttl(self):
+        repository = make_repository()
+        service = TenantSubscriptionService(repository)
+        tenant_id = repository.subscription.tenant_id
+        asyncio.run(service.get_tenant_entitlements(tenant_id))
+
+        # A missed invalidation is bounded by the TTL
+        snapshot, stored_at = entitlement_cache._entries[str(tenant_id)]["entitlements"]
+        entitlement_cache._entries[str(tenant_id)]["entitlements"] = (snapshot, stored_at - entitlement_cache.ttl)
+        asyncio.run(service.get_tenant_entitlements(tenant_id))
+        asyncio.run(service.get_tenant_entitlements(tenant_id))
+
+        assert repository.subscription_loads == 2
@@ -0,0 +1,26 @@
+import pytest
+
+from app.services.addresses.geo_utils import (
+    geohash_encode, geohash_bbox, geohash_tiles, radius_bbox, haversine_km, in_bbox
+)
+
+
+class TestGeoUtils:
+    """Test cases for geohash tiling used by the address proximity cache."""
+
+    def test_geohash_encode_known_value(self):
+        assert geohash_encode(-5.6, 42.6, 5) == "ezs42"
+
+    def test_geohash_bbox_contains_point(self):
+        point = (36.8219, -1.2921)
+        tile = geohash_encode(point[0], point[1], 6)
+        assert in_bbox(point, geohash_bbox(tile))
+
+    def test_tiles_cover_radius(self):
+        centre = (36.8219, -1.2921)
+        bbox = radius_bbox(centre[0], centre[1], 3)
+        tiles = geohash_tiles(bbox, 5)
+
+        for corner in [(bbox[0], bbox[1]), (bbox[2], bbox[3]), (bbox[0], bbox[3]), (bbox[2], bbox[1])]:
+            assert geohash_encode(corner[0], corner[1], 5) in tiles
+        assert haversine_km(centre, (bbox[2], centre[1])) == pytest.approx(3, rel=0.01)
@@ -0,0 +1,165 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.customers import Customer, CustomerType
+from app.domain.entities.orders import Order, OrderLine, OrderStatus
+from app.domain.entities.users import User, UserRoleType
+from app.infrastucture.database import invoice_repository_impl
+from app.infrastucture.database.invoice_repository_impl import InvoiceRepositoryImpl
+from app.services.invoices.invoice_service import InvoiceService
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Records one PostgREST call and answers it through the client"""
+
+    def __init__(self, client, table, action=None, payload=None):
+        self.client = client
+        self.table = table
+        self.action = action
+        self.payload = payload
+        self.filters = []
+
+    def insert(self, payload):
+        return FakeQuery(self.client, self.table, "insert", payload)
+
+    def delete(self):
+        return FakeQuery(self.client, self.table, "delete")
+
+    def in_(self, column, values):
+        self.filters.append((column, list(values)))
+        return self
+
+    def execute(self):
+        self.client.calls.append((self.table, self.action, self.payload, self.filters))
+        if (self.table, self.action) in self.client.failing:
+            raise RuntimeError(f"{self.table} {self.action} failed")
+        return FakeResponse(self.payload)
+
+
+class FakeRpc:
+    def __init__(self, client, function, params):
+        self.client = client
+        self.function = function
+        self.params = params
+
+    def execute(self):
+        self.client.calls.append((self.function, "rpc", self.params, []))
+        counter = (self.params['p_tenant_id'], self.params['p_prefix'])
+        first = self.client.counters.get(counter, 0) + 1
+        self.client.counters[counter] = first + self.params['p_count'] - 1
+        return FakeResponse(first)
+
+
+class FakeSupabase:
+    """Supabase client stand-in with a document number counter per tenant and prefix"""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.counters = {}
+        self.failing = set(failing)
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, function, params):
+        return FakeRpc(self, function, params)
+
+
+class InMemoryOrders:
+    def __init__(self, orders):
+        self.orders = orders
+
+    async def get_orders_by_ids(self, order_ids):
+        return [order for order in self.orders if order.id in order_ids]
+
+
+class InMemoryCustomers:
+    def __init__(self, customers):
+        self.customers = customers
+
+    async def get_by_ids(self, customer_ids):
+        return [customer for customer in self.customers if customer.id in customer_ids]
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    client = FakeSupabase()
+    monkeypatch.setattr(invoice_repository_impl, "get_database", lambda: client)
+    return client
+
+
+def make_order(tenant_id, customer_id, order_no, status=OrderStatus.DELIVERED):
+    order = Order.create(tenant_id=tenant_id, order_no=order_no, customer_id=customer_id)
+    order.order_status = status
+    order.order_lines = [OrderLine.create(order_id=order.id, variant_id=uuid4(), qty_ordered=Decimal("2"), list_price=Decimal("1500"))]
+    return order
+
+
+class TestInvoiceBatch:
+    """Test cases for allocating invoice numbers and creating invoices in bulk."""
+
+    def test_number_blocks_come_from_the_database_counter(self, supabase):
+        repository = InvoiceRepositoryImpl()
+        tenant_id, other_tenant = uuid4(), uuid4()
+
+        first = asyncio.run(repository.get_next_invoice_numbers(tenant_id, "INV", 3))
+        # A concurrent batch gets the next block instead of re-reading the highest number
+        second = asyncio.run(repository.get_next_invoice_numbers(tenant_id, "INV", 2))
+
+        assert first == ["INV-000001", "INV-000002", "INV-000003"]
+        assert second == ["INV-000004", "INV-000005"]
+        assert asyncio.run(repository.get_next_invoice_number(tenant_id, "INV")) == "INV-000006"
+        assert asyncio.run(repository.get_next_invoice_numbers(other_tenant, "INV", 1)) == ["INV-000001"]
+        assert asyncio.run(repository.get_next_invoice_numbers(tenant_id, "INV", 0)) == []
+        assert {call[2]['p_document_type'] for call in supabase.calls} == {"invoice"}
+
+    def test_generating_invoices_for_delivered_orders_uses_one_block_and_one_insert(self, supabase):
+        user = User.create(email="accounts@example.com", full_name="Accounts", role=UserRoleType.ACCOUNTS, tenant_id=uuid4())
+        customer = Customer.create(tenant_id=user.tenant_id, customer_type=CustomerType.CREDIT, name="Kilimani Gas")
+        delivered = [make_order(user.tenant_id, customer.id, f"ORD-{i}") for i in range(3)]
+        in_transit = make_order(user.tenant_id, customer.id, "ORD-9", status=OrderStatus.IN_TRANSIT)
+        missing_customer = make_order(user.tenant_id, uuid4(), "ORD-10")
+        service = InvoiceService(
+            InvoiceRepositoryImpl(),
+            InMemoryOrders(delivered + [in_transit, missing_customer]),
+            InMemoryCustomers([customer])
+        )
+        service.invoice_repository.get_invoiced_order_ids = lambda order_ids, tenant_id: asyncio.sleep(0, result=[])
+
+        result = asyncio.run(service.generate_invoices_for_delivered_orders(
+            user, [str(order.id) for order in delivered + [in_transit, missing_customer]] + ["not-a-uuid"]
+        ))
+
+        assert result["created_count"] == 3 and result["failed_count"] == 3
+        assert [invoice.invoice_no for invoice in result["invoices"]] == ["INV-000001", "INV-000002", "INV-000003"]
+        assert [invoice.order_no for invoice in result["invoices"]] == ["ORD-0", "ORD-1", "ORD-2"]
+        assert [call[:2] for call in supabase.calls] == [
+            ("allocate_document_numbers", "rpc"), ("invoices", "insert"), ("invoice_lines", "insert")
+        ]
+        assert supabase.calls[0][2]['p_count'] == 3
+        assert len(supabase.calls[2][2]) == 3
+
+    def test_a_chunk_whose_lines_fail_is_removed_and_reported(self, supabase):
+        supabase.failing.add(("invoice_lines", "insert"))
+        user = User.create(email="accounts@example.com", full_name="Accounts", role=UserRoleType.TENANT_ADMIN, tenant_id=uuid4())
+        customer = Customer.create(tenant_id=user.tenant_id, customer_type=CustomerType.CASH, name="Westlands Depot")
+        orders = [make_order(user.tenant_id, customer.id, f"ORD-{i}") for i in range(2)]
+        service = InvoiceService(InvoiceRepositoryImpl(), InMemoryOrders(orders), InMemoryCustomers([customer]))
+        service.invoice_repository.get_invoiced_order_ids = lambda order_ids, tenant_id: asyncio.sleep(0, result=[])
+
+        result = asyncio.run(service.generate_invoices_for_delivered_orders(user, [str(order.id) for order in orders]))
+
+        assert result["created_count"] == 0
+        assert [failure["error"] for failure in result["failed"]] == ["Failed to save invoice"] * 2
+        table, action, _, filters = supabase.calls[-1]
+        assert (table, action) == ("invoices", "delete")
+        # Headers of the chunk are deleted again so no invoice is left without lines
+        assert filters == [("id", [header["id"] for header in supabase.calls[-3][2]])]
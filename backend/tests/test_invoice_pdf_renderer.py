@@ -0,0 +1,86 @@
+import asyncio
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from uuid import uuid4
+
+from pypdf import PdfReader
+
+from app.domain.entities.invoices import Invoice, InvoiceStatus, InvoiceType
+from app.services.invoices.invoice_pdf_renderer import (
+    InvoicePdfRenderer,
+    PdfCache,
+    invoice_pdf_cache_key,
+    render_invoices_pdf
+)
+
+
+def make_invoice(invoice_no: str = "INV-2024-000001") -> Invoice:
+    return Invoice(
+        id=uuid4(),
+        tenant_id=uuid4(),
+        invoice_no=invoice_no,
+        invoice_type=InvoiceType.STANDARD,
+        invoice_status=InvoiceStatus.GENERATED,
+        customer_id=uuid4(),
+        customer_name="Acme Gas Ltd",
+        customer_address="1 Industrial Road, Nairobi",
+        invoice_date=date(2024, 1, 1),
+        due_date=date(2024, 1, 31)
+    )
+
+
+class TestInvoicePdfRenderer:
+    """Test cases for invoice PDF rendering and caching."""
+
+    def test_cache_key_follows_updated_at(self):
+        invoice = make_invoice()
+        key = invoice_pdf_cache_key(invoice)
+
+        assert invoice_pdf_cache_key(invoice) == key
+        invoice.updated_at = invoice.updated_at + timedelta(seconds=1)
+        assert invoice_pdf_cache_key(invoice) != key
+
+    def test_pdf_cache_evicts_least_recently_used(self):
+        cache = PdfCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1234"
+        assert cache.size == 8
+
+    def test_render_merged_document(self):
+        content = render_invoices_pdf([make_invoice("INV-1"), make_invoice("INV-2")])
+
+        assert content.startswith(b"%PDF")
+
+    def test_render_zip_uses_cache(self):
+        # Render on a thread so the test does not depend on worker processes
+        renderer = InvoicePdfRenderer(executor=ThreadPoolExecutor(max_workers=1))
+        invoices = [make_invoice("INV-1"), make_invoice("INV-2")]
+
+        archive = asyncio.run(renderer.render_zip(invoices))
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as bundle:
+            assert bundle.namelist() == ["invoice-INV-1.pdf", "invoice-INV-2.pdf"]
+        assert len(renderer.cache) == 2
+
+    def test_render_merged_renders_each_invoice_and_concatenates_them(self):
+        renderer = InvoicePdfRenderer(executor=ThreadPoolExecutor(max_workers=2))
+        invoices = [make_invoice("INV-1"), make_invoice("INV-2"), make_invoice("INV-3")]
+        cached = asyncio.run(renderer.render(invoices[0]))
+
+        merged = asyncio.run(renderer.render_merged(invoices))
+
+        # Every invoice was rendered (and cached) on its own; the first came from cache
+        assert len(renderer.cache) == 3
+        assert renderer.cache.get(invoice_pdf_cache_key(invoices[0])) is cached
+        pages = len(PdfReader(io.BytesIO(cached)).pages)
+        assert len(PdfReader(io.BytesIO(merged)).pages) == 3 * pages
+
+        renderer.shutdown()
+        assert renderer._executor is None
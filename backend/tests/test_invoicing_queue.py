@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities.orders import Order, OrderStatus
+from app.domain.entities.users import User, UserRoleType
+from app.infrastucture.database.repositories.order_repository import SQLAlchemyOrderRepository
+from app.services.invoices.invoice_service import InvoiceService
+
+
+class KeysetOrders:
+    """Order repository stand-in paging with the same (created_at, id) keyset as the SQL"""
+
+    def __init__(self, orders):
+        self.orders = sorted(orders, key=lambda order: (order.created_at, order.id), reverse=True)
+        self.calls = []
+
+    async def get_orders_ready_for_invoicing(self, tenant_id, limit=100, after=None, offset=0):
+        self.calls.append((after, offset))
+        remaining = [order for order in self.orders if after is None or (order.created_at, order.id) < after]
+        start = offset if after is None else 0
+        return remaining[start:start + limit]
+
+
+class RecordingSession:
+    """AsyncSession stand-in returning no rows and recording the compiled statements"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+
+def make_user():
+    return User.create(email="accounts@example.com", full_name="Accounts", role=UserRoleType.ACCOUNTS, tenant_id=uuid4())
+
+
+def make_orders(tenant_id, created_at_offsets):
+    start = datetime(2026, 3, 2, 8, 0, 0, 123456, tzinfo=timezone.utc)
+    orders = []
+    for index, minutes in enumerate(created_at_offsets):
+        order = Order.create(tenant_id=tenant_id, order_no=f"ORD-{index}", customer_id=uuid4())
+        order.order_status = OrderStatus.DELIVERED
+        order.created_at = start + timedelta(minutes=minutes)
+        orders.append(order)
+    return orders
+
+
+def read_all_pages(service, user, limit):
+    pages, cursor = [], None
+    while True:
+        orders, cursor = asyncio.run(service.get_orders_ready_for_invoicing(user, limit=limit, cursor=cursor))
+        pages.append([order.order_no for order in orders])
+        if cursor is None:
+            return pages
+
+
+class TestInvoicingQueue:
+    """Test cases for keyset pagination of orders ready for invoicing."""
+
+    def test_pages_cover_tied_timestamps_exactly_once(self):
+        user = make_user()
+        # Three orders share a created_at, so the page boundary falls inside the tie
+        orders = make_orders(user.tenant_id, [0, 5, 5, 5, 9])
+        repository = KeysetOrders(orders)
+        service = InvoiceService(None, repository, None)
+
+        pages = read_all_pages(service, user, limit=2)
+
+        expected = [order.order_no for order in repository.orders]
+        assert [order_no for page in pages for order_no in page] == expected
+        assert [len(page) for page in pages] == [2, 2, 1]
+        # The cursor is the exact (created_at, id) of the last row of the previous page
+        last_of_first_page = repository.orders[1]
+        assert repository.calls[1][0] == (last_of_first_page.created_at, last_of_first_page.id)
+
+    def test_a_full_last_page_is_followed_by_an_empty_one(self):
+        user = make_user()
+        repository = KeysetOrders(make_orders(user.tenant_id, [0, 1, 2, 3]))
+        service = InvoiceService(None, repository, None)
+
+        pages = read_all_pages(service, user, limit=2)
+
+        assert [len(page) for page in pages] == [2, 2, 0]
+        assert asyncio.run(service.get_orders_ready_for_invoicing(user, limit=10)) == (repository.orders, None)
+        with pytest.raises(ValueError):
+            asyncio.run(service.get_orders_ready_for_invoicing(user, cursor="not-a-cursor"))
+
+    def test_cursor_pages_seek_instead_of_skipping_rows(self):
+        session = RecordingSession()
+        repository = SQLAlchemyOrderRepository(session)
+        tenant_id, cursor = uuid4(), (datetime(2026, 3, 2, 8, 5, tzinfo=timezone.utc), uuid4())
+
+        asyncio.run(repository.get_orders_ready_for_invoicing(tenant_id, limit=50, after=cursor, offset=100))
+        asyncio.run(repository.get_orders_ready_for_invoicing(tenant_id, limit=50, offset=100))
+
+        keyset, offset = session.statements
+        assert "(orders.created_at, orders.id) < (" in keyset
+        assert "ORDER BY orders.created_at DESC, orders.id DESC" in keyset
+        assert "NOT (EXISTS (SELECT" in keyset and "OFFSET" not in keyset
+        assert "OFFSET" in offset and "orders.created_at, orders.id) <" not in offset
@@ -0,0 +1,78 @@
+import pytest
+from decimal import Decimal
+from uuid import uuid4
+
+from app.domain.entities.load_model import LoadModel
+from app.domain.entities.trip_planning import TripPlan, TripPlanningLine, TripPlanningValidationResult
+
+
+def make_line(planned_qty: str, unit_weight_kg: str, unit_volume_m3: str = "0") -> TripPlanningLine:
+    return TripPlanningLine(
+        product_id=uuid4(),
+        variant_id=uuid4(),
+        product_name="LPG",
+        variant_name="CYL13",
+        ordered_qty=Decimal(planned_qty),
+        planned_qty=Decimal(planned_qty),
+        unit_weight_kg=Decimal(unit_weight_kg),
+        unit_volume_m3=Decimal(unit_volume_m3)
+    )
+
+
+class TestLoadModel:
+    """Test cases for the fixed-point load model."""
+
+    def test_incremental_totals(self):
+        load = LoadModel()
+        load.set_item("CYL13", Decimal("27.5"), Decimal("0.045"))
+        load.set_item("CYL6", Decimal("12.25"), Decimal("0.02"))
+
+        load.add("CYL13", 10)
+        load.add("CYL6", Decimal("4"))
+        load.remove("CYL13", 2)
+
+        assert load.total_weight_kg == Decimal("269")
+        assert load.total_volume_m3 == Decimal("0.44")
+        assert load.get_quantity("CYL13") == Decimal("8")
+
+        load.discard("CYL6")
+        assert load.total_weight_kg == Decimal("220")
+
+    def test_remove_more_than_loaded_fails(self):
+        load = LoadModel.from_items([("CYL13", 1, "27", "0")])
+
+        with pytest.raises(ValueError):
+            load.remove("CYL13", 2)
+
+    def test_evaluate_candidates_does_not_mutate(self):
+        load = LoadModel.from_items([("CYL13", 10, "27", "0.05"), ("CYL6", 0, "12", "0.02")])
+
+        results = load.evaluate_candidates(
+            [{"CYL13": 5}, {"CYL6": 10}, {"CYL13": -10, "CYL6": 1}],
+            capacity_kg=400,
+            capacity_m3=1
+        )
+
+        assert [result["fits"] for result in results] == [False, True, True]
+        assert results[0]["weight_kg"] == Decimal("405")
+        assert results[2]["weight_kg"] == Decimal("12")
+        assert load.total_weight_kg == Decimal("270")
+
+    def test_trip_plan_totals_follow_line_changes(self):
+        plan = TripPlan.create(uuid4(), uuid4(), vehicle_capacity_kg=Decimal("500"))
+        heavy = make_line("10", "27")
+        light = make_line("5", "12")
+        plan.add_planning_line(heavy)
+        plan.add_planning_line(light)
+        assert plan.total_weight_kg == Decimal("330")
+
+        plan.update_planned_quantity(heavy.product_id, heavy.variant_id, Decimal("20"))
+        assert plan.total_weight_kg == Decimal("600")
+        assert plan.validate_plan() == TripPlanningValidationResult.WEIGHT_EXCEEDED
+
+        plan.remove_planning_line(light.product_id, light.variant_id)
+        assert plan.total_weight_kg == Decimal("540")
+        assert len(plan.planning_lines) == 1
+
+        options = plan.evaluate_quantity_changes([{(heavy.product_id, heavy.variant_id): Decimal("-5")}])
+        assert options[0]["fits"] is True
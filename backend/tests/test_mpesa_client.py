@@ -0,0 +1,208 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.services.payments.mpesa_client import DarajaClient, MpesaApiError
+from app.services.payments.mpesa_service import MpesaService
+
+
+class DarajaStandIn:
+    """Minimal local Daraja: OAuth, STK push and STK query with injectable failures"""
+
+    def __init__(self, failures_before_success: int = 0, expires_in: int = 3599, connect_failures: int = 0):
+        self.failures_before_success = failures_before_success
+        self.connect_failures = connect_failures
+        self.expires_in = expires_in
+        self.token_requests = 0
+        self.stk_requests = 0
+        self.query_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.revoked_tokens = set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/v1/generate":
+            self.token_requests += 1
+            return httpx.Response(200, json={
+                "access_token": f"token-{self.token_requests}",
+                "expires_in": str(self.expires_in)
+            })
+
+        if self.connect_failures > 0:
+            self.connect_failures -= 1
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        token = request.headers.get("Authorization", "").replace("Bearer ", "")
+        if not token.startswith("token-") or token in self.revoked_tokens:
+            return httpx.Response(401, json={"errorMessage": "Invalid Access Token"})
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if request.url.path == "/mpesa/stkpush/v1/processrequest":
+                self.stk_requests += 1
+                if self.failures_before_success > 0:
+                    self.failures_before_success -= 1
+                    return httpx.Response(503, text="Service Unavailable")
+                payload = json.loads(request.content)
+                return httpx.Response(200, json={
+                    "MerchantRequestID": "29115-34620561-1",
+                    "CheckoutRequestID": f"ws_CO_{payload['AccountReference']}",
+                    "ResponseCode": "0",
+                    "ResponseDescription": "Success. Request accepted for processing",
+                    "CustomerMessage": "Success. Request accepted for processing"
+                })
+            if request.url.path == "/mpesa/stkpushquery/v1/query":
+                self.query_requests += 1
+                if self.failures_before_success > 0:
+                    self.failures_before_success -= 1
+                    return httpx.Response(503, text="Service Unavailable")
+                payload = json.loads(request.content)
+                return httpx.Response(200, json={
+                    "CheckoutRequestID": payload["CheckoutRequestID"],
+                    "ResultCode": "0",
+                    "ResultDesc": "The service request is processed successfully."
+                })
+            return httpx.Response(404)
+        finally:
+            self.in_flight -= 1
+
+
+def make_client(stand_in: DarajaStandIn, **kwargs) -> DarajaClient:
+    return DarajaClient(
+        base_url="https://daraja.local",
+        consumer_key="key",
+        consumer_secret="secret",
+        backoff_base=0.001,
+        transport=httpx.MockTransport(stand_in),
+        **kwargs
+    )
+
+
+class TestDarajaClient:
+    """Test cases for the async M-PESA client against a local Daraja stand-in."""
+
+    def test_token_is_cached_across_requests(self):
+        stand_in = DarajaStandIn()
+
+        async def run():
+            service = MpesaService(client=make_client(stand_in))
+            results = await asyncio.gather(*(
+                service.initiate_stk_push("0712345678", Decimal("100"), f"INV-{i}") for i in range(5)
+            ))
+            await service.client.aclose()
+            return results
+
+        results = asyncio.run(run())
+
+        assert all(result["success"] for result in results)
+        assert results[0]["phone_number"] == "254712345678"
+        assert stand_in.token_requests == 1
+
+    def test_token_refreshed_before_expiry(self):
+        stand_in = DarajaStandIn(expires_in=60)
+
+        async def run():
+            client = make_client(stand_in, refresh_margin=300)
+            first = await client.get_access_token()
+            second = await client.get_access_token()
+            await client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first != second
+        assert stand_in.token_requests == 2
+
+    def test_retries_transient_errors(self):
+        stand_in = DarajaStandIn(failures_before_success=2)
+
+        async def run():
+            service = MpesaService(client=make_client(stand_in, max_retries=3))
+            result = await service.check_transaction_status("ws_CO_1")
+            await service.client.aclose()
+            return result
+
+        result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert stand_in.query_requests == 3
+
+    def test_gives_up_after_max_retries(self):
+        stand_in = DarajaStandIn(failures_before_success=10)
+
+        async def run():
+            client = make_client(stand_in, max_retries=2)
+            try:
+                await client.post("/mpesa/stkpushquery/v1/query", {"CheckoutRequestID": "ws_CO_1"}, idempotent=True)
+            finally:
+                await client.aclose()
+
+        with pytest.raises(MpesaApiError) as error:
+            asyncio.run(run())
+
+        assert error.value.status_code == 503
+        assert stand_in.query_requests == 3
+
+    def test_stk_push_is_not_resent_once_daraja_may_have_accepted_it(self):
+        stand_in = DarajaStandIn(failures_before_success=1)
+
+        async def run():
+            client = make_client(stand_in, max_retries=3)
+            try:
+                await client.post("/mpesa/stkpush/v1/processrequest", {"AccountReference": "INV-1"})
+            finally:
+                await client.aclose()
+
+        with pytest.raises(MpesaApiError) as error:
+            asyncio.run(run())
+
+        assert error.value.status_code == 503
+        assert stand_in.stk_requests == 1
+
+        # A request that never reached Daraja is safe to send again
+        stand_in = DarajaStandIn(connect_failures=2)
+
+        async def connect_then_push():
+            service = MpesaService(client=make_client(stand_in, max_retries=3))
+            result = await service.initiate_stk_push("254712345678", Decimal("50"), "INV-2")
+            await service.client.aclose()
+            return result
+
+        assert asyncio.run(connect_then_push())["success"] is True
+        assert stand_in.stk_requests == 1
+
+    def test_revoked_token_is_replaced(self):
+        stand_in = DarajaStandIn()
+        stand_in.revoked_tokens.add("token-1")
+
+        async def run():
+            service = MpesaService(client=make_client(stand_in))
+            result = await service.check_transaction_status("ws_CO_1")
+            await service.client.aclose()
+            return result
+
+        result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["checkout_request_id"] == "ws_CO_1"
+        assert stand_in.token_requests == 2
+
+    def test_concurrency_is_bounded(self):
+        stand_in = DarajaStandIn()
+
+        async def run():
+            client = make_client(stand_in, max_concurrency=3)
+            await asyncio.gather(*(
+                client.post("/mpesa/stkpush/v1/processrequest", {"AccountReference": f"INV-{i}"})
+                for i in range(12)
+            ))
+            await client.aclose()
+
+        asyncio.run(run())
+
+        assert stand_in.max_in_flight <= 3
@@ -0,0 +1,213 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+from decimal import Decimal
+from uuid import uuid4
+
+from app.domain.entities.payments import Payment, PaymentMethod, PaymentStatus
+from app.infrastucture.database.payment_repository_impl import PaymentRepositoryImpl
+from app.services.payments.mpesa_reconciliation import MpesaReconciliationWorker, ReconciliationRepositories
+
+
+class StatusStandIn:
+    """Answers STK status queries from a checkout id -> result code map; None means still processing"""
+
+    def __init__(self, result_codes):
+        self.result_codes = result_codes
+        self.queries = []
+
+    async def check_transaction_status(self, checkout_request_id):
+        self.queries.append(checkout_request_id)
+        code = self.result_codes.get(checkout_request_id)
+        if code is None:
+            return {"success": False, "error": "The transaction is being processed", "result_code": None}
+        return {"success": True, "result_code": code, "result_description": f"Result {code}"}
+
+
+class ScriptedResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class ScriptedSession:
+    """AsyncSession stand-in answering each execute with the next scripted rows"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.executed = []
+        self.committed = False
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        return ScriptedResult(self.responses.pop(0) if self.responses else [])
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+class InMemoryRepositories:
+    """Payments, invoices and orders held in dicts, recording the bulk calls made"""
+
+    def __init__(self, payments):
+        self.payments = {payment.id: payment for payment in payments}
+        self.applied_invoice_payments = []
+        self.closed_orders = []
+        self.order_id = uuid4()
+        self.fail_order_close = False
+
+    async def finalize_gateway_payments(self, outcomes):
+        changed = []
+        for payment_id, (status, response) in outcomes.items():
+            payment = self.payments[payment_id]
+            if payment.payment_status == PaymentStatus.PENDING:
+                payment.payment_status = status
+                payment.gateway_response = response
+                changed.append(payment)
+        invoice_payments = [
+            (payment.invoice_id, payment.amount) for payment in changed
+            if payment.payment_status == PaymentStatus.COMPLETED and payment.invoice_id
+        ]
+        self.applied_invoice_payments.extend(invoice_payments)
+        return changed, [
+            {"invoice_id": invoice_id, "tenant_id": uuid4(), "order_id": self.order_id, "invoice_status": "paid"}
+            for invoice_id, _ in invoice_payments
+        ]
+
+    async def bulk_transition_orders(self, order_ids, from_status, to_status, **kwargs):
+        if self.fail_order_close:
+            raise RuntimeError("orders table locked")
+        self.closed_orders.extend(order_ids)
+        return order_ids
+
+    def scope(self):
+        @asynccontextmanager
+        async def repositories():
+            yield ReconciliationRepositories(payments=self, orders=self)
+        return repositories
+
+
+def make_payment(checkout_request_id):
+    payment = Payment.create(
+        tenant_id=uuid4(),
+        payment_no=f"PAY-{checkout_request_id}",
+        amount=Decimal("100"),
+        payment_method=PaymentMethod.MPESA,
+        payment_date=date.today(),
+        invoice_id=uuid4()
+    )
+    payment.external_transaction_id = checkout_request_id
+    return payment
+
+
+def make_worker(stand_in, repositories, **kwargs):
+    options = dict(initial_delay=0, backoff_base=0.05, requests_per_second=1000)
+    options.update(kwargs)
+    return MpesaReconciliationWorker(mpesa_service=stand_in, repositories=repositories.scope(), **options)
+
+
+class TestMpesaReconciliationWorker:
+    """Test cases for background STK push reconciliation."""
+
+    def test_final_results_are_applied_in_bulk(self):
+        payments = [make_payment("ws_CO_1"), make_payment("ws_CO_2"), make_payment("ws_CO_3")]
+        repositories = InMemoryRepositories(payments)
+        stand_in = StatusStandIn({"ws_CO_1": "0", "ws_CO_2": "1032", "ws_CO_3": None})
+        worker = make_worker(stand_in, repositories)
+        for payment in payments:
+            worker.track(payment.external_transaction_id, payment.id)
+
+        stats = asyncio.run(worker.run_once())
+
+        assert stats == {"checked": 3, "completed": 1, "failed": 1, "pending": 1}
+        assert payments[0].payment_status == PaymentStatus.COMPLETED
+        assert payments[1].payment_status == PaymentStatus.FAILED
+        assert payments[2].payment_status == PaymentStatus.PENDING
+        assert repositories.applied_invoice_payments == [(payments[0].invoice_id, Decimal("100"))]
+        assert repositories.closed_orders == [repositories.order_id]
+        assert len(worker) == 1
+
+    def test_processing_requests_back_off(self):
+        payment = make_payment("ws_CO_1")
+        stand_in = StatusStandIn({})
+        worker = make_worker(stand_in, InMemoryRepositories([payment]), backoff_base=10)
+        worker.track("ws_CO_1", payment.id)
+
+        asyncio.run(worker.run_once())
+        asyncio.run(worker.run_once())
+
+        # The second pass finds nothing due until the backoff expires
+        assert stand_in.queries == ["ws_CO_1"]
+        assert worker.seconds_until_next_check() > 9
+
+    def test_batch_size_limits_each_pass(self):
+        payments = [make_payment(f"ws_CO_{i}") for i in range(5)]
+        stand_in = StatusStandIn({payment.external_transaction_id: "0" for payment in payments})
+        worker = make_worker(stand_in, InMemoryRepositories(payments), batch_size=2)
+        for payment in payments:
+            worker.track(payment.external_transaction_id, payment.id)
+
+        stats = asyncio.run(worker.run_once())
+
+        assert stats["checked"] == 2
+        assert len(worker) == 3
+
+    def test_expired_requests_are_dropped(self):
+        payment = make_payment("ws_CO_1")
+        worker = make_worker(StatusStandIn({}), InMemoryRepositories([payment]), max_age=60)
+        worker.track("ws_CO_1", payment.id, age=120)
+
+        asyncio.run(worker.run_once())
+
+        assert len(worker) == 0
+        assert payment.payment_status == PaymentStatus.PENDING
+
+    def test_failed_order_close_keeps_the_committed_payments(self):
+        payment = make_payment("ws_CO_1")
+        repositories = InMemoryRepositories([payment])
+        repositories.fail_order_close = True
+        worker = make_worker(StatusStandIn({"ws_CO_1": "0"}), repositories)
+        worker.track("ws_CO_1", payment.id)
+
+        stats = asyncio.run(worker.run_once())
+
+        # The invoice was credited with the payment; only the order close is left undone
+        assert stats["completed"] == 1 and len(worker) == 0
+        assert repositories.applied_invoice_payments == [(payment.invoice_id, Decimal("100"))]
+        assert repositories.closed_orders == []
+
+    def test_amounts_beyond_the_invoice_balance_are_recorded_on_the_payments(self):
+        first, second = make_payment("ws_CO_1"), make_payment("ws_CO_2")
+        second.invoice_id = first.invoice_id
+        repository = PaymentRepositoryImpl(None)
+        function_rows = [SimpleNamespace(
+            invoice_id=first.invoice_id, tenant_id=first.tenant_id, order_id=None,
+            invoice_status="paid", applied_amount=Decimal("130"), unapplied_amount=Decimal("70")
+        )]
+        session = ScriptedSession([repository._to_payment_model(first), repository._to_payment_model(second)], function_rows)
+        repository.session = session
+
+        payments, applied = asyncio.run(repository.finalize_gateway_payments({
+            first.id: (PaymentStatus.COMPLETED, {"result_code": "0"}),
+            second.id: (PaymentStatus.COMPLETED, {"result_code": "0"})
+        }))
+
+        # Both payments complete in the same transaction that credits the invoice
+        assert session.committed and [payment.payment_status for payment in payments] == [PaymentStatus.COMPLETED] * 2
+        assert applied == [{"invoice_id": first.invoice_id, "tenant_id": first.tenant_id, "order_id": None, "invoice_status": "paid"}]
+        _, update_params = session.executed[-1]
+        assert [params["b_notes"] for params in update_params] == [
+            None, "Unapplied amount: 70 exceeds the invoice balance"
+        ]
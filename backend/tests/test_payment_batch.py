@@ -0,0 +1,188 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.invoices import Invoice, InvoiceStatus, InvoiceType
+from app.domain.entities.payments import PaymentMethod, PaymentPostingLine, PaymentStatus
+from app.domain.entities.users import User, UserRoleType, UserStatus
+from app.domain.exceptions.payments import PaymentValidationError
+from app.infrastucture.database.payment_repository_impl import PaymentRepositoryImpl
+from app.services.payments.payment_service import PaymentService
+
+
+class InMemoryPayments:
+    """The batch-posting part of PaymentRepository, recording what was posted"""
+
+    def __init__(self, posted_transaction_ids=()):
+        self.posted_transaction_ids = set(posted_transaction_ids)
+        self.posted = []
+        self.fail_with = None
+
+    async def get_existing_external_transaction_ids(self, tenant_id, external_transaction_ids):
+        return self.posted_transaction_ids & set(external_transaction_ids)
+
+    async def get_next_payment_numbers(self, tenant_id, prefix, count):
+        return [f"{prefix}-{i:06d}" for i in range(1, count + 1)]
+
+    async def post_payments(self, payments):
+        if self.fail_with:
+            raise ValueError(self.fail_with)
+        self.posted.append(payments)
+        totals = {}
+        for payment in payments:
+            totals.setdefault(payment.invoice_id, [payment.order_id, Decimal('0')])[1] += payment.amount
+        return [
+            {"invoice_id": invoice_id, "tenant_id": payments[0].tenant_id, "order_id": order_id,
+             "invoice_status": "paid" if amount == Decimal('100') else "partial_paid"}
+            for invoice_id, (order_id, amount) in totals.items()
+        ]
+
+
+class InMemoryInvoices:
+    def __init__(self, invoices):
+        self.invoices = invoices
+        self.lookups = 0
+
+    async def get_payable_invoices_by_references(self, references, tenant_id):
+        self.lookups += 1
+        return [invoice for invoice in self.invoices if invoice.invoice_no in references or invoice.order_no in references]
+
+
+class RecordingOrders:
+    def __init__(self):
+        self.closed = []
+
+    async def bulk_transition_orders(self, order_ids, from_status, to_status, **kwargs):
+        self.closed.extend(order_ids)
+        return order_ids
+
+
+def make_invoice(tenant_id, number, due_in_days=30):
+    return Invoice(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        invoice_no=f"INV-{number:06d}",
+        invoice_type=InvoiceType.STANDARD,
+        invoice_status=InvoiceStatus.SENT,
+        customer_id=uuid4(),
+        customer_name="Customer",
+        customer_address="Nairobi",
+        invoice_date=date.today(),
+        due_date=date.today() + timedelta(days=due_in_days),
+        order_id=uuid4(),
+        order_no=f"ORD-{number:06d}",
+        total_amount=Decimal('100'),
+        balance_due=Decimal('100')
+    )
+
+
+def make_user(tenant_id):
+    return User(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        email="accounts@example.com",
+        full_name="Accounts",
+        role=UserRoleType.ACCOUNTS,
+        status=UserStatus.ACTIVE,
+        last_login=None,
+        created_at=datetime.utcnow(),
+        created_by=None,
+        updated_at=datetime.utcnow(),
+        updated_by=None,
+        deleted_at=None,
+        deleted_by=None,
+        auth_user_id=None
+    )
+
+
+class CounterSession:
+    """AsyncSession stand-in answering allocate_document_numbers from a counter per tenant and prefix"""
+
+    def __init__(self):
+        self.counters = {}
+        self.calls = []
+
+    async def execute(self, stmt, params=None):
+        self.calls.append((str(stmt), params))
+        counter = (params["tenant_id"], params["prefix"])
+        first = self.counters.get(counter, 0) + 1
+        self.counters[counter] = first + params["count"] - 1
+        return SimpleNamespace(scalar_one=lambda: first)
+
+
+def make_service(payments, invoices, orders):
+    invoice_service = SimpleNamespace(invoice_repository=invoices, order_repository=orders)
+    return PaymentService(payments, invoice_service)
+
+
+class TestPaymentBatchPosting:
+    """Test cases for posting statement batches as payments."""
+
+    def test_lines_are_matched_and_posted_together(self):
+        tenant_id = uuid4()
+        first, second = make_invoice(tenant_id, 1), make_invoice(tenant_id, 2)
+        payments, invoices, orders = InMemoryPayments(), InMemoryInvoices([first, second]), RecordingOrders()
+        lines = [
+            PaymentPostingLine(reference="inv-000001", amount=Decimal('100'), external_transaction_id="QK1"),
+            PaymentPostingLine(reference="ORD-000002", amount=Decimal('40'), external_transaction_id="QK2"),
+            PaymentPostingLine(reference="ORD-000002", amount=Decimal('70')),
+            PaymentPostingLine(reference="INV-999999", amount=Decimal('10')),
+        ]
+
+        result = asyncio.run(make_service(payments, invoices, orders).post_payment_batch(
+            make_user(tenant_id), lines, PaymentMethod.MPESA
+        ))
+
+        assert invoices.lookups == 1
+        [posted] = payments.posted
+        assert [(payment.invoice_id, payment.amount) for payment in posted] == [(first.id, Decimal('100')), (second.id, Decimal('40'))]
+        assert all(payment.payment_status == PaymentStatus.COMPLETED for payment in posted)
+        assert [line["line"] for line in result["rejected"]] == [2, 3]
+        assert result["invoices_paid"] == 1
+        assert orders.closed == [first.order_id]
+
+    def test_already_posted_transactions_are_skipped(self):
+        tenant_id = uuid4()
+        invoice = make_invoice(tenant_id, 1)
+        payments = InMemoryPayments(posted_transaction_ids={"QK1"})
+        lines = [
+            PaymentPostingLine(reference="INV-000001", amount=Decimal('30'), external_transaction_id="QK1"),
+            PaymentPostingLine(reference="INV-000001", amount=Decimal('30'), external_transaction_id="QK2"),
+            PaymentPostingLine(reference="INV-000001", amount=Decimal('30'), external_transaction_id="QK2"),
+        ]
+
+        result = asyncio.run(make_service(payments, InMemoryInvoices([invoice]), RecordingOrders()).post_payment_batch(
+            make_user(tenant_id), lines, PaymentMethod.BANK_TRANSFER
+        ))
+
+        assert [payment.external_transaction_id for payment in payments.posted[0]] == ["QK2"]
+        assert [line["line"] for line in result["rejected"]] == [0, 2]
+
+    def test_conflicting_batch_is_not_posted(self):
+        tenant_id = uuid4()
+        payments = InMemoryPayments()
+        payments.fail_with = "invoice balance changed"
+        service = make_service(payments, InMemoryInvoices([make_invoice(tenant_id, 1)]), RecordingOrders())
+
+        with pytest.raises(PaymentValidationError):
+            asyncio.run(service.post_payment_batch(
+                make_user(tenant_id), [PaymentPostingLine(reference="INV-000001", amount=Decimal('50'))], PaymentMethod.CASH
+            ))
+
+    def test_payment_numbers_come_from_the_database_counter(self):
+        session = CounterSession()
+        repository = PaymentRepositoryImpl(session)
+        tenant_id = uuid4()
+
+        first = asyncio.run(repository.get_next_payment_numbers(tenant_id, "PAY", 2))
+        # A concurrent batch gets the next block instead of re-reading the highest number
+        second = asyncio.run(repository.get_next_payment_numbers(tenant_id, "PAY", 2))
+
+        assert first == ["PAY-000001", "PAY-000002"] and second == ["PAY-000003", "PAY-000004"]
+        assert asyncio.run(repository.get_next_payment_number(tenant_id, "REF")) == "REF-000001"
+        assert asyncio.run(repository.get_next_payment_numbers(tenant_id, "PAY", 0)) == []
+        assert all("allocate_document_numbers('payment'" in statement for statement, _ in session.calls)
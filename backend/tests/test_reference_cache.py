@@ -0,0 +1,115 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.vehicles import VehicleType
+from app.domain.entities.warehouses import Warehouse, WarehouseType
+from app.infrastucture.database.reference_cache import TenantCache, invalidate_tenant_references, reference_cache
+from app.infrastucture.database.repositories.vehicle_repository import VehicleRepositoryImpl
+from app.services.trips.trip_service import TripService
+
+
+class CountingFleet:
+    """Vehicle and warehouse repository stand-in counting the queries made"""
+
+    def __init__(self, vehicles, depots):
+        self.vehicles = vehicles
+        self.depots = depots
+        self.vehicle_loads = 0
+        self.depot_loads = []
+
+    async def get_vehicles_by_tenant(self, tenant_id, limit=100):
+        self.vehicle_loads += 1
+        return [vehicle for vehicle in self.vehicles if vehicle.tenant_id == tenant_id]
+
+    async def get_by_ids(self, warehouse_ids):
+        self.depot_loads.append(sorted(warehouse_ids))
+        return [depot for depot in self.depots if str(depot.id) in warehouse_ids]
+
+
+class DeletingSession:
+    """AsyncSession stand-in returning one vehicle row for the delete"""
+
+    def __init__(self, row):
+        self.row = row
+        self.commits = 0
+
+    async def execute(self, stmt):
+        return SimpleNamespace(scalar_one_or_none=lambda: self.row)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def make_vehicle(tenant_id, plate, depot_id=None):
+    return SimpleNamespace(
+        id=uuid4(), tenant_id=tenant_id, plate=plate, vehicle_type=VehicleType.CYLINDER_TRUCK,
+        capacity_kg=Decimal("5000"), capacity_m3=None, active=True, depot_id=depot_id
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_reference_cache():
+    reference_cache.clear()
+    yield
+    reference_cache.clear()
+
+
+class TestReferenceCache:
+    """Test cases for the per-tenant vehicle and warehouse reference cache."""
+
+    def test_vehicles_with_depots_use_one_depot_query_and_are_cached(self):
+        tenant_id = uuid4()
+        depot = Warehouse.create(tenant_id=tenant_id, code="WH-1", name="Embakasi Depot", type=WarehouseType.FIL)
+        fleet = CountingFleet(
+            [make_vehicle(tenant_id, "KCA 001A", depot.id), make_vehicle(tenant_id, "KCA 002A", depot.id),
+             make_vehicle(tenant_id, "KCA 003A")],
+            [depot]
+        )
+        service = TripService(None, warehouse_repository=fleet, vehicle_repository=fleet)
+
+        first = asyncio.run(service.get_vehicles_with_depots(tenant_id))
+        first[0]["plate"] = "changed by the caller"
+        second = asyncio.run(service.get_vehicles_with_depots(tenant_id))
+
+        assert fleet.depot_loads == [[str(depot.id)]]
+        assert fleet.vehicle_loads == 1
+        assert [vehicle["depot"]["name"] if vehicle["depot"] else None for vehicle in second] == [
+            "Embakasi Depot", "Embakasi Depot", None
+        ]
+        # Callers get copies, so the cached list is never mutated
+        assert second[0]["plate"] == "KCA 001A"
+
+    def test_entries_expire_after_the_ttl(self):
+        cache = TenantCache("Test", ttl=60)
+        tenant_id = uuid4()
+        cache.set(tenant_id, "vehicles_with_depots", [{"plate": "KCA 001A"}])
+        assert cache.get(tenant_id, "vehicles_with_depots") == [{"plate": "KCA 001A"}]
+
+        value, stored_at = cache._entries[str(tenant_id)]["vehicles_with_depots"]
+        cache._entries[str(tenant_id)]["vehicles_with_depots"] = (value, stored_at - 60)
+
+        assert cache.get(tenant_id, "vehicles_with_depots") is None
+        assert "vehicles_with_depots" not in cache._entries[str(tenant_id)]
+
+    def test_vehicle_writes_invalidate_only_their_tenant(self):
+        tenant_id, other_tenant = uuid4(), uuid4()
+        fleet = CountingFleet([make_vehicle(tenant_id, "KCA 001A"), make_vehicle(other_tenant, "KCB 001B")], [])
+        service = TripService(None, warehouse_repository=fleet, vehicle_repository=fleet)
+        asyncio.run(service.get_vehicles_with_depots(tenant_id))
+        asyncio.run(service.get_vehicles_with_depots(other_tenant))
+
+        session = DeletingSession(SimpleNamespace(tenant_id=tenant_id, deleted_at=None))
+        assert asyncio.run(VehicleRepositoryImpl(session).delete_vehicle(fleet.vehicles[0].id))
+        asyncio.run(service.get_vehicles_with_depots(tenant_id))
+        asyncio.run(service.get_vehicles_with_depots(other_tenant))
+
+        assert session.commits == 1
+        assert fleet.vehicle_loads == 3
+
+        invalidate_tenant_references(other_tenant)
+        asyncio.run(service.get_vehicles_with_depots(other_tenant))
+        assert fleet.vehicle_loads == 4
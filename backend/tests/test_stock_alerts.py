@@ -0,0 +1,133 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+from app.domain.entities.stock_alerts import StockAlertSeverity, StockPosition, StockReorderPoint
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.users import User, UserRoleType
+from app.infrastucture.database.availability_cache import AvailabilityCache, AvailabilityChanges
+from app.infrastucture.database.stock_alert_engine import StockAlertEngine
+from app.services.stock_levels.stock_alert_service import StockAlertService
+
+
+class InMemoryStockAlerts:
+    """Stock alert repository over prepared positions, counting the loads"""
+
+    def __init__(self, positions=(), reorder_points=()):
+        self.positions = list(positions)
+        self.reorder_points = list(reorder_points)
+        self.loads = 0
+
+    async def get_reorder_points(self, tenant_id):
+        return [point for point in self.reorder_points if point.tenant_id == tenant_id]
+
+    async def set_reorder_point(self, reorder_point):
+        self.reorder_points = [
+            point for point in self.reorder_points
+            if (point.tenant_id, point.warehouse_id, point.variant_id)
+            != (reorder_point.tenant_id, reorder_point.warehouse_id, reorder_point.variant_id)
+        ] + [reorder_point]
+        return reorder_point
+
+    async def delete_reorder_point(self, tenant_id, variant_id, warehouse_id=None):
+        return True
+
+    async def get_stock_positions(self, tenant_id):
+        self.loads += 1
+        return [StockPosition(**vars(position)) for position in self.positions]
+
+
+def on_hand(warehouse_id, variant_id, quantity, available=None):
+    return StockPosition(
+        warehouse_id, variant_id, StockStatus.ON_HAND, Decimal(quantity),
+        Decimal(quantity if available is None else available)
+    )
+
+
+class TestStockAlerts:
+    """Test cases for the in-memory low and negative stock alerting engine."""
+
+    def test_reorder_points_resolve_per_warehouse_then_variant_then_default(self):
+        tenant_id, depot, branch = uuid4(), uuid4(), uuid4()
+        cylinder, regulator, hose = uuid4(), uuid4(), uuid4()
+        repository = InMemoryStockAlerts(
+            positions=[
+                on_hand(depot, cylinder, 30), on_hand(branch, cylinder, 30),
+                on_hand(depot, regulator, 5), on_hand(depot, hose, 0),
+                StockPosition(depot, hose, StockStatus.TRUCK_STOCK, Decimal("-2"), Decimal("-2"))
+            ],
+            reorder_points=[
+                StockReorderPoint(tenant_id, cylinder, Decimal("50")),
+                StockReorderPoint(tenant_id, cylinder, Decimal("20"), warehouse_id=depot),
+                StockReorderPoint(tenant_id, regulator, Decimal("2"))
+            ]
+        )
+        service = StockAlertService(repository, engine=StockAlertEngine())
+
+        alerts = asyncio.run(service.get_active_alerts(tenant_id))
+
+        assert [(alert.warehouse_id, alert.variant_id, alert.severity, alert.reorder_point) for alert in alerts] == [
+            (depot, hose, StockAlertSeverity.CRITICAL, Decimal("10")),
+            (branch, cylinder, StockAlertSeverity.LOW, Decimal("50"))
+        ]
+        assert [position.variant_id for position in asyncio.run(service.get_negative_stock(tenant_id))] == [hose]
+        assert asyncio.run(service.get_active_alerts(tenant_id, warehouse_id=branch))[0].variant_id == cylinder
+        assert repository.loads == 1
+
+    def test_committed_writes_update_alerts_and_notify_once_per_escalation(self):
+        tenant_id, depot, cylinder = uuid4(), uuid4(), uuid4()
+        engine = StockAlertEngine()
+        raised = []
+        engine.subscribe(raised.append)
+        service = StockAlertService(InMemoryStockAlerts([on_hand(depot, cylinder, 40)]), engine=engine)
+        asyncio.run(service.get_book(tenant_id))
+        changes = AvailabilityChanges(AvailabilityCache(), alerts=engine)
+
+        changes.record(tenant_id, depot, cylinder, StockStatus.ON_HAND, Decimal("8"), Decimal("8"))
+        changes.discard()
+        assert asyncio.run(service.get_active_alerts(tenant_id)) == [] and raised == []
+
+        changes.record(tenant_id, depot, cylinder, StockStatus.ON_HAND, Decimal("8"), Decimal("8"))
+        changes.publish()
+        changes.record(tenant_id, depot, cylinder, StockStatus.ON_HAND, Decimal("6"), Decimal("6"))
+        changes.publish()
+        # A reservation changes only the available quantity; the quantity recorded earlier is kept
+        changes.record(tenant_id, depot, cylinder, StockStatus.ON_HAND, Decimal("0"), Decimal("-1"))
+        changes.record(tenant_id, depot, cylinder, StockStatus.ON_HAND, Decimal("-1"))
+        changes.publish()
+
+        assert [alert.severity for alert in raised] == [StockAlertSeverity.LOW, StockAlertSeverity.NEGATIVE]
+        (alert,) = asyncio.run(service.get_active_alerts(tenant_id))
+        assert (alert.available_qty, alert.quantity, alert.raised_at) == (Decimal("-1"), Decimal("-1"), raised[0].raised_at)
+        assert asyncio.run(service.get_negative_stock(tenant_id))[0].quantity == Decimal("-1")
+
+        changes.record(tenant_id, depot, cylinder, StockStatus.ON_HAND, Decimal("25"), Decimal("25"))
+        changes.publish()
+        assert asyncio.run(service.get_active_alerts(tenant_id)) == []
+        assert asyncio.run(service.get_negative_stock(tenant_id)) == []
+
+    def test_changing_a_reorder_point_reevaluates_the_buckets_it_covers(self):
+        user = User.create(email="stock@example.com", full_name="Stock", role=UserRoleType.TENANT_ADMIN, tenant_id=uuid4())
+        depot, branch, cylinder = uuid4(), uuid4(), uuid4()
+        engine = StockAlertEngine()
+
+        def failing_listener(alert):
+            raise RuntimeError("mail server down")
+
+        raised = []
+        engine.subscribe(failing_listener)
+        engine.subscribe(raised.append)
+        repository = InMemoryStockAlerts([on_hand(depot, cylinder, 15), on_hand(branch, cylinder, 15)])
+        service = StockAlertService(repository, engine=engine)
+        assert asyncio.run(service.get_active_alerts(user.tenant_id)) == []
+
+        asyncio.run(service.set_reorder_point(user, cylinder, Decimal("20")))
+        assert {alert.warehouse_id for alert in raised} == {depot, branch}
+
+        asyncio.run(service.set_reorder_point(user, cylinder, Decimal("12"), warehouse_id=depot))
+        alerts = asyncio.run(service.get_active_alerts(user.tenant_id))
+        assert [(alert.warehouse_id, alert.reorder_point) for alert in alerts] == [(branch, Decimal("20"))]
+
+        asyncio.run(service.delete_reorder_point(user, cylinder, warehouse_id=depot))
+        assert len(asyncio.run(service.get_active_alerts(user.tenant_id))) == 2
+        assert len(raised) == 3 and repository.loads == 1
@@ -0,0 +1,111 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.stock_availability import AvailabilityRequestLine
+from app.domain.entities.stock_docs import StockDoc, StockDocLine, StockDocType, StockStatus
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import StockDocInsufficientStockError
+from app.infrastucture.database.availability_cache import AvailabilityCache, AvailabilityChanges, AvailabilityMatrix, availability_cache
+from app.services.stock_docs.stock_doc_service import StockDocService
+from app.services.stock_levels.availability_service import AvailabilityService
+
+
+class CountingStockLevels:
+    """The one stock level repository call the availability service makes"""
+
+    def __init__(self, available):
+        self.available = available
+        self.loads = 0
+
+    async def get_available_quantities(self, tenant_id):
+        self.loads += 1
+        return dict(self.available)
+
+
+class StockLevelsOnRecord:
+    """Stock document repository answering availability from committed stock levels"""
+
+    def __init__(self, available):
+        self.available = available
+        self.checks = []
+
+    async def validate_stock_availability(self, warehouse_id, variant_id=None, gas_type=None, required_quantity=0):
+        self.checks.append((variant_id, required_quantity))
+        return self.available.get((warehouse_id, variant_id), Decimal("0")) >= Decimal(str(required_quantity))
+
+
+class TestStockAvailability:
+    """Test cases for cached available-to-promise checks."""
+
+    def test_multi_line_check_loads_the_matrix_once(self):
+        tenant_id, warehouse_id, cylinder, bulk = uuid4(), uuid4(), uuid4(), uuid4()
+        stock_levels = CountingStockLevels({
+            (warehouse_id, cylinder, StockStatus.ON_HAND): Decimal("10"),
+            (warehouse_id, cylinder, StockStatus.TRUCK_STOCK): Decimal("4"),
+            (warehouse_id, bulk, StockStatus.ON_HAND): Decimal("500")
+        })
+        service = AvailabilityService(stock_levels, cache=AvailabilityCache())
+
+        check = asyncio.run(service.check_availability(tenant_id, [
+            AvailabilityRequestLine(warehouse_id, cylinder, Decimal("6")),
+            AvailabilityRequestLine(warehouse_id, cylinder, Decimal("6")),
+            AvailabilityRequestLine(warehouse_id, cylinder, Decimal("4"), StockStatus.TRUCK_STOCK),
+            AvailabilityRequestLine(warehouse_id, bulk, Decimal("250"))
+        ]))
+        total = asyncio.run(service.get_total_available_quantity(tenant_id, cylinder))
+
+        # The two ON_HAND cylinder lines draw on the same bucket and together exceed it
+        assert not check.is_available
+        assert [(line.variant_id, line.shortfall) for line in check.shortfalls] == [(cylinder, Decimal("2"))]
+        assert len(check.lines) == 3
+        assert total == Decimal("10")
+        assert stock_levels.loads == 1
+
+    def test_committed_changes_update_the_loaded_matrix(self):
+        tenant_id, other_tenant, warehouse_id, variant_id = uuid4(), uuid4(), uuid4(), uuid4()
+        cache = AvailabilityCache()
+        service = AvailabilityService(
+            CountingStockLevels({(warehouse_id, variant_id, StockStatus.ON_HAND): Decimal("10")}), cache=cache
+        )
+        asyncio.run(service.get_matrix(tenant_id))
+        changes = AvailabilityChanges(cache)
+
+        changes.record(tenant_id, warehouse_id, variant_id, StockStatus.ON_HAND, Decimal("3"))
+        changes.discard()
+        assert asyncio.run(service.get_available_quantity(tenant_id, warehouse_id, variant_id)) == Decimal("10")
+
+        changes.record(tenant_id, warehouse_id, variant_id, StockStatus.ON_HAND, Decimal("7"))
+        changes.record(other_tenant, warehouse_id, variant_id, StockStatus.ON_HAND, Decimal("1"))
+        changes.publish()
+        assert asyncio.run(service.get_available_quantity(tenant_id, warehouse_id, variant_id)) == Decimal("7")
+        # Tenants without a loaded matrix are left to load fresh
+        assert cache.get(other_tenant) is None
+
+    def test_stock_documents_are_validated_against_stock_levels_not_the_cache(self):
+        tenant_id, warehouse_id, variant_id = uuid4(), uuid4(), uuid4()
+        stock_docs = StockLevelsOnRecord({(warehouse_id, variant_id): Decimal("5")})
+        service = StockDocService(stock_doc_repository=stock_docs)
+        # A matrix loaded before another process issued the stock still shows 50
+        availability_cache.store(tenant_id, AvailabilityMatrix({(warehouse_id, variant_id, StockStatus.ON_HAND): Decimal("50")}))
+        doc_id = uuid4()
+        stock_doc = StockDoc(
+            id=doc_id,
+            tenant_id=tenant_id,
+            doc_no="TRF-0001",
+            doc_type=StockDocType.TRF_WH,
+            source_wh_id=warehouse_id,
+            stock_doc_lines=[
+                StockDocLine(id=uuid4(), stock_doc_id=doc_id, variant_id=variant_id, quantity=Decimal("3")),
+                StockDocLine(id=uuid4(), stock_doc_id=doc_id, variant_id=variant_id, quantity=Decimal("3"))
+            ]
+        )
+
+        # The two lines draw on the same bucket and are checked together
+        try:
+            with pytest.raises(StockDocInsufficientStockError):
+                asyncio.run(service._validate_stock_availability(stock_doc))
+        finally:
+            availability_cache.invalidate(tenant_id)
+        assert stock_docs.checks == [(variant_id, 6.0)]
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities.stock_docs import StockDocLine, StockDocStatus, StockDocType
+from app.infrastucture.database.repositories.stock_doc_repository import SQLAlchemyStockDocRepository
+from app.presentation.schemas.stock_docs.output_schemas import StockDocSummaryResponse
+from app.services.stock_docs.stock_doc_service import StockDocService
+
+
+class RecordingSession:
+    """AsyncSession stand-in returning fixed rows and recording the executed statements"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return self.rows
+
+
+class InMemoryLines:
+    """The batched line loader, counting how often it is called"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.calls = 0
+        self.tenant_ids = []
+
+    async def get_stock_doc_lines_for_docs(self, doc_ids, tenant_id):
+        self.calls += 1
+        self.tenant_ids.append(tenant_id)
+        return {doc_id: [line for line in self.lines if line.stock_doc_id == doc_id] for doc_id in doc_ids}
+
+
+def make_header_row(line_count=None, total_value=None):
+    now = datetime(2026, 3, 31, 8, 0)
+    return SimpleNamespace(
+        id=uuid4(), tenant_id=uuid4(), doc_no="REC_SUPP-000001", doc_type="REC_SUPP", doc_status="open",
+        source_wh_id=None, dest_wh_id=uuid4(), ref_doc_id=None, ref_doc_type=None, posted_date=None,
+        total_qty=Decimal("12"), notes=None, created_at=now, created_by=None, updated_at=now, updated_by=None,
+        deleted_at=None, deleted_by=None, line_count=line_count, total_value=total_value
+    )
+
+
+class TestStockDocListing:
+    """Test cases for header-only stock document listings."""
+
+    def test_listing_pages_headers_and_totals_in_sql(self):
+        session = RecordingSession([make_header_row(line_count=3, total_value=Decimal("150.5"))])
+        repository = SQLAlchemyStockDocRepository(session)
+
+        docs = asyncio.run(repository.get_stock_docs_by_type(StockDocType.REC_SUPP, uuid4(), limit=20, offset=40))
+
+        sql = session.statements[0]
+        assert len(session.statements) == 1
+        assert "LIMIT" in sql and "OFFSET" in sql
+        assert "count(stock_doc_lines.id)" in sql and "GROUP BY stock_doc_lines.stock_doc_id" in sql
+        assert (docs[0].line_count, docs[0].total_value, docs[0].stock_doc_lines) == (3, Decimal("150.5"), [])
+
+    def test_listing_without_totals_skips_the_lines_table(self):
+        session = RecordingSession([make_header_row()])
+        repository = SQLAlchemyStockDocRepository(session)
+
+        docs = asyncio.run(
+            repository.get_stock_docs_by_status(StockDocStatus.OPEN, uuid4(), include_line_totals=False)
+        )
+
+        assert "stock_doc_lines" not in session.statements[0]
+        assert docs[0].line_count is None
+        assert StockDocSummaryResponse.from_entity(docs[0]).line_count == 0
+
+    def test_lines_are_loaded_for_a_page_in_one_call(self):
+        first, second = make_header_row(line_count=2), make_header_row(line_count=0)
+        stock_docs = [SQLAlchemyStockDocRepository(None)._to_stock_doc_header(row) for row in (first, second)]
+        lines = [
+            StockDocLine(id=uuid4(), stock_doc_id=first.id, variant_id=uuid4(), quantity=Decimal(q), unit_cost=Decimal("2"))
+            for q in ("5", "7")
+        ]
+        loader = InMemoryLines(lines)
+
+        lines_by_doc = asyncio.run(StockDocService(loader).get_stock_doc_lines_for_docs(
+            [doc.id for doc in stock_docs], first.tenant_id
+        ))
+        for doc in stock_docs:
+            doc.stock_doc_lines = lines_by_doc[doc.id]
+
+        assert loader.calls == 1 and loader.tenant_ids == [first.tenant_id]
+        assert [len(doc.stock_doc_lines) for doc in stock_docs] == [2, 0]
+        assert StockDocSummaryResponse.from_entity(stock_docs[0]).line_count == 2
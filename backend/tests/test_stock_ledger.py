@@ -0,0 +1,154 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_ledger import StockMovementType, stock_movement_source
+from app.domain.entities.stock_levels import StockBucketChange, StockLevel
+from app.infrastucture.database.repositories.stock_level_repository import SQLAlchemyStockLevelRepository
+from app.services.stock_levels.stock_snapshot_worker import StockSnapshotWorker, snapshot_due_at
+
+
+class InMemorySnapshots:
+    """The snapshot part of StockLedgerRepository, recording requested snapshot times"""
+
+    def __init__(self, latest=None):
+        self.latest = latest
+        self.created = []
+
+    async def get_latest_snapshot_time(self):
+        return self.latest
+
+    async def create_balance_snapshot(self, snapshot_at):
+        self.created.append(snapshot_at)
+        self.latest = snapshot_at
+        return 3
+
+    def scope(self):
+        @asynccontextmanager
+        async def repositories():
+            yield self
+        return repositories
+
+
+class LedgerSession:
+    """AsyncSession stand-in returning the locked stock level row and recording statements with their rows"""
+
+    def __init__(self, row):
+        self.row = row
+        self.executed = []
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((str(stmt.compile(dialect=postgresql.dialect())), params))
+        return SimpleNamespace(
+            scalars=lambda: SimpleNamespace(all=lambda: [self.row]),
+            scalar_one_or_none=lambda: self.row
+        )
+
+    def ledger_rows(self):
+        return [row for sql, rows in self.executed if sql.startswith("INSERT INTO stock_ledger") for row in rows]
+
+
+def make_stock_row(stock_level, quantity):
+    return SimpleNamespace(
+        id=uuid4(), tenant_id=stock_level.tenant_id, warehouse_id=stock_level.warehouse_id,
+        variant_id=stock_level.variant_id, stock_status=stock_level.stock_status, quantity=quantity,
+        reserved_qty=Decimal("0"), available_qty=quantity, unit_cost=Decimal("12.5"),
+        total_cost=quantity * Decimal("12.5"), last_transaction_date=None, created_at=None, updated_at=None
+    )
+
+
+def make_stock_level(quantity):
+    return StockLevel(
+        tenant_id=uuid4(),
+        warehouse_id=uuid4(),
+        variant_id=uuid4(),
+        stock_status=StockStatus.ON_HAND,
+        quantity=quantity,
+        unit_cost=Decimal("12.5")
+    )
+
+
+class TestStockLedger:
+    """Test cases for stock ledger entries and balance snapshots."""
+
+    def test_entries_carry_the_movement_source(self):
+        repository = SQLAlchemyStockLevelRepository(session=None)
+        stock_level = make_stock_level(Decimal("40"))
+        doc_id, user_id = uuid4(), uuid4()
+
+        with stock_movement_source(ref_doc_id=doc_id, ref_doc_type="ISS_SALE", created_by=user_id):
+            entry = repository._to_ledger_entry(stock_level, Decimal("-5"), Decimal("40"), StockMovementType.ISSUE)
+        plain = repository._to_ledger_entry(stock_level, Decimal("5"), Decimal("45"), StockMovementType.RECEIPT)
+
+        assert (entry.movement_type, entry.ref_doc_id, entry.ref_doc_type, entry.created_by) == (
+            StockMovementType.ISSUE, doc_id, "ISS_SALE", user_id
+        )
+        assert entry.unit_cost == Decimal("12.5")
+        assert (plain.movement_type, plain.ref_doc_id) == (StockMovementType.RECEIPT, None)
+
+    def test_stock_writes_insert_the_ledger_row(self):
+        current = make_stock_level(Decimal("40"))
+        doc_id, user_id = uuid4(), uuid4()
+
+        session = LedgerSession(make_stock_row(current, Decimal("40")))
+        with stock_movement_source(ref_doc_id=doc_id, ref_doc_type="ISS_SALE", created_by=user_id):
+            asyncio.run(SQLAlchemyStockLevelRepository(session).apply_stock_changes(
+                current.tenant_id, current.warehouse_id,
+                [StockBucketChange(current.variant_id, StockStatus.ON_HAND, Decimal("-5"))],
+                StockMovementType.ISSUE
+            ))
+
+        [row] = session.ledger_rows()
+        assert (row["tenant_id"], row["warehouse_id"], row["variant_id"], row["stock_status"]) == (
+            current.tenant_id, current.warehouse_id, current.variant_id, StockStatus.ON_HAND
+        )
+        assert (row["quantity_change"], row["balance_after"]) == (Decimal("-5"), Decimal("35"))
+        assert (row["movement_type"], row["ref_doc_id"], row["ref_doc_type"], row["created_by"]) == (
+            StockMovementType.ISSUE.value, doc_id, "ISS_SALE", user_id
+        )
+
+        # Overwriting a level records the difference to the locked row, not to the value read earlier
+        counted = StockLevel(
+            tenant_id=current.tenant_id, warehouse_id=current.warehouse_id, variant_id=current.variant_id,
+            stock_status=StockStatus.ON_HAND, quantity=Decimal("46"), unit_cost=Decimal("12.5")
+        )
+        session = LedgerSession(make_stock_row(current, Decimal("40")))
+        asyncio.run(SQLAlchemyStockLevelRepository(session)._save_stock_level(counted))
+
+        [row] = session.ledger_rows()
+        assert (row["quantity_change"], row["balance_after"]) == (Decimal("6"), Decimal("46"))
+        assert (row["movement_type"], row["ref_doc_id"], row["created_by"]) == (
+            StockMovementType.ADJUSTMENT.value, None, None
+        )
+
+        # An unchanged level writes no ledger row
+        session = LedgerSession(make_stock_row(current, Decimal("46")))
+        asyncio.run(SQLAlchemyStockLevelRepository(session)._save_stock_level(counted))
+        assert session.ledger_rows() == []
+
+    def test_snapshot_waits_for_the_settle_window(self):
+        day = timedelta(days=1)
+        settle = timedelta(minutes=10)
+
+        just_after_midnight = datetime(2026, 3, 31, 0, 5, tzinfo=timezone.utc)
+        later = datetime(2026, 3, 31, 0, 15, tzinfo=timezone.utc)
+
+        assert snapshot_due_at(just_after_midnight, day, settle) == datetime(2026, 3, 30, tzinfo=timezone.utc)
+        assert snapshot_due_at(later, day, settle) == datetime(2026, 3, 31, tzinfo=timezone.utc)
+
+    def test_worker_takes_each_snapshot_once(self):
+        snapshots = InMemorySnapshots(latest=datetime(2026, 3, 30, tzinfo=timezone.utc))
+        worker = StockSnapshotWorker(repositories=snapshots.scope())
+        now = datetime(2026, 3, 31, 8, 0, tzinfo=timezone.utc)
+
+        first = asyncio.run(worker.run_once(now))
+        second = asyncio.run(worker.run_once(now + timedelta(hours=1)))
+
+        assert (first, second) == (3, None)
+        assert snapshots.created == [datetime(2026, 3, 31, tzinfo=timezone.utc)]
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.stock_docs import StockStatus
+from app.domain.entities.stock_reservations import StockHoldRequest, StockReservation
+from app.domain.entities.users import User, UserRoleType
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import InsufficientStockError, StockDocValidationError
+from app.infrastucture.database.repositories.stock_reservation_repository import SQLAlchemyStockReservationRepository
+from app.services.stock_levels.stock_level_service import StockLevelService
+from app.services.stock_levels.stock_reservation_expirer import StockReservationExpirer
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class ConditionalUpdateSession:
+    """AsyncSession stand-in where the conditional increment succeeds for the first buckets only"""
+
+    def __init__(self, successful_updates):
+        self.successful_updates = successful_updates
+        self.executed = []
+        self.committed = False
+        self.rolled_back = False
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        if params is None:
+            matched = self.successful_updates > 0
+            self.successful_updates -= 1
+            return FakeResult(uuid4() if matched else None)
+        return FakeResult(None)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class InMemoryReservations:
+    """The reservation repository calls the service and expirer make"""
+
+    def __init__(self, expirable=0):
+        self.placed = []
+        self.expirable = expirable
+
+    async def place_holds(self, holds):
+        self.placed.extend(holds)
+        return holds
+
+    async def expire_holds(self, now, batch_size=500):
+        batch = min(self.expirable, batch_size)
+        self.expirable -= batch
+        return batch
+
+    def scope(self):
+        @asynccontextmanager
+        async def repositories():
+            yield self
+        return repositories
+
+
+def make_hold(tenant_id, warehouse_id, variant_id, quantity):
+    return StockReservation(
+        tenant_id=tenant_id,
+        warehouse_id=warehouse_id,
+        variant_id=variant_id,
+        quantity=Decimal(quantity),
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+    )
+
+
+class TestStockReservations:
+    """Test cases for expiring stock reservation holds."""
+
+    def test_holds_are_placed_for_an_order_with_expiry(self):
+        reservations = InMemoryReservations()
+        service = StockLevelService(stock_level_repository=None, stock_reservation_repository=reservations)
+        user = User.create(email="planner@example.com", full_name="Planner", role=UserRoleType.DISPATCHER, tenant_id=uuid4())
+        order_id, line_id = uuid4(), uuid4()
+        before = datetime.now(timezone.utc)
+
+        holds = asyncio.run(service.place_stock_holds(
+            user,
+            [StockHoldRequest(uuid4(), uuid4(), Decimal("4"), StockStatus.ON_HAND, line_id)],
+            order_id=order_id,
+            hold_for=timedelta(minutes=30)
+        ))
+
+        assert reservations.placed == holds
+        assert (holds[0].tenant_id, holds[0].order_id, holds[0].order_line_id) == (user.tenant_id, order_id, line_id)
+        assert before + timedelta(minutes=30) <= holds[0].expires_at <= datetime.now(timezone.utc) + timedelta(minutes=30)
+        with pytest.raises(StockDocValidationError):
+            asyncio.run(service.place_stock_holds(user, [StockHoldRequest(uuid4(), uuid4(), Decimal("0"))]))
+
+    def test_a_short_bucket_places_no_holds(self):
+        tenant_id, warehouse_id, first, second = uuid4(), uuid4(), uuid4(), uuid4()
+        holds = [
+            make_hold(tenant_id, warehouse_id, first, "2"),
+            make_hold(tenant_id, warehouse_id, first, "3"),
+            make_hold(tenant_id, warehouse_id, second, "1")
+        ]
+        session = ConditionalUpdateSession(successful_updates=1)
+
+        with pytest.raises(InsufficientStockError):
+            asyncio.run(SQLAlchemyStockReservationRepository(session).place_holds(holds))
+
+        # Two buckets (the first variant's lines are combined), the second one short
+        assert len(session.executed) == 2
+        assert session.rolled_back and not session.committed
+
+    def test_expirer_drains_due_holds_in_batches(self):
+        reservations = InMemoryReservations(expirable=1201)
+        expirer = StockReservationExpirer(batch_size=500, repositories=reservations.scope())
+
+        assert asyncio.run(expirer.run_once()) == 1201
+        assert asyncio.run(expirer.run_once()) == 0
@@ -0,0 +1,109 @@
+import asyncio
+import io
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.domain.entities.stock_docs import StockCount, StockDocType, StockStatus
+from app.domain.entities.users import User, UserRoleType
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import StockDocLineValidationError
+from app.services.stock_docs.stock_count_import import parse_stock_counts
+from app.services.stock_docs.stock_doc_service import StockDocService
+
+
+class InMemoryStockRepositories:
+    """The stock doc and stock level calls a stock take makes, recording what was written"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.created_docs = []
+        self.snapshot_reads = 0
+
+    async def validate_warehouse_permissions(self, user_id, warehouse_id, permission_type):
+        return True
+
+    async def get_warehouse_stock_snapshot(self, tenant_id, warehouse_id):
+        self.snapshot_reads += 1
+        return self.snapshot
+
+    async def generate_doc_number(self, tenant_id, doc_type):
+        return f"{doc_type.value}-000001"
+
+    async def create_stock_doc_with_lines(self, stock_doc):
+        self.created_docs.append(stock_doc)
+        return stock_doc
+
+
+def make_user():
+    return User.create(email="counter@example.com", full_name="Counter", role=UserRoleType.DISPATCHER, tenant_id=uuid4())
+
+
+class TestStockTake:
+    """Test cases for bulk physical count import and variance computation."""
+
+    def test_parses_csv_and_json_lines(self):
+        variant_id = uuid4()
+        csv_file = io.BytesIO(f"variant_id,counted_qty,stock_status\n{variant_id},12,\n{variant_id},3,quarantine\n".encode())
+        jsonl_file = io.BytesIO(f'{{"variant_id": "{variant_id}", "quantity": 5}}\n\n'.encode())
+
+        assert list(parse_stock_counts(csv_file)) == [
+            StockCount(variant_id, Decimal("12")),
+            StockCount(variant_id, Decimal("3"), StockStatus.QUARANTINE)
+        ]
+        assert list(parse_stock_counts(jsonl_file)) == [StockCount(variant_id, Decimal("5"))]
+
+        with pytest.raises(StockDocLineValidationError):
+            list(parse_stock_counts(io.BytesIO(b"variant_id,counted_qty\nnot-a-uuid,1\n")))
+
+    def test_variances_become_one_signed_document(self):
+        over, short, exact, missing = uuid4(), uuid4(), uuid4(), uuid4()
+        repositories = InMemoryStockRepositories({
+            (over, StockStatus.ON_HAND): (Decimal("10"), Decimal("2.5")),
+            (short, StockStatus.ON_HAND): (Decimal("8"), Decimal("4")),
+            (exact, StockStatus.ON_HAND): (Decimal("5"), Decimal("1")),
+            (missing, StockStatus.ON_HAND): (Decimal("3"), Decimal("1")),
+            (short, StockStatus.QUARANTINE): (Decimal("2"), Decimal("4"))
+        })
+        service = StockDocService(repositories, repositories)
+        warehouse_id = uuid4()
+        counts = [
+            StockCount(over, Decimal("7")),
+            StockCount(over, Decimal("5")),
+            StockCount(short, Decimal("6")),
+            StockCount(exact, Decimal("5")),
+            StockCount(short, Decimal("0"), StockStatus.QUARANTINE)
+        ]
+
+        result = asyncio.run(service.create_stock_take_variance(make_user(), warehouse_id, counts, full_count=True))
+
+        assert repositories.snapshot_reads == 1
+        assert result.counted_items == 4
+        assert {(line.variant_id, line.stock_status): line.variance for line in result.variance_lines} == {
+            (over, StockStatus.ON_HAND): Decimal("2"),
+            (short, StockStatus.ON_HAND): Decimal("-2"),
+            (missing, StockStatus.ON_HAND): Decimal("-3"),
+            (short, StockStatus.QUARANTINE): Decimal("-2")
+        }
+
+        [stock_doc] = repositories.created_docs
+        assert result.stock_doc is stock_doc
+        assert stock_doc.doc_type == StockDocType.ADJ_VARIANCE
+        assert stock_doc.dest_wh_id == warehouse_id
+        assert {line.variant_id: line.quantity for line in stock_doc.stock_doc_lines} == {
+            over: Decimal("2"), short: Decimal("-2"), missing: Decimal("-3")
+        }
+        assert stock_doc.total_qty == Decimal("7")
+
+    def test_no_document_without_on_hand_variance(self):
+        variant_id = uuid4()
+        repositories = InMemoryStockRepositories({(variant_id, StockStatus.ON_HAND): (Decimal("4"), Decimal("1"))})
+        service = StockDocService(repositories, repositories)
+
+        result = asyncio.run(service.create_stock_take_variance(
+            make_user(), uuid4(), [StockCount(variant_id, Decimal("4"))]
+        ))
+
+        assert result.variance_lines == []
+        assert result.stock_doc is None
+        assert repositories.created_docs == []
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from app.domain.entities.stripe_entities import StripeWebhookEvent
+from app.services.stripe.stripe_service import StripeService
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+class InMemoryWebhookQueue:
+    """The webhook-event part of StripeRepository, backed by a dict"""
+
+    def __init__(self):
+        self.events = {}
+
+    async def enqueue_webhook_event(self, webhook_event):
+        if any(event.stripe_event_id == webhook_event.stripe_event_id for event in self.events.values()):
+            return False
+        self.events[webhook_event.id] = webhook_event
+        return True
+
+    async def claim_webhook_events(self, limit=50, lease_seconds=300):
+        claimed = [
+            event for event in self.events.values()
+            if not event.processed and event.dead_lettered_at is None
+            and (event.next_attempt_at is None or event.next_attempt_at <= datetime.utcnow())
+        ][:limit]
+        for event in claimed:
+            event.attempts += 1
+        return claimed
+
+    async def update_webhook_event(self, webhook_event_id, webhook_event_data):
+        event = self.events[webhook_event_id]
+        for key, value in webhook_event_data.items():
+            setattr(event, key, value)
+        return event
+
+    async def get_webhook_event_by_stripe_id(self, stripe_event_id):
+        return next((event for event in self.events.values() if event.stripe_event_id == stripe_event_id), None)
+
+
+def make_service(queue):
+    return StripeService(stripe_repo=queue, audit_repo=None, stripe_secret_key="sk_test", stripe_webhook_secret=WEBHOOK_SECRET)
+
+
+def signed(payload):
+    timestamp = int(time.time())
+    signature = hmac.new(WEBHOOK_SECRET.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def make_payload(event_id, subscription_id="sub_1"):
+    return json.dumps({
+        "id": event_id,
+        "object": "event",
+        "type": "invoice.payment_succeeded",
+        "api_version": "2023-10-16",
+        "created": int(time.time()),
+        "livemode": False,
+        "pending_webhooks": 1,
+        "request": {"id": None, "idempotency_key": None},
+        "data": {"object": {"object": "invoice", "id": "in_1", "subscription": subscription_id}}
+    })
+
+
+def make_event(event_type="customer.subscription.updated"):
+    return StripeWebhookEvent(
+        id=uuid4(),
+        stripe_event_id=f"evt_{uuid4().hex}",
+        event_type=event_type,
+        api_version="2023-10-16",
+        created=datetime.utcnow(),
+        livemode=False,
+        pending_webhooks=1,
+        data={"object": {"object": "subscription", "id": "sub_1"}},
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+
+
+class TestStripeWebhookQueue:
+    """Test cases for queued Stripe webhook ingestion and processing."""
+
+    def test_fast_path_queues_once(self):
+        queue = InMemoryWebhookQueue()
+        service = make_service(queue)
+        payload = make_payload("evt_1")
+
+        first = asyncio.run(service.process_webhook_event(payload, signed(payload)))
+        second = asyncio.run(service.process_webhook_event(payload, signed(payload)))
+
+        assert (first, second) == (True, False)
+        [event] = queue.events.values()
+        assert event.ordering_key == "sub_1"
+        assert event.processed is False
+
+    def test_failures_retry_then_dead_letter(self):
+        queue = InMemoryWebhookQueue()
+        event = make_event()
+        queue.events[event.id] = event
+        service = make_service(queue)
+
+        async def failing_handler(stripe_event):
+            raise RuntimeError("handler crashed")
+        service._handle_webhook_event = failing_handler
+
+        first = asyncio.run(service.process_pending_webhook_events(max_attempts=2))
+        assert first["retried"] == 1
+        assert event.next_attempt_at > datetime.utcnow()
+
+        event.next_attempt_at = None
+        second = asyncio.run(service.process_pending_webhook_events(max_attempts=2))
+        assert second["dead_lettered"] == 1
+        assert event.dead_lettered_at is not None
+        assert event.last_error == "handler crashed"
+
+        requeued = asyncio.run(service.retry_dead_lettered_webhook_event(event.stripe_event_id))
+        assert requeued.dead_lettered_at is None
+        assert requeued.attempts == 0
+
+    def test_processed_events_are_marked(self):
+        queue = InMemoryWebhookQueue()
+        event = make_event()
+        queue.events[event.id] = event
+        handled = []
+        service = make_service(queue)
+
+        async def handler(stripe_event):
+            handled.append((stripe_event.type, stripe_event.data.object.id))
+        service._handle_webhook_event = handler
+
+        stats = asyncio.run(service.process_pending_webhook_events())
+
+        assert stats["processed"] == 1
+        assert handled == [("customer.subscription.updated", "sub_1")]
+        assert event.processed is True
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.domain.entities.payments import PaymentStatus
+from app.domain.entities.users import User, UserRoleType
+from app.infrastucture.database import invoice_repository_impl
+from app.infrastucture.database.invoice_repository_impl import InvoiceRepositoryImpl
+from app.infrastucture.database.models.payments import PaymentModel
+from app.infrastucture.database.payment_repository_impl import PaymentRepositoryImpl
+from app.infrastucture.database.reference_cache import invalidate_tenant_summaries, summary_cache
+from app.services.invoices.invoice_service import InvoiceService
+
+# (status, amount, payment_date) of one tenant's payments
+PAYMENTS = [
+    (PaymentStatus.COMPLETED, "100.00", date(2026, 3, 1)),
+    (PaymentStatus.COMPLETED, "250.50", date(2026, 3, 15)),
+    (PaymentStatus.COMPLETED, "-40.00", date(2026, 3, 16)),  # refund
+    (PaymentStatus.PENDING, "75.25", date(2026, 3, 20)),
+    (PaymentStatus.FAILED, "60.00", date(2026, 3, 21)),
+    (PaymentStatus.COMPLETED, "500.00", date(2026, 4, 2)),
+]
+
+
+async def summarize(tenant_id, other_tenant, **date_range):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(PaymentModel.__table__.create)
+        async with AsyncSession(engine) as session:
+            rows = [(tenant_id, *payment) for payment in PAYMENTS]
+            rows.append((other_tenant, PaymentStatus.COMPLETED, "999.00", date(2026, 3, 10)))
+            session.add_all([
+                PaymentModel(
+                    id=uuid4(), tenant_id=tenant, payment_no=f"PAY-{index:06d}", payment_type="customer_payment",
+                    payment_status=status.value, payment_method="mpesa", amount=Decimal(amount),
+                    customer_id=uuid4(), payment_date=payment_date
+                )
+                for index, (tenant, status, amount, payment_date) in enumerate(rows)
+            ])
+            await session.commit()
+            return await PaymentRepositoryImpl(session).get_payment_summary(tenant_id, **date_range)
+    finally:
+        await engine.dispose()
+
+
+class SummaryRpc:
+    """Supabase client stand-in answering get_invoice_summary with a fixed row"""
+
+    def __init__(self, row):
+        self.row = row
+        self.calls = []
+
+    def rpc(self, function, params):
+        self.calls.append((function, params))
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=[self.row] if self.row else []))
+
+
+class TestSummaries:
+    """Test cases for invoice and payment summaries aggregated in the database."""
+
+    def test_payment_summary_aggregates_by_status_and_excludes_refunds(self):
+        tenant_id, other_tenant = uuid4(), uuid4()
+
+        summary = asyncio.run(summarize(tenant_id, other_tenant))
+        march = asyncio.run(summarize(tenant_id, other_tenant, from_date=date(2026, 3, 1), to_date=date(2026, 3, 31)))
+
+        assert (summary.total_payments, summary.total_amount) == (6, Decimal("985.75"))
+        assert (summary.completed_payments, summary.completed_amount) == (3, Decimal("850.50"))
+        assert (summary.pending_payments, summary.pending_amount) == (1, Decimal("75.25"))
+        assert (summary.failed_payments, summary.failed_amount) == (1, Decimal("60.00"))
+        assert (march.total_payments, march.total_amount) == (5, Decimal("485.75"))
+        assert (march.completed_payments, march.completed_amount) == (2, Decimal("350.50"))
+
+    def test_invoice_summary_maps_the_database_counts(self, monkeypatch):
+        client = SummaryRpc({"draft_invoices": 2, "sent_invoices": 5, "paid_invoices": 7, "overdue_invoices": None})
+        monkeypatch.setattr(invoice_repository_impl, "get_database", lambda: client)
+        tenant_id = uuid4()
+
+        summary = asyncio.run(InvoiceRepositoryImpl().get_invoice_summary(tenant_id))
+
+        assert summary == {
+            "draft_invoices": 2, "sent_invoices": 5, "paid_invoices": 7, "overdue_invoices": 0, "total_invoices": 14
+        }
+        assert client.calls == [("get_invoice_summary", {"p_tenant_id": str(tenant_id), "p_today": date.today().isoformat()})]
+
+        client.row = None
+        assert asyncio.run(InvoiceRepositoryImpl().get_invoice_summary(tenant_id))["total_invoices"] == 0
+
+    def test_invoice_summary_is_cached_until_an_invoice_or_payment_write(self, monkeypatch):
+        client = SummaryRpc({"draft_invoices": 1, "sent_invoices": 0, "paid_invoices": 0, "overdue_invoices": 0})
+        monkeypatch.setattr(invoice_repository_impl, "get_database", lambda: client)
+        user = User.create(email="accounts@example.com", full_name="Accounts", role=UserRoleType.ACCOUNTS, tenant_id=uuid4())
+        service = InvoiceService(InvoiceRepositoryImpl(), None, None)
+        summary_cache.invalidate(user.tenant_id)
+
+        first = asyncio.run(service.get_invoice_summary(user))
+        client.row = {"draft_invoices": 1, "sent_invoices": 1, "paid_invoices": 0, "overdue_invoices": 0}
+        cached = asyncio.run(service.get_invoice_summary(user))
+        invalidate_tenant_summaries(user.tenant_id)
+        refreshed = asyncio.run(service.get_invoice_summary(user))
+
+        assert first["total_invoices"] == cached["total_invoices"] == 1
+        assert refreshed["total_invoices"] == 2
+        assert len(client.calls) == 2
@@ -0,0 +1,191 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities.audit_events import AuditActorType, AuditEvent, AuditEventType, AuditObjectType
+from app.domain.entities.orders import Order, OrderLine, OrderStatus, OrderTransition
+from app.domain.entities.trips import Trip, TripStatus
+from app.domain.entities.users import User, UserRoleType
+from app.infrastucture.database.repositories.order_repository import SQLAlchemyOrderRepository
+from app.services.trips.trip_status_automation_service import TripStatusAutomationService
+from app.services.vehicles.vehicle_warehouse_service import VehicleWarehouseService
+
+
+class TransitioningVehicleLoads:
+    """The vehicle load repository, applying the order transition it is handed with the movement"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.movements = []
+
+    async def apply_vehicle_movement(self, tenant_id, warehouse_id, stock_docs, changes, truck_inventory,
+                                     movement_type=None, allow_negative=False, order_transition=None):
+        if self.fail:
+            raise RuntimeError("Insufficient stock")
+        self.movements.append(SimpleNamespace(stock_docs=stock_docs, order_transition=order_transition))
+        # The first order was moved on by someone else in the meantime
+        return order_transition.order_ids[1:]
+
+
+class NumberingStockDocs:
+    async def generate_doc_number(self, tenant_id, doc_type):
+        return f"{doc_type.value}-000001"
+
+
+class TripOrders:
+    """Order repository stand-in; the loaded transition must not go through it"""
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.bulk_calls = []
+
+    async def get_orders_by_ids(self, order_ids):
+        return [order for order in self.orders if order.id in order_ids]
+
+    async def bulk_transition_orders(self, **kwargs):
+        self.bulk_calls.append(kwargs)
+        return kwargs["order_ids"]
+
+
+class TripStops:
+    def __init__(self, orders):
+        self.orders = orders
+
+    async def get_trip_stops_by_trip(self, trip_id):
+        return [SimpleNamespace(order_id=order.id) for order in self.orders]
+
+
+class TransitionSession:
+    """AsyncSession stand-in returning the transitioned rows and recording what it is asked to do"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.added = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(all=lambda: self.rows)
+
+    def add_all(self, models):
+        self.added.extend(models)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def make_user():
+    return User.create(email="dispatch@example.com", full_name="Dispatch", role=UserRoleType.DISPATCHER, tenant_id=uuid4())
+
+
+def make_trip(user):
+    trip = Trip.create(tenant_id=user.tenant_id, trip_no="TRIP-1", vehicle_id=uuid4(), start_wh_id=uuid4())
+    trip.trip_status = TripStatus.LOADED
+    return trip
+
+
+def make_allocated_order(user, order_no):
+    order = Order.create(tenant_id=user.tenant_id, order_no=order_no, customer_id=uuid4())
+    order.order_status = OrderStatus.ALLOCATED
+    line = OrderLine.create(order_id=order.id, variant_id=uuid4(), qty_ordered=Decimal("4"), list_price=Decimal("1500"))
+    line.qty_allocated = Decimal("4")
+    order.order_lines = [line]
+    return order
+
+
+def make_automation(orders, vehicle_loads):
+    vehicle_warehouse = VehicleWarehouseService(
+        NumberingStockDocs(), stock_level_service=None, vehicle_load_repository=vehicle_loads
+    )
+    return TripStatusAutomationService(TripStops(orders.orders), orders, None, vehicle_warehouse)
+
+
+def make_audit_event(user, order):
+    return AuditEvent.create(
+        tenant_id=user.tenant_id,
+        actor_id=user.id,
+        actor_type=AuditActorType.USER,
+        object_type=AuditObjectType.ORDER,
+        object_id=order.id,
+        event_type=AuditEventType.STATUS_CHANGE,
+        field_name="order_status"
+    )
+
+
+class TestTripStatusAutomation:
+    """Test cases for moving a trip's orders along with its status."""
+
+    def test_loading_the_truck_marks_its_orders_loaded_in_the_same_movement(self):
+        user = make_user()
+        orders = [make_allocated_order(user, f"ORD-{i}") for i in range(3)]
+        orders[2].order_status = OrderStatus.APPROVED
+        trip_orders, vehicle_loads = TripOrders(orders), TransitioningVehicleLoads()
+
+        result = asyncio.run(make_automation(trip_orders, vehicle_loads).handle_trip_status_change(
+            user, make_trip(user), TripStatus.LOADED, TripStatus.PLANNED
+        ))
+
+        transition = vehicle_loads.movements[0].order_transition
+        assert result["success"] and result["truck_inventory"][0]["success"]
+        assert transition.order_ids == [orders[0].id, orders[1].id]
+        assert (transition.from_status, transition.to_status) == (OrderStatus.ALLOCATED, OrderStatus.LOADED)
+        assert [event.object_id for event in transition.audit_events] == transition.order_ids
+        assert trip_orders.bulk_calls == []
+        assert [update["success"] for update in result["order_updates"]] == [False, True]
+        assert [order.order_status for order in orders] == [OrderStatus.ALLOCATED, OrderStatus.LOADED, OrderStatus.APPROVED]
+
+    def test_a_failed_load_leaves_the_orders_allocated(self):
+        user = make_user()
+        orders = [make_allocated_order(user, f"ORD-{i}") for i in range(2)]
+        trip_orders = TripOrders(orders)
+
+        result = asyncio.run(make_automation(trip_orders, TransitioningVehicleLoads(fail=True)).handle_trip_status_change(
+            user, make_trip(user), TripStatus.LOADED, TripStatus.PLANNED
+        ))
+
+        assert result["truck_inventory"][0]["success"] is False
+        assert [update["success"] for update in result["order_updates"]] == [False, False]
+        assert all("Vehicle could not be loaded" in update["error"] for update in result["order_updates"])
+        assert trip_orders.bulk_calls == []
+        assert all(order.order_status == OrderStatus.ALLOCATED for order in orders)
+
+    def test_bulk_transition_is_guarded_on_status_and_audits_only_what_moved(self):
+        user = make_user()
+        moved, skipped = make_allocated_order(user, "ORD-1"), make_allocated_order(user, "ORD-2")
+        session = TransitionSession([SimpleNamespace(id=moved.id, tenant_id=user.tenant_id)])
+
+        transitioned = asyncio.run(SQLAlchemyOrderRepository(session).bulk_transition_orders(
+            [moved.id, skipped.id], OrderStatus.IN_TRANSIT, OrderStatus.DELIVERED, user.id,
+            mark_delivered=True, audit_events=[make_audit_event(user, moved), make_audit_event(user, skipped)]
+        ))
+
+        assert transitioned == [moved.id]
+        assert "orders.order_status = %(order_status_1)s" in session.statements[0]
+        assert "RETURNING orders.id, orders.tenant_id" in session.statements[0]
+        assert session.statements[1].startswith("UPDATE order_lines")
+        assert [model.object_id for model in session.added] == [moved.id]
+        assert (session.commits, session.rollbacks) == (1, 0)
+
+        # Inside a larger unit of work the transition is written but not committed
+        in_movement = TransitionSession([SimpleNamespace(id=moved.id, tenant_id=user.tenant_id)])
+        asyncio.run(SQLAlchemyOrderRepository(in_movement).add_order_transition(OrderTransition(
+            order_ids=[moved.id], from_status=OrderStatus.ALLOCATED, to_status=OrderStatus.LOADED
+        )))
+        assert len(in_movement.statements) == 1 and in_movement.commits == 0
+
+        failing = TransitionSession([])
+        failing.execute = lambda stmt, params=None: (_ for _ in ()).throw(RuntimeError("deadlock"))
+        with pytest.raises(RuntimeError):
+            asyncio.run(SQLAlchemyOrderRepository(failing).bulk_transition_orders(
+                [moved.id], OrderStatus.ALLOCATED, OrderStatus.LOADED
+            ))
+        assert failing.rollbacks == 1
@@ -0,0 +1,216 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.domain.entities.stock_docs import StockDocStatus, StockDocType, StockStatus
+from app.domain.entities.truck_reconciliation import TruckReconciliation
+from app.domain.entities.users import User, UserRoleType
+from app.services.vehicles.truck_reconciliation_service import TruckReconciliationService
+from app.services.vehicles.truck_reconciliation_worker import TruckReconciliationWorker
+from app.services.vehicles.vehicle_warehouse_service import VehicleWarehouseService
+
+
+class RecordingVehicleLoads:
+    """The vehicle load repository, recording each movement it is asked to apply"""
+
+    def __init__(self, failing_warehouses=()):
+        self.movements = []
+        self.failing_warehouses = set(failing_warehouses)
+
+    async def apply_vehicle_movement(self, tenant_id, warehouse_id, stock_docs, changes, truck_inventory,
+                                     movement_type=None, allow_negative=False):
+        if warehouse_id in self.failing_warehouses:
+            raise RuntimeError("deadlock detected")
+        self.movements.append(SimpleNamespace(
+            tenant_id=tenant_id, warehouse_id=warehouse_id, stock_docs=stock_docs, changes=changes,
+            movement_type=movement_type, allow_negative=allow_negative
+        ))
+
+
+class NumberingStockDocs:
+    """The one stock document call reconciliation makes"""
+
+    async def generate_doc_number(self, tenant_id, doc_type):
+        return f"{doc_type.value}-000001"
+
+
+class StaticReconciliations:
+    """Truck reconciliation repository answering from prepared rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.windows = []
+
+    async def get_trip_reconciliation(self, trip_id):
+        reconciliations = TruckReconciliation.group(row for row in self.rows if row["trip_id"] == trip_id)
+        return reconciliations[0].record_counts({}) if reconciliations else None
+
+    async def get_unreconciled_trips(self, completed_from, completed_to):
+        self.windows.append((completed_from, completed_to))
+        return TruckReconciliation.group(self.rows)
+
+    async def claim_trip_for_reconciliation(self, trip_id):
+        return True
+
+
+class SharedStockDocs:
+    """The posted variance documents and per-trip advisory locks every worker process sees"""
+
+    def __init__(self):
+        self.variance_docs = []
+        self.locks = {}
+
+
+class ClaimingReconciliations(StaticReconciliations):
+    """One process's session: it read the trips without locks and claims each one before posting"""
+
+    def __init__(self, rows, database):
+        super().__init__(rows)
+        self.database = database
+        self.held = None
+
+    async def claim_trip_for_reconciliation(self, trip_id):
+        lock = self.database.locks.setdefault(trip_id, asyncio.Lock())
+        await lock.acquire()
+        self.held = lock
+        if any(doc.ref_doc_id == trip_id for doc in self.database.variance_docs):
+            self.end_transaction()
+            return False
+        return True
+
+    def end_transaction(self):
+        if self.held is not None:
+            self.held.release()
+            self.held = None
+
+
+class CommittingVehicleLoads:
+    """Vehicle load repository on the same session, committing the variance document and releasing the claim"""
+
+    def __init__(self, database, transaction):
+        self.database = database
+        self.transaction = transaction
+        self.movements = []
+
+    async def apply_vehicle_movement(self, tenant_id, warehouse_id, stock_docs, changes, truck_inventory,
+                                     movement_type=None, allow_negative=False):
+        # Let the other process catch up before this one commits
+        await asyncio.sleep(0)
+        self.movements.append(changes)
+        self.database.variance_docs.extend(stock_docs)
+        self.transaction.end_transaction()
+
+
+def make_user():
+    return User.create(email="depot@example.com", full_name="Depot", role=UserRoleType.DISPATCHER, tenant_id=uuid4())
+
+
+class TestTruckReconciliation:
+    """Test cases for end-of-trip truck stock reconciliation."""
+
+    def test_unload_reconciles_against_manifest_and_deliveries(self):
+        trip_id, cylinder, bulk = uuid4(), uuid4(), uuid4()
+        vehicle_loads = RecordingVehicleLoads()
+        reconciliations = StaticReconciliations([
+            {"trip_id": trip_id, "variant_id": cylinder, "loaded_qty": 20, "delivered_qty": 12, "empties_collected_qty": 9},
+            {"trip_id": trip_id, "variant_id": bulk, "loaded_qty": 5, "delivered_qty": 5}
+        ])
+        service = VehicleWarehouseService(
+            NumberingStockDocs(), stock_level_service=None,
+            vehicle_load_repository=vehicle_loads, truck_reconciliation_repository=reconciliations
+        )
+        user = make_user()
+
+        # The caller's expected manifest is superseded by the trip's own records
+        result = asyncio.run(service.unload_vehicle_as_warehouse(
+            uuid4(), trip_id, uuid4(),
+            actual_inventory=[{"variant_id": str(cylinder), "quantity": 7}, {"variant_id": str(bulk), "quantity": 1}],
+            expected_inventory=[{"variant_id": str(cylinder), "quantity": 20}],
+            unloaded_by=user.id,
+            user=user
+        ))
+
+        transfer, variance_doc = vehicle_loads.movements[0].stock_docs
+        assert len(vehicle_loads.movements) == 1 and result["variance_docs"] == [str(variance_doc.id)]
+        assert variance_doc.doc_type == StockDocType.ADJ_VARIANCE
+        assert {line.variant_id: line.quantity for line in variance_doc.stock_doc_lines} == {
+            cylinder: Decimal("-1"), bulk: Decimal("1")
+        }
+        assert {variance["variant_id"]: variance["empties_collected_qty"] for variance in result["variances"]} == {
+            str(cylinder): 9.0, str(bulk): 0.0
+        }
+
+    def test_fleet_reconciliation_writes_one_document_per_trip_with_variances(self):
+        tenant_id, cylinder, bulk = uuid4(), uuid4(), uuid4()
+        short_trip, exact_trip, failing_trip = uuid4(), uuid4(), uuid4()
+        depot, failing_depot = uuid4(), uuid4()
+        rows = [
+            {"trip_id": short_trip, "tenant_id": tenant_id, "warehouse_id": depot, "variant_id": cylinder,
+             "loaded_qty": 10, "delivered_qty": 6, "counted_qty": 3},
+            {"trip_id": short_trip, "tenant_id": tenant_id, "warehouse_id": depot, "variant_id": bulk,
+             "loaded_qty": 2, "delivered_qty": 0, "counted_qty": 0},
+            {"trip_id": exact_trip, "tenant_id": tenant_id, "warehouse_id": depot, "variant_id": cylinder,
+             "loaded_qty": 8, "delivered_qty": 8, "counted_qty": 0},
+            {"trip_id": failing_trip, "tenant_id": tenant_id, "warehouse_id": failing_depot, "variant_id": cylinder,
+             "loaded_qty": 4, "delivered_qty": 0, "counted_qty": 5}
+        ]
+        vehicle_loads = RecordingVehicleLoads(failing_warehouses=[failing_depot])
+        service = TruckReconciliationService(NumberingStockDocs(), vehicle_loads, StaticReconciliations(rows))
+
+        variance_docs = asyncio.run(service.reconcile_fleet(
+            datetime(2026, 10, 17, tzinfo=timezone.utc), datetime(2026, 10, 18, tzinfo=timezone.utc)
+        ))
+
+        movement = vehicle_loads.movements[0]
+        assert len(variance_docs) == 1 and len(vehicle_loads.movements) == 1
+        assert (variance_docs[0].ref_doc_id, variance_docs[0].doc_status) == (short_trip, StockDocStatus.POSTED)
+        assert variance_docs[0].total_qty == Decimal("3")
+        assert {(change.variant_id, change.stock_status): change.quantity_change for change in movement.changes} == {
+            (cylinder, StockStatus.TRUCK_STOCK): Decimal("-1"),
+            (bulk, StockStatus.TRUCK_STOCK): Decimal("-2")
+        }
+        assert (movement.warehouse_id, movement.allow_negative) == (depot, True)
+
+    def test_worker_reconciles_each_closed_day_once(self):
+        reconciliations = StaticReconciliations([])
+
+        @asynccontextmanager
+        async def services():
+            yield TruckReconciliationService(NumberingStockDocs(), RecordingVehicleLoads(), reconciliations)
+
+        worker = TruckReconciliationWorker(services=services)
+        now = datetime(2026, 10, 18, 6, 0, tzinfo=timezone.utc)
+
+        assert asyncio.run(worker.run_once(now)) == 0
+        assert asyncio.run(worker.run_once(now + timedelta(hours=12))) is None
+        assert asyncio.run(worker.run_once(now + timedelta(days=1))) == 0
+        assert reconciliations.windows == [
+            (datetime(2026, 10, 17, tzinfo=timezone.utc), datetime(2026, 10, 18, tzinfo=timezone.utc)),
+            (datetime(2026, 10, 18, tzinfo=timezone.utc), datetime(2026, 10, 19, tzinfo=timezone.utc))
+        ]
+
+    def test_concurrent_fleet_runs_post_each_trip_once(self):
+        tenant_id, trip_id, cylinder = uuid4(), uuid4(), uuid4()
+        rows = [{"trip_id": trip_id, "tenant_id": tenant_id, "warehouse_id": uuid4(), "variant_id": cylinder,
+                 "loaded_qty": 10, "delivered_qty": 6, "counted_qty": 3}]
+        database = SharedStockDocs()
+        processes = []
+        for _ in range(2):
+            reconciliations = ClaimingReconciliations(rows, database)
+            vehicle_loads = CommittingVehicleLoads(database, reconciliations)
+            processes.append((TruckReconciliationService(NumberingStockDocs(), vehicle_loads, reconciliations), vehicle_loads))
+        window = (datetime(2026, 10, 17, tzinfo=timezone.utc), datetime(2026, 10, 18, tzinfo=timezone.utc))
+
+        async def run_everywhere():
+            return await asyncio.gather(*(service.reconcile_fleet(*window) for service, _ in processes))
+
+        results = asyncio.run(run_everywhere())
+
+        # Both processes selected the trip, only the one that claimed it first posted
+        assert sorted(len(variance_docs) for variance_docs in results) == [0, 1]
+        assert [doc.ref_doc_id for doc in database.variance_docs] == [trip_id]
+        assert sum(len(vehicle_loads.movements) for _, vehicle_loads in processes) == 1
+        assert not any(lock.locked() for lock in database.locks.values())
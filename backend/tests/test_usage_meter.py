@@ -0,0 +1,171 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import stripe
+
+from app.domain.entities.stripe_entities import StripeUsageType
+from app.services.stripe.stripe_service import StripeService
+from app.services.tenant_subscriptions import usage_meter
+from app.services.tenant_subscriptions.usage_meter import UsageMeter
+
+
+class RecordingSinks:
+    """Persist/report handlers that record batches and can be told to fail"""
+
+    def __init__(self):
+        self.persisted = []
+        self.reported = []
+        self.flush_ids = []
+        self.timestamps = []
+        self.fail_persist = False
+        self.reject_report = False
+        self.fail_report = False
+
+    async def persist(self, increments, gauges):
+        if self.fail_persist:
+            raise RuntimeError("database unavailable")
+        self.persisted.append((increments, gauges))
+
+    async def report(self, increments, flush_id, reported_at):
+        self.reported.append(increments)
+        self.flush_ids.append(flush_id)
+        self.timestamps.append(reported_at)
+        if self.fail_report:
+            raise RuntimeError("Stripe timed out")
+        return increments if self.reject_report else {}
+
+
+class MeteredItems:
+    """Stripe repository stand-in with one metered 'orders' item per tenant"""
+
+    def __init__(self):
+        self.usage_records = []
+
+    async def get_subscription_by_tenant_id(self, tenant_id):
+        return SimpleNamespace(id=tenant_id)
+
+    async def get_subscription_items_by_subscription_id(self, subscription_id):
+        return [SimpleNamespace(
+            id=subscription_id, stripe_subscription_item_id=f"si_{subscription_id.hex}",
+            usage_type=StripeUsageType.METERED, metadata={}
+        )]
+
+    async def create_usage_record(self, record):
+        self.usage_records.append(record)
+
+
+def make_meter(sinks):
+    return UsageMeter(persist=sinks.persist, report=sinks.report)
+
+
+class TestUsageMeter:
+    """Test cases for in-memory usage aggregation and batched flushing."""
+
+    def test_counts_are_aggregated_per_flush(self):
+        sinks = RecordingSinks()
+        meter = make_meter(sinks)
+        tenant_id = uuid4()
+        for _ in range(5):
+            meter.record(tenant_id, 'orders')
+        meter.record(tenant_id, 'drivers', 3)
+        meter.record(tenant_id, 'drivers', 4)
+
+        asyncio.run(meter.flush())
+
+        assert sinks.persisted == [({tenant_id: {'orders': 5}}, {tenant_id: {'drivers': 4}})]
+        assert sinks.reported == [{tenant_id: {'orders': 5}}]
+
+    def test_usage_combines_baseline_and_pending(self):
+        meter = make_meter(RecordingSinks())
+        tenant_id = uuid4()
+
+        assert meter.usage(tenant_id) is None
+
+        meter.prime(tenant_id, {'orders': 10})
+        meter.record(tenant_id, 'orders', 2)
+        assert meter.usage(tenant_id) == {'orders': 12}
+
+        asyncio.run(meter.flush())
+        assert meter.usage(tenant_id) == {'orders': 12}
+
+    def test_failed_persist_keeps_deltas(self):
+        sinks = RecordingSinks()
+        meter = make_meter(sinks)
+        tenant_id = uuid4()
+        meter.record(tenant_id, 'orders', 3)
+
+        sinks.fail_persist = True
+        with pytest.raises(RuntimeError):
+            asyncio.run(meter.flush())
+        assert sinks.reported == []
+
+        sinks.fail_persist = False
+        meter.record(tenant_id, 'orders', 1)
+        asyncio.run(meter.flush())
+        assert sinks.persisted == [({tenant_id: {'orders': 4}}, {})]
+
+    def test_unreported_usage_is_retried_under_its_original_flush_id(self):
+        sinks = RecordingSinks()
+        meter = make_meter(sinks)
+        tenant_id = uuid4()
+        meter.record(tenant_id, 'orders', 3)
+
+        sinks.reject_report = True
+        asyncio.run(meter.flush())
+        sinks.reject_report = False
+        meter.record(tenant_id, 'orders', 2)
+        asyncio.run(meter.flush())
+
+        # The rejected batch is re-sent unchanged; the new delta waits for a batch of its own
+        assert sinks.reported == [{tenant_id: {'orders': 3}}, {tenant_id: {'orders': 3}}, {tenant_id: {'orders': 2}}]
+        assert sinks.flush_ids[0] == sinks.flush_ids[1] != sinks.flush_ids[2]
+        # The database saw each delta exactly once
+        assert [batch[0][tenant_id]['orders'] for batch in sinks.persisted] == [3, 2]
+
+    def test_batch_stays_in_flight_until_stripe_acknowledges_it(self):
+        sinks = RecordingSinks()
+        meter = make_meter(sinks)
+        tenant_id = uuid4()
+        meter.record(tenant_id, 'orders', 4)
+
+        sinks.fail_report = True
+        assert asyncio.run(meter.flush())["unreported_tenants"] == 1
+        meter.record(tenant_id, 'orders', 1)
+        asyncio.run(meter.flush())
+        assert sinks.reported == [{tenant_id: {'orders': 4}}] * 2
+        assert len(set(sinks.flush_ids)) == 1
+
+        sinks.fail_report = False
+        assert asyncio.run(meter.flush())["unreported_tenants"] == 0
+        assert sinks.reported[2:] == [{tenant_id: {'orders': 4}}, {tenant_id: {'orders': 1}}]
+        assert sinks.flush_ids[2] == sinks.flush_ids[0] != sinks.flush_ids[3]
+        assert sinks.timestamps[0] == sinks.timestamps[1] == sinks.timestamps[2]
+
+    def test_retried_records_send_identical_parameters_to_stripe(self, monkeypatch):
+        calls = []
+
+        def create_usage_record(item_id, **params):
+            calls.append((item_id, params))
+            if len(calls) == 1:
+                raise stripe.error.APIConnectionError("connection reset")
+            return SimpleNamespace(id="mbur_1")
+
+        monkeypatch.setattr(stripe.SubscriptionItem, "create_usage_record", create_usage_record)
+        repository = MeteredItems()
+        service = StripeService(stripe_repo=repository, audit_repo=None, stripe_secret_key="sk_test", stripe_webhook_secret="whsec_test")
+        meter = UsageMeter(persist=RecordingSinks().persist, report=service.report_usage_batch)
+        tenant_id = uuid4()
+        meter.record(tenant_id, 'orders', 3)
+
+        monkeypatch.setattr(usage_meter.time, "time", lambda: 1767225600.5)
+        assert asyncio.run(meter.flush())["unreported_tenants"] == 1
+        monkeypatch.setattr(usage_meter.time, "time", lambda: 1767225660.5)
+        assert asyncio.run(meter.flush())["unreported_tenants"] == 0
+
+        # Same idempotency key, same timestamp, same quantity, so Stripe accepts the retry and counts it once
+        assert len(calls) == 2 and calls[0] == calls[1]
+        assert (calls[0][1]["quantity"], calls[0][1]["timestamp"]) == (3, 1767225600)
+        assert repository.usage_records[0].timestamp == datetime.utcfromtimestamp(calls[0][1]["timestamp"])
@@ -0,0 +1,147 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities.stock_docs import StockDocStatus, StockDocType, StockStatus
+from app.domain.entities.stock_levels import StockBucketChange
+from app.domain.entities.users import User, UserRoleType
+from app.domain.exceptions.stock_docs.stock_doc_exceptions import InsufficientStockError
+from app.infrastucture.database.repositories.stock_level_repository import SQLAlchemyStockLevelRepository
+from app.services.vehicles.vehicle_warehouse_service import VehicleWarehouseService
+
+
+class RecordingVehicleLoads:
+    """The vehicle load repository, recording each movement it is asked to apply"""
+
+    def __init__(self):
+        self.movements = []
+
+    async def apply_vehicle_movement(self, tenant_id, warehouse_id, stock_docs, changes, truck_inventory,
+                                     movement_type=None, allow_negative=False, order_transition=None):
+        self.movements.append(SimpleNamespace(
+            tenant_id=tenant_id, warehouse_id=warehouse_id, stock_docs=stock_docs, changes=changes,
+            truck_inventory=truck_inventory, allow_negative=allow_negative, order_transition=order_transition
+        ))
+        return list(order_transition.order_ids) if order_transition else []
+
+
+class NumberingStockDocs:
+    """The one stock document service call the bulk paths make"""
+
+    async def generate_doc_number(self, tenant_id, doc_type):
+        return f"{doc_type.value}-000001"
+
+
+class LockedRowsSession:
+    """AsyncSession stand-in returning the locked stock level rows and recording the statements"""
+
+    def __init__(self, models):
+        self.models = models
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.models))
+
+
+def make_service(vehicle_loads):
+    return VehicleWarehouseService(NumberingStockDocs(), stock_level_service=None, vehicle_load_repository=vehicle_loads)
+
+
+def net_changes(changes):
+    totals = {}
+    for change in changes:
+        key = (change.variant_id, change.stock_status)
+        totals[key] = totals.get(key, Decimal("0")) + change.quantity_change
+    return totals
+
+
+def make_user():
+    return User.create(email="loader@example.com", full_name="Loader", role=UserRoleType.DISPATCHER, tenant_id=uuid4())
+
+
+class TestVehicleLoading:
+    """Test cases for set-based vehicle loading and unloading."""
+
+    def test_load_applies_the_whole_manifest_as_one_movement(self):
+        vehicle_loads = RecordingVehicleLoads()
+        user, warehouse_id, cylinder, product = make_user(), uuid4(), uuid4(), uuid4()
+        items = [
+            {"product_id": str(product), "variant_id": str(cylinder), "quantity": 10, "empties_expected_qty": 4},
+            {"product_id": str(product), "variant_id": str(cylinder), "quantity": 5, "empties_expected_qty": 2}
+        ]
+
+        result = asyncio.run(make_service(vehicle_loads).load_vehicle_as_warehouse(
+            uuid4(), uuid4(), warehouse_id, items, user.id, user
+        ))
+
+        movement = vehicle_loads.movements[0]
+        transfer = movement.stock_docs[0]
+        assert len(vehicle_loads.movements) == 1 and result["truck_inventory_count"] == 1
+        assert (transfer.doc_type, transfer.doc_status, transfer.source_wh_id) == (
+            StockDocType.TRF_TRUCK, StockDocStatus.POSTED, warehouse_id
+        )
+        assert net_changes(movement.changes) == {
+            (cylinder, StockStatus.ON_HAND): Decimal("-15"),
+            (cylinder, StockStatus.TRUCK_STOCK): Decimal("15")
+        }
+        assert (movement.truck_inventory[0].loaded_qty, movement.truck_inventory[0].empties_expected_qty) == (
+            Decimal("15"), Decimal("6")
+        )
+        assert not movement.allow_negative
+
+    def test_unload_writes_off_the_variance_from_truck_stock(self):
+        vehicle_loads = RecordingVehicleLoads()
+        user, warehouse_id, cylinder, bulk = make_user(), uuid4(), uuid4(), uuid4()
+
+        result = asyncio.run(make_service(vehicle_loads).unload_vehicle_as_warehouse(
+            uuid4(), uuid4(), warehouse_id,
+            actual_inventory=[{"variant_id": str(cylinder), "quantity": 3}],
+            expected_inventory=[{"variant_id": str(cylinder), "quantity": 5}, {"variant_id": str(bulk), "quantity": 1}],
+            unloaded_by=user.id,
+            user=user
+        ))
+
+        movement = vehicle_loads.movements[0]
+        transfer, variance_doc = movement.stock_docs
+        assert result["variance_docs"] == [str(variance_doc.id)]
+        assert variance_doc.doc_type == StockDocType.ADJ_VARIANCE
+        assert sorted(line.quantity for line in variance_doc.stock_doc_lines) == [Decimal("-2"), Decimal("-1")]
+        # The truck gives up everything it was expected to carry; the depot gets what came back
+        assert net_changes(movement.changes) == {
+            (cylinder, StockStatus.TRUCK_STOCK): Decimal("-5"),
+            (cylinder, StockStatus.ON_HAND): Decimal("3"),
+            (bulk, StockStatus.TRUCK_STOCK): Decimal("-1")
+        }
+        assert movement.allow_negative
+
+    def test_stock_changes_are_one_locked_read_and_one_upsert(self):
+        tenant_id, warehouse_id, variant_id = uuid4(), uuid4(), uuid4()
+        on_hand = SimpleNamespace(
+            id=uuid4(), tenant_id=tenant_id, warehouse_id=warehouse_id, variant_id=variant_id,
+            stock_status=StockStatus.ON_HAND, quantity=Decimal("20"), reserved_qty=Decimal("8"),
+            available_qty=Decimal("12"), unit_cost=Decimal("10"), total_cost=Decimal("200"),
+            last_transaction_date=None, created_at=None, updated_at=None
+        )
+        changes = [
+            StockBucketChange(variant_id, StockStatus.ON_HAND, Decimal("-12")),
+            StockBucketChange(variant_id, StockStatus.TRUCK_STOCK, Decimal("12"), Decimal("10"))
+        ]
+
+        session = LockedRowsSession([on_hand])
+        levels = asyncio.run(SQLAlchemyStockLevelRepository(session).apply_stock_changes(tenant_id, warehouse_id, changes))
+
+        assert [level.quantity for level in levels] == [Decimal("8"), Decimal("12")]
+        assert "FOR UPDATE" in session.statements[0]
+        assert "ON CONFLICT ON CONSTRAINT stock_levels_unique_combination" in session.statements[1]
+        assert len(session.statements) == 3  # locked read, upsert, ledger insert
+
+        changes[0].quantity_change = Decimal("-13")
+        short = LockedRowsSession([on_hand])
+        with pytest.raises(InsufficientStockError):
+            asyncio.run(SQLAlchemyStockLevelRepository(short).apply_stock_changes(tenant_id, warehouse_id, changes))
+        assert len(short.statements) == 1